@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+"""
+CLI benchmark suite
+
+Runs CLI commands end to end against the local Conjur stub server
+(test/util/conjur_stub_server.py) and reports, per scenario, the wall time
+of the process, the number of HTTP requests and TCP connections the server
+saw, and the peak RSS of the process. Server latency can be injected to
+model a remote Conjur.
+
+Usage:
+  python benchmarks/bench_cli.py [--runs 5] [--latency 0.02] [--size 200]
+                                 [--scenario NAME ...] [--json results.json]
+
+Each run is a fresh process, exactly as a user invoking 'conjur' would
+start one, so interpreter and import time are part of the measurement.
+Use --json to keep a baseline and compare it with a later run.
+"""
+
+# Builtins
+import argparse
+import json
+import os
+import statistics
+import sys
+from typing import Callable, List, NamedTuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+from test.util.cli_sandbox import CliSandbox
+from test.util.conjur_stub_server import ConjurStubServer
+
+ADMIN_LOGIN = 'admin'
+POLICY = """- !variable benchmark/extra
+"""
+
+
+class Scenario(NamedTuple):
+    """
+    A CLI invocation to measure. 'prepare' runs before every measured run
+    and returns the CLI arguments and the text to pass on stdin
+    """
+    name: str
+    prepare: Callable
+
+
+def seed(server: ConjurStubServer, size: int) -> str:
+    """
+    Fills the stub server with 'size' variables, hosts and users, and returns
+    the API key of the admin user
+    """
+    api_key = server.add_user(ADMIN_LOGIN, password='Admin-P4ss!')
+    for i in range(size):
+        server.add_variable(f'apps/app{i}/secret', f'value-{i}')
+        server.add_host(f'apps/host{i}')
+        server.add_user(f'user{i}')
+        server.add_membership('group:ops', f'user:user{i}')
+    server.add_resource('group', 'ops')
+    server.add_membership('group:admins', f'user:{ADMIN_LOGIN}')
+    server.add_resource('group', 'admins')
+    server.add_host_factory('apps/factory')
+    return api_key
+
+
+def build_scenarios(server: ConjurStubServer, sandbox: CliSandbox, size: int) -> List[Scenario]:
+    """
+    Returns the benchmark scenarios
+    """
+    many = min(size, 100)
+    variable_ids = [f'apps/app{i}/secret' for i in range(many)]
+    resource_ids = [f'variable:{variable_id}' for variable_id in variable_ids]
+    host_ids = [f'apps/host{i}' for i in range(many)]
+
+    ids_file = sandbox.path('resource_ids.txt')
+    with open(ids_file, 'w', encoding='utf-8') as ids_fp:
+        ids_fp.write('\n'.join(resource_ids) + '\n')
+    host_ids_file = sandbox.path('host_ids.txt')
+    with open(host_ids_file, 'w', encoding='utf-8') as ids_fp:
+        ids_fp.write('\n'.join(host_ids) + '\n')
+    policy_file = sandbox.path('policy.yml')
+    with open(policy_file, 'w', encoding='utf-8') as policy_fp:
+        policy_fp.write(POLICY)
+
+    def new_hosts_file() -> str:
+        path = sandbox.path('new_hosts.txt')
+        with open(path, 'w', encoding='utf-8') as hosts_fp:
+            hosts_fp.write('\n'.join(f'new/host{i}' for i in range(many)) + '\n')
+        return path
+
+    def create_hosts():
+        token = 'benchmark-token'
+        server.host_factory_tokens[token] = {'token': token, 'expiration': '', 'cidr': [],
+                                             'host_factory': server.full_id('host_factory',
+                                                                            'apps/factory')}
+        return ['hostfactory', 'create', 'host', '--ids-file', new_hosts_file(),
+                '--token', token, '--output', sandbox.path('new_hosts.json')], None
+
+    return [
+        Scenario('help', lambda: (['--help'], None)),
+        Scenario('whoami', lambda: (['whoami'], None)),
+        Scenario('variable get', lambda: (['variable', 'get', '-i', variable_ids[0]], None)),
+        Scenario(f'variable get x{many}', lambda: (['variable', 'get', '-i', *variable_ids],
+                                                   None)),
+        Scenario('variable set', lambda: (['variable', 'set', '-i', variable_ids[0],
+                                           '-v', 'new-value'], None)),
+        Scenario('list', lambda: (['list'], None)),
+        Scenario('list --inspect', lambda: (['list', '--inspect'], None)),
+        Scenario('list --kind variable', lambda: (['list', '--kind', 'variable'], None)),
+        Scenario('show', lambda: (['show', '-i', resource_ids[0]], None)),
+        Scenario(f'show x{many}', lambda: (['show', '--ids-file', ids_file], None)),
+        Scenario(f'resource exists x{many}', lambda: (['resource', 'exists', '--ids-file',
+                                                       ids_file], None)),
+        Scenario('role memberships', lambda: (['role', 'memberships', '-i',
+                                               f'user:{ADMIN_LOGIN}'], None)),
+        Scenario('list --members-of', lambda: (['list', '--members-of', 'group:ops'], None)),
+        Scenario('policy load', lambda: (['policy', 'load', '-b', 'root', '-f', policy_file],
+                                         None)),
+        Scenario('hostfactory create token', lambda: (['hostfactory', 'create', 'token',
+                                                       '-i', 'apps/factory', '-dh', '1'],
+                                                      None)),
+        Scenario(f'hostfactory create host x{many}', create_hosts),
+        Scenario(f'host rotate-api-key x{many}', lambda: (
+            ['host', 'rotate-api-key', '--ids-file', host_ids_file,
+             '--output', sandbox.path('host_keys.json')], None)),
+    ]
+
+
+def measure(server: ConjurStubServer, sandbox: CliSandbox, scenario: Scenario,
+            runs: int) -> dict:
+    """
+    Runs a scenario 'runs' times and aggregates the measurements
+    """
+    seconds, requests, connections, max_rss = [], [], [], []
+    failures = 0
+    for _ in range(runs):
+        args, stdin = scenario.prepare()
+        server.reset_stats()
+        result = sandbox.run(*args, stdin=stdin)
+        if result.returncode != 0:
+            failures += 1
+            sys.stderr.write(f"'{scenario.name}' failed ({result.returncode}): "
+                             f"{(result.stdout + result.stderr).strip()[-300:]}\n")
+        seconds.append(result.seconds)
+        requests.append(server.request_total)
+        connections.append(server.connection_total)
+        max_rss.append(result.max_rss_kb)
+    return {
+        'scenario': scenario.name,
+        'runs': runs,
+        'failures': failures,
+        'median_seconds': statistics.median(seconds),
+        'min_seconds': min(seconds),
+        'max_seconds': max(seconds),
+        'requests': statistics.median(requests),
+        'connections': statistics.median(connections),
+        'max_rss_mib': max(max_rss) / 1024,
+    }
+
+
+def print_table(results: List[dict]):
+    """
+    Prints the results as a table
+    """
+    print(f"{'scenario':<32}{'median s':>10}{'min s':>8}{'max s':>8}"
+          f"{'requests':>10}{'conns':>7}{'rss MiB':>9}{'failed':>8}")
+    for result in results:
+        print(f"{result['scenario']:<32}{result['median_seconds']:>10.3f}"
+              f"{result['min_seconds']:>8.3f}{result['max_seconds']:>8.3f}"
+              f"{result['requests']:>10.0f}{result['connections']:>7.0f}"
+              f"{result['max_rss_mib']:>9.1f}{result['failures']:>8}")
+
+
+def main():
+    """
+    Run the benchmark suite and print a results table
+    """
+    parser = argparse.ArgumentParser(description='CLI benchmark suite')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs per scenario (default: 5)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds the stub server waits before answering a request '
+                             '(default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Up to this many extra seconds of random latency (default: 0)')
+    parser.add_argument('--size', type=int, default=200,
+                        help='Number of variables, hosts and users to seed (default: 200)')
+    parser.add_argument('--scenario', action='append', metavar='NAME',
+                        help='Only run scenarios whose name contains NAME (repeatable)')
+    parser.add_argument('--json', metavar='FILE', dest='json_file',
+                        help='Also write the results to FILE as JSON')
+    args = parser.parse_args()
+
+    with ConjurStubServer(latency=args.latency, jitter=args.jitter) as server:
+        api_key = seed(server, args.size)
+        with CliSandbox(server.url, server.account, ADMIN_LOGIN, api_key) as sandbox:
+            scenarios = [scenario for scenario in build_scenarios(server, sandbox, args.size)
+                         if not args.scenario
+                         or any(name in scenario.name for name in args.scenario)]
+            results = [measure(server, sandbox, scenario, args.runs) for scenario in scenarios]
+
+    print_table(results)
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as json_fp:
+            json.dump({'latency': args.latency, 'jitter': args.jitter, 'size': args.size,
+                       'results': results}, json_fp, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+Resource memory benchmark
+
+Compares the memory needed to hold the result of a large `conjur list`
+as returned by the server (full ids / inspect objects) and as Resource
+objects.
+
+Usage:
+  python benchmarks/bench_resource_memory.py [--count 500000]
+"""
+
+# Builtins
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# pylint: disable=wrong-import-position
+from conjur.resource import Resource
+
+KINDS = ['variable', 'host', 'user', 'group', 'layer', 'policy', 'webservice']
+
+
+def generate_full_ids(count: int) -> list:
+    """
+    Generate resource ids shaped like the ones returned by the list command
+    """
+    return [f"myaccount:{KINDS[i % len(KINDS)]}:apps/team{i % 300}/service{i // 300}/item{i}"
+            for i in range(count)]
+
+
+def generate_inspect_result(full_ids: list) -> list:
+    """
+    Generate resource objects shaped like the ones returned by `list --inspect`
+    """
+    return [{'id': full_id,
+             'owner': 'myaccount:policy:apps',
+             'policy': 'myaccount:policy:root',
+             'permissions': [],
+             'annotations': [],
+             'created_at': '2022-08-02T12:00:00.000+00:00'}
+            for full_id in full_ids]
+
+
+def measure(label: str, build) -> dict:
+    """
+    Measure the memory retained by the object returned from build()
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = build()
+    duration = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = len(held)
+    del held
+    gc.collect()
+    return {'label': label, 'size': size, 'retained': current, 'peak': peak, 'seconds': duration}
+
+
+def main():
+    """
+    Run the benchmark and print a results table
+    """
+    parser = argparse.ArgumentParser(description='Resource memory benchmark')
+    parser.add_argument('--count', type=int, default=500000,
+                        help='Number of resources to hold (default: 500000)')
+    args = parser.parse_args()
+
+    full_ids = generate_full_ids(args.count)
+    results = [
+        measure('inspect result (list of dicts)',
+                lambda: generate_inspect_result(generate_full_ids(args.count))),
+        measure('full ids (list of str)', lambda: generate_full_ids(args.count)),
+        measure('list of Resource',
+                lambda: [Resource.from_full_id(full_id) for full_id in full_ids]),
+    ]
+
+    print(f"{'container':<34}{'resources':>10}{'retained MiB':>14}{'peak MiB':>10}"
+          f"{'bytes/res':>11}{'seconds':>9}")
+    for result in results:
+        print(f"{result['label']:<34}{result['size']:>10}"
+              f"{result['retained'] / 2 ** 20:>14.1f}{result['peak'] / 2 ** 20:>10.1f}"
+              f"{result['retained'] / max(result['size'], 1):>11.0f}"
+              f"{result['seconds']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
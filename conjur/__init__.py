@@ -26,4 +26,15 @@ Your choices:
 """)
 
 # pylint: disable=wrong-import-position
-from conjur.cli import Cli
+# Imported first so the profiler knows when importing the CLI started
+from conjur.util import profiler  # pylint: disable=unused-import
+
+
+def __getattr__(name):
+    # The CLI is imported on first use, so that light entry points such as
+    # shell completion do not pay for importing the SDK
+    if name == 'Cli':
+        # pylint: disable=import-outside-toplevel
+        from conjur.cli import Cli
+        return Cli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,6 @@ __main__ module
 This module makes this package egg-invokable
 """
 
-from conjur.cli import Cli
+from conjur.launcher import launch
 
-Cli.launch()
+launch()
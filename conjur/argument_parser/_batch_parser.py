@@ -0,0 +1,66 @@
+"""
+Module For the BatchParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, \
+    formatter, title_formatter
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class BatchParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Batch subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_batch_parser(self):
+        """
+        Method adds batch parser functionality to parser
+        """
+        batch_subparser = self._create_batch_parser()
+        self._add_batch_options(batch_subparser)
+        return self
+
+    def _create_batch_parser(self):
+        batch_name = 'batch - Run the commands of a file'
+        batch_usage = 'conjur [global options] batch [options] <file>'
+
+        batch_subparser = self.resource_subparsers \
+            .add_parser('batch',
+                        help='Runs the commands of a file in a single process',
+                        description=command_description(batch_name,
+                                                        batch_usage),
+                        epilog=command_epilog(
+                            'conjur batch commands.txt\t\t'
+                            'Runs the commands of commands.txt one after the other\n'
+                            '    conjur batch --parallel 4 commands.txt\t'
+                            'Runs up to 4 commands at a time, waiting at `wait` lines\n'
+                            '    conjur batch --fail-fast - < commands.txt\t'
+                            'Runs the commands read from stdin until one fails\n\n'
+                            'The file holds one command per line, without the leading '
+                            '`conjur`. A line\nholding only `wait` waits for the commands '
+                            'above it to complete. Every\ncommand is reported as a JSON line '
+                            'holding its status, exit code and output.'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return batch_subparser
+
+    @staticmethod
+    def _add_batch_options(batch_subparser: ArgparseWrapper):
+        batch_options = batch_subparser.add_argument_group(title=title_formatter("Options"))
+
+        batch_options.add_argument('batch_file', metavar='FILE', nargs='?', default='-',
+                                   help='File of commands, one per line (use - to read '
+                                        'from stdin, the default)')
+        batch_options.add_argument('--parallel', metavar='VALUE', type=int, default=1,
+                                   help='Optional- maximum number of commands running at '
+                                        'the same time (Default: 1)')
+        batch_options.add_argument('--fail-fast', action='store_true',
+                                   help='Optional- skip the remaining commands once one '
+                                        'failed')
+        batch_options.add_argument('-h', '--help', action='help',
+                                   help='Display help screen and exit')
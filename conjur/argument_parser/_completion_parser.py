@@ -0,0 +1,106 @@
+"""
+Module For the CompletionParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
+    title_formatter
+from conjur.util.completion import COMPLETION_SCRIPTS, RESOURCE_KINDS
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class CompletionParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Completion subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_completion_parser(self):
+        """
+        Method adds completion parser functionality to parser
+        """
+        completion_parser = self._create_completion_parser()
+        completion_subparser = completion_parser.add_subparsers(title="Subcommand",
+                                                                dest='action')
+
+        for shell in COMPLETION_SCRIPTS:
+            self._add_completion_script(completion_subparser, shell)
+        self._add_completion_refresh(completion_subparser)
+        self._add_completion_options(completion_parser)
+
+        return self
+
+    def _create_completion_parser(self):
+        completion_name = 'completion - Complete commands and IDs in the shell'
+        completion_usage = 'conjur [global options] completion <subcommand> [options]'
+
+        completion_parser = self.resource_subparsers \
+            .add_parser('completion',
+                        help='Complete commands and IDs in the shell',
+                        description=command_description(completion_name,
+                                                        completion_usage),
+                        epilog=command_epilog(
+                            'source <(conjur completion bash)\t'
+                            'Enables completion in the current bash shell\n'
+                            '    conjur completion refresh\t\t'
+                            'Fetches the IDs suggested by completion now\n\n'
+                            'The IDs suggested are cached locally and refreshed '
+                            'in the background every few minutes',
+                            command='completion',
+                            subcommands=list(COMPLETION_SCRIPTS) + ['refresh']),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return completion_parser
+
+    @staticmethod
+    def _add_completion_script(completion_subparser: ArgparseWrapper, shell: str):
+        script_name = f'{shell} - Print the completion script of {shell}'
+        script_usage = f'conjur [global options] completion {shell}'
+
+        script_subcommand_parser = completion_subparser \
+            .add_parser(name=shell,
+                        help=f'Print the completion script of {shell}',
+                        description=command_description(script_name, script_usage),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        script_options = script_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        script_options.add_argument('-h', '--help', action='help',
+                                    help='Display help screen and exit')
+
+    @staticmethod
+    def _add_completion_refresh(completion_subparser: ArgparseWrapper):
+        refresh_name = 'refresh - Fetch the IDs suggested by completion'
+        refresh_usage = 'conjur [global options] completion refresh [options]'
+
+        refresh_subcommand_parser = completion_subparser \
+            .add_parser(name='refresh',
+                        help='Fetch the IDs suggested by completion',
+                        description=command_description(refresh_name, refresh_usage),
+                        epilog=command_epilog(
+                            'conjur completion refresh\t\t'
+                            'Fetches the IDs of every kind\n'
+                            '    conjur completion refresh -k variable\t'
+                            'Fetches the IDs of the variables only\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        refresh_options = refresh_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        refresh_options.add_argument('-k', '--kind', dest='kinds', metavar='VALUE',
+                                     action='append', choices=RESOURCE_KINDS,
+                                     help='Optional- kind of the IDs to fetch, can be '
+                                          'repeated (default: every kind)')
+        refresh_options.add_argument('-h', '--help', action='help',
+                                     help='Display help screen and exit')
+
+    @staticmethod
+    def _add_completion_options(completion_parser: ArgparseWrapper):
+        completion_options = completion_parser.add_argument_group(
+            title=title_formatter("Options"))
+        completion_options.add_argument('-h', '--help', action='help',
+                                        help='Display help screen and exit')
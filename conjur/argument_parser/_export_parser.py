@@ -0,0 +1,70 @@
+"""
+Module For the ExportParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
+    title_formatter
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, DEFAULT_EXPORT_BATCH_SIZE, \
+    EXPORT_PASSPHRASE_ENV_VARIABLE_NAME
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class ExportParser:
+    """Partial class of the ArgParseBuilder.
+    This class adds the Export subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_export_parser(self):
+        """
+        Method adds export parser functionality to parser
+        """
+        export_parser = self._create_export_parser()
+        self._add_export_options(export_parser)
+        return self
+
+    def _create_export_parser(self):
+        export_name = 'export - Export the values of variables to an encrypted archive'
+        export_usage = 'conjur [global options] export [options]'
+
+        export_parser = self.resource_subparsers \
+            .add_parser('export',
+                        help='Export the values of the variables of a policy to an encrypted '
+                             'archive, to be replayed by `conjur import`',
+                        description=command_description(export_name, export_usage),
+                        epilog=command_epilog(
+                            'conjur export -b apps -o apps.enc\t\t'
+                            'Exports the variables of the apps policy and of the policies '
+                            'it holds\n'
+                            '    conjur export -o snapshot.enc\t\t'
+                            'Exports every variable of the account\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return export_parser
+
+    @staticmethod
+    def _add_export_options(export_parser: ArgparseWrapper):
+        export_options = export_parser.add_argument_group(title=title_formatter("Options"))
+        export_options.add_argument('-b', '--policy', '--branch', metavar='VALUE',
+                                    dest='policy', default='root',
+                                    help='Optional- export the variables of the policy and of '
+                                         'the policies it holds (Default: root)')
+        export_options.add_argument('-o', '--output', metavar='FILE', dest='output_file',
+                                    required=True,
+                                    help='Write the archive to FILE, readable by its owner only. '
+                                         'The passphrase is read from '
+                                         f'{EXPORT_PASSPHRASE_ENV_VARIABLE_NAME} or prompted for')
+        export_options.add_argument('--batch-size', metavar='VALUE', type=int,
+                                    dest='batch_size', default=DEFAULT_EXPORT_BATCH_SIZE,
+                                    help='Optional- number of values fetched per request '
+                                         f'(Default: {DEFAULT_EXPORT_BATCH_SIZE})')
+        export_options.add_argument('--concurrency', metavar='VALUE', type=int,
+                                    dest='concurrency', default=DEFAULT_BULK_CONCURRENCY,
+                                    help='Optional- maximum number of concurrent requests '
+                                         f'(Default: {DEFAULT_BULK_CONCURRENCY})')
+        export_options.add_argument('-h', '--help', action='help',
+                                    help='Display help screen and exit')
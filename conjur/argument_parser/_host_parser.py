@@ -2,8 +2,8 @@
 Module For the HostParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, add_journal_option, \
+    add_output_file_option, command_description, command_epilog, formatter, title_formatter
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 # pylint: disable=too-few-public-methods
@@ -58,7 +58,11 @@ class HostParser:
                                       host_rotate_api_key_usage),
                                   epilog=command_epilog(
                                       'conjur host rotate-api-key -i my_apps/myVM\t\t'
-                                      'Rotates the API key for host myVM'),
+                                      'Rotates the API key for host myVM\n'
+                                      '    conjur host rotate-api-key --ids-file hosts.txt '
+                                      '--output keys.json\t\t'
+                                      'Rotates the API keys of the hosts listed in hosts.txt '
+                                      'and writes them to keys.json'),
                                   usage=argparse.SUPPRESS,
                                   add_help=False,
                                   formatter_class=formatter)
@@ -67,6 +71,9 @@ class HostParser:
         host_rotate_api_key.add_argument('-i', '--id',
                                          help='Provide host identifier for which '
                                               'you want to rotate the API key')
+        add_bulk_options(host_rotate_api_key, item='host identifier')
+        add_output_file_option(host_rotate_api_key, 'the new API keys')
+        add_journal_option(host_rotate_api_key)
         host_rotate_api_key.add_argument('-h', '--help', action='help',
                                          help='Display help screen and exit')
 
@@ -2,8 +2,9 @@
 Module For the hostfactoryParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, add_journal_option, \
+    add_output_file_option, command_description, command_epilog, formatter, title_formatter
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, DEFAULT_TOKEN_POOL_FILE
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 
@@ -24,9 +25,13 @@ class HostFactoryParser:
         hostfactory_subparser = hostfactory_parser.add_subparsers(title="Subcommand", dest='action')
         hostfactory_create_menu_item = self._add_hostfactory_create(hostfactory_subparser)
         hostfactory_revoke_menu_item = self._add_hostfactory_revoke(hostfactory_subparser)
+        hostfactory_pool_menu_item = self._add_hostfactory_pool(hostfactory_subparser)
         self._add_hostfactory_create_token(hostfactory_create_menu_item)
         self._add_hostfactory_create_host(hostfactory_create_menu_item)
         self._add_hostfactory_revoke_token(hostfactory_revoke_menu_item)
+        self._add_hostfactory_pool_refill(hostfactory_pool_menu_item)
+        self._add_hostfactory_pool_acquire(hostfactory_pool_menu_item)
+        self._add_hostfactory_pool_drain(hostfactory_pool_menu_item)
         self._add_hostfactory_options(hostfactory_parser)
 
         return self
@@ -46,7 +51,7 @@ class HostFactoryParser:
                             '--duration-days 2\t\t\t '
                             'Creates a token for creating hosts with restrictions\n',
                             command='hostfactory',
-                            subcommands=['create']),
+                            subcommands=['create', 'revoke', 'pool']),
                         usage=argparse.SUPPRESS,
                         add_help=False,
                         formatter_class=formatter)
@@ -191,6 +196,9 @@ class HostFactoryParser:
         create_token.add_argument('-m', '--duration-minutes', metavar='VALUE', type=int,
                                   help='(Optional) Validity (in minutes) '
                                        'of Host Factory token.')
+        create_token.add_argument('-c', '--count', metavar='VALUE', type=int, default=1,
+                                  help='(Optional) Number of tokens to create '
+                                       'in a single request (Default: 1)')
         create_token.add_argument('-h', '--help', action='help',
                                   help='Display help screen and exit')
 
@@ -208,7 +216,12 @@ class HostFactoryParser:
                         epilog=command_epilog(
                             'conjur hostfactory create host --id brand-new-host '
                             '--token 82cv6kk040axyffzvmscpf129k81yq1bzkey3gcgfvjc00pfy41h\t\t '
-                            'Create host using Host Factory\t\t',
+                            'Create host using Host Factory\t\t\n'
+                            '    conjur hostfactory create host --ids-file hosts.txt '
+                            '--token 82cv6kk040axyffzvmscpf129k81yq1bzkey3gcgfvjc00pfy41h '
+                            '--output keys.json\t\t '
+                            'Create every host listed in hosts.txt and write their API keys '
+                            'to keys.json\t\t',
                             command='host',
                         ),
                         usage=argparse.SUPPRESS,
@@ -219,15 +232,163 @@ class HostFactoryParser:
             title=title_formatter("Options"))
         # hidden argument to be used to distinguish this action
         create_host.add_argument('-action_type', default='create_host', help=argparse.SUPPRESS)
-        create_host.add_argument('-i', '--id', metavar='VALUE', required=True,
-                                 help='(Mandatory) Identifier of host to be created '
+        create_host.add_argument('-i', '--id', metavar='VALUE', nargs='*',
+                                 help='(Mandatory) Identifier(s) of host to be created '
                                       'It will be created within '
                                       'the account of the Host Factory.')
         create_host.add_argument('-t', '--token', metavar='VALUE', required=True,
                                  help='(Mandatory) A Host Factory token must be provided.')
+        add_bulk_options(create_host, item='host identifier')
+        create_host.add_argument('--rate-limit', metavar='VALUE', type=float,
+                                 dest='rate_limit',
+                                 help='Optional- maximum number of hosts to create per second')
+        create_host.add_argument('--retries', metavar='VALUE', type=int, default=2,
+                                 help='Optional- number of times to retry creating a host '
+                                      'after a transient failure (Default: 2)')
+        add_output_file_option(create_host, 'the created hosts and their API keys')
+        add_journal_option(create_host)
         create_host.add_argument('-h', '--help', action='help',
                                  help='Display help screen and exit')
 
+    @staticmethod
+    def _add_hostfactory_pool(hostfactory_subparser: ArgparseWrapper):
+        hostfactory_pool_name = 'pool - Manage a local pool of pre-generated Host Factory tokens'
+        hostfactory_pool_usage = 'conjur [global options] hostfactory ' \
+                                 'pool <subcommand> [options] [args]'
+
+        pool_cmd = hostfactory_subparser \
+            .add_parser(name="pool",
+                        help='Manage a local pool of pre-generated Host Factory tokens',
+                        description=command_description(
+                            hostfactory_pool_name, hostfactory_pool_usage),
+                        epilog=command_epilog(
+                            'conjur hostfactory pool acquire --hostfactoryid my_factory',
+                            command='hostfactory pool',
+                            subcommands=['refill', 'acquire', 'drain']
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        hostfactory_pool_subcommand = pool_cmd.add_subparsers(title="Subcommand", dest='action')
+        hostfactory_pool_options = pool_cmd.add_argument_group(
+            title=title_formatter("Options"))
+        hostfactory_pool_options.add_argument('-h', '--help', action='help',
+                                              help='Display help screen and exit')
+        return hostfactory_pool_subcommand
+
+    @staticmethod
+    def _add_hostfactory_pool_refill(menu: ArgparseWrapper):
+        name = 'refill - Fill the token pool of a Host Factory'
+        usage = 'conjur [global options] hostfactory pool refill [options] [args]'
+
+        subcommand = menu \
+            .add_parser(name="refill",
+                        help='Fill the token pool of a Host Factory',
+                        description=command_description(name, usage),
+                        epilog=command_epilog(
+                            'conjur hostfactory pool refill --hostfactoryid my_factory '
+                            '--duration-hours 4 --size 50 --low-water 10\t\t '
+                            'Keep 50 tokens valid for 4 hours available, creating more '
+                            'once fewer than 10 are left\t\t',
+                            command='refill',
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        # Options
+        options = subcommand.add_argument_group(title=title_formatter("Options"))
+        options.add_argument('-action_type', default='pool_refill', help=argparse.SUPPRESS)
+        options.add_argument('-i', '--hostfactoryid', metavar='VALUE', required=True,
+                             help='(Mandatory) Host Factory ID to work with')
+        options.add_argument('--cidr', metavar='VALUE',
+                             help='(Optional) CIDR containing all IP addresses that can use '
+                                  'the tokens for creating hosts')
+        options.add_argument('-d', '--duration-days', metavar='VALUE', type=int,
+                             help='(Optional) Validity (in days) of the tokens.')
+        options.add_argument('-dh', '--duration-hours', metavar='VALUE', type=int,
+                             help='(Optional) Validity (in hours) of the tokens.')
+        options.add_argument('-m', '--duration-minutes', metavar='VALUE', type=int,
+                             help='(Optional) Validity (in minutes) of the tokens.')
+        options.add_argument('--size', metavar='VALUE', type=int, default=10,
+                             help='(Optional) Number of tokens to keep in the pool '
+                                  '(Default: 10)')
+        options.add_argument('--low-water', metavar='VALUE', type=int, default=2,
+                             dest='low_water',
+                             help='(Optional) Refill the pool when acquiring a token leaves '
+                                  'fewer than VALUE tokens (Default: 2)')
+        HostFactoryParser._add_pool_file_option(options)
+        options.add_argument('-h', '--help', action='help',
+                             help='Display help screen and exit')
+
+    @staticmethod
+    def _add_hostfactory_pool_acquire(menu: ArgparseWrapper):
+        name = 'acquire - Take an unexpired token out of the token pool'
+        usage = 'conjur [global options] hostfactory pool acquire [options] [args]'
+
+        subcommand = menu \
+            .add_parser(name="acquire",
+                        help='Take an unexpired token out of the token pool',
+                        description=command_description(name, usage),
+                        epilog=command_epilog(
+                            'conjur hostfactory pool acquire --hostfactoryid my_factory '
+                            '--min-ttl 300\t\t '
+                            'Take a token that is valid for at least 5 more minutes\t\t',
+                            command='acquire',
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        # Options
+        options = subcommand.add_argument_group(title=title_formatter("Options"))
+        options.add_argument('-action_type', default='pool_acquire', help=argparse.SUPPRESS)
+        options.add_argument('-i', '--hostfactoryid', metavar='VALUE', required=True,
+                             help='(Mandatory) Host Factory ID to work with')
+        options.add_argument('--min-ttl', metavar='VALUE', type=int, default=60,
+                             dest='min_ttl',
+                             help='(Optional) Minimum number of seconds the token must '
+                                  'remain valid (Default: 60)')
+        HostFactoryParser._add_pool_file_option(options)
+        options.add_argument('-h', '--help', action='help',
+                             help='Display help screen and exit')
+
+    @staticmethod
+    def _add_hostfactory_pool_drain(menu: ArgparseWrapper):
+        name = 'drain - Revoke the unused tokens of the token pool'
+        usage = 'conjur [global options] hostfactory pool drain [options] [args]'
+
+        subcommand = menu \
+            .add_parser(name="drain",
+                        help='Revoke the unused tokens of the token pool',
+                        description=command_description(name, usage),
+                        epilog=command_epilog(
+                            'conjur hostfactory pool drain --hostfactoryid my_factory\t\t '
+                            'Revoke the unused tokens of my_factory\t\t',
+                            command='drain',
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        # Options
+        options = subcommand.add_argument_group(title=title_formatter("Options"))
+        options.add_argument('-action_type', default='pool_drain', help=argparse.SUPPRESS)
+        options.add_argument('-i', '--hostfactoryid', metavar='VALUE',
+                             help='(Optional) Host Factory ID to work with. '
+                                  'All Host Factories in the pool are drained if omitted')
+        options.add_argument('--concurrency', metavar='VALUE', type=int,
+                             default=DEFAULT_BULK_CONCURRENCY,
+                             help='(Optional) Maximum number of concurrent requests '
+                                  f'(Default: {DEFAULT_BULK_CONCURRENCY})')
+        HostFactoryParser._add_pool_file_option(options)
+        options.add_argument('-h', '--help', action='help',
+                             help='Display help screen and exit')
+
+    @staticmethod
+    def _add_pool_file_option(options):
+        options.add_argument('--pool-file', metavar='FILE', dest='pool_file',
+                             default=DEFAULT_TOKEN_POOL_FILE,
+                             help='(Optional) Token pool file '
+                                  f'(Default: {DEFAULT_TOKEN_POOL_FILE})')
+
     @staticmethod
     def _add_hostfactory_options(parser: ArgparseWrapper):
         options = parser.add_argument_group(title=title_formatter("Options"))
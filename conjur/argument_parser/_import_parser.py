@@ -0,0 +1,63 @@
+"""
+Module For the ImportParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
+    title_formatter
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, EXPORT_PASSPHRASE_ENV_VARIABLE_NAME
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class ImportParser:
+    """Partial class of the ArgParseBuilder.
+    This class adds the Import subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_import_parser(self):
+        """
+        Method adds import parser functionality to parser
+        """
+        import_parser = self._create_import_parser()
+        self._add_import_options(import_parser)
+        return self
+
+    def _create_import_parser(self):
+        import_name = 'import - Set the values of variables from an encrypted archive'
+        import_usage = 'conjur [global options] import [options]'
+
+        import_parser = self.resource_subparsers \
+            .add_parser('import',
+                        help='Set the values of the variables of an archive made by '
+                             '`conjur export`',
+                        description=command_description(import_name, import_usage),
+                        epilog=command_epilog(
+                            'conjur import -i apps.enc\t\t\t'
+                            'Sets the values of the variables of the archive\n'
+                            '    conjur import -i apps.enc --resume\t'
+                            'Resumes an interrupted import after its last checkpoint\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return import_parser
+
+    @staticmethod
+    def _add_import_options(import_parser: ArgparseWrapper):
+        import_options = import_parser.add_argument_group(title=title_formatter("Options"))
+        import_options.add_argument('-i', '--input', metavar='FILE', dest='input_file',
+                                    required=True,
+                                    help='Read the archive from FILE. The passphrase is read '
+                                         f'from {EXPORT_PASSPHRASE_ENV_VARIABLE_NAME} or '
+                                         'prompted for')
+        import_options.add_argument('--resume', action='store_true', dest='resume',
+                                    help='Optional- skip the variables set before the import '
+                                         'was interrupted, as recorded in FILE.checkpoint')
+        import_options.add_argument('--concurrency', metavar='VALUE', type=int,
+                                    dest='concurrency', default=DEFAULT_BULK_CONCURRENCY,
+                                    help='Optional- maximum number of concurrent requests '
+                                         f'(Default: {DEFAULT_BULK_CONCURRENCY})')
+        import_options.add_argument('-h', '--help', action='help',
+                                    help='Display help screen and exit')
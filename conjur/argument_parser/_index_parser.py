@@ -0,0 +1,101 @@
+"""
+Module For the IndexParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
+    title_formatter
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class IndexParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Index subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_index_parser(self):
+        """
+        Method adds index parser functionality to parser
+        """
+        index_parser = self._create_index_parser()
+        index_subparser = index_parser.add_subparsers(title="Subcommand", dest='action')
+
+        self._add_index_sync(index_subparser)
+        self._add_index_status(index_subparser)
+        self._add_index_options(index_parser)
+
+        return self
+
+    def _create_index_parser(self):
+        index_name = 'index - Manage the local index of resources'
+        index_usage = 'conjur [global options] index <subcommand> [options]'
+
+        index_parser = self.resource_subparsers \
+            .add_parser('index',
+                        help='Manage the local index of resources used by `list --local`',
+                        description=command_description(index_name,
+                                                        index_usage),
+                        epilog=command_epilog(
+                            'conjur index sync\t\t\t'
+                            'Indexes every resource of the account\n'
+                            '    conjur list --local --search=db\t'
+                            'Searches the index instead of the server\n',
+                            command='index',
+                            subcommands=['sync', 'status']),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return index_parser
+
+    @staticmethod
+    def _add_index_sync(index_subparser: ArgparseWrapper):
+        index_sync_name = 'sync - Index the resources of the account'
+        index_sync_usage = 'conjur [global options] index sync [options]'
+
+        index_sync_subcommand_parser = index_subparser \
+            .add_parser(name='sync',
+                        help='Index the resources of the account, in a single request',
+                        description=command_description(index_sync_name, index_sync_usage),
+                        epilog=command_epilog(
+                            'conjur index sync\t\t\t'
+                            'Indexes every resource of the account\n'
+                            '    conjur index sync -k variable\t'
+                            'Indexes the variables again, keeping the other kinds\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        index_sync_options = index_sync_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        index_sync_options.add_argument('-k', '--kind', dest='kinds', metavar='VALUE',
+                                        action='append',
+                                        help='Optional- kind of the resources to index, can be '
+                                             'repeated (default: every kind)')
+        index_sync_options.add_argument('-h', '--help', action='help',
+                                        help='Display help screen and exit')
+
+    @staticmethod
+    def _add_index_status(index_subparser: ArgparseWrapper):
+        index_status_name = 'status - Show what the local index holds'
+        index_status_usage = 'conjur [global options] index status'
+
+        index_status_subcommand_parser = index_subparser \
+            .add_parser(name='status',
+                        help='Show the number of resources of each kind in the local index, '
+                             'and when they were indexed',
+                        description=command_description(index_status_name, index_status_usage),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        index_status_options = index_status_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        index_status_options.add_argument('-h', '--help', action='help',
+                                          help='Display help screen and exit')
+
+    @staticmethod
+    def _add_index_options(index_parser: ArgparseWrapper):
+        index_options = index_parser.add_argument_group(title=title_formatter("Options"))
+        index_options.add_argument('-h', '--help', action='help',
+                                   help='Display help screen and exit')
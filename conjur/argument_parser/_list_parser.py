@@ -4,6 +4,7 @@ Module For the ListParser
 import argparse
 from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
     title_formatter
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, DEFAULT_LIST_PAGE_SIZE
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 
@@ -46,6 +47,12 @@ class ListParser:
                             'Shows resources that superuser is entitled to see\n'
                             '    conjur list --search=superuser\t\t\t\t\t'
                             'Searches for resources with superuser\n'
+                            '    conjur list --local --kind=variable --prefix=prod/\t\t\t'
+                            'Lists variables under prod/ from the local index\n'
+                            '    conjur list --inspect --stream --page-size=500\t\t\t'
+                            'Lists every resource with its metadata, 500 at a time\n'
+                            '    conjur list --inspect --snapshot=inventory.snap\t\t\t'
+                            'Prints the resources added, removed or changed since the last run\n'
                             '    conjur list --members-of group:\'aws-apps\'\t\t\t\t'
                             'Returns all direct members of the \'aws-apps\' group\n'
                             '    conjur list'
@@ -85,6 +92,37 @@ class ListParser:
         list_options.add_argument('-s', '--search',
                                   action='store', metavar='VALUE', dest='search',
                                   help='Optional- search for resources based on specified query')
+        list_options.add_argument('--prefix',
+                                  action='store', metavar='VALUE', dest='prefix',
+                                  help='Optional- list resources whose ID starts with the '
+                                       'specified value. Requires \'--local\'')
+        list_options.add_argument('--local',
+                                  action='store_true', dest='local',
+                                  help='Optional- answer from the local index built by '
+                                       '`conjur index sync` instead of the server. Searches '
+                                       'match parts of IDs and annotation values, ignoring case')
+        list_options.add_argument('--stream',
+                                  action='store_true', dest='stream',
+                                  help='Optional- list page by page and print the resources as '
+                                       'each page arrives, for lists too large to hold in memory')
+        list_options.add_argument('--page-size',
+                                  action='store', metavar='VALUE', type=int, dest='page_size',
+                                  default=DEFAULT_LIST_PAGE_SIZE,
+                                  help='Use together with \'--stream\' or \'--snapshot\' '
+                                       'option - number of resources per page '
+                                       f'(Default: {DEFAULT_LIST_PAGE_SIZE})')
+        list_options.add_argument('--concurrency',
+                                  action='store', metavar='VALUE', type=int, dest='concurrency',
+                                  default=DEFAULT_BULK_CONCURRENCY,
+                                  help='Use together with \'--stream\' or \'--snapshot\' '
+                                       'option - maximum number of pages listed concurrently '
+                                       f'(Default: {DEFAULT_BULK_CONCURRENCY})')
+        list_options.add_argument('--snapshot',
+                                  action='store', metavar='FILE', dest='snapshot',
+                                  help='Optional- print only the resources added, removed or '
+                                       'changed since the snapshot FILE was taken, as JSON lines, '
+                                       'and replace it. Changes of metadata are detected with '
+                                       '\'--inspect\'')
         list_options.add_argument('-m', '--members-of',
                                   action='store', metavar='VALUE', dest='members_of',
                                   help='Optional - retrieve list of direct members of a specified '
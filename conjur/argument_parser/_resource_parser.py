@@ -2,8 +2,8 @@
 Module For the ResourceParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, command_description, \
+    command_epilog, formatter, title_formatter
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 
@@ -59,17 +59,20 @@ class ResourceParser:
                             resource_exists_name, resource_exists_usage),
                         epilog=command_epilog(
                             'conjur resource exists -i variable:vars/myvar\t\t\t'
-                            'Returns true if the variable resource vars/myvar exists\n'),
+                            'Returns true if the variable resource vars/myvar exists\n'
+                            '    conjur resource exists --ids-file ids.txt\t\t\t'
+                            'Checks every resource listed in ids.txt, one JSON line '
+                            'per resource\n'),
                         usage=argparse.SUPPRESS,
                         add_help=False,
                         formatter_class=formatter)
         resource_exists_options = resource_exists_subcommand_parser.add_argument_group(
             title=title_formatter("Options"))
         resource_exists_options.add_argument('-i', '--id', dest='identifier', metavar='VALUE',
-                                          help='Provide resource identifier',
-                                          required=True)
+                                             help='Provide resource identifier(s)', nargs='*')
         resource_exists_options.add_argument('--json', dest='json_response', action='store_true',
                                           help='Output a JSON response with a single field, exists')
+        add_bulk_options(resource_exists_options)
         resource_exists_options.add_argument('-h', '--help', action='help',
                                           help='Display help screen and exit')
 
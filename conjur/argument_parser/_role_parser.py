@@ -2,8 +2,10 @@
 Module For the RoleParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_output_file_option, command_description, \
+    command_epilog, formatter, title_formatter
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.util.role_graph import GRAPH_FORMATS
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 
@@ -25,6 +27,7 @@ class RoleParser:
 
         self._add_role_exists(role_subparser)
         self._add_role_memberships(role_subparser)
+        self._add_role_graph(role_subparser)
         self._add_role_options(role_parser)
 
         return self
@@ -42,7 +45,7 @@ class RoleParser:
                             'conjur role exists -i host:hosts/myhost\t\t\t'
                             'Returns true if the host role hosts/myhost exists\n',
                             command='role',
-                            subcommands=['exists', 'memberships']),
+                            subcommands=['exists', 'memberships', 'graph']),
                         usage=argparse.SUPPRESS,
                         add_help=False,
                         formatter_class=formatter)
@@ -101,6 +104,61 @@ class RoleParser:
         role_get_options.add_argument('-h', '--help', action='help',
                                           help='Display help screen and exit')
 
+    @staticmethod
+    def _add_role_graph(role_subparser: ArgparseWrapper):
+        role_graph_name = 'graph - Crawls the memberships of the roles of a policy once and ' \
+                          'answers membership queries locally'
+        role_graph_usage = 'conjur [global options] role graph (--root POLICY | --input FILE) ' \
+                           '[options]'
+
+        role_graph_subcommand_parser = role_subparser \
+            .add_parser(name="graph",
+                        help='Crawls the memberships of the roles of a policy once and '
+                             'answers membership queries locally',
+                        description=command_description(
+                            role_graph_name, role_graph_usage),
+                        epilog=command_epilog(
+                            'conjur role graph --root apps -o apps.graph.json\t\t\t'
+                            'Saves the role graph of the apps policy\n'
+                            '    conjur role graph --input apps.graph.json --format dot\t\t'
+                            'Prints the saved graph in the DOT format\n'
+                            '    conjur role graph --input apps.graph.json '
+                            '--path host:apps/web group:admins\t'
+                            'Shows why apps/web is a member of admins\n'
+                            '    conjur role graph --root root --cycles\t\t\t\t'
+                            'Lists the roles that are members of each other\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        role_graph_options = role_graph_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        source = role_graph_options.add_mutually_exclusive_group(required=True)
+        source.add_argument('--root', dest='root', metavar='POLICY',
+                            help='Crawl the roles of POLICY and of the policies it holds, '
+                                 'and every role they are members of (use root for all roles)')
+        source.add_argument('--input', dest='input_file', metavar='FILE',
+                            help='Load the graph saved in FILE instead of crawling it')
+        query = role_graph_options.add_mutually_exclusive_group()
+        query.add_argument('--memberships', dest='memberships_of', metavar='ROLE',
+                           help='Print every role ROLE is a direct or indirect member of')
+        query.add_argument('--path', dest='path', metavar=('MEMBER', 'ROLE'), nargs=2,
+                           help='Print the shortest chain of memberships through which '
+                                'MEMBER has ROLE')
+        query.add_argument('--cycles', dest='cycles', action='store_true',
+                           help='Print the groups of roles that are members of each other')
+        role_graph_options.add_argument('--format', dest='graph_format', metavar='FORMAT',
+                                        choices=GRAPH_FORMATS, default='json',
+                                        help='Optional- format of the graph when no query '
+                                             f"is given ({' | '.join(GRAPH_FORMATS)}, "
+                                             'Default: json, which --input loads)')
+        add_output_file_option(role_graph_options, 'the graph')
+        role_graph_options.add_argument('--concurrency', metavar='VALUE', type=int,
+                                        dest='concurrency', default=DEFAULT_BULK_CONCURRENCY,
+                                        help='Optional- maximum number of concurrent requests '
+                                             f'when crawling (Default: {DEFAULT_BULK_CONCURRENCY})')
+        role_graph_options.add_argument('-h', '--help', action='help',
+                                        help='Display help screen and exit')
+
     @staticmethod
     def _add_role_options(role_parser: ArgparseWrapper):
         policy_options = role_parser.add_argument_group(title=title_formatter("Options"))
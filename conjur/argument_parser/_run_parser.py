@@ -0,0 +1,62 @@
+"""
+Module For the RunParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, \
+    formatter, title_formatter
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class RunParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Run subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_run_parser(self):
+        """
+        Method adds run parser functionality to parser
+        """
+        run_subparser = self._create_run_parser()
+        self._add_run_options(run_subparser)
+        return self
+
+    def _create_run_parser(self):
+        run_name = 'run - Run a command with secrets in its environment'
+        run_usage = 'conjur [global options] run [options] -- <command> [args]'
+
+        run_subparser = self.resource_subparsers \
+            .add_parser('run',
+                        help='Runs a command with secrets in its environment',
+                        description=command_description(run_name,
+                                                        run_usage),
+                        epilog=command_epilog(
+                            'conjur run -- ./start.sh\t\t\t\t'
+                            'Runs start.sh with the secrets of secrets.yml\n'
+                            '    conjur run --secrets app.yml -e production -- env\t'
+                            'Runs env with the secrets of the production\n'
+                            '\t\t\t\t\t\t\tenvironment of app.yml\n'
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return run_subparser
+
+    @staticmethod
+    def _add_run_options(run_subparser: ArgparseWrapper):
+        run_options = run_subparser.add_argument_group(title=title_formatter("Options"))
+
+        run_options.add_argument('--secrets', dest='secrets_file', metavar='FILE',
+                                 default='secrets.yml',
+                                 help='Optional- file mapping environment variables to '
+                                      'secrets, in the\nsecrets.yml format of Summon '
+                                      '(default: secrets.yml)')
+        run_options.add_argument('-e', '--environment', metavar='VALUE',
+                                 help='Optional- environment of the secrets file to use')
+        run_options.add_argument('command', nargs=argparse.REMAINDER,
+                                 help='Command to run, and its arguments')
+        run_options.add_argument('-h', '--help', action='help',
+                                 help='Display help screen and exit')
@@ -1,7 +1,12 @@
 """
 Module For the ScreenOptionsParser
 """
+import os
+
+from conjur.constants import DEFAULT_REQUEST_RETRIES, MAX_IN_FLIGHT_ENV_VARIABLE_NAME, \
+    MAX_REQUEST_RATE_ENV_VARIABLE_NAME
 from conjur.version import __version__
+from conjur.util.metrics import METRICS_FILE_ENV_VARIABLE_NAME, METRICS_FORMATS
 from conjur.argument_parser.parser_utils import conjur_copyright
 
 
@@ -35,4 +40,49 @@ class ScreenOptionsParser:
                                           'system vulnerable to security attacks!\n',
                                      dest='ssl_verify',
                                      action='store_false')
+
+        global_optional.add_argument('--request-retries', metavar='VALUE', type=int,
+                                     dest='request_retries', default=DEFAULT_REQUEST_RETRIES,
+                                     help='Number of times to retry a read request that failed '
+                                          'with a transient error,\nwith jittered backoff that '
+                                          'honors Retry-After (Default: '
+                                          f'{DEFAULT_REQUEST_RETRIES}, 0 disables retries)')
+
+        global_optional.add_argument('--max-request-rate', metavar='VALUE', type=float,
+                                     dest='max_request_rate',
+                                     default=os.getenv(MAX_REQUEST_RATE_ENV_VARIABLE_NAME),
+                                     help='Maximum number of requests per second sent to the '
+                                          'Conjur server by all CLI\nprocesses of this machine '
+                                          f'(Default: ${MAX_REQUEST_RATE_ENV_VARIABLE_NAME} '
+                                          'if set)')
+
+        global_optional.add_argument('--max-in-flight', metavar='VALUE', type=int,
+                                     dest='max_in_flight',
+                                     default=os.getenv(MAX_IN_FLIGHT_ENV_VARIABLE_NAME),
+                                     help='Maximum number of concurrent requests to the Conjur '
+                                          'server from all CLI\nprocesses of this machine '
+                                          f'(Default: ${MAX_IN_FLIGHT_ENV_VARIABLE_NAME} '
+                                          'if set)')
+
+        global_optional.add_argument('--profile',
+                                     help='Write a report of the time spent in each phase '
+                                          'of the command to stderr',
+                                     action='store_true')
+
+        global_optional.add_argument('--profile-output', metavar='FILE',
+                                     dest='profile_output',
+                                     help='Also write cProfile statistics of the command to '
+                                          'FILE (readable with pstats)')
+
+        global_optional.add_argument('--metrics-file', metavar='FILE', dest='metrics_file',
+                                     default=os.getenv(METRICS_FILE_ENV_VARIABLE_NAME),
+                                     help='Record the endpoint, status, response size, duration '
+                                          'and retries of every request to FILE\n(Default: '
+                                          f'${METRICS_FILE_ENV_VARIABLE_NAME} if set)')
+
+        global_optional.add_argument('--metrics-format', dest='metrics_format',
+                                     choices=METRICS_FORMATS,
+                                     help='Append JSON lines, or keep cumulative counters in a '
+                                          'Prometheus textfile\n(Default: prometheus for '
+                                          'files ending with .prom, jsonl otherwise)')
         return self
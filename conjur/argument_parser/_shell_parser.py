@@ -0,0 +1,56 @@
+"""
+Module For the ShellParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, \
+    formatter, title_formatter
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class ShellParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Shell subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_shell_parser(self):
+        """
+        Method adds shell parser functionality to parser
+        """
+        shell_subparser = self._create_shell_parser()
+        self._add_shell_options(shell_subparser)
+        return self
+
+    def _create_shell_parser(self):
+        shell_name = 'shell - Run commands interactively'
+        shell_usage = 'conjur [global options] shell'
+
+        shell_subparser = self.resource_subparsers \
+            .add_parser('shell',
+                        help='Runs commands interactively, with a single session',
+                        description=command_description(shell_name,
+                                                        shell_usage),
+                        epilog=command_epilog(
+                            'conjur shell\t\t\t'
+                            'Starts an interactive shell. Type commands without the '
+                            'leading `conjur`,\n'
+                            '\t\t\t\t'
+                            'for example `variable get -i secrets/mysecret`, and '
+                            '`exit` to leave\n'
+                            '    conjur shell < commands.txt\t'
+                            'Runs the commands of commands.txt, one per line\n'
+                        ),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return shell_subparser
+
+    @staticmethod
+    def _add_shell_options(shell_subparser: ArgparseWrapper):
+        shell_options = shell_subparser.add_argument_group(title=title_formatter("Options"))
+
+        shell_options.add_argument('-h', '--help', action='help',
+                                   help='Display help screen and exit')
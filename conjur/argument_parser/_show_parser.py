@@ -3,7 +3,8 @@ Module For the ShowParser
 """
 
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, command_description, \
+    command_epilog, formatter, title_formatter
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 # pylint: disable=too-few-public-methods
@@ -35,6 +36,10 @@ class ShowParser:
                         epilog=command_epilog(
                             'conjur show -i variable:somevariable\t'
                             'Shows metadata about the variable somevariable\n'
+                            '    conjur show -i variable:one host:two\t'
+                            'Shows metadata about several objects, one JSON line per object\n'
+                            '    conjur show --ids-file ids.txt\t\t'
+                            'Shows metadata about every object listed in ids.txt\n'
                         ),
                         usage=argparse.SUPPRESS,
                         add_help=False,
@@ -46,8 +51,8 @@ class ShowParser:
         show_options = show_subparser.add_argument_group(title=title_formatter("Options"))
 
         show_options.add_argument('-i', '--id', dest='identifier', metavar='VALUE',
-                                          help='Provide object identifier',
-                                          required=True)
+                                  help='Provide object identifier(s)', nargs='*')
+        add_bulk_options(show_options)
 
         show_options.add_argument('-h', '--help', action='help',
                                     help='Display help screen and exit')
@@ -0,0 +1,92 @@
+"""
+Module For the TemplateParser
+"""
+import argparse
+from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
+    title_formatter
+from conjur.wrapper.argparse_wrapper import ArgparseWrapper
+
+
+# pylint: disable=too-few-public-methods
+class TemplateParser:
+    """Partial class of the ArgParseBuilder.
+    This class add the Template subparser to the ArgParseBuilder parser."""
+
+    def __init__(self):
+        self.resource_subparsers = None  # here to reduce warnings on resource_subparsers not exist
+        raise NotImplementedError("this is partial class of ArgParseBuilder")
+
+    def add_template_parser(self):
+        """
+        Method adds template parser functionality to parser
+        """
+        template_parser = self._create_template_parser()
+        template_subparser = template_parser.add_subparsers(title="Subcommand", dest='action')
+
+        self._add_template_render(template_subparser)
+        self._add_template_options(template_parser)
+
+        return self
+
+    def _create_template_parser(self):
+        template_name = 'template - Render files that reference secrets'
+        template_usage = 'conjur [global options] template <subcommand> [options] [args]'
+
+        template_parser = self.resource_subparsers \
+            .add_parser('template',
+                        help='Render files that reference secrets',
+                        description=command_description(template_name,
+                                                        template_usage),
+                        epilog=command_epilog(
+                            'conjur template render app.conf.tpl -o app.conf\t'
+                            'Renders app.conf.tpl to app.conf\n',
+                            command='template',
+                            subcommands=['render']),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        return template_parser
+
+    @staticmethod
+    def _add_template_render(template_subparser: ArgparseWrapper):
+        template_render_name = 'render - Render templates with the values of variables'
+        template_render_usage = 'conjur [global options] template render [options] ' \
+                                '<template> [<template> ...]'
+
+        template_render_subcommand_parser = template_subparser \
+            .add_parser(name="render",
+                        help='Render templates with the values of the variables they reference',
+                        description=command_description(
+                            template_render_name, template_render_usage),
+                        epilog=command_epilog(
+                            'conjur template render app.conf.tpl -o app.conf\t\t'
+                            'Renders app.conf.tpl to app.conf\n'
+                            '    conjur template render app.conf.tpl\t\t\t'
+                            'Renders app.conf.tpl to the standard output\n'
+                            '    conjur template render *.tpl --output-dir /etc/app\t'
+                            'Renders every template to /etc/app, without\n'
+                            '\t\t\t\t\t\t\tthe .tpl suffix, fetching all the variables '
+                            'at once\n\n'
+                            'Templates reference variables as {{ secret "path/to/variable" }}'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        template_render_options = template_render_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+        template_render_options.add_argument('templates', metavar='TEMPLATE', nargs='+',
+                                             help='Template file(s) to render')
+        template_render_options.add_argument('-o', '--output', metavar='FILE',
+                                             help='Optional- file to render a single template '
+                                                  'to, readable by its owner only\n'
+                                                  '(default: standard output)')
+        template_render_options.add_argument('--output-dir', metavar='DIR',
+                                             help='Optional- directory to render the templates '
+                                                  'to, readable by their owner only')
+        template_render_options.add_argument('-h', '--help', action='help',
+                                             help='Display help screen and exit')
+
+    @staticmethod
+    def _add_template_options(template_parser: ArgparseWrapper):
+        template_options = template_parser.add_argument_group(title=title_formatter("Options"))
+        template_options.add_argument('-h', '--help', action='help',
+                                      help='Display help screen and exit')
@@ -2,8 +2,8 @@
 Module For the UserParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, add_journal_option, \
+    add_output_file_option, command_description, command_epilog, formatter, title_formatter
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 # pylint: disable=too-few-public-methods
@@ -68,7 +68,11 @@ class UserParser:
                             'conjur user rotate-api-key\t\t\t'
                             'Rotates logged-in user\'s API key\n'
                             '    conjur user rotate-api-key -i joe\t\t'
-                            'Rotates the API key for user joe\n'),
+                            'Rotates the API key for user joe\n'
+                            '    conjur user rotate-api-key --ids-file users.txt '
+                            '--output keys.json\t\t'
+                            'Rotates the API keys of the users listed in users.txt '
+                            'and writes them to keys.json\n'),
                         usage=argparse.SUPPRESS,
                         add_help=False,
                         formatter_class=formatter)
@@ -78,6 +82,9 @@ class UserParser:
                                                  help='Provide the identifier of the user for whom '
                                                       'you want to rotate the API key '
                                                       '(Default: logged-in user)')
+        add_bulk_options(user_rotate_api_key_options, item='user identifier')
+        add_output_file_option(user_rotate_api_key_options, 'the new API keys')
+        add_journal_option(user_rotate_api_key_options)
         user_rotate_api_key_options.add_argument('-h', '--help', action='help',
                                                  help='Display help screen and exit')
 
@@ -2,8 +2,9 @@
 Module For the VariableParser
 """
 import argparse
-from conjur.argument_parser.parser_utils import command_description, command_epilog, formatter, \
-    title_formatter
+from conjur.argument_parser.parser_utils import add_bulk_options, add_output_file_option, \
+    command_description, command_epilog, duration_seconds, formatter, title_formatter
+from conjur.constants import DEFAULT_MAX_WATCH_INTERVAL_SECONDS, DEFAULT_WATCH_INTERVAL_SECONDS
 from conjur.wrapper.argparse_wrapper import ArgparseWrapper
 
 
@@ -25,6 +26,8 @@ class VariableParser:
 
         self._add_variable_get(variable_subparser)
         self._add_variable_set(variable_subparser)
+        self._add_variable_watch(variable_subparser)
+        self._add_variable_access(variable_subparser)
         self._add_variable_options(variable_parser)
 
         return self
@@ -46,7 +49,7 @@ class VariableParser:
                             '    conjur variable set -i secrets/mysecret -v my_secret_value\t'
                             'Sets the value of variable secrets/mysecret to my_secret_value\n',
                             command='variable',
-                            subcommands=['get', 'set']),
+                            subcommands=['get', 'set', 'watch', 'access']),
                         usage=argparse.SUPPRESS,
                         add_help=False,
                         formatter_class=formatter)
@@ -80,6 +83,11 @@ class VariableParser:
         variable_get_options.add_argument('--version', metavar='VALUE',
                                           help='Optional- specify desired '
                                                'version of variable value')
+        variable_get_options.add_argument('--hedge', action='store_true',
+                                          help='Optional- when reading a single variable, '
+                                               'send a second request to another\nread URL '
+                                               'of the configuration if the first one is '
+                                               'slower than usual')
         variable_get_options.add_argument('-h', '--help', action='help',
                                           help='Display help screen and exit')
 
@@ -109,6 +117,81 @@ class VariableParser:
         variable_set_options.add_argument('-h', '--help', action='help',
                                           help='Display help screen and exit')
 
+    @staticmethod
+    def _add_variable_watch(variable_subparser: ArgparseWrapper):
+        variable_watch_name = 'watch - Watch variables for changes'
+        variable_watch_usage = 'conjur [global options] variable watch [options] [args]'
+        variable_watch_subcommand_parser = variable_subparser \
+            .add_parser(name="watch",
+                        help='Watch variables and report when their values change',
+                        description=command_description(
+                            variable_watch_name, variable_watch_usage),
+                        epilog=command_epilog(
+                            'conjur variable watch -i secrets/a secrets/b\t\t'
+                            'Prints a JSON line each time secrets/a or secrets/b changes\n'
+                            '    conjur variable watch -i secrets/a --exec ./reload.sh\t'
+                            'Runs reload.sh each time secrets/a changes\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        variable_watch_options = variable_watch_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+
+        variable_watch_options.add_argument('-i', '--id', dest='identifier', metavar='VALUE',
+                                            help='Provide variable identifier(s)', nargs='+',
+                                            required=True)
+        variable_watch_options.add_argument('--interval', metavar='DURATION',
+                                            type=duration_seconds,
+                                            default=DEFAULT_WATCH_INTERVAL_SECONDS,
+                                            help='Optional- time between polls, such as 30s '
+                                                 'or 5m (Default: 30s)')
+        variable_watch_options.add_argument('--max-interval', metavar='DURATION',
+                                            type=duration_seconds,
+                                            default=DEFAULT_MAX_WATCH_INTERVAL_SECONDS,
+                                            help='Optional- longest time between polls while '
+                                                 'nothing changes (Default: 5m)')
+        variable_watch_options.add_argument('--exec', dest='hook', metavar='COMMAND',
+                                            help='Optional- command to run on changes '
+                                                 'instead of printing them. The IDs of\nthe '
+                                                 'changed variables are in the '
+                                                 'CONJUR_CHANGED_VARIABLES environment\n'
+                                                 'variable, one per line')
+        variable_watch_options.add_argument('-h', '--help', action='help',
+                                            help='Display help screen and exit')
+
+    @staticmethod
+    def _add_variable_access(variable_subparser: ArgparseWrapper):
+        variable_access_name = 'access - Show the users and hosts that have a privilege ' \
+                               'on variables'
+        variable_access_usage = 'conjur [global options] variable access [options] [args]'
+        variable_access_subcommand_parser = variable_subparser \
+            .add_parser(name="access",
+                        help='Show the users and hosts that have a privilege on variables, '
+                             'through any group, layer or policy',
+                        description=command_description(
+                            variable_access_name, variable_access_usage),
+                        epilog=command_epilog(
+                            'conjur variable access -i secrets/a secrets/b\t\t'
+                            'Shows who can fetch the values of secrets/a and secrets/b\n'
+                            '    conjur variable access --ids-file ids.txt -p update\t'
+                            'Shows who can set the values of the variables of ids.txt\n'),
+                        usage=argparse.SUPPRESS,
+                        add_help=False,
+                        formatter_class=formatter)
+        variable_access_options = variable_access_subcommand_parser.add_argument_group(
+            title=title_formatter("Options"))
+
+        variable_access_options.add_argument('-i', '--id', dest='identifier', metavar='VALUE',
+                                             help='Provide variable identifier(s)', nargs='*')
+        variable_access_options.add_argument('-p', '--privilege', metavar='VALUE',
+                                             dest='privilege', default='execute',
+                                             help='Optional- privilege to look for '
+                                                  '(read | execute | update, Default: execute)')
+        add_bulk_options(variable_access_options, item='variable identifier')
+        add_output_file_option(variable_access_options, 'the results')
+        variable_access_options.add_argument('-h', '--help', action='help',
+                                             help='Display help screen and exit')
+
     @staticmethod
     def _add_variable_options(variable_parser: ArgparseWrapper):
         policy_options = variable_parser.add_argument_group(title=title_formatter("Options"))
@@ -6,6 +6,9 @@ import argparse
 from conjur.wrapper import ArgparseWrapper
 
 from conjur.argument_parser.parser_utils import formatter, header, main_epilog, title_formatter
+from conjur.argument_parser._export_parser import ExportParser
+from conjur.argument_parser._import_parser import ImportParser
+from conjur.argument_parser._index_parser import IndexParser
 from conjur.argument_parser._init_parser import InitParser
 from conjur.argument_parser._login_parser import LoginParser
 from conjur.argument_parser._logout_parser import LogoutParser
@@ -13,12 +16,17 @@ from conjur.argument_parser._policy_parser import PolicyParser
 from conjur.argument_parser._host_parser import HostParser
 from conjur.argument_parser._list_parser import ListParser
 from conjur.argument_parser._check_parser import CheckParser
+from conjur.argument_parser._completion_parser import CompletionParser
 from conjur.argument_parser._show_parser import ShowParser
 from conjur.argument_parser._resource_parser import ResourceParser
 from conjur.argument_parser._screen_options_parser import ScreenOptionsParser
 from conjur.argument_parser._user_parser import UserParser
 from conjur.argument_parser._variable_parser import VariableParser
 from conjur.argument_parser._role_parser import RoleParser
+from conjur.argument_parser._run_parser import RunParser
+from conjur.argument_parser._shell_parser import ShellParser
+from conjur.argument_parser._batch_parser import BatchParser
+from conjur.argument_parser._template_parser import TemplateParser
 from conjur.argument_parser._whoami_parser import WhoamiParser
 from conjur.argument_parser._hostfactory_parser import HostFactoryParser
 
@@ -36,6 +44,14 @@ class ArgParseBuilder(InitParser,
                       UserParser,
                       VariableParser,
                       RoleParser,
+                      RunParser,
+                      ShellParser,
+                      BatchParser,
+                      CompletionParser,
+                      IndexParser,
+                      ExportParser,
+                      ImportParser,
+                      TemplateParser,
                       WhoamiParser,
                       HostFactoryParser,
                       ScreenOptionsParser):
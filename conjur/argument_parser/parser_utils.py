@@ -5,6 +5,8 @@ This Module holds all the utils needed for the ArgParseBuilder
 import argparse
 import time
 
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+
 
 def formatter(prog: str) -> argparse.RawTextHelpFormatter:
     """
@@ -60,6 +62,59 @@ def title_formatter(title: str) -> str:
     return f"\n{title}"
 
 
+def add_bulk_options(options, item: str = 'identifier'):
+    """
+    This method adds the options shared by commands that can run on many
+    identifiers in a single invocation
+    """
+    options.add_argument('--ids-file', metavar='FILE', dest='ids_file',
+                         help=f'Optional- read additional {item}s from FILE, one per line '
+                              f'(use - to read from stdin)')
+    options.add_argument('--concurrency', metavar='VALUE', type=int,
+                         dest='concurrency', default=DEFAULT_BULK_CONCURRENCY,
+                         help='Optional- maximum number of concurrent requests when '
+                              f'running on many {item}s (Default: {DEFAULT_BULK_CONCURRENCY})')
+
+
+def add_output_file_option(options, content: str):
+    """
+    This method adds the option for writing results holding credentials
+    to a file readable by its owner only
+    """
+    options.add_argument('-o', '--output', metavar='FILE', dest='output_file',
+                         help=f'Optional- write {content} to FILE '
+                              '(readable by its owner only) instead of stdout')
+
+
+def add_journal_option(options):
+    """
+    This method adds the option for recording the progress of a bulk
+    command, so that an interrupted run can resume where it stopped
+    """
+    options.add_argument('--resume', metavar='FILE', dest='journal_file',
+                         help='Optional- record each identifier done to the journal FILE '
+                              'and skip those it already holds, so a run that was '
+                              'interrupted continues where it stopped. Results are '
+                              'appended to the output file of the previous run')
+
+
+def duration_seconds(value: str) -> float:
+    """
+    This method parses a positive duration such as 30, 30s, 5m or 1h,
+    in seconds by default, for use as the type of an argument
+    """
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    number, unit = (value[:-1], value[-1]) if value[-1:] in units else (value, 's')
+    try:
+        seconds = float(number) * units[unit]
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"invalid duration: '{value}', "
+                                         f"expected for example 30s, 5m or 1h")
+    return seconds
+
+
 def conjur_copyright() -> str:
     """
     This method builds the copyright description
@@ -22,19 +22,36 @@ from conjur_api.errors.errors import HttpError, HttpStatusError
 from conjur.argument_parser.argparse_builder import ArgParseBuilder
 from conjur.data_object.policy_data import PolicyData
 from conjur.logic.credential_provider.credential_store_factory import CredentialStoreFactory
+from conjur.logic.credential_provider.leader_credentials_provider import \
+    LeaderCredentialsProvider
 from conjur.errors import CertificateVerificationException
 from conjur.errors_messages import INCONSISTENT_VERIFY_MODE_MESSAGE
+from conjur.util.metrics import MetricsRecorder
+from conjur.util.batch_runner import BatchRunner, read_batch_file
+from conjur.util.hedging import HedgedReader
+from conjur.util.interactive_shell import InteractiveShell
+from conjur.util.profiler import Profiler
+from conjur.util.read_routing import EndpointHealth, ReadRoutingClient
+from conjur.util.rate_limiter import SharedRateLimiter, ThrottledClient
+from conjur.util.retry import RetryingClient, RetryPolicy
 from conjur.util.util_functions import determine_status_code_specific_error_messages, \
     file_is_missing_or_empty, get_ssl_verification_meta_data_from_conjurrc
 from conjur.wrapper import ArgparseWrapper
-from conjur.constants import DEFAULT_CONFIG_FILE, LOGIN_IS_REQUIRED
+from conjur.constants import DEFAULT_CONFIG_FILE, DEFAULT_ENDPOINT_HEALTH_FILE, \
+    DEFAULT_RATE_LIMIT_STATE_FILE, DEFAULT_REQUEST_RETRIES, DEFAULT_SHELL_HISTORY_FILE, \
+    LOGIN_IS_REQUIRED
 
 from conjur.data_object import ConjurrcData
 from conjur import cli_actions
 from conjur.version import __version__
 
 
-# pylint: disable=too-many-statements
+# Commands that change the configuration or the process, which cannot run
+# within the shell or a batch
+NESTED_UNSUPPORTED_COMMANDS = ['init', 'login', 'logout', 'run', 'shell', 'batch']
+
+
+# pylint: disable=too-many-statements,too-many-instance-attributes
 class Cli:
     """
     Main wrapper around CLI-like usages of this module. Provides various
@@ -44,9 +61,18 @@ class Cli:
     def __init__(self):
         # TODO stop using testing_env
         self.is_testing_env = str(os.getenv('TEST_ENV')).lower() == 'true'
+        self.profiler = Profiler()
+        self.metrics_recorder = None
+        self.endpoint_health = None
+        self.hedged_reader = None
+        # Command launched by `conjur run` once the CLI is done
+        self.child_process = None
+        self.parser = None
+        self.exit_code = 0
 
         # Assume default credential store option until we get to parse the CLI args
-        self.credential_provider = CredentialStoreFactory.create_credential_store()
+        with self.profiler.phase('credential store resolution'):
+            self.credential_provider = CredentialStoreFactory.create_credential_store()
 
     def run(self):
         """
@@ -54,9 +80,57 @@ class Cli:
         test sources. Parses CLI args and invokes the appropriate client command.
         """
 
+        with self.profiler.phase('argument parser build'):
+            self.parser = self._build_parser()
+
+        with self.profiler.phase('argument parsing'):
+            resource, args = self._parse_args(self.parser)
+
+        profile = args.profile or args.profile_output is not None
+        if args.profile_output:
+            self.profiler.start_cprofile()
+
+        if args.metrics_file:
+            command = ' '.join(filter(None, [resource, getattr(args, 'action', None)]))
+            self.metrics_recorder = MetricsRecorder.create(args.metrics_file,
+                                                           args.metrics_format, command)
+
+        Client.configure_logger(debug=args.debug)
+
+        # There may be a better way to do this. Currently we have to
+        # re-initialize the credential store once the CLI args become available
+        if 'force_netrc' not in args or args.force_netrc is False:
+            args.force_netrc = None
+        with self.profiler.phase('credential store resolution (from args)'):
+            self.credential_provider = \
+                CredentialStoreFactory.create_credential_store(args.force_netrc)
+
+        # pylint: disable=broad-except
+        try:
+            self.run_action(resource, args)
+        except KeyboardInterrupt:
+            self._handle_keyboard_interrupt_exception()
+        except Exception as error:
+            self._handle_exception(args, error)
+
+        else:
+            if self.child_process is None:
+                # Explicit exit (required for tests)
+                sys.exit(self.exit_code)
+
+        finally:
+            # Written before exiting, whether the command succeeded or not
+            self._write_run_state(args, profile)
+
+        if self.child_process is not None:
+            # Launched last, as the command replaces the CLI process
+            sys.exit(self.child_process.launch())
+
+    @staticmethod
+    def _build_parser() -> ArgparseWrapper:
         # The following block of code implements the fluent interface technique
         # https://en.wikipedia.org/wiki/Fluent_interface
-        parser = ArgParseBuilder() \
+        return ArgParseBuilder() \
             .add_login_parser() \
             .add_init_parser() \
             .add_logout_parser() \
@@ -69,38 +143,48 @@ class Cli:
             .add_user_parser() \
             .add_variable_parser() \
             .add_role_parser() \
+            .add_run_parser() \
+            .add_template_parser() \
+            .add_shell_parser() \
+            .add_batch_parser() \
+            .add_completion_parser() \
+            .add_index_parser() \
+            .add_export_parser() \
+            .add_import_parser() \
             .add_whoami_parser() \
             .add_hostfactory_parser() \
             .add_main_screen_options() \
             .build()
 
-        resource, args = self._parse_args(parser)
-
-        Client.configure_logger(debug=args.debug)
-
-        # There may be a better way to do this. Currently we have to
-        # re-initialize the credential store once the CLI args become available
-        if 'force_netrc' not in args or args.force_netrc is False:
-            args.force_netrc = None
-        self.credential_provider = CredentialStoreFactory.create_credential_store(args.force_netrc)
-
-        # pylint: disable=broad-except
+    def _write_profile(self, profile_output: str = None):
+        if profile_output:
+            self.profiler.dump_cprofile(profile_output)
+        self.profiler.write_report()
+        if profile_output:
+            sys.stderr.write(f"cProfile statistics were written to '{profile_output}'\n")
+
+    def _write_run_state(self, args, profile: bool):
+        if self.endpoint_health:
+            self._save_endpoint_health()
+        if self.metrics_recorder:
+            self._write_metrics()
+        if profile:
+            self._write_profile(args.profile_output)
+
+    def _save_endpoint_health(self):
         try:
-            self.run_action(resource, args)
-        except KeyboardInterrupt:
-            self._handle_keyboard_interrupt_exception()
-        except FileNotFoundError as file_not_found_error:
-            self._handle_file_not_found_exception(file_not_found_error)
-        except HttpError as server_error:
-            self._handle_http_exception(server_error, args)
-        except CertificateVerificationException:
-            self._handle_certificate_verification_exception(args)
-        except Exception as error:
-            self._handle_general_exception(args, error)
+            self.endpoint_health.save()
+        except OSError:
+            # Losing the measurements only affects the choice of the next follower
+            logging.debug(traceback.format_exc())
 
-        else:
-            # Explicit exit (required for tests)
-            sys.exit(0)
+    def _write_metrics(self):
+        try:
+            self.metrics_recorder.close()
+        except OSError as error:
+            # Failing to write metrics must not change the outcome of the command
+            logging.debug(traceback.format_exc())
+            sys.stderr.write(f"Failed to write metrics. Reason: {error}\n")
 
     # pylint: disable=too-many-branches,logging-fstring-interpolation
     def run_action(self, resource: str, args):
@@ -112,9 +196,15 @@ class Cli:
         # Needed for unit tests so that they do not require configuring
 
         if resource in ['logout', 'init', 'login']:
-            self._run_auth_flow(args, resource)
+            with self.profiler.phase('command'):
+                self._run_auth_flow(args, resource)
             return
-        self._perform_auth_if_not_login(args)
+        if resource == 'completion' and args.action != 'refresh':
+            # Printing a completion script requires neither a configuration nor a session
+            cli_actions.handle_completion_logic(args)
+            return
+        with self.profiler.phase('login check'):
+            self._perform_auth_if_not_login(args)
         self._run_command_flow(args, resource)
 
     def _run_auth_flow(self, args, resource):
@@ -148,14 +238,87 @@ class Cli:
             return
 
     def _run_command_flow(self, args, resource):
-        ssl_verification_meta_data = get_ssl_verification_meta_data_from_conjurrc(args.ssl_verify)
-        conjurrc_data = ConjurrcData.load_from_file()
-        client = Client(ssl_verification_mode=ssl_verification_meta_data.mode,
-                        connection_info=conjurrc_data.get_client_connection_info(),
-                        authn_strategy=conjurrc_data.get_authn_strategy(self.credential_provider),
-                        debug=args.debug,
-                        async_mode=False)
-
+        client = self._create_client(args)
+        with self.profiler.phase('command'):
+            self.exit_code = self._dispatch_command(args, resource, client)
+
+    def _create_client(self, args) -> Client:
+        with self.profiler.phase('config load'):
+            ssl_verification_meta_data = \
+                get_ssl_verification_meta_data_from_conjurrc(args.ssl_verify)
+            conjurrc_data = ConjurrcData.load_from_file()
+        with self.profiler.phase('client creation'):
+            client = self._create_appliance_client(args, conjurrc_data,
+                                                   ssl_verification_meta_data.mode,
+                                                   conjurrc_data.conjur_url)
+        if conjurrc_data.read_urls:
+            self.endpoint_health = EndpointHealth(DEFAULT_ENDPOINT_HEALTH_FILE)
+            client = ReadRoutingClient(
+                client, conjurrc_data.read_urls,
+                lambda url: self._create_appliance_client(args, conjurrc_data,
+                                                          ssl_verification_meta_data.mode, url),
+                self.endpoint_health)
+            if getattr(args, 'hedge', False):
+                # Every hedged request is throttled and measured, the whole
+                # read is retried and profiled like the calls of the client
+                self.hedged_reader = self._wrap_client_calls(args, HedgedReader(
+                    conjurrc_data.conjur_url, conjurrc_data.read_urls,
+                    lambda url: self._create_appliance_client(args, conjurrc_data,
+                                                              ssl_verification_meta_data.mode,
+                                                              url, async_mode=True),
+                    self.endpoint_health))
+        elif getattr(args, 'hedge', False):
+            logging.debug("Hedged reads require read_urls in the configuration, "
+                          "reading from the leader only")
+        return self._wrap_client_calls(args, client)
+
+    def _wrap_client_calls(self, args, client):
+        request_retries = getattr(args, 'request_retries', DEFAULT_REQUEST_RETRIES)
+        if request_retries > 0:
+            client = RetryingClient(client, RetryPolicy(max_attempts=request_retries + 1))
+        if getattr(args, 'profile', False) or getattr(args, 'profile_output', None):
+            # Calls to the client are where the network round trips happen
+            client = self.profiler.wrap_client(client)
+        return client
+
+    # pylint: disable=too-many-arguments
+    def _create_sdk_client(self, args, conjurrc_data: ConjurrcData, ssl_verification_mode,
+                           url: str, async_mode: bool = False) -> Client:
+        connection_info = conjurrc_data.get_client_connection_info()
+        credential_provider = self.credential_provider
+        if url != conjurrc_data.conjur_url:
+            # Followers accept the credentials stored for the leader
+            connection_info.conjur_url = url
+            credential_provider = LeaderCredentialsProvider(credential_provider,
+                                                            conjurrc_data.conjur_url)
+        return Client(ssl_verification_mode=ssl_verification_mode,
+                      connection_info=connection_info,
+                      authn_strategy=conjurrc_data.get_authn_strategy(credential_provider),
+                      debug=args.debug,
+                      async_mode=async_mode)
+
+    # pylint: disable=too-many-arguments
+    def _create_appliance_client(self, args, conjurrc_data: ConjurrcData,
+                                 ssl_verification_mode, url: str, async_mode: bool = False):
+        client = self._create_sdk_client(args, conjurrc_data, ssl_verification_mode, url,
+                                         async_mode=async_mode)
+        if self.metrics_recorder:
+            client = self.metrics_recorder.wrap_client(client)
+        max_request_rate = getattr(args, 'max_request_rate', None)
+        max_in_flight = getattr(args, 'max_in_flight', None)
+        if max_request_rate or max_in_flight:
+            # Throttled inside the retries so that every attempt is throttled
+            client = ThrottledClient(client, SharedRateLimiter(DEFAULT_RATE_LIMIT_STATE_FILE, url,
+                                                               rate=max_request_rate,
+                                                               max_in_flight=max_in_flight))
+        return client
+
+    # pylint: disable=too-many-return-statements
+    def _dispatch_command(self, args, resource, client) -> int:
+        """
+        Runs the command and returns its exit code. Bulk commands exit with 1
+        when any of their identifiers failed
+        """
         if resource == 'list':
             cli_actions.handle_list_logic(args, client)
 
@@ -163,33 +326,60 @@ class Cli:
             cli_actions.handle_check_logic(args, client)
 
         elif resource == 'show':
-            cli_actions.handle_show_logic(args, client)
+            return 1 if cli_actions.handle_show_logic(args, client) else 0
 
         elif resource == 'resource':
-            cli_actions.handle_resource_logic(args, client)
+            return 1 if cli_actions.handle_resource_logic(args, client) else 0
 
         elif resource == 'whoami':
             result = client.whoami()
             print(json.dumps(result, indent=4))
 
         elif resource == 'variable':
-            cli_actions.handle_variable_logic(args, client)
+            cli_actions.handle_variable_logic(args, client, self.hedged_reader)
 
         elif resource == 'role':
             cli_actions.handle_role_logic(args, client)
 
+        elif resource == 'run':
+            self.child_process = cli_actions.handle_run_logic(args, client)
+
+        elif resource == 'template':
+            cli_actions.handle_template_logic(args, client)
+
+        elif resource == 'shell':
+            return self._run_shell(args, client)
+
+        elif resource == 'batch':
+            return self._run_batch(args, client)
+
+        elif resource == 'index':
+            cli_actions.handle_index_logic(args, client)
+
+        elif resource == 'export':
+            cli_actions.handle_export_logic(args, client)
+
+        elif resource == 'import':
+            return 1 if cli_actions.handle_import_logic(args, client) else 0
+
+        elif resource == 'completion':
+            cli_actions.handle_completion_logic(args, client, self.parser)
+
         elif resource == 'policy':
             policy_data = PolicyData(action=args.action, branch=args.branch, file=args.file)
             cli_actions.handle_policy_logic(policy_data, client)
 
         elif resource == 'user':
-            cli_actions.handle_user_logic(self.credential_provider, args, client)
+            return 1 if cli_actions.handle_user_logic(self.credential_provider, args, client) else 0
 
         elif resource == 'host':
-            cli_actions.handle_host_logic(args, client)
+            return 1 if cli_actions.handle_host_logic(args, client, self.credential_provider) \
+                else 0
 
         elif resource == 'hostfactory':
-            cli_actions.handle_hostfactory_logic(args, client)
+            return 1 if cli_actions.handle_hostfactory_logic(args, client) else 0
+
+        return 0
 
     def _run_init_if_not_occur(self):
         if not self.is_testing_env and file_is_missing_or_empty(DEFAULT_CONFIG_FILE):
@@ -208,20 +398,69 @@ class Cli:
                 sys.stdout.write(f"{LOGIN_IS_REQUIRED}\n")
                 cli_actions.handle_login_logic(self.credential_provider, ssl_verify=args.ssl_verify)
 
+    def _run_shell(self, shell_args, client) -> int:
+        shell = InteractiveShell(self.parser,
+                                 lambda words: self._run_nested_command(shell_args, words, client),
+                                 history_file=DEFAULT_SHELL_HISTORY_FILE)
+        return shell.run()
+
+    def _run_batch(self, batch_args, client) -> int:
+        groups = read_batch_file(batch_args.batch_file)
+        runner = BatchRunner(lambda words: self._run_nested_command(batch_args, words, client),
+                             batch_args.parallel, batch_args.fail_fast)
+        commands = runner.run(groups)
+        failed = sum(1 for command in commands if command.exit_code not in (None, 0))
+        skipped = sum(1 for command in commands if command.exit_code is None)
+        sys.stderr.write(f"Ran {len(commands) - skipped} of {len(commands)} command(s), "
+                         f"{failed} failed\n")
+        return 1 if failed else 0
+
+    # pylint: disable=broad-except
+    def _run_nested_command(self, shell_args, words, client) -> int:
+        """
+        Runs a command of the shell or of a batch with the client of the
+        invocation, so the configuration and the session are reused.
+        Returns its exit code
+        """
+        args = shell_args
+        try:
+            resource, args = self._parse_args(self.parser, words)
+            if resource in NESTED_UNSUPPORTED_COMMANDS:
+                sys.stdout.write(f"Error: the {resource} command cannot run in a shell "
+                                 f"or a batch\n")
+                return 1
+            with self.profiler.phase('command'):
+                return self._dispatch_command(args, resource, client)
+        except SystemExit as exit_request:
+            return _exit_code(exit_request)
+        except Exception as error:
+            try:
+                self._handle_exception(args, error)
+            except SystemExit as exit_request:
+                return _exit_code(exit_request)
+        return 0
+
     @staticmethod
-    def _parse_args(parser: ArgparseWrapper):
-        args = parser.parse_args()
+    def _parse_args(parser: ArgparseWrapper, argv: list = None):
+        args = parser.parse_args(argv)
 
         if not args.resource:
             parser.print_help()
             sys.exit(0)
 
         # Check whether we are running a command with required additional arguments/options
-        if args.resource not in ['list', 'check', 'show', 'whoami', 'init', 'login', 'logout']:
+        if args.resource not in ['list', 'check', 'show', 'whoami', 'init', 'login', 'logout',
+                                 'run', 'shell', 'batch', 'export', 'import']:
             if 'action' not in args or not args.action:
                 parser.print_help()
                 sys.exit(0)
 
+        # Commands that can run on many identifiers accept them either
+        # as arguments or from a file, so argparse cannot enforce either one
+        if 'ids_file' in args and 'identifier' in args \
+                and not args.identifier and not args.ids_file:
+            parser.error("the following arguments are required: -i/--id")
+
         return args.resource, args
 
     @staticmethod
@@ -238,6 +477,16 @@ class Cli:
         sys.stdout.write("\n")
         sys.exit(0)
 
+    def _handle_exception(self, args, error: Exception):
+        if isinstance(error, FileNotFoundError):
+            self._handle_file_not_found_exception(error)
+        elif isinstance(error, HttpError):
+            self._handle_http_exception(error, args)
+        elif isinstance(error, CertificateVerificationException):
+            self._handle_certificate_verification_exception(args)
+        else:
+            self._handle_general_exception(args, error)
+
     @staticmethod
     def _handle_file_not_found_exception(file_not_found_error: FileNotFoundError):
         sys.stdout.write(f"Error: No such file or directory: '{file_not_found_error.filename}'\n")
@@ -273,6 +522,12 @@ class Cli:
         sys.exit(1)
 
 
+def _exit_code(exit_request: SystemExit) -> int:
+    if exit_request.code is None or isinstance(exit_request.code, int):
+        return exit_request.code or 0
+    return 1
+
+
 if __name__ == '__main__':
     # Not coverage-tested since the integration tests do this
     Cli.launch()  # pragma: no cover
@@ -10,32 +10,56 @@ import sys
 
 # SDK
 from conjur_api.interface import CredentialsProviderInterface
-from conjur_api.models import CreateHostData, CreateTokenData, ListMembersOfData, ListPermittedRolesData, \
+from conjur_api.models import CreateHostData, ListMembersOfData, ListPermittedRolesData, \
     CredentialsData
 
 # Internal
 # pylint: disable=too-many-arguments
 from conjur.controller.hostfactory_controller import HostFactoryController
+from conjur.controller.token_pool_controller import TokenPoolController
 from conjur.controller.resource_controller import ResourceController
 from conjur.controller.show_controller import ShowController
 from conjur.controller.check_controller import CheckController
+from conjur.controller.completion_controller import CompletionController
+from conjur.controller.export_controller import ExportController
+from conjur.controller.import_controller import ImportController
+from conjur.controller.index_controller import IndexController
+from conjur.controller.run_controller import RunController
+from conjur.controller.template_controller import TemplateController
+from conjur.controller.variable_access_controller import VariableAccessController
+from conjur.controller.variable_watch_controller import VariableWatchController
 
 from conjur.errors import ConflictingParametersException, FileNotFoundException, \
     InvalidFilePermissionsException, MissingRequiredParameterException
+from conjur.logic.export_logic import ExportLogic
 from conjur.logic.hostfactory_logic import HostFactoryLogic
+from conjur.logic.import_logic import ImportLogic
+from conjur.logic.token_pool_logic import TokenPoolLogic
 from conjur.controller import InitController, LoginController, \
     LogoutController, ListController, VariableController, \
     PolicyController, UserController, HostController, RoleController
 from conjur.logic import InitLogic, LoginLogic, LogoutLogic, ListLogic, VariableLogic, \
     PolicyLogic, UserLogic, RoleLogic
 from conjur.data_object import ConjurrcData, UserInputData, HostResourceData, ListData, VariableData, \
-    PolicyData
+    PolicyData, CreateTokenData
 from conjur.logic.resource_logic import ResourceLogic
 from conjur.logic.check_logic import CheckLogic
+from conjur.logic.completion_logic import CompletionLogic
+from conjur.logic.index_logic import IndexLogic
 from conjur.logic.show_logic import ShowLogic
+from conjur.logic.run_logic import RunLogic
+from conjur.logic.template_logic import TemplateLogic
+from conjur.logic.variable_access_logic import VariableAccessLogic
+from conjur.logic.variable_watch_logic import VariableWatchLogic
 from conjur.util.ssl_utils import SSLClient
-from conjur.util import init_utils, util_functions
-from conjur.constants import DEFAULT_NETRC_FILE
+from conjur.util import bulk_utils, init_utils, util_functions
+from conjur.util.bulk_journal import open_journal
+from conjur.util.completion import CompletionCache
+from conjur.util.rate_limiter import RateLimiter
+from conjur.util.resource_index import ResourceIndex
+from conjur.util.retry import RetryPolicy
+from conjur.constants import DEFAULT_COMPLETION_CACHE_DIRECTORY, DEFAULT_NETRC_FILE, \
+    DEFAULT_RESOURCE_INDEX_DIRECTORY
 
 
 # pylint: disable=raise-missing-from
@@ -131,7 +155,38 @@ def handle_list_logic(args: list = None, client=None):
     list_logic = ListLogic(client)
     list_controller = ListController(list_logic=list_logic)
 
-    if args.permitted_roles_identifier:
+    if getattr(args, 'stream', False) and (getattr(args, 'local', False)
+                                           or getattr(args, 'snapshot', None)
+                                           or args.permitted_roles_identifier
+                                           or args.members_of):
+        raise ConflictingParametersException("Error: --stream can only be used with "
+                                             "--kind, --search, --role, --inspect, --limit "
+                                             "and --offset")
+    if getattr(args, 'local', False):
+        if args.permitted_roles_identifier or args.members_of or args.role or args.inspect \
+                or getattr(args, 'snapshot', None):
+            raise ConflictingParametersException("Error: --local can only be used with "
+                                                 "--kind, --search, --prefix, --limit and "
+                                                 "--offset")
+        list_data = ListData(kind=args.kind, search=args.search, limit=args.limit,
+                             offset=args.offset)
+        list_controller.load_local(list_data, _resource_index(), args.prefix)
+    elif getattr(args, 'prefix', None):
+        raise MissingRequiredParameterException("Error: --prefix requires --local")
+    elif getattr(args, 'snapshot', None):
+        if args.permitted_roles_identifier or args.members_of or args.limit or args.offset:
+            raise ConflictingParametersException("Error: --snapshot can only be used with "
+                                                 "--kind, --search, --role and --inspect")
+        list_data = ListData(kind=args.kind, inspect=args.inspect, search=args.search,
+                             role=args.role)
+        list_controller.load_changes(list_data, args.snapshot, args.page_size,
+                                     args.concurrency)
+    elif getattr(args, 'stream', False):
+        list_data = ListData(kind=args.kind, inspect=args.inspect,
+                             search=args.search, limit=args.limit,
+                             offset=args.offset, role=args.role)
+        list_controller.load_stream(list_data, args.page_size, args.concurrency)
+    elif args.permitted_roles_identifier:
         list_permitted_roles_data = ListPermittedRolesData(
             identifier=args.permitted_roles_identifier,
             privilege=args.privilege)
@@ -150,6 +205,41 @@ def handle_list_logic(args: list = None, client=None):
                              offset=args.offset, role=args.role)
         list_controller.load(list_data)
 
+def handle_index_logic(args: list = None, client=None):
+    """
+    Method wraps the index call logic
+    """
+    index_logic = IndexLogic(client, _resource_index())
+    index_controller = IndexController(index_logic=index_logic)
+    if args.action == 'sync':
+        index_controller.sync(ConjurrcData.load_from_file().conjur_account, args.kinds)
+    elif args.action == 'status':
+        index_controller.status()
+
+def _resource_index() -> ResourceIndex:
+    # Each server has its own index
+    return ResourceIndex.for_server(DEFAULT_RESOURCE_INDEX_DIRECTORY,
+                                    ConjurrcData.load_from_file().conjur_url)
+
+def handle_export_logic(args: list = None, client=None):
+    """
+    Method wraps the export call logic
+    """
+    export_logic = ExportLogic(client, args.batch_size, args.concurrency)
+    export_controller = ExportController(export_logic)
+    export_controller.export(args.policy, args.output_file)
+
+
+def handle_import_logic(args: list = None, client=None) -> int:
+    """
+    Method wraps the import call logic. Returns the number of variables
+    that failed
+    """
+    import_logic = ImportLogic(client, args.concurrency)
+    import_controller = ImportController(import_logic)
+    return import_controller.import_archive(args.input_file, args.resume)
+
+
 def handle_check_logic(args: list = None, client=None):
     """
     Method wraps the check call logic
@@ -158,29 +248,68 @@ def handle_check_logic(args: list = None, client=None):
     check_controller = CheckController(check_logic=check_logic)
     check_controller.check(args.identifier, args.privilege, args.role)
 
-def handle_show_logic(args: list = None, client=None):
+def handle_show_logic(args: list = None, client=None) -> int:
     """
-    Method wraps the show call logic
+    Method wraps the show call logic. Returns the number of resources that
+    failed to be shown
     """
     show_logic = ShowLogic(client)
     show_controller = ShowController(show_logic=show_logic)
-    show_controller.load(args.identifier)
+    if bulk_utils.is_bulk_request(args.identifier, args.ids_file):
+        resource_ids = bulk_utils.read_identifiers(args.identifier, args.ids_file)
+        return show_controller.load_many(resource_ids, args.concurrency)
+    show_controller.load(bulk_utils.read_identifiers(args.identifier)[0])
+    return 0
 
-def handle_resource_logic(args: list = None, client=None):
+def handle_run_logic(args: list = None, client=None):
     """
-    Method wraps the resource call logic
+    Method wraps the run call logic. Returns the child process to launch
+    """
+    run_logic = RunLogic(client)
+    run_controller = RunController(run_logic=run_logic)
+    return run_controller.load(args.secrets_file, args.environment, args.command)
+
+def handle_template_logic(args: list = None, client=None):
+    """
+    Method wraps the template call logic
+    """
+    template_logic = TemplateLogic(client)
+    template_controller = TemplateController(template_logic=template_logic)
+    if args.action == 'render':
+        template_controller.render(args.templates, args.output, args.output_dir)
+
+def handle_completion_logic(args: list = None, client=None, parser=None):
+    """
+    Method wraps the completion call logic
+    """
+    if args.action == 'refresh':
+        completion_logic = CompletionLogic(client,
+                                           CompletionCache(DEFAULT_COMPLETION_CACHE_DIRECTORY))
+        CompletionController(completion_logic=completion_logic).refresh(parser, args.kinds)
+    else:
+        CompletionController.print_script(args.action)
+
+def handle_resource_logic(args: list = None, client=None) -> int:
+    """
+    Method wraps the resource call logic. Returns the number of resources
+    that failed to be checked
     """
     resource_logic = ResourceLogic(client)
     resource_controller = ResourceController(resource_logic=resource_logic)
 
     if args.action == 'exists':
-        resource_controller.exists(resource_id=args.identifier,
+        if bulk_utils.is_bulk_request(args.identifier, args.ids_file):
+            resource_ids = bulk_utils.read_identifiers(args.identifier, args.ids_file)
+            return resource_controller.exists_many(resource_ids, args.concurrency)
+        resource_controller.exists(resource_id=bulk_utils.read_identifiers(args.identifier)[0],
                                    json_response=args.json_response)
+    return 0
 
 
-def handle_hostfactory_logic(args: list = None, client=None):
+def handle_hostfactory_logic(args: list = None, client=None) -> int:
     """
-        Method wraps the hostfactory call logic
+        Method wraps the hostfactory call logic. Returns the number of hosts
+        that failed to be created
     """
     if args.action_type == 'create_token':
         hostfactory_logic = HostFactoryLogic(client)
@@ -189,27 +318,64 @@ def handle_hostfactory_logic(args: list = None, client=None):
                                             cidr=args.cidr,
                                             days=args.duration_days,
                                             hours=args.duration_hours,
-                                            minutes=args.duration_minutes)
+                                            minutes=args.duration_minutes,
+                                            count=args.count)
         hostfactory_controller = HostFactoryController(hostfactory_logic=hostfactory_logic)
         hostfactory_controller.create_token(create_token_data)
     elif args.action_type == 'create_host':
         hostfactory_logic = HostFactoryLogic(client)
-
-        create_host_data = CreateHostData(host_id=args.id,
-                                          token=args.token)
         hostfactory_controller = HostFactoryController(hostfactory_logic=hostfactory_logic)
-        hostfactory_controller.create_host(create_host_data)
+        host_ids = bulk_utils.read_identifiers(args.id, args.ids_file)
+
+        journal_file = getattr(args, 'journal_file', None)
+        if bulk_utils.is_bulk_request(args.id, args.ids_file) or args.output_file \
+                or journal_file:
+            rate_limiter = RateLimiter(args.rate_limit) if args.rate_limit else None
+            with open_journal(journal_file, 'hostfactory create host') as journal:
+                return hostfactory_controller.create_hosts(
+                    host_ids, args.token, output_file=args.output_file,
+                    max_workers=args.concurrency, rate_limiter=rate_limiter,
+                    retry_policy=RetryPolicy(args.retries + 1), journal=journal)
+        else:
+            create_host_data = CreateHostData(host_id=host_ids[0],
+                                              token=args.token)
+            hostfactory_controller.create_host(create_host_data)
     elif args.action_type == 'revoke_token':
         hostfactory_logic = HostFactoryLogic(client)
         hostfactory_controller = HostFactoryController(hostfactory_logic=hostfactory_logic)
         hostfactory_controller.revoke_token(args.token)
+    elif args.action_type.startswith('pool_'):
+        handle_token_pool_logic(args, client)
+    return 0
 
 
-def handle_variable_logic(args: list = None, client=None):
+def handle_token_pool_logic(args: list = None, client=None):
+    """
+    Method wraps the Host Factory token pool call logic
+    """
+    token_pool_controller = TokenPoolController(
+        token_pool_logic=TokenPoolLogic(client, args.pool_file))
+    if args.action_type == 'pool_refill':
+        duration_minutes = (args.duration_days or 0) * 24 * 60 \
+                           + (args.duration_hours or 0) * 60 + (args.duration_minutes or 0)
+        if duration_minutes <= 0:
+            raise MissingRequiredParameterException(
+                "Either 'duration-days' / 'duration-hours' / 'duration-minutes' "
+                "are missing or not in the correct format. Solution: provide one "
+                "of the required parameters or make sure they are positive numbers")
+        token_pool_controller.refill(args.hostfactoryid, args.size, args.low_water,
+                                     args.cidr, duration_minutes)
+    elif args.action_type == 'pool_acquire':
+        token_pool_controller.acquire(args.hostfactoryid, args.min_ttl)
+    elif args.action_type == 'pool_drain':
+        token_pool_controller.drain(args.hostfactoryid, args.concurrency)
+
+
+def handle_variable_logic(args: list = None, client=None, hedged_reader=None):
     """
     Method wraps the variable call logic
     """
-    variable_logic = VariableLogic(client)
+    variable_logic = VariableLogic(client, hedged_reader)
     if args.action == 'get':
         variable_data = VariableData(action=args.action, id=args.identifier, value=None,
                                      variable_version=args.version)
@@ -222,6 +388,16 @@ def handle_variable_logic(args: list = None, client=None):
         variable_controller = VariableController(variable_logic=variable_logic,
                                                  variable_data=variable_data)
         variable_controller.set_variable()
+    elif args.action == 'watch':
+        variable_watch_logic = VariableWatchLogic(client, args.interval, args.max_interval)
+        variable_watch_controller = VariableWatchController(variable_watch_logic, args.hook)
+        variable_watch_controller.watch(args.identifier)
+    elif args.action == 'access':
+        variable_access_logic = VariableAccessLogic(client, args.concurrency)
+        variable_access_controller = VariableAccessController(variable_access_logic)
+        variable_access_controller.who_can_access(
+            bulk_utils.read_identifiers(args.identifier, args.ids_file),
+            args.privilege, args.output_file)
 
 
 def handle_role_logic(args: list = None, client=None):
@@ -237,6 +413,19 @@ def handle_role_logic(args: list = None, client=None):
     elif args.action == 'memberships':
         role_controller.role_memberships(identifier=args.identifier,
                                          direct=args.direct)
+    elif args.action == 'graph':
+        account = ConjurrcData.load_from_file().conjur_account if args.root else None
+        graph = role_controller.load_role_graph(account, root=args.root,
+                                                input_file=args.input_file,
+                                                concurrency=args.concurrency)
+        if args.memberships_of:
+            role_controller.role_graph_memberships(graph, args.memberships_of)
+        elif args.path:
+            role_controller.role_graph_path(graph, *args.path)
+        elif args.cycles:
+            role_controller.role_graph_cycles(graph)
+        else:
+            role_controller.export_role_graph(graph, args.graph_format, args.output_file)
 
 
 def handle_policy_logic(policy_data: PolicyData = None, client=None):
@@ -251,11 +440,22 @@ def handle_policy_logic(policy_data: PolicyData = None, client=None):
 
 def handle_user_logic(
         credential_provider: CredentialsProviderInterface,
-        args=None, client=None):
+        args=None, client=None) -> int:
     """
-    Method wraps the user call logic
+    Method wraps the user call logic. Returns the number of users whose API
+    key failed to be rotated
     """
     user_logic = UserLogic(ConjurrcData, credential_provider, client)
+    journal_file = getattr(args, 'journal_file', None)
+    ids_file = getattr(args, 'ids_file', None)
+    # New API keys requested in an output file are never printed to stdout
+    if args.action == 'rotate-api-key' and (ids_file or journal_file
+                                            or getattr(args, 'output_file', None)):
+        user_ids = bulk_utils.read_identifiers([args.id] if args.id else None, ids_file)
+        user_controller = UserController(user_logic=user_logic, user_input_data=None)
+        with open_journal(journal_file, 'user rotate-api-key') as journal:
+            return user_controller.rotate_api_keys(user_ids, output_file=args.output_file,
+                                                   max_workers=args.concurrency, journal=journal)
     if args.action == 'rotate-api-key':
         user_input_data = UserInputData(action=args.action,
                                         id=args.id,
@@ -271,12 +471,29 @@ def handle_user_logic(
         user_controller = UserController(user_logic=user_logic,
                                          user_input_data=user_input_data)
         user_controller.change_personal_password()
+    return 0
 
 
-def handle_host_logic(args, client):
+def handle_host_logic(args, client,
+                      credential_provider: CredentialsProviderInterface = None) -> int:
     """
-    Method wraps the host call logic
+    Method wraps the host call logic. Returns the number of hosts whose API
+    key failed to be rotated
     """
     host_resource_data = HostResourceData(action=args.action, host_to_update=args.id)
     host_controller = HostController(client=client, host_resource_data=host_resource_data)
+    journal_file = getattr(args, 'journal_file', None)
+    ids_file = getattr(args, 'ids_file', None)
+    # New API keys requested in an output file are never printed to stdout
+    if ids_file or journal_file or getattr(args, 'output_file', None):
+        host_ids = bulk_utils.read_identifiers([args.id] if args.id else None, ids_file)
+        logged_in_username = None
+        if credential_provider:
+            logged_in_username = credential_provider.load(
+                ConjurrcData.load_from_file().conjur_url).username
+        with open_journal(journal_file, 'host rotate-api-key') as journal:
+            return host_controller.rotate_api_keys(host_ids, output_file=args.output_file,
+                                                   max_workers=args.concurrency, journal=journal,
+                                                   logged_in_username=logged_in_username)
     host_controller.rotate_api_key()
+    return 0
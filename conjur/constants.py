@@ -24,6 +24,18 @@ DEFAULT_NETRC_FILE_NAME = INTERNAL_FILE_PREFIX + "netrc"
 DEFAULT_CONFIG_FILE = os.path.expanduser(os.path.join('~', '.conjurrc'))
 DEFAULT_NETRC_FILE = os.path.expanduser(os.path.join('~', DEFAULT_NETRC_FILE_NAME))
 DEFAULT_CERTIFICATE_FILE = os.path.expanduser(os.path.join('~', "conjur-server.pem"))
+DEFAULT_TOKEN_POOL_FILE = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur-hostfactory-tokens.json"))
+DEFAULT_RATE_LIMIT_STATE_FILE = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur-rate-limit.json"))
+DEFAULT_ENDPOINT_HEALTH_FILE = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur-endpoint-health.json"))
+DEFAULT_SHELL_HISTORY_FILE = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur_shell_history"))
+DEFAULT_COMPLETION_CACHE_DIRECTORY = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur-completion"))
+DEFAULT_RESOURCE_INDEX_DIRECTORY = os.path.expanduser(
+    os.path.join('~', INTERNAL_FILE_PREFIX + "conjur-index"))
 
 VALID_CONFIRMATIONS = ["yes", "y"]
 
@@ -41,6 +53,27 @@ TEST_KEYRING = "SecretService Keyring"
 # For user interaction
 LOGIN_IS_REQUIRED = "To start using the CLI, log in to Conjur"
 
+# For commands that operate on many identifiers at once
+DEFAULT_BULK_CONCURRENCY = 8
+
+# For streaming a list page by page
+DEFAULT_LIST_PAGE_SIZE = 1000
+
+# For exporting and importing the values of variables
+DEFAULT_EXPORT_BATCH_SIZE = 100
+EXPORT_PASSPHRASE_ENV_VARIABLE_NAME = "CONJUR_EXPORT_PASSPHRASE"
+
+# For retrying idempotent requests that failed with a transient error
+DEFAULT_REQUEST_RETRIES = 2
+
+# For watching variables for changes, in seconds
+DEFAULT_WATCH_INTERVAL_SECONDS = 30.0
+DEFAULT_MAX_WATCH_INTERVAL_SECONDS = 300.0
+
+# For throttling the requests of all the CLI processes of the machine
+MAX_REQUEST_RATE_ENV_VARIABLE_NAME = "CONJUR_CLI_MAX_REQUEST_RATE"
+MAX_IN_FLIGHT_ENV_VARIABLE_NAME = "CONJUR_CLI_MAX_IN_FLIGHT"
+
 # For keyring environment configuration
 KEYRING_TYPE_ENV_VARIABLE_NAME = "PYTHON_KEYRING_BACKEND"
 MAC_OS_KEYRING_NAME = "keyring.backends.macOS.Keyring"
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""
+CompletionController module
+
+This module is the controller that facilitates all completion actions
+required to successfully execute the COMPLETION command
+"""
+
+# Builtins
+import sys
+from typing import List
+
+# Internals
+from conjur.logic.completion_logic import CompletionLogic
+from conjur.util.completion import COMPLETION_SCRIPTS, RESOURCE_KINDS
+
+
+class CompletionController:
+    """
+    CompletionController
+
+    This class represents the Presentation Layer for the COMPLETION command
+    """
+
+    def __init__(self, completion_logic: CompletionLogic = None):
+        self.completion_logic = completion_logic
+
+    @staticmethod
+    def print_script(shell: str):
+        """
+        Method that prints the completion script of a shell
+        """
+        sys.stdout.write(COMPLETION_SCRIPTS[shell])
+
+    def refresh(self, parser, kinds: List[str] = None):
+        """
+        Method that fetches the IDs of the kinds, or of every kind, and
+        describes the commands for completion
+        """
+        self.completion_logic.write_command_tree(parser)
+        counts = self.completion_logic.refresh(list(dict.fromkeys(kinds or RESOURCE_KINDS)))
+        for kind, count in counts.items():
+            sys.stderr.write(f"Cached {count} {kind} ID(s) for completion\n")
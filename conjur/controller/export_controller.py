@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+ExportController module
+
+This module is the controller that facilitates the EXPORT command
+"""
+
+# Builtins
+import sys
+
+# Internals
+from conjur.logic.export_logic import ExportLogic
+from conjur.util.private_file import open_private_file
+from conjur.util.secrets_archive import ArchiveWriter, read_passphrase
+
+
+# pylint: disable=too-few-public-methods
+class ExportController:
+    """
+    ExportController
+
+    This class represents the Presentation Layer for the EXPORT command
+    """
+
+    def __init__(self, export_logic: ExportLogic):
+        self.export_logic = export_logic
+
+    def export(self, policy: str, output_file: str):
+        """
+        Method that writes the archive of the variables of the policy. The
+        archive is readable by its owner only, and is written next to its
+        destination then renamed, so a failed export leaves no partial file
+        """
+        passphrase = read_passphrase(confirm=True)
+        with open_private_file(output_file) as archive_file:
+            exported = self.export_logic.export(policy, ArchiveWriter(archive_file, passphrase))
+        sys.stdout.write(f"Exported {exported} variable(s) to '{output_file}'")
+        if self.export_logic.skipped_count:
+            sys.stdout.write(f", skipped {self.export_logic.skipped_count} "
+                             "variable(s) without a value")
+        sys.stdout.write("\n")
@@ -8,10 +8,14 @@ This module is the controller that facilitates all host actions
 
 # Builtins
 import sys
+from typing import List
 
 # Internals
-from conjur.errors import MissingRequiredParameterException
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.errors import ConflictingParametersException, MissingRequiredParameterException
 from conjur.resource import Resource
+from conjur.util import bulk_utils
+from conjur.util.bulk_journal import BulkJournal, pending, resumed, tracked
 
 
 class HostController():
@@ -38,6 +42,33 @@ class HostController():
         sys.stdout.write(f"Successfully rotated API key for '{self.host_resource_data.host_to_update}'""\n"
                          f"New API key is: {new_api_key}\n")
 
+    def rotate_api_keys(self, host_ids: List[str], output_file: str = None,
+                        max_workers: int = DEFAULT_BULK_CONCURRENCY,
+                        journal: BulkJournal = None, logged_in_username: str = None) -> int:
+        """
+        Method that rotates the API keys of many hosts concurrently, writing one
+        JSON line holding the new API key or the error per host, either to stdout
+        or to an owner-only output file. A failure does not abort the others.
+        Hosts completed according to the journal are skipped. The logged-in
+        host is reported as an error since rotating its key would invalidate
+        the session the other rotations rely on. Returns the number of hosts
+        that failed
+        """
+        def rotate(host_id: str) -> str:
+            if f"host/{host_id}" == logged_in_username:
+                raise ConflictingParametersException(
+                    "Cannot rotate the API key of the logged-in host in bulk")
+            return self.client.rotate_other_api_key(Resource(kind='host', identifier=host_id))
+
+        results = bulk_utils.run_concurrently(rotate, pending(host_ids, journal), max_workers)
+        with bulk_utils.open_output(output_file, append=resumed(journal)) as output:
+            rotated, failed = bulk_utils.write_results(tracked(results, journal, output),
+                                                       'api_key', output)
+        if output_file:
+            sys.stdout.write(f"Rotated the API key of {rotated} host(s), {failed} failed. "
+                             f"Results were written to '{output_file}'\n")
+        return failed
+
     def prompt_for_host_id_if_needed(self):
         """
         Method to prompt the user to enter the host id of the
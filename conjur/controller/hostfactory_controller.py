@@ -9,14 +9,20 @@ import http
 import logging
 import sys
 import traceback
+from typing import List
 
 # SDK
 from conjur_api.errors.errors import HttpError, HttpStatusError
 from conjur_api.models import CreateTokenData, CreateHostData
 
 # Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
 from conjur.errors import MissingRequiredParameterException, InvalidHostFactoryTokenException
 from conjur.logic.hostfactory_logic import HostFactoryLogic
+from conjur.util import bulk_utils
+from conjur.util.bulk_journal import BulkJournal, pending, resumed, tracked
+from conjur.util.rate_limiter import RateLimiter
+from conjur.util.retry import RetryPolicy
 
 # pylint: disable=too-few-public-methods,logging-fstring-interpolation
 INVALID_TOKEN_ERROR = "Cannot create host using Host " \
@@ -71,6 +77,45 @@ class HostFactoryController:
         except HttpError:
             logging.debug(traceback.format_exc())
 
+    # pylint: disable=too-many-arguments
+    def create_hosts(self, host_ids: List[str], token: str, *, output_file: str = None,
+                     max_workers: int = DEFAULT_BULK_CONCURRENCY,
+                     rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                     journal: BulkJournal = None) -> int:
+        """
+        Method that facilitates creating many hosts with one token. A JSON line
+        holding the created host (and its API key) or the error is written per
+        host, either to stdout or to an owner-only output file. Hosts
+        completed according to the journal are skipped. Returns the number of
+        hosts that failed to be created
+        """
+        host_ids = pending(host_ids, journal)
+        logging.debug(f"Creating {len(host_ids)} hosts using Host Factory...")
+        results = self.hostfactory_logic.create_hosts(host_ids, token, max_workers,
+                                                      rate_limiter, retry_policy)
+        created = failed = 0
+        with bulk_utils.open_output(output_file, append=resumed(journal)) as output:
+            for host_id, result, error in tracked(results, journal, output):
+                if error is None:
+                    created += 1
+                    bulk_utils.write_json_line({'id': host_id, 'host': result}, output)
+                    continue
+
+                # An invalid token fails every host the same way, so stop early
+                if isinstance(error, HttpStatusError) \
+                        and error.status == http.HTTPStatus.UNAUTHORIZED:
+                    raise InvalidHostFactoryTokenException(
+                        INVALID_TOKEN_ERROR.format(error)) from error
+                failed += 1
+                logging.debug(f"Failed to create host '{host_id}': {error}")
+                bulk_utils.write_json_line({'id': host_id,
+                                            'error': bulk_utils.format_error(error)}, output)
+
+        if output_file:
+            sys.stdout.write(f"Created {created} host(s) using Host Factory, {failed} failed. "
+                             f"Results were written to '{output_file}'\n")
+        return failed
+
     def revoke_token(self, token: str):
         """
         Method that facilitates token revocation call to the logic
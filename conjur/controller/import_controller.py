@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+ImportController module
+
+This module is the controller that facilitates the IMPORT command
+"""
+
+# Builtins
+import sys
+
+# Internals
+from conjur.errors import FileNotFoundException
+from conjur.logic.import_logic import ImportLogic
+from conjur.util import bulk_utils
+from conjur.util.secrets_archive import ArchiveReader, read_passphrase
+
+
+# pylint: disable=too-few-public-methods
+class ImportController:
+    """
+    ImportController
+
+    This class represents the Presentation Layer for the IMPORT command.
+    Variables that cannot be set are reported as JSON lines
+    """
+
+    def __init__(self, import_logic: ImportLogic):
+        self.import_logic = import_logic
+
+    def import_archive(self, input_file: str, resume: bool = False) -> int:
+        """
+        Method that sets the values of the variables of the archive. Returns
+        the number of variables that failed
+        """
+        try:
+            archive_file = open(input_file, 'rb')  # pylint: disable=consider-using-with
+        except FileNotFoundError as error:
+            raise FileNotFoundException(f"Error: the archive '{input_file}' "
+                                        "does not exist") from error
+        with archive_file:
+            reader = ArchiveReader(archive_file, read_passphrase())
+            imported, failed = self.import_logic.import_archive(
+                input_file, reader, resume, on_failure=self._report_failure)
+        sys.stdout.write(f"Imported {imported} variable(s), {failed} failed\n")
+        return failed
+
+    @staticmethod
+    def _report_failure(variable_id: str, error: Exception):
+        bulk_utils.write_json_line({'id': variable_id, 'error': bulk_utils.format_error(error)})
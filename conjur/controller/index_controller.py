@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""
+IndexController module
+
+This module is the controller that facilitates all index actions
+required to successfully execute the INDEX command
+"""
+
+# Builtins
+import sys
+from datetime import datetime, timezone
+from typing import List
+
+# Internals
+from conjur.logic.index_logic import IndexLogic
+from conjur.util import util_functions
+
+
+class IndexController:
+    """
+    IndexController
+
+    This class represents the Presentation Layer for the INDEX command
+    """
+
+    def __init__(self, index_logic: IndexLogic):
+        self.index_logic = index_logic
+
+    def sync(self, account: str, kinds: List[str] = None):
+        """
+        Method that syncs the local index and reports what was indexed
+        """
+        counts = self.index_logic.sync(account, list(dict.fromkeys(kinds or ())))
+        sys.stdout.write(f"Successfully indexed {sum(counts.values())} resource(s) "
+                         f"of {len(counts)} kind(s)\n")
+
+    def status(self):
+        """
+        Method that prints the kinds of the local index, with their number
+        of resources and when they were synced
+        """
+        metadata = self.index_logic.resource_index.metadata() or {'kinds': {}}
+        util_functions.print_json_result({
+            kind: {'count': details['count'],
+                   'synced_at': datetime.fromtimestamp(details['synced_at'], timezone.utc)
+                   .isoformat(timespec='seconds')}
+            for kind, details in sorted(metadata['kinds'].items())})
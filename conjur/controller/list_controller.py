@@ -11,6 +11,8 @@ from conjur_api.models import ListMembersOfData, ListPermittedRolesData
 from conjur.logic.list_logic import ListLogic
 from conjur.data_object.list_data import ListData
 from conjur.util import util_functions
+from conjur.util.bulk_utils import write_json_line
+from conjur.util.resource_index import ResourceIndex
 
 
 class ListController:
@@ -30,6 +32,30 @@ class ListController:
         result = self.list_logic.list(list_data)
         util_functions.print_json_result(result)
 
+    def load_stream(self, list_data: ListData, page_size: int, concurrency: int):
+        """
+        Method that prints the resources page by page, as they are listed
+        """
+        util_functions.print_json_array(
+            self.list_logic.list_pages(list_data, page_size, concurrency))
+
+    def load_local(self, list_data: ListData, resource_index: ResourceIndex,
+                   prefix: str = None):
+        """
+        Method that lists resources from the local index
+        """
+        result = self.list_logic.list_local(list_data, resource_index, prefix)
+        util_functions.print_json_result(result)
+
+    def load_changes(self, list_data: ListData, snapshot_path: str, page_size: int,
+                     concurrency: int):
+        """
+        Method that prints the changes since the snapshot as JSON lines
+        """
+        for change in self.list_logic.list_changes(list_data, snapshot_path, page_size,
+                                                   concurrency):
+            write_json_line(change)
+
     def get_permitted_roles(self, list_permitted_roles_data: ListPermittedRolesData):
         """
         Get all permitted roles according to given data
@@ -8,9 +8,13 @@ required to successfully execute the RESOURCE command
 """
 
 import sys
+from typing import List
+
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
 from conjur.logic.resource_logic import ResourceLogic
 from conjur.resource import Resource
 from conjur.util import util_functions
+from conjur.util.bulk_utils import write_results
 
 # pylint: disable=too-few-public-methods
 class ResourceController:
@@ -34,3 +38,14 @@ class ResourceController:
             util_functions.print_json_result({'exists' : result})
         else:
             sys.stdout.write(str(result).lower()+'\n')
+
+    def exists_many(self, resource_ids: List[str],
+                    max_workers: int = DEFAULT_BULK_CONCURRENCY) -> int:
+        """
+        Method that checks the existence of many resources, writing one JSON
+        line per resource. A failed check is reported on its line and does
+        not abort the others. Returns the number of checks that failed
+        """
+        _, failed = write_results(self.resource_logic.exists_many(resource_ids, max_workers),
+                                  'exists')
+        return failed
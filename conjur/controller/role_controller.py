@@ -6,11 +6,15 @@ RoleController module
 This module is the controller that facilitates all list actions
 required to successfully execute the ROLE command
 """
+import json
 import sys
 
+from conjur.errors import FileNotFoundException, InvalidFormatException
 from conjur.logic.role_logic import RoleLogic
 from conjur.role import Role
 from conjur.util import util_functions
+from conjur.util.bulk_utils import open_output
+from conjur.util.role_graph import RoleGraph
 
 # pylint: disable=too-few-public-methods
 class RoleController:
@@ -43,3 +47,54 @@ class RoleController:
         role = Role.from_full_id(identifier)
         result = self.role_logic.role_memberships(role.kind, role.identifier, direct)
         util_functions.print_json_result(result)
+
+    # pylint: disable=too-many-arguments
+    def load_role_graph(self, account: str, root: str = None, input_file: str = None,
+                        concurrency: int = None) -> RoleGraph:
+        """
+        Method that crawls the role graph of the root policy, or loads the
+        graph saved in input_file
+        """
+        if root:
+            graph = self.role_logic.role_graph(account, root, concurrency)
+            sys.stderr.write(f"Crawled {len(graph.roles)} role(s) and "
+                             f"{graph.edge_count} membership(s)\n")
+            return graph
+        try:
+            with open(input_file, 'r', encoding='utf-8') as graph_file:
+                return RoleGraph.from_dict(json.load(graph_file))
+        except FileNotFoundError as error:
+            raise FileNotFoundException(f"Error: the role graph file '{input_file}' "
+                                        f"does not exist") from error
+        except ValueError as error:
+            raise InvalidFormatException(f"Error: the role graph file '{input_file}' "
+                                         f"is not valid JSON") from error
+
+    @staticmethod
+    def export_role_graph(graph: RoleGraph, graph_format: str, output_file: str = None):
+        """
+        Method that writes the role graph in the format, to output_file or stdout
+        """
+        with open_output(output_file) as output:
+            output.write(graph.export(graph_format))
+
+    @staticmethod
+    def role_graph_memberships(graph: RoleGraph, identifier: str):
+        """
+        Method that prints the transitive memberships of a role of the graph
+        """
+        util_functions.print_json_result(graph.memberships(identifier))
+
+    @staticmethod
+    def role_graph_path(graph: RoleGraph, member: str, identifier: str):
+        """
+        Method that prints the shortest chain of memberships from member to the role
+        """
+        util_functions.print_json_result(graph.path(member, identifier))
+
+    @staticmethod
+    def role_graph_cycles(graph: RoleGraph):
+        """
+        Method that prints the cycles of memberships of the graph
+        """
+        util_functions.print_json_result(graph.cycles())
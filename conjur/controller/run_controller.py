@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+RunController module
+
+This module is the controller that facilitates all run actions
+required to successfully execute the RUN command
+"""
+
+# Builtins
+from typing import List
+
+# Internals
+from conjur.errors import MissingRequiredParameterException
+from conjur.logic.run_logic import RunLogic
+from conjur.util.child_process import ChildProcess
+from conjur.util.secrets_file import load_secrets_file
+
+
+# pylint: disable=too-few-public-methods
+class RunController:
+    """
+    RunController
+
+    This class represents the Presentation Layer for the RUN command
+    """
+
+    def __init__(self, run_logic: RunLogic):
+        self.run_logic = run_logic
+
+    def load(self, secrets_file: str, environment: str, command: List[str]) -> ChildProcess:
+        """
+        Method that reads the secrets file, fetches the secrets and returns
+        the child process to launch once the CLI is done
+        """
+        if command and command[0] == '--':
+            command = command[1:]
+        if not command:
+            raise MissingRequiredParameterException("Error: a command to run is required, "
+                                                    "for example: conjur run -- env")
+        secrets = load_secrets_file(secrets_file, environment)
+        values = self.run_logic.fetch_values(secrets)
+        return self.run_logic.prepare(secrets, values, command)
@@ -7,10 +7,14 @@ This module is the controller that facilitates all show actions
 required to successfully execute the SHOW command
 """
 
+from typing import List
+
 from conjur_api.errors.errors import HttpStatusError
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
 from conjur.logic.show_logic import ShowLogic
 from conjur.resource import Resource
 from conjur.util import util_functions
+from conjur.util.bulk_utils import write_results
 
 # pylint: disable=too-few-public-methods
 class ShowController:
@@ -35,3 +39,14 @@ class ShowController:
             raise HttpStatusError(status=http_error.status,
                                   message=f"{http_error}. Error: {http_error.response}",
                                   response=http_error.response) from http_error
+
+    def load_many(self, resource_ids: List[str],
+                  max_workers: int = DEFAULT_BULK_CONCURRENCY) -> int:
+        """
+        Method that shows many resources, writing one JSON line per resource.
+        A failure to show a resource is reported on its line and does not
+        abort the others. Returns the number of resources that failed
+        """
+        _, failed = write_results(self.show_logic.show_many(resource_ids, max_workers),
+                                  'resource')
+        return failed
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+TemplateController module
+
+This module is the controller that facilitates all template actions
+required to successfully execute the TEMPLATE command
+"""
+
+# Builtins
+import os
+import sys
+from typing import List
+
+# Internals
+from conjur.errors import ConflictingParametersException, MissingRequiredParameterException
+from conjur.logic.template_logic import TemplateLogic
+
+TEMPLATE_SUFFIXES = ('.tpl', '.tmpl', '.template')
+
+
+# pylint: disable=too-few-public-methods
+class TemplateController:
+    """
+    TemplateController
+
+    This class represents the Presentation Layer for the TEMPLATE command
+    """
+
+    def __init__(self, template_logic: TemplateLogic):
+        self.template_logic = template_logic
+
+    def render(self, template_paths: List[str], output: str = None, output_dir: str = None):
+        """
+        Method that renders the templates, fetching the variables referenced
+        by all of them at once. A single template is rendered to output, or
+        to the standard output. Many templates are rendered to output_dir
+        """
+        output_paths = self._output_paths(template_paths, output, output_dir)
+        variable_ids = self.template_logic.find_references(template_paths)
+        values = self.template_logic.fetch_values(variable_ids)
+
+        for template_path, output_path in zip(template_paths, output_paths):
+            if output_path is None:
+                self.template_logic.render(template_path, values, sys.stdout)
+                sys.stdout.flush()
+            else:
+                self.template_logic.render_to_file(template_path, values, output_path)
+                sys.stderr.write(f"Rendered '{template_path}' to '{output_path}'\n")
+
+    @staticmethod
+    def _output_paths(template_paths: List[str], output: str, output_dir: str) -> List[str]:
+        if output and output_dir:
+            raise ConflictingParametersException("Error: --output and --output-dir "
+                                                 "cannot be used together")
+        if output_dir:
+            output_paths = [os.path.join(output_dir, _rendered_name(template_path))
+                            for template_path in template_paths]
+            if len(set(output_paths)) != len(output_paths):
+                raise ConflictingParametersException("Error: several templates would be "
+                                                     "rendered to the same file")
+        else:
+            if len(template_paths) > 1:
+                raise MissingRequiredParameterException("Error: --output-dir is required "
+                                                        "to render several templates")
+            output_paths = [None if output in (None, '-') else output]
+
+        for template_path, output_path in zip(template_paths, output_paths):
+            if output_path and os.path.realpath(output_path) == os.path.realpath(template_path):
+                raise ConflictingParametersException(f"Error: rendering '{template_path}' "
+                                                     f"would overwrite it")
+        return output_paths
+
+
+def _rendered_name(template_path: str) -> str:
+    name = os.path.basename(template_path)
+    for suffix in TEMPLATE_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return name
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+TokenPoolController
+
+This Module represents the Presentation Layer for the Host Factory token pool
+"""
+# Builtins
+import json
+import logging
+import sys
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.errors import OperationNotCompletedException
+from conjur.logic.token_pool_logic import TokenPoolLogic
+from conjur.util import bulk_utils
+
+
+# pylint: disable=logging-fstring-interpolation
+class TokenPoolController:
+    """
+    TokenPoolController
+
+    This class represents the Presentation Layer for the Host Factory token pool
+    """
+
+    def __init__(self, token_pool_logic: TokenPoolLogic):
+        self.token_pool_logic = token_pool_logic
+
+    # pylint: disable=too-many-arguments
+    def refill(self, host_factory: str, size: int, low_water: int = 0,
+               cidr: str = None, duration_minutes: int = 0):
+        """
+        Method that facilitates refilling the token pool
+        """
+        logging.debug(f"Refilling the token pool of Host Factory '{host_factory}'...")
+        cidr = [block for block in (cidr or '').split(',') if block]
+        created, available = self.token_pool_logic.refill(host_factory, size, low_water,
+                                                          cidr, duration_minutes)
+        sys.stdout.write(f"Created {created} Host Factory token(s) for '{host_factory}'. "
+                         f"{available} token(s) are available in "
+                         f"'{self.token_pool_logic.pool_file}'\n")
+
+    def acquire(self, host_factory: str, min_ttl: int = 0):
+        """
+        Method that facilitates taking a token out of the token pool
+        """
+        logging.debug(f"Acquiring a token of Host Factory '{host_factory}' from the pool...")
+        token = self.token_pool_logic.acquire(host_factory, min_ttl)
+        sys.stdout.write(json.dumps(token, indent=4, sort_keys=True) + '\n')
+
+    def drain(self, host_factory: str = None, max_workers: int = DEFAULT_BULK_CONCURRENCY):
+        """
+        Method that facilitates revoking every unused token of the token pool
+        """
+        logging.debug("Revoking the unused tokens of the token pool...")
+        revoked, failures = self.token_pool_logic.drain(host_factory, max_workers)
+        for token, error in failures:
+            logging.debug(f"Failed to revoke token expiring at '{token['expiration']}': {error}")
+        sys.stdout.write(f"Revoked {revoked} Host Factory token(s).\n")
+        if failures:
+            raise OperationNotCompletedException(
+                f"Failed to revoke {len(failures)} token(s), they were kept in the pool. "
+                f"Reason: {bulk_utils.format_error(failures[0][1])}")
@@ -11,16 +11,20 @@ import getpass
 import http
 import logging
 import sys
+from typing import List
 
 # SDK
 from conjur_api.errors.errors import HttpError, HttpStatusError
 
 # Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
 from conjur.errors import InvalidPasswordComplexityException, \
     OperationNotCompletedException
 from conjur.errors_messages import PASSWORD_COMPLEXITY_CONSTRAINTS_MESSAGE
 from conjur.logic.user_logic import UserLogic
 from conjur.data_object.user_input_data import UserInputData
+from conjur.util import bulk_utils
+from conjur.util.bulk_journal import BulkJournal, pending, resumed, tracked
 
 
 class UserController:
@@ -47,6 +51,25 @@ class UserController:
             sys.stdout.write("An error occurred. Log in again or try again in debug mode.\n")
             raise
 
+    def rotate_api_keys(self, user_ids: List[str], output_file: str = None,
+                        max_workers: int = DEFAULT_BULK_CONCURRENCY,
+                        journal: BulkJournal = None) -> int:
+        """
+        Method that rotates the API keys of many users, writing one JSON line
+        holding the new API key or the error per user, either to stdout or to
+        an owner-only output file. A failure does not abort the others.
+        Users completed according to the journal are skipped. Returns the
+        number of users that failed
+        """
+        results = self.user_logic.rotate_other_api_keys(pending(user_ids, journal), max_workers)
+        with bulk_utils.open_output(output_file, append=resumed(journal)) as output:
+            rotated, failed = bulk_utils.write_results(tracked(results, journal, output),
+                                                       'api_key', output)
+        if output_file:
+            sys.stdout.write(f"Rotated the API key of {rotated} user(s), {failed} failed. "
+                             f"Results were written to '{output_file}'\n")
+        return failed
+
     # pylint: disable=logging-fstring-interpolation,line-too-long
     def change_personal_password(self):
         """
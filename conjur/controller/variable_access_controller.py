@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+VariableAccessController module
+
+This module is the controller that facilitates the access action
+of the VARIABLE command
+"""
+
+# Builtins
+import sys
+from typing import List
+
+# Internals
+from conjur.logic.variable_access_logic import DEFAULT_ACCESS_PRIVILEGE, VariableAccessLogic
+from conjur.util import bulk_utils
+
+
+# pylint: disable=too-few-public-methods
+class VariableAccessController:
+    """
+    VariableAccessController
+
+    This class represents the Presentation Layer for the access action of the
+    VARIABLE command. Each variable is reported as a JSON line, to stdout or
+    to an owner-only output file
+    """
+
+    def __init__(self, variable_access_logic: VariableAccessLogic):
+        self.variable_access_logic = variable_access_logic
+
+    def who_can_access(self, variable_ids: List[str], privilege: str = DEFAULT_ACCESS_PRIVILEGE,
+                       output_file: str = None):
+        """
+        Method that reports the users and hosts that have the privilege on
+        each variable. A failure does not abort the other variables
+        """
+        results = self.variable_access_logic.who_can_access(variable_ids, privilege)
+        with bulk_utils.open_output(output_file) as output:
+            succeeded, failed = bulk_utils.write_results(results, 'access', output)
+        if output_file:
+            sys.stdout.write(f"Reported the access to {succeeded} variable(s), {failed} "
+                             f"failed. Results were written to '{output_file}'\n")
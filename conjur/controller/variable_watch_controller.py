@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+VariableWatchController module
+
+This module is the controller that facilitates the watch action
+of the VARIABLE command
+"""
+
+# Builtins
+import datetime
+import logging
+import os
+import shlex
+import subprocess
+import sys
+from typing import List
+
+# Internals
+from conjur.logic.variable_watch_logic import VariableWatchLogic
+from conjur.util.bulk_utils import write_json_line
+
+CHANGED_VARIABLES_ENV_VARIABLE_NAME = 'CONJUR_CHANGED_VARIABLES'
+
+
+# pylint: disable=too-few-public-methods
+class VariableWatchController:
+    """
+    VariableWatchController
+
+    This class represents the Presentation Layer for the watch action of the
+    VARIABLE command. Changes are reported as JSON lines on stdout, or passed
+    to a hook command
+    """
+
+    def __init__(self, variable_watch_logic: VariableWatchLogic, hook: str = None):
+        self.variable_watch_logic = variable_watch_logic
+        self.hook = shlex.split(hook) if hook else None
+
+    def watch(self, variable_ids: List[str], polls: int = None):
+        """
+        Method that watches the variables until interrupted
+        """
+        self.variable_watch_logic.watch(variable_ids, self._on_change, polls)
+
+    def _on_change(self, changed_ids: List[str]):
+        detected_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        if self.hook is None:
+            for variable_id in changed_ids:
+                # A variable that was deleted or lost its value is reported as removed
+                event = 'changed' if self.variable_watch_logic.has_value(variable_id) \
+                    else 'removed'
+                write_json_line({'event': event, 'id': variable_id,
+                                 'detected_at': detected_at})
+            return
+        self._run_hook(changed_ids)
+
+    # pylint: disable=logging-fstring-interpolation
+    def _run_hook(self, changed_ids: List[str]):
+        environment = dict(os.environ)
+        # IDs may hold spaces, so they are separated by new lines
+        environment[CHANGED_VARIABLES_ENV_VARIABLE_NAME] = '\n'.join(changed_ids)
+        logging.debug(f"Running '{' '.join(self.hook)}' for {len(changed_ids)} change(s)")
+        try:
+            exit_code = subprocess.run(self.hook, env=environment, check=False).returncode
+        except OSError as error:
+            sys.stderr.write(f"Error: cannot run '{self.hook[0]}': {error.strerror}\n")
+            return
+        if exit_code != 0:
+            # A failing hook does not stop the watch, it runs again on the next change
+            sys.stderr.write(f"Hook '{self.hook[0]}' exited with code {exit_code}\n")
@@ -11,3 +11,4 @@ from conjur.data_object.list_data import ListData
 from conjur.data_object.policy_data import PolicyData
 from conjur.data_object.variable_data import VariableData
 from conjur.data_object.authn_types import AuthnTypes
+from conjur.data_object.create_token_data import CreateTokenData
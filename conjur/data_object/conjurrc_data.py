@@ -6,6 +6,8 @@ ConjurrcData module
 This module represents an object that holds conjurrc data
 """
 
+from typing import List
+
 from yaml import dump as yaml_dump
 from yaml import load as yaml_load
 
@@ -33,13 +35,16 @@ class ConjurrcData:
 
     # pylint: disable=too-many-arguments
     def __init__(self, conjur_url: str = None, account: str = None, cert_file: str = None,
-                 authn_type: str = None, service_id: str = None, netrc_path: str = None):
+                 authn_type: str = None, service_id: str = None, netrc_path: str = None,
+                 *, read_urls: List[str] = None):
         self.conjur_url = conjur_url
         self.conjur_account = account
         self.cert_file = cert_file
         self.authn_type = ConjurrcData._parse_authn_type(authn_type)
         self.service_id = service_id
         self.netrc_path = netrc_path
+        # URLs of read-only followers that serve the read requests
+        self.read_urls = ConjurrcData._parse_read_urls(read_urls)
 
     # pylint: disable=unspecified-encoding
     @classmethod
@@ -59,7 +64,8 @@ class ConjurrcData:
                                     loaded_conjurrc['cert_file'],
                                     loaded_conjurrc.get('authn_type'),
                                     loaded_conjurrc.get('service_id'),
-                                    loaded_conjurrc.get('netrc_path'))
+                                    loaded_conjurrc.get('netrc_path'),
+                                    read_urls=loaded_conjurrc.get('read_urls'))
         except KeyError as key_error:
             raise InvalidConfigurationException from key_error
         except FileNotFoundError as not_found_err:
@@ -79,6 +85,8 @@ class ConjurrcData:
                 'service_id': self.service_id,
                 'netrc_path': self.netrc_path
             }
+            if self.read_urls:
+                data['read_urls'] = self.read_urls
             out = f"---\n{yaml_dump(data)}"
             config_fp.write(out)
 
@@ -107,6 +115,21 @@ class ConjurrcData:
         raise InvalidConfigurationException(
             f"Invalid authn_type: {self.authn_type.value}. Must be either 'authn' or 'ldap'.")
 
+    @staticmethod
+    def _parse_read_urls(read_urls: str | List[str]) -> List[str]:
+        """
+        Method parses the read_urls, given as a list or as a single URL
+        """
+        if not read_urls:
+            return []
+        if isinstance(read_urls, str):
+            read_urls = [read_urls]
+        if not isinstance(read_urls, list) or \
+                not all(isinstance(read_url, str) and read_url for read_url in read_urls):
+            raise InvalidConfigurationException(
+                f"Invalid read_urls: {read_urls}. Must be a list of URLs.")
+        return [read_url.rstrip('/') for read_url in read_urls]
+
     @staticmethod
     def _parse_authn_type(authn_type: str | AuthnTypes) -> AuthnTypes:
         """
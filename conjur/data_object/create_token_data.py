@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+CreateTokenData module
+
+This module represents the DTO that holds the params the user passes in.
+We use this DTO to build the create token request
+"""
+
+# SDK
+from conjur_api.models import CreateTokenData as SdkCreateTokenData
+
+# Internals
+from conjur.errors import InvalidFormatException
+
+
+# pylint: disable=too-few-public-methods,too-many-arguments
+class CreateTokenData(SdkCreateTokenData):
+    """
+    Used for organizing the params the user passed in to execute the CreateToken
+    command. Extends the SDK object with the number of tokens to create, so many
+    tokens are minted in a single request.
+    """
+
+    def __init__(self, host_factory: str = "", *, cidr: str = "", days: int = 0,
+                 hours: int = 0, minutes: int = 0, count: int = 1):
+        super().__init__(host_factory=host_factory, cidr=cidr, days=days,
+                         hours=hours, minutes=minutes)
+        self.count = count if count is not None else 1
+        if self.count <= 0:
+            raise InvalidFormatException("'count' must be a positive number")
+
+    def to_dict(self):
+        params = super().to_dict()
+        if self.count > 1:
+            params['count'] = self.count
+        return params
+
+    def __repr__(self) -> str:
+        return f"{{'host_factory': '{self.host_factory}', " \
+               f"'cidr': '{self.cidr}', " \
+               f"'expiration': '{self.duration}', " \
+               f"'count': '{self.count}'}}"
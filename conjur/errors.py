@@ -135,6 +135,17 @@ class InvalidHostFactoryTokenException(Exception):
         super().__init__(self.message)
 
 
+class TokenPoolEmptyException(Exception):
+    """
+    Thrown to indicate that the local Host Factory token
+    pool holds no unexpired token and cannot be refilled
+    """
+
+    def __init__(self, message: str = ""):
+        self.message = message
+        super().__init__(self.message)
+
+
 class ConfirmationException(Exception):
     """ Exception when user did not confirm a particular flow """
 
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Launcher module
+
+This module is the entry point of the conjur command. Shell completion
+requests are answered here, without importing the rest of the CLI, so a
+completion does not pay for importing the SDK
+"""
+
+# Builtins
+import sys
+from typing import List
+
+# Internals
+from conjur.constants import DEFAULT_COMPLETION_CACHE_DIRECTORY
+from conjur.util.completion import COMPLETE_COMMAND, Completer, CompletionCache, \
+    command_tree, refresh_in_background
+
+
+def launch():
+    """
+    Runs the command line, or answers a completion request
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == COMPLETE_COMMAND:
+        sys.exit(complete(sys.argv[2:]))
+
+    # pylint: disable=import-outside-toplevel
+    from conjur.cli import Cli
+    Cli.launch()
+
+
+def complete(words: List[str]) -> int:
+    """
+    Writes the suggestions for the last of the words, the one being typed,
+    one per line
+    """
+    cache = CompletionCache(DEFAULT_COMPLETION_CACHE_DIRECTORY)
+    completer = Completer(cache, lambda: _load_command_tree(cache), refresh_in_background)
+    # pylint: disable=broad-except
+    try:
+        suggestions = completer.complete(words[:-1], words[-1] if words else '')
+    except Exception:
+        # A failed completion must not write to the terminal of the user
+        return 1
+    sys.stdout.write(''.join(f"{suggestion}\n" for suggestion in suggestions))
+    return 0
+
+
+def _load_command_tree(cache: CompletionCache) -> dict:
+    tree = cache.load_command_tree()
+    if tree is None:
+        # Only after an installation or an upgrade, the description is cached
+        # pylint: disable=import-outside-toplevel,protected-access
+        from conjur.cli import Cli
+        tree = command_tree(Cli._build_parser())
+        try:
+            cache.write_command_tree(tree)
+        except OSError:
+            pass
+    return tree
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+CompletionLogic module
+
+This module is the business logic for refreshing the IDs suggested by
+shell completion
+"""
+
+# Builtins
+from typing import Dict, List
+
+# Internals
+from conjur.logic.index_logic import list_by_kind
+from conjur.util.completion import CompletionCache, command_tree
+from conjur.util.resource_index import searchable_text
+
+
+class CompletionLogic:
+    """
+    CompletionLogic
+
+    This class holds the business logic for filling the completion cache
+    with the IDs of the resources visible to the user
+    """
+
+    def __init__(self, client, cache: CompletionCache):
+        self.client = client
+        self.cache = cache
+
+    def refresh(self, kinds: List[str]) -> Dict[str, int]:
+        """
+        Replaces the cached IDs of the kinds with the ones listed by the
+        server, in a single request, and returns how many IDs each kind has
+        """
+        counts = {}
+        for kind, resources in list_by_kind(self.client, kinds).items():
+            identifiers = [searchable_text(resource)[0] for resource in resources]
+            self.cache.write_ids(kind, identifiers)
+            counts[kind] = len(identifiers)
+        return counts
+
+    def write_command_tree(self, parser):
+        """
+        Replaces the cached description of the commands of the parser
+        """
+        self.cache.write_command_tree(command_tree(parser))
@@ -8,3 +8,5 @@ from conjur.logic.credential_provider.file_credentials_provider import FileCrede
 from conjur.logic.credential_provider.keystore_credentials_provider \
     import KeystoreCredentialsProvider
 from conjur.logic.credential_provider.credential_store_factory import CredentialStoreFactory
+from conjur.logic.credential_provider.leader_credentials_provider \
+    import LeaderCredentialsProvider
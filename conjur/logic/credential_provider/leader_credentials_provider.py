@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+LeaderCredentialsProvider module
+
+This module holds the logic for authenticating to read-only followers
+with the credentials stored for their leader
+"""
+
+# SDK
+from conjur_api.models import CredentialsData
+from conjur_api.interface import CredentialsProviderInterface
+
+
+class LeaderCredentialsProvider(CredentialsProviderInterface):
+    """
+    LeaderCredentialsProvider
+
+    Followers accept the API keys of their leader, but the credentials are
+    stored under the leader URL only. This class reads and writes them
+    there whatever URL they are requested for
+    """
+
+    def __init__(self, credentials_provider: CredentialsProviderInterface, leader_url: str):
+        self.credentials_provider = credentials_provider
+        self.leader_url = leader_url
+
+    def save(self, credential_data: CredentialsData):
+        """
+        Method that writes user data under the leader URL
+        """
+        credential_data.machine = self.leader_url
+        self.credentials_provider.save(credential_data)
+
+    def load(self, conjur_url: str) -> CredentialsData:
+        """
+        Method that loads the credentials of the leader
+        """
+        return self.credentials_provider.load(self.leader_url)
+
+    def update_api_key_entry(self, user_to_update: str,
+                             credential_data: CredentialsData, new_api_key: str):
+        """
+        Method to update the API key from the described entry
+        """
+        self.credentials_provider.update_api_key_entry(user_to_update, credential_data,
+                                                       new_api_key)
+
+    def remove_credentials(self, conjur_url: str):
+        """
+        Method to remove the credentials of the leader
+        """
+        self.credentials_provider.remove_credentials(self.leader_url)
+
+    def is_exists(self, conjur_url: str) -> bool:
+        """
+        Method to check if credentials of the leader exist
+        """
+        return self.credentials_provider.is_exists(self.leader_url)
+
+    def cleanup_if_exists(self, conjur_url: str):
+        """
+        Method to cleanup credential leftovers of the leader if exist
+        """
+        self.credentials_provider.cleanup_if_exists(self.leader_url)
+
+    def get_store_location(self):
+        """
+        Method to return the source of the credentials
+        """
+        return self.credentials_provider.get_store_location()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+ExportLogic module
+
+This module is the business logic for executing the EXPORT command
+"""
+
+# Builtins
+import logging
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, DEFAULT_EXPORT_BATCH_SIZE
+from conjur.data_object.list_data import ListData
+from conjur.errors import InvalidFormatException
+from conjur.logic.list_logic import ListLogic
+from conjur.util.bulk_utils import run_concurrently
+from conjur.util.role_graph import is_in_policy
+from conjur.util.secrets_archive import ArchiveWriter, encode_value
+from conjur.util.util_functions import get_existing_values
+
+
+# pylint: disable=too-few-public-methods
+class ExportLogic:
+    """
+    ExportLogic
+
+    This class exports the values of the variables of a policy to an
+    archive. The IDs are listed page by page and the values are fetched in
+    concurrent batches, written as they arrive, so the number of variables
+    held in memory does not depend on the size of the account
+    """
+
+    def __init__(self, client, batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_BULK_CONCURRENCY):
+        self.client = client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.skipped_count = 0
+
+    # pylint: disable=logging-fstring-interpolation
+    def export(self, policy: str, writer: ArchiveWriter) -> int:
+        """
+        Method that writes the values of the variables of the policy branch,
+        and of the policies it holds, to the archive. Variables without a
+        value are skipped. Returns the number of variables exported
+        """
+        if self.batch_size < 1:
+            raise InvalidFormatException("Error: --batch-size must be a positive number")
+        policy_id = policy.split(':', 2)[-1]
+        variable_ids = (full_id.split(':', 2)[2] for full_id in ListLogic(self.client)
+                        .list_pages(ListData(kind='variable'), concurrency=self.concurrency)
+                        if is_in_policy(full_id, policy_id))
+        for batch, values, error in run_concurrently(self._values, _batches(variable_ids,
+                                                                            self.batch_size),
+                                                     self.concurrency):
+            if error is not None:
+                raise error
+            writer.write_chunk([encode_value(variable_id, values[variable_id])
+                                for variable_id in batch if variable_id in values])
+            self.skipped_count += len(batch) - len(values)
+            logging.debug(f"Exported {writer.record_count} variable(s)")
+        writer.close()
+        return writer.record_count
+
+    def _values(self, batch: List[str]) -> Dict[str, object]:
+        return get_existing_values(self.client, batch)
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
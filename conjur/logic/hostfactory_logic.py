@@ -8,10 +8,15 @@ returned data
 
 # Builtins
 import json
+from typing import Iterator, List, Tuple
 
 # Internals
 from conjur_api.models import CreateTokenData,CreateHostData
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
 from conjur.errors import MissingRequiredParameterException
+from conjur.util.bulk_utils import run_concurrently
+from conjur.util.rate_limiter import RateLimiter
+from conjur.util.retry import RetryPolicy
 
 
 # pylint: disable=too-few-public-methods
@@ -50,6 +55,28 @@ class HostFactoryLogic:
         response = self.client.create_host(create_host_data)
         return json.dumps(response, indent=4, sort_keys=True)
 
+    # pylint: disable=too-many-arguments
+    def create_hosts(self, host_ids: List[str], token: str,
+                     max_workers: int = DEFAULT_BULK_CONCURRENCY,
+                     rate_limiter: RateLimiter = None,
+                     retry_policy: RetryPolicy = None) -> Iterator[Tuple]:
+        """
+        Creates many hosts with the same Host Factory token concurrently, retrying
+        transient failures. Yields a (host_id, created_host, error) tuple per host,
+        in order, where created_host is the server response holding the API key.
+        """
+        if token is None:
+            raise MissingRequiredParameterException('Missing required parameters')
+        retry_policy = retry_policy or RetryPolicy()
+
+        def create_host_attempt(host_id: str) -> dict:
+            if rate_limiter:
+                rate_limiter.acquire()
+            return self.client.create_host(CreateHostData(host_id=host_id, token=token))
+
+        return run_concurrently(lambda host_id: retry_policy.call(create_host_attempt, host_id),
+                                host_ids, max_workers)
+
     # pylint: disable=inconsistent-return-statements
     def revoke_token(self, token: str):
         """
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+ImportLogic module
+
+This module is the business logic for executing the IMPORT command
+"""
+
+# Builtins
+import json
+import logging
+import os
+from typing import Callable, Iterator, Tuple
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.util.bulk_utils import run_concurrently
+from conjur.util.private_file import write_private_file
+from conjur.util.secrets_archive import ArchiveReader, decode_value
+
+CHECKPOINT_FILE_SUFFIX = '.checkpoint'
+
+
+# pylint: disable=too-few-public-methods
+class ImportLogic:
+    """
+    ImportLogic
+
+    This class sets the values of the variables of an archive made by
+    `conjur export`. Values are set concurrently while the archive is read
+    chunk by chunk. Once every variable of a chunk was set, the number of
+    chunks done is saved to a checkpoint file next to the archive, so an
+    interrupted import can resume after the last chunk done. The checkpoint
+    never moves past a chunk with a failed variable, so a resumed import sets
+    that chunk again
+    """
+
+    def __init__(self, client, concurrency: int = DEFAULT_BULK_CONCURRENCY):
+        self.client = client
+        self.concurrency = concurrency
+
+    # pylint: disable=logging-fstring-interpolation
+    def import_archive(self, archive_path: str, reader: ArchiveReader, resume: bool = False,
+                       on_failure: Callable[[str, Exception], None] = None) -> Tuple[int, int]:
+        """
+        Method that sets the values of the archive. Variables that cannot be
+        set are passed to on_failure and do not stop the others. Returns the
+        number of variables set and failed
+        """
+        # A truncated or modified archive is reported before any value is set
+        reader.verify()
+        checkpoint_path = archive_path + CHECKPOINT_FILE_SUFFIX
+        checkpoint = {'salt': reader.salt.hex(), 'chunks': 0, 'imported': 0, 'failed': 0}
+        if resume:
+            checkpoint = self._load_checkpoint(checkpoint_path, checkpoint)
+            logging.debug(f"Resuming after {checkpoint['chunks']} chunk(s)")
+
+        done = True
+        for (number, last, record), _, error in run_concurrently(
+                self._set, self._records(reader, checkpoint['chunks']), self.concurrency):
+            if error is None:
+                checkpoint['imported'] += 1
+            else:
+                checkpoint['failed'] += 1
+                done = False
+                if on_failure:
+                    on_failure(record['id'], error)
+            if last and done:
+                checkpoint['chunks'] = number + 1
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+        # The checkpoint is kept for --resume to set the failed chunks again
+        if checkpoint['failed'] == 0 and os.path.exists(checkpoint_path):
+            os.unlink(checkpoint_path)
+        return checkpoint['imported'], checkpoint['failed']
+
+    def _set(self, item: Tuple[int, bool, dict]):
+        _, _, record = item
+        self.client.set(record['id'], decode_value(record))
+
+    @staticmethod
+    def _records(reader: ArchiveReader, skipped_chunks: int) -> Iterator[Tuple[int, bool, dict]]:
+        """
+        Yields (number of the chunk, whether it is its last record, record)
+        """
+        for number, records in reader.chunks():
+            if number < skipped_chunks:
+                continue
+            for position, record in enumerate(records):
+                yield number, position == len(records) - 1, record
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str, default: dict) -> dict:
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except (FileNotFoundError, ValueError):
+            return default
+        # A checkpoint of another archive is ignored
+        return checkpoint if checkpoint.get('salt') == default['salt'] else default
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, checkpoint: dict):
+        directory, name = os.path.split(os.path.abspath(checkpoint_path))
+        write_private_file(directory, name, json.dumps(checkpoint).encode('utf-8'))
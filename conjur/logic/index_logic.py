@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+IndexLogic module
+
+This module is the business logic for executing the index command
+"""
+
+# Builtins
+from typing import Dict, List, Optional
+
+# Internals
+from conjur.resource import Resource
+from conjur.util.resource_index import ResourceIndex
+
+
+# pylint: disable=too-few-public-methods
+class IndexLogic:
+    """
+    IndexLogic
+
+    This class holds the business logic for syncing the local index of the
+    resources with the server
+    """
+
+    def __init__(self, client, resource_index: ResourceIndex):
+        self.client = client
+        self.resource_index = resource_index
+
+    def sync(self, account: str, kinds: List[str] = None) -> Dict[str, int]:
+        """
+        Lists the resources of the kinds, or of every kind, in a single
+        request and replaces their index. Returns the number of resources
+        indexed for each kind.
+
+        A sync is not incremental: every resource of the kinds is listed
+        again and the index of each kind is rewritten whole
+        """
+        # The server returns the annotations searched locally with or without inspect
+        resources_by_kind = {kind: [] for kind in kinds or ()}
+        if not kinds:
+            # Kinds that have no resources any more are emptied as well
+            indexed = (self.resource_index.metadata() or {}).get('kinds', {})
+            resources_by_kind.update({kind: [] for kind in indexed})
+        resources_by_kind.update(list_by_kind(self.client, kinds, {'inspect': True}))
+
+        self.resource_index.write_kinds(account, resources_by_kind)
+        return {kind: len(resources) for kind, resources in sorted(resources_by_kind.items())}
+
+
+def list_by_kind(client, kinds: Optional[List[str]],
+                 constraints: dict = None) -> Dict[str, list]:
+    """
+    Lists the resources of the kinds, or of every kind, in a single request
+    and returns them grouped by kind. The server filters a single kind, many
+    kinds are filtered here
+    """
+    constraints = dict(constraints or {})
+    if kinds and len(kinds) == 1:
+        constraints['kind'] = kinds[0]
+    resources_by_kind = {kind: [] for kind in kinds or ()}
+    for resource in client.list(constraints) or ():
+        full_id = resource['id'] if isinstance(resource, dict) else resource
+        kind = Resource.from_full_id(full_id).kind
+        if kinds and kind not in kinds:
+            continue
+        resources_by_kind.setdefault(kind, []).append(resource)
+    return resources_by_kind
@@ -6,10 +6,19 @@ ListLogic module
 This module is the business logic for executing the list command
 """
 # pylint: disable=too-few-public-methods
+import itertools
 import logging
+from contextlib import closing
+from typing import Iterator
 
 from conjur_api.models import ListMembersOfData, ListPermittedRolesData
+from conjur.constants import DEFAULT_BULK_CONCURRENCY, DEFAULT_LIST_PAGE_SIZE
+from conjur.errors import InvalidFormatException
 from conjur.resource import Resource
+from conjur.util.bulk_utils import run_concurrently
+from conjur.util.resource_index import ResourceIndex
+from conjur.util.resource_snapshot import read_snapshot, resource_entry, snapshot_changes, \
+    write_snapshot
 
 
 class ListLogic:
@@ -30,6 +39,88 @@ class ListLogic:
         list_constraints = self.build_constraints(list_data)
         return self.client.list(list_constraints)
 
+    def list_pages(self, list_data, page_size: int = DEFAULT_LIST_PAGE_SIZE,
+                   concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Iterator:
+        """
+        Method for listing page by page, yielding the resources in order as
+        each page arrives. Up to 2 * concurrency pages are fetched ahead, so
+        memory does not grow with the number of resources listed
+        """
+        try:
+            start = int(list_data.offset or 0)
+            end = start + int(list_data.limit) if list_data.limit is not None else None
+        except ValueError as error:
+            raise InvalidFormatException("Error: --limit and --offset must be numbers") \
+                from error
+        if page_size < 1:
+            raise InvalidFormatException("Error: --page-size must be a positive number")
+        offsets = itertools.count(start, page_size) if end is None \
+            else range(start, end, page_size)
+        constraints = self.build_constraints(list_data)
+        constraints.pop('offset', None)
+
+        def list_page(offset):
+            limit = page_size if end is None else min(page_size, end - offset)
+            # The client removes 'inspect' from the constraints it is given
+            return self.client.list(dict(constraints, offset=str(offset), limit=str(limit)))
+
+        with closing(run_concurrently(list_page, offsets, concurrency)) as pages:
+            for offset, page, error in pages:
+                if error is not None:
+                    raise error
+                # pylint: disable=logging-fstring-interpolation
+                logging.debug(f"Listed {len(page)} resource(s) at offset {offset}")
+                yield from page
+                # A short page is the last one, the pages fetched ahead are empty
+                if len(page) < page_size:
+                    return
+
+    @staticmethod
+    def list_local(list_data, resource_index: ResourceIndex, prefix: str = None) -> list:
+        """
+        Method for answering a list from the local index instead of the server
+        """
+        try:
+            offset = int(list_data.offset or 0)
+            limit = int(list_data.limit) if list_data.limit is not None else None
+        except ValueError as error:
+            raise InvalidFormatException("Error: --limit and --offset must be numbers") \
+                from error
+        # pylint: disable=logging-fstring-interpolation
+        logging.debug(f"Executing list command on the local index with the following "
+                      f"constraints: {list_data}")
+        return resource_index.query(kinds=[list_data.kind] if list_data.kind else None,
+                                    search=list_data.search, prefix=prefix,
+                                    offset=offset, limit=limit)
+
+    def list_changes(self, list_data, snapshot_path: str,
+                     page_size: int = DEFAULT_LIST_PAGE_SIZE,
+                     concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Iterator[dict]:
+        """
+        Method for listing the resources added, removed or changed since the
+        snapshot was taken. The resources are listed page by page and only
+        their digests are kept, along with the metadata of the changed ones
+        with --inspect. The snapshot is replaced once every change was
+        consumed, so an interrupted run reports the same changes again
+        """
+        constraints = self.build_constraints(list_data)
+        previous = read_snapshot(snapshot_path, constraints)
+        resources = {}
+        current = {}
+        for resource in self.list_pages(list_data, page_size, concurrency):
+            resource_id, current[resource_id] = resource_entry(resource)
+            if list_data.inspect and previous.get(resource_id) != current[resource_id]:
+                resources[resource_id] = resource
+        # pylint: disable=logging-fstring-interpolation
+        logging.debug(f"Comparing {len(current)} listed resource(s) with the "
+                      f"{len(previous)} of snapshot '{snapshot_path}'")
+        for change, resource_id in snapshot_changes(previous, current):
+            record = {'change': change, 'id': resource_id}
+            if list_data.inspect and change != 'removed':
+                record['resource'] = resources[resource_id]
+            yield record
+        write_snapshot(snapshot_path, constraints, current)
+
     def get_permitted_roles(self, data: ListPermittedRolesData) -> dict:
         """
         Lists the roles which have the named permission on a resource.
@@ -7,6 +7,12 @@ This module is the business logic for executing the resource command
 """
 
 import logging
+from typing import Iterator, List, Tuple
+
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.resource import Resource
+from conjur.util.bulk_utils import run_concurrently
+
 
 # pylint: disable=too-few-public-methods
 class ResourceLogic:
@@ -26,3 +32,15 @@ class ResourceLogic:
         logging.debug(resource_id)
 
         return self.client.resource_exists(kind, resource_id)
+
+    def exists_many(self, resource_ids: List[str],
+                    max_workers: int = DEFAULT_BULK_CONCURRENCY) -> Iterator[Tuple]:
+        """
+        Method for checking the existence of many resources concurrently. Yields a
+        (resource_id, exists, error) tuple per full resource ID, in order
+        """
+        def exists_full_id(full_id: str) -> bool:
+            resource = Resource.from_full_id(full_id)
+            return self.exists(resource.kind, resource.identifier)
+
+        return run_concurrently(exists_full_id, resource_ids, max_workers)
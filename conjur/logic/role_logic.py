@@ -8,6 +8,12 @@ This module is the business logic for executing the ROLE command
 
 # Builtins
 import logging
+from typing import Dict, List
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.util.bulk_utils import run_concurrently
+from conjur.util.role_graph import RoleGraph, is_in_policy, role_kind
 
 # pylint: disable=too-few-public-methods
 class RoleLogic:
@@ -38,3 +44,34 @@ class RoleLogic:
         logging.debug(role_id)
 
         return self.client.role_memberships(kind, role_id, direct)
+
+    def role_graph(self, account: str, root: str,
+                   concurrency: int = DEFAULT_BULK_CONCURRENCY) -> RoleGraph:
+        """
+        Method to crawl the memberships of the roles of the root policy and
+        of every role they are members of, directly or not. The roles found
+        at each depth are crawled concurrently, one request per role
+        """
+        policy_id = root.split(':', 2)[-1]
+        frontier = [full_id for full_id in self.client.list({})
+                    if role_kind(full_id) and is_in_policy(full_id, policy_id)]
+        memberships: Dict[str, List[str]] = {}
+        seen = set(frontier)
+        while frontier:
+            logging.debug(f"Crawling the memberships of {len(frontier)} role(s)")
+            next_frontier = []
+            for full_id, direct, error in run_concurrently(self._direct_memberships,
+                                                           frontier, concurrency):
+                if error is not None:
+                    raise error
+                memberships[full_id] = direct
+                for membership in direct:
+                    if membership not in seen:
+                        seen.add(membership)
+                        next_frontier.append(membership)
+            frontier = next_frontier
+        return RoleGraph.from_memberships(account, memberships, root=policy_id)
+
+    def _direct_memberships(self, full_id: str) -> List[str]:
+        _, kind, identifier = full_id.split(':', 2)
+        return self.client.role_memberships(kind, identifier, True)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+RunLogic module
+
+This module is the business logic for executing the run command
+"""
+
+# Builtins
+import logging
+from typing import Dict, List
+
+# Internals
+from conjur.util.child_process import ChildProcess, SecretFiles
+from conjur.util.secrets_file import SecretSpec, VARIABLE
+
+
+class RunLogic:
+    """
+    RunLogic
+
+    This class holds the business logic for launching a command with the
+    secrets of a secrets file in its environment
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    # pylint: disable=logging-fstring-interpolation
+    def fetch_values(self, secrets: List[SecretSpec]) -> Dict[str, str]:
+        """
+        Fetches the values of all the variables of the secrets in a single
+        batch request. Returns the values by variable ID
+        """
+        variable_ids = list(dict.fromkeys(secret.value for secret in secrets
+                                          if secret.kind == VARIABLE))
+        if not variable_ids:
+            return {}
+        logging.debug(f"Fetching {len(variable_ids)} variable(s) in one request")
+        return self.client.get_many(*variable_ids)
+
+    @staticmethod
+    def prepare(secrets: List[SecretSpec], values: Dict[str, str], command: List[str],
+                secret_files: SecretFiles = None) -> ChildProcess:
+        """
+        Builds the child process, with an environment variable per secret.
+        Secrets passed as files are written to secret_files
+        """
+        secret_files = secret_files or SecretFiles()
+        environment = {}
+        try:
+            for secret in secrets:
+                value = values[secret.value] if secret.kind == VARIABLE else secret.value
+                if isinstance(value, bytes):
+                    value = value.decode('utf-8')
+                if secret.as_file:
+                    value = secret_files.write(secret.name, value)
+                environment[secret.name] = value
+        except BaseException:
+            secret_files.cleanup()
+            raise
+        return ChildProcess(command, environment, secret_files)
@@ -7,6 +7,12 @@ This module is the business logic for executing the show command
 """
 
 import json
+from typing import Iterator, List, Tuple
+
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.resource import Resource
+from conjur.util.bulk_utils import run_concurrently
+
 
 # pylint: disable=too-few-public-methods
 class ShowLogic:
@@ -24,3 +30,15 @@ class ShowLogic:
         Method for calling get_resource from the client service
         """
         return self.client.get_resource(kind, resource_id)
+
+    def show_many(self, resource_ids: List[str],
+                  max_workers: int = DEFAULT_BULK_CONCURRENCY) -> Iterator[Tuple]:
+        """
+        Method for fetching many resources concurrently. Yields a
+        (resource_id, result, error) tuple per full resource ID, in order
+        """
+        def show_full_id(full_id: str):
+            resource = Resource.from_full_id(full_id)
+            return self.show(resource.kind, resource.identifier)
+
+        return run_concurrently(show_full_id, resource_ids, max_workers)
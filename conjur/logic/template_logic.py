@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+TemplateLogic module
+
+This module is the business logic for executing the template command
+"""
+
+# Builtins
+import logging
+import os
+import re
+import tempfile
+from typing import Dict, Iterable, List, TextIO
+
+# Internals
+from conjur.errors import InvalidFormatException
+
+# A reference to a variable in a template: {{ secret "path/to/variable" }}
+SECRET_REFERENCE_PATTERN = re.compile(r'\{\{\s*secret\s+(?:"([^"]+)"|\'([^\']+)\')\s*\}\}')
+# An opening of a reference that does not match the pattern, a likely typo
+UNMATCHED_REFERENCE_PATTERN = re.compile(r'\{\{\s*secret\b')
+
+
+class TemplateLogic:
+    """
+    TemplateLogic
+
+    This class holds the business logic for rendering templates that
+    reference variables. Templates are read line by line, so they are never
+    held in memory as a whole, and references may not span lines
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    @staticmethod
+    def find_references(template_paths: Iterable[str]) -> List[str]:
+        """
+        Returns the IDs of the variables referenced by the templates, each
+        ID once, in order of first appearance
+        """
+        variable_ids = {}
+        for template_path in template_paths:
+            with open(template_path, 'r', encoding='utf-8', newline='') as template:
+                for line_number, line in enumerate(template, start=1):
+                    matches = list(SECRET_REFERENCE_PATTERN.finditer(line))
+                    if len(UNMATCHED_REFERENCE_PATTERN.findall(line)) != len(matches):
+                        raise InvalidFormatException(
+                            f"Error: invalid secret reference in '{template_path}' at "
+                            f"line {line_number}. Use {{{{ secret \"path/to/variable\" }}}}")
+                    for match in matches:
+                        variable_ids.setdefault(_variable_id(match), None)
+        return list(variable_ids)
+
+    # pylint: disable=logging-fstring-interpolation
+    def fetch_values(self, variable_ids: List[str]) -> Dict[str, str]:
+        """
+        Fetches the values of all the variables in a single batch request
+        """
+        if not variable_ids:
+            return {}
+        logging.debug(f"Fetching {len(variable_ids)} variable(s) in one request")
+        return self.client.get_many(*variable_ids)
+
+    @staticmethod
+    def render(template_path: str, values: Dict[str, str], output: TextIO):
+        """
+        Writes the template to output, line by line, with every reference
+        replaced by the value of its variable
+        """
+        def value_of(match) -> str:
+            value = values[_variable_id(match)]
+            return value.decode('utf-8') if isinstance(value, bytes) else value
+
+        with open(template_path, 'r', encoding='utf-8', newline='') as template:
+            for line in template:
+                output.write(SECRET_REFERENCE_PATTERN.sub(value_of, line))
+
+    @staticmethod
+    def render_to_file(template_path: str, values: Dict[str, str], output_path: str):
+        """
+        Renders the template to a file readable by its owner only. The file is
+        written next to its destination and then moved into place, so readers
+        never see a partially rendered file
+        """
+        output_directory = os.path.dirname(os.path.abspath(output_path))
+        # mkstemp creates the file readable by its owner only
+        file_descriptor, temp_path = tempfile.mkstemp(prefix='.conjur-template-',
+                                                      dir=output_directory)
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8', newline='') as output:
+                TemplateLogic.render(template_path, values, output)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def _variable_id(match) -> str:
+    return match.group(1) or match.group(2)
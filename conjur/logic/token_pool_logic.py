@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+TokenPoolLogic
+
+This module holds the business logic for the local Host Factory token
+reservoir: a file holding pre-generated tokens that are handed out
+without a round trip to the server
+"""
+
+# Builtins
+import http
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+# SDK
+from conjur_api.errors.errors import HttpError, HttpStatusError
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.data_object.create_token_data import CreateTokenData
+from conjur.errors import MissingRequiredParameterException, TokenPoolEmptyException
+from conjur.util import file_lock
+from conjur.util.bulk_utils import run_concurrently
+
+POOL_FILE_VERSION = 1
+
+
+class TokenPoolLogic:
+    """
+    TokenPoolLogic
+
+    This class holds the business logic for the Host Factory token reservoir.
+    The reservoir file maps a Host Factory ID to its unused tokens and to the
+    settings used to refill it. Every operation holds an exclusive lock on the
+    file, so many processes (for example, one per booting instance) can share
+    a reservoir without handing out the same token twice.
+    """
+
+    def __init__(self, client, pool_file: str, clock: Callable[[], float] = time.time):
+        self.client = client
+        self.pool_file = pool_file
+        self.clock = clock
+
+    # pylint: disable=too-many-arguments
+    def refill(self, host_factory: str, size: int, low_water: int = 0,
+               cidr: List[str] = None, duration_minutes: int = 0) -> Tuple[int, int]:
+        """
+        Tops up the tokens of the Host Factory to 'size' using a single request
+        and stores the settings used by acquire() to refill it automatically
+        once fewer than 'low_water' tokens are left.
+        Returns the number of tokens created and the number now available.
+        """
+        if not host_factory or size is None or size <= 0 or duration_minutes <= 0:
+            raise MissingRequiredParameterException('Missing required parameters')
+
+        with file_lock.locked_file(self.pool_file) as pool_fd:
+            pool = self._load(pool_fd)
+            entry = pool['host_factories'].setdefault(host_factory, {'tokens': []})
+            entry['settings'] = {'size': size,
+                                 'low_water': min(max(low_water or 0, 0), size),
+                                 'cidr': list(cidr or []),
+                                 'duration_minutes': duration_minutes}
+            entry['tokens'] = self._unexpired(entry['tokens'], 0)
+            created = self._mint(host_factory, entry, size - len(entry['tokens']))
+            file_lock.write_all(pool_fd, json.dumps(pool))
+            return created, len(entry['tokens'])
+
+    def acquire(self, host_factory: str, min_ttl: int = 0) -> dict:
+        """
+        Removes and returns the unused token of the Host Factory that expires
+        first but is still valid for at least 'min_ttl' seconds. Tokens that
+        expire sooner are dropped. When fewer than the low-water mark are left,
+        the reservoir is refilled with the settings stored by refill(). That
+        refill is best-effort: if it fails, the token is still handed out and
+        the next acquire tries again.
+        """
+        if not host_factory:
+            raise MissingRequiredParameterException('Missing required parameters')
+
+        with file_lock.locked_file(self.pool_file) as pool_fd:
+            pool = self._load(pool_fd)
+            entry = pool['host_factories'].get(host_factory, {'tokens': []})
+            entry['tokens'] = self._unexpired(entry['tokens'], min_ttl)
+            settings = entry.get('settings')
+
+            if not entry['tokens'] and settings:
+                self._mint(host_factory, entry, settings['size'])
+            if not entry['tokens']:
+                raise TokenPoolEmptyException(
+                    f"No unexpired token is available for Host Factory '{host_factory}'. "
+                    "Fill the token pool using 'hostfactory pool refill' and try again")
+
+            token = entry['tokens'].pop(0)
+            if settings and len(entry['tokens']) < settings['low_water']:
+                try:
+                    self._mint(host_factory, entry, settings['size'] - len(entry['tokens']))
+                except HttpError as error:
+                    # pylint: disable=logging-fstring-interpolation
+                    logging.debug(f"Failed to refill the token pool of Host Factory "
+                                  f"'{host_factory}': {error}")
+
+            pool['host_factories'][host_factory] = entry
+            file_lock.write_all(pool_fd, json.dumps(pool))
+            return token
+
+    def drain(self, host_factory: str = None,
+              max_workers: int = DEFAULT_BULK_CONCURRENCY) -> Tuple[int, List[Tuple]]:
+        """
+        Revokes the unused tokens of the Host Factory (or of every Host Factory
+        in the reservoir) concurrently and removes them from the reservoir.
+        Expired tokens are removed without a request. Tokens that failed to be
+        revoked are kept so the drain can be retried.
+        Returns the number of revoked tokens and a (token, error) list of failures.
+        """
+        with file_lock.locked_file(self.pool_file) as pool_fd:
+            pool = self._load(pool_fd)
+            host_factories = [host_factory] if host_factory else list(pool['host_factories'])
+            revoked, failures = 0, []
+            for name in host_factories:
+                entry = pool['host_factories'].pop(name, None)
+                if entry is None:
+                    continue
+                tokens = self._unexpired(entry['tokens'], 0)
+                kept = []
+                for token, _, error in run_concurrently(
+                        lambda token: self.client.revoke_token(token['token']),
+                        tokens, max_workers):
+                    if error is None or _is_not_found(error):
+                        revoked += 1
+                    else:
+                        kept.append(token)
+                        failures.append((token, error))
+                if kept:
+                    pool['host_factories'][name] = {'tokens': kept}
+            file_lock.write_all(pool_fd, json.dumps(pool))
+            return revoked, failures
+
+    def _mint(self, host_factory: str, entry: dict, count: int) -> int:
+        """
+        Creates 'count' tokens with the stored settings in a single request and
+        adds them to the entry, keeping the tokens sorted by expiration
+        """
+        if count <= 0:
+            return 0
+        settings = entry['settings']
+        create_token_data = CreateTokenData(host_factory=host_factory,
+                                            cidr=','.join(settings['cidr']) or None,
+                                            minutes=settings['duration_minutes'],
+                                            count=count)
+        tokens = self.client.create_token(create_token_data)
+        entry['tokens'].extend(tokens)
+        entry['tokens'].sort(key=_expires_at)
+        return len(tokens)
+
+    def _unexpired(self, tokens: List[dict], min_ttl: int) -> List[dict]:
+        deadline = self.clock() + (min_ttl or 0)
+        return [token for token in tokens if _expires_at(token) > deadline]
+
+    @staticmethod
+    def _load(pool_fd: int) -> dict:
+        content = file_lock.read_all(pool_fd)
+        pool = json.loads(content) if content.strip() else {}
+        pool.setdefault('version', POOL_FILE_VERSION)
+        pool.setdefault('host_factories', {})
+        return pool
+
+
+def _expires_at(token: dict) -> float:
+    """
+    Returns the expiration of a token returned by the server as a timestamp
+    """
+    return datetime.fromisoformat(token['expiration'].replace('Z', '+00:00')).timestamp()
+
+
+def _is_not_found(error: Exception) -> bool:
+    return isinstance(error, HttpStatusError) and error.status == http.HTTPStatus.NOT_FOUND
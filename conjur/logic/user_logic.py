@@ -8,7 +8,7 @@ This module is the business logic for handling all user-related activity
 
 # Builtins
 import logging
-from typing import Tuple
+from typing import Iterator, List, Tuple
 
 # SDK
 from conjur_api.interface import CredentialsProviderInterface
@@ -16,7 +16,9 @@ from conjur_api.errors.errors import HttpError
 from conjur_api.models import CredentialsData
 
 # Internals
-from conjur.errors import OperationNotCompletedException
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.errors import ConflictingParametersException, OperationNotCompletedException
+from conjur.util.bulk_utils import run_concurrently
 from conjur.resource import Resource
 from conjur.data_object import ConjurrcData
 
@@ -90,6 +92,26 @@ class UserLogic:
         logging.debug(f"Successfully rotated API key for '{resource_to_update}'")
         return new_api_key
 
+    def rotate_other_api_keys(self, users_to_update: List[str],
+                              max_workers: int = DEFAULT_BULK_CONCURRENCY) -> Iterator[Tuple]:
+        """
+        Method to rotate the API keys of many users concurrently over the
+        session of the logged-in user, whose credentials are loaded once.
+        Yields a (user_id, new_api_key, error) tuple per user, in order.
+        The logged-in user is reported as an error since rotating their key
+        would invalidate the session the other rotations rely on.
+        """
+        logged_in_username = self.extract_credentials_from_credential_store().username
+
+        def rotate(user_id: str) -> str:
+            if user_id == logged_in_username:
+                raise ConflictingParametersException(
+                    "Cannot rotate the API key of the logged-in user in bulk. "
+                    "Run 'conjur user rotate-api-key' without '--ids-file' instead")
+            return self.rotate_other_api_key(user_id)
+
+        return run_concurrently(rotate, users_to_update, max_workers)
+
     def rotate_personal_api_key(self, logged_in_username: str, logged_in_credentials: str,
                                 current_key: str) -> str:
         """
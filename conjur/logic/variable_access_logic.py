@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+VariableAccessLogic module
+
+This module is the business logic for the access action of the VARIABLE
+command, which finds the users and hosts that have a privilege on variables
+"""
+
+# Builtins
+import logging
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+
+# SDK
+from conjur_api.models import ListMembersOfData, ListPermittedRolesData
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.resource import Resource
+from conjur.util.bulk_utils import run_concurrently
+
+# Roles that are granted to others and expanded to their members
+GRANTED_ROLE_KINDS = ('group', 'layer', 'policy')
+DEFAULT_ACCESS_PRIVILEGE = 'execute'
+
+
+# pylint: disable=too-few-public-methods
+class VariableAccessLogic:
+    """
+    VariableAccessLogic
+
+    This class expands the roles permitted on variables down to the users
+    and hosts that have the privilege through them. The members of a role
+    are listed once, however many variables or roles it is shared by, and
+    the roles found at each depth are listed concurrently.
+    """
+
+    def __init__(self, client, concurrency: int = DEFAULT_BULK_CONCURRENCY):
+        self.client = client
+        self.concurrency = concurrency
+        self._members: Dict[str, List[str]] = {}
+        self._member_errors: Dict[str, Exception] = {}
+        self._concrete: Dict[str, FrozenSet[str]] = {}
+
+    # pylint: disable=logging-fstring-interpolation
+    def who_can_access(self, variable_ids: List[str],
+                       privilege: str = DEFAULT_ACCESS_PRIVILEGE) -> Iterator[Tuple]:
+        """
+        Yields (variable ID, access, error) per variable, in order, where
+        access holds the roles permitted on the variable and the users and
+        hosts that have the privilege through them
+        """
+        permitted = list(run_concurrently(
+            lambda variable_id: self.client.list_permitted_roles(ListPermittedRolesData(
+                kind='variable', identifier=variable_id, privilege=privilege)),
+            variable_ids, self.concurrency))
+        granted = {role for _, roles, error in permitted if error is None
+                   for role in roles if _kind(role) in GRANTED_ROLE_KINDS}
+        self._list_members(granted)
+        logging.debug(f"Listed the members of {len(self._members)} role(s) for "
+                      f"{len(variable_ids)} variable(s)")
+
+        for variable_id, roles, error in permitted:
+            if error is not None:
+                yield variable_id, None, error
+                continue
+            try:
+                concrete = set()
+                for role in roles:
+                    concrete.update(self._concrete_members(role))
+            except Exception as member_error:  # pylint: disable=broad-except
+                yield variable_id, None, member_error
+                continue
+            yield variable_id, {
+                'privilege': privilege,
+                'roles': sorted(roles),
+                'users': sorted(role for role in concrete if _kind(role) == 'user'),
+                'hosts': sorted(role for role in concrete if _kind(role) == 'host'),
+            }, None
+
+    def _list_members(self, roles):
+        """
+        Lists the direct members of the roles and of the granted roles among
+        their members, depth by depth, skipping the roles already listed
+        """
+        frontier = [role for role in sorted(roles) if role not in self._members]
+        queued = set(frontier)
+        while frontier:
+            next_frontier = set()
+            for role, grants, error in run_concurrently(self._direct_members, frontier,
+                                                        self.concurrency):
+                if error is not None:
+                    self._member_errors[role] = error
+                    self._members[role] = []
+                    continue
+                self._members[role] = members = [grant['member'] for grant in grants]
+                next_frontier.update(member for member in members
+                                     if _kind(member) in GRANTED_ROLE_KINDS
+                                     and member not in self._members
+                                     and member not in queued)
+            frontier = sorted(next_frontier)
+            queued.update(frontier)
+
+    def _direct_members(self, role: str) -> list:
+        data = ListMembersOfData(kind=None, identifier=role)
+        data.set_resource(Resource.from_full_id(role))
+        return self.client.list_members_of_role(data)
+
+    def _concrete_members(self, role: str) -> FrozenSet[str]:
+        """
+        Returns the users and hosts that are the role or have it, directly
+        or through other roles
+        """
+        if role in self._concrete:
+            return self._concrete[role]
+        found = set()
+        seen = {role}
+        pending = [role]
+        while pending:
+            current = pending.pop()
+            if current in self._member_errors:
+                raise self._member_errors[current]
+            if _kind(current) not in GRANTED_ROLE_KINDS:
+                found.add(current)
+                continue
+            for member in self._members.get(current, ()):
+                if member not in seen:
+                    seen.add(member)
+                    pending.append(member)
+        self._concrete[role] = frozenset(found)
+        return self._concrete[role]
+
+
+def _kind(full_id: str) -> str:
+    parts = full_id.split(':', 2)
+    return parts[1] if len(parts) == 3 else ''
@@ -23,8 +23,10 @@ class VariableLogic:
     returned data
     """
 
-    def __init__(self, client):
+    def __init__(self, client, hedged_reader=None):
         self.client = client
+        # Optional reader that hedges single variable reads across endpoints
+        self.hedged_reader = hedged_reader
 
     # pylint: disable=logging-fstring-interpolation
     def get_variable(self, variable_data: VariableData) -> str:
@@ -34,8 +36,9 @@ class VariableLogic:
         logging.debug(variable_data)
         # pylint: disable=no-else-return
         if len(variable_data.variable_id) == 1:
-            variable_value = self.client.get(variable_data.variable_id[0],
-                                             variable_data.variable_version)
+            reader = self.hedged_reader or self.client
+            variable_value = reader.get(variable_data.variable_id[0],
+                                        variable_data.variable_version)
             return variable_value.decode('utf-8')
         else:
             variable_values = self.client.get_many(*variable_data.variable_id)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+VariableWatchLogic module
+
+This module is the business logic for watching variables for changes
+"""
+
+# Builtins
+import hashlib
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+# Internals
+from conjur.constants import DEFAULT_MAX_WATCH_INTERVAL_SECONDS, DEFAULT_WATCH_INTERVAL_SECONDS
+from conjur.util.retry import is_transient_error, retry_after_seconds
+from conjur.util.util_functions import get_existing_values
+
+# Factor the interval grows by after each poll that found no change
+IDLE_BACKOFF_FACTOR = 1.5
+# Spread of the intervals, so that watchers started together do not poll together
+INTERVAL_JITTER = 0.1
+
+
+class VariableWatchLogic:
+    """
+    VariableWatchLogic
+
+    This class holds the business logic for detecting changes of variables.
+    Every poll fetches the values of all the watched variables in a single
+    batch request and compares their SHA-256 digests with the ones of the
+    previous poll. Only the digests are kept, never the values. A variable
+    that is deleted or has no value fails the batch, so the poll falls back
+    to fetching the variables one by one, and the variable is reported as
+    changed when it loses or gets back a value.
+
+    The interval between polls grows while the variables do not change, up
+    to a maximum, and goes back to its initial value after a change.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, client, interval: float = DEFAULT_WATCH_INTERVAL_SECONDS,
+                 max_interval: float = DEFAULT_MAX_WATCH_INTERVAL_SECONDS,
+                 sleep: Callable[[float], None] = time.sleep,
+                 jitter: Callable[[], float] = None):
+        self.client = client
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self._sleep = sleep
+        self._jitter = jitter or (lambda: random.uniform(1 - INTERVAL_JITTER,
+                                                         1 + INTERVAL_JITTER))
+        self._digests: Dict[str, str] = {}
+
+    # pylint: disable=logging-fstring-interpolation
+    def poll(self, variable_ids: List[str]) -> List[str]:
+        """
+        Fetches the variables and returns the IDs of the ones that changed
+        since the previous poll. The first poll only records the digests
+        """
+        values = get_existing_values(self.client, variable_ids)
+        changed = []
+        for variable_id in variable_ids:
+            digest = _digest(values.get(variable_id))
+            if variable_id in self._digests and self._digests[variable_id] != digest:
+                changed.append(variable_id)
+            elif digest is None and variable_id not in self._digests:
+                logging.warning(f"Variable '{variable_id}' does not exist or has no value")
+            self._digests[variable_id] = digest
+        return changed
+
+    def has_value(self, variable_id: str) -> bool:
+        """
+        Returns true if the variable had a value at the last poll
+        """
+        return self._digests.get(variable_id) is not None
+
+
+    # pylint: disable=logging-fstring-interpolation
+    def watch(self, variable_ids: List[str], on_change: Callable[[List[str]], None],
+              polls: Optional[int] = None):
+        """
+        Polls the variables until interrupted, or for the given number of
+        polls, and calls on_change with the IDs of the variables that changed.
+        Transient errors are logged and the poll is tried again later
+        """
+        variable_ids = list(dict.fromkeys(variable_ids))
+        interval = self.interval
+        poll_count = 0
+        while polls is None or poll_count < polls:
+            if poll_count:
+                self._sleep(interval * self._jitter())
+            poll_count += 1
+            try:
+                changed = self.poll(variable_ids)
+            except Exception as error:  # pylint: disable=broad-except
+                if not is_transient_error(error):
+                    raise
+                logging.warning(f"Failed to poll the variables, trying again later. "
+                                f"Reason: {error}")
+                interval = min(max(interval * IDLE_BACKOFF_FACTOR,
+                                   retry_after_seconds(error) or 0), self.max_interval)
+                continue
+
+            if changed:
+                interval = self.interval
+                on_change(changed)
+            else:
+                interval = min(interval * IDLE_BACKOFF_FACTOR, self.max_interval)
+            logging.debug(f"Next poll in about {interval:.1f}s")
+
+
+def _digest(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return hashlib.sha256(value).hexdigest()
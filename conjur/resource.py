@@ -4,6 +4,8 @@
 Resource module
 """
 
+# Builtins
+import sys
 
 # pylint: disable=too-few-public-methods
 from conjur.errors import MissingRequiredParameterException
@@ -14,6 +16,10 @@ class Resource:
     DTO class that represents a resource in Conjur.
     """
 
+    # Resources are held in very large numbers when listing an account,
+    # so we avoid the per-instance __dict__
+    __slots__ = ('kind', 'identifier')
+
     @classmethod
     def from_full_id(cls, full_id: str):
         """
@@ -33,7 +39,8 @@ class Resource:
         """
         Used for representing Conjur resources
         """
-        self.kind = kind
+        # There are only a handful of kinds so every resource shares the same string
+        self.kind = sys.intern(kind) if isinstance(kind, str) else kind
         self.identifier = identifier
 
     def full_id(self):
@@ -48,5 +55,8 @@ class Resource:
         """
         return self.kind == other.kind and self.identifier == other.identifier
 
+    def __hash__(self):
+        return hash((self.kind, self.identifier))
+
     def __repr__(self):
         return f"'kind': '{self.kind}', 'identifier': '{self.identifier}'"
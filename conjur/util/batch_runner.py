@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch runner module
+
+This module runs the CLI commands of a file in a single process, in
+sequence or in parallel, and reports the outcome of every command
+"""
+
+# Builtins
+import io
+import shlex
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, TextIO
+
+# Internals
+from conjur.errors import InvalidFormatException
+from conjur.util.bulk_utils import STDIN_FILE_NAME, run_concurrently, write_json_line
+
+# A line holding only this word waits for the commands above it to complete
+BARRIER_COMMAND = 'wait'
+# Options whose value is masked in the report
+SENSITIVE_OPTIONS = ('-v', '--value', '-p', '--password')
+MASKED_VALUE = '****'
+
+
+# pylint: disable=too-few-public-methods
+class BatchCommand:
+    """
+    A command of a batch file, and its outcome once run
+    """
+
+    def __init__(self, line_number: int, words: List[str]):
+        self.line_number = line_number
+        self.words = words
+        self.exit_code = None
+        self.output = ''
+        self.errors = ''
+        self.duration = 0.0
+
+    def to_report(self) -> dict:
+        """
+        Returns the report of the command, with sensitive option values masked
+        """
+        report = {'line': self.line_number,
+                  'command': shlex.join(mask_sensitive_options(self.words))}
+        if self.exit_code is None:
+            report['status'] = 'skipped'
+            return report
+        report.update({'status': 'ok' if self.exit_code == 0 else 'failed',
+                       'exit_code': self.exit_code,
+                       'output': self.output,
+                       'errors': self.errors,
+                       'duration_seconds': round(self.duration, 6)})
+        return report
+
+
+def mask_sensitive_options(words: List[str]) -> List[str]:
+    """
+    Returns the words of a command with the values of sensitive options masked
+    """
+    masked = []
+    mask_next = False
+    for word in words:
+        if mask_next:
+            masked.append(MASKED_VALUE)
+            mask_next = False
+        elif word in SENSITIVE_OPTIONS:
+            masked.append(word)
+            mask_next = True
+        elif word.split('=', 1)[0] in SENSITIVE_OPTIONS and '=' in word:
+            masked.append(f"{word.split('=', 1)[0]}={MASKED_VALUE}")
+        else:
+            masked.append(word)
+    return masked
+
+
+def read_batch_file(path: str) -> List[List[BatchCommand]]:
+    """
+    Reads the commands of a batch file, or of stdin if path is '-', split
+    into groups at every `wait` line. Blank lines and comments are skipped
+    """
+    if path == STDIN_FILE_NAME:
+        return parse_batch(sys.stdin)
+    with open(path, 'r', encoding='utf-8') as batch_file:
+        return parse_batch(batch_file)
+
+
+def parse_batch(lines: TextIO) -> List[List[BatchCommand]]:
+    """
+    Parses the lines of a batch file into groups of commands
+    """
+    groups = [[]]
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            words = shlex.split(line, comments=True)
+        except ValueError as error:
+            raise InvalidFormatException(f"Error: line {line_number} of the batch file "
+                                         f"is invalid. {error}") from error
+        if not words:
+            continue
+        if words == [BARRIER_COMMAND]:
+            groups.append([])
+        else:
+            groups[-1].append(BatchCommand(line_number, words))
+    return [group for group in groups if group]
+
+
+class ThreadLocalStream(io.TextIOBase):
+    """
+    Stream that writes to a buffer of the current thread while one is
+    captured, and to the wrapped stream otherwise. Installed as sys.stdout
+    and sys.stderr, it separates the output of commands run in parallel
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__()
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """
+        Captures what the current thread writes while the context is active
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+
+class BatchRunner:
+    """
+    Runs the commands of a batch with execute, which returns their exit code.
+
+    The commands of a group run in parallel on up to parallel threads, and
+    groups run one after the other. With fail_fast, the groups after a
+    failed command are skipped, and so are the commands after a failed one
+    when they run one at a time. The report holds one JSON line per
+    command, in the order of the file
+    """
+
+    def __init__(self, execute: Callable[[List[str]], int], parallel: int = 1,
+                 fail_fast: bool = False, clock: Callable[[], float] = time.perf_counter):
+        self.parallel = max(1, parallel)
+        self.fail_fast = fail_fast
+        self._execute = execute
+        self._clock = clock
+
+    def run(self, groups: List[List[BatchCommand]], report: TextIO = None) -> List[BatchCommand]:
+        """
+        Runs the groups of commands, writes the report of every command and
+        returns the commands with their outcome
+        """
+        # The report goes to the original stream, never to a captured one
+        report = report or sys.stdout
+        original_streams = sys.stdout, sys.stderr
+        stdout = ThreadLocalStream(sys.stdout)
+        stderr = ThreadLocalStream(sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+        failed = False
+        try:
+            for group in groups:
+                if not (failed and self.fail_fast):
+                    for command in self._run_group(group, stdout, stderr):
+                        write_json_line(command.to_report(), report)
+                        failed = failed or command.exit_code != 0
+                        if failed and self.fail_fast and self.parallel == 1:
+                            break
+                for command in group:
+                    if command.exit_code is None:
+                        write_json_line(command.to_report(), report)
+        finally:
+            sys.stdout, sys.stderr = original_streams
+        return [command for group in groups for command in group]
+
+    def _run_group(self, group: List[BatchCommand], stdout: ThreadLocalStream,
+                   stderr: ThreadLocalStream) -> Iterator[BatchCommand]:
+        if self.parallel == 1:
+            return (self._run_command(command, stdout, stderr) for command in group)
+        return (command for command, _, _ in run_concurrently(
+            lambda command: self._run_command(command, stdout, stderr), group, self.parallel))
+
+    def _run_command(self, command: BatchCommand, stdout: ThreadLocalStream,
+                     stderr: ThreadLocalStream) -> BatchCommand:
+        started_at = self._clock()
+        with stdout.capture() as output, stderr.capture() as errors:
+            command.exit_code = self._execute(command.words)
+        command.duration = self._clock() - started_at
+        command.output = output.getvalue()
+        command.errors = errors.getvalue()
+        return command
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk journal module
+
+This module records the progress of bulk commands, so that a run that is
+interrupted can resume where it stopped instead of starting over.
+
+A journal is an append-only file of JSON lines: a header naming the
+command, then the identifier of each item completed, as {"id": ...}.
+Failed items are not recorded, so they are tried again on resume. Each line
+is flushed as soon as its item is done, so the journal survives the CLI
+being killed. It is also synced to disk at least every
+JOURNAL_SYNC_SECONDS and when the run ends, so that a crash of the machine
+loses at most the last second of progress, without paying for a sync per
+item. The output file the results are written to is synced before the
+journal each time, so that a synced journal never marks as done an item
+whose result, such as a new API key, did not reach the disk.
+"""
+
+# Builtins
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, List, Tuple
+
+# Internals
+from conjur.errors import InvalidFormatException
+
+JOURNAL_FORMAT_VERSION = 1
+JOURNAL_SYNC_SECONDS = 1.0
+
+
+class BulkJournal:
+    """
+    The identifiers completed by a bulk command, appended to a file as they
+    complete
+    """
+
+    def __init__(self, path: str, command: str):
+        self.path = path
+        self.command = command
+        self.completed = set()
+        self._output = None
+        valid_length = self._load()
+        # The journal lists the identifiers the command ran on, so keep it private
+        file_descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(file_descriptor, 'r+b')
+        # Drop a line torn by a previous run that was killed while writing it
+        self._file.truncate(valid_length)
+        self._file.seek(valid_length)
+        if valid_length == 0:
+            self._append({'journal': JOURNAL_FORMAT_VERSION, 'command': command})
+            self.sync()
+        self._last_sync = time.monotonic()
+
+    @property
+    def resumed(self) -> bool:
+        """
+        Returns true if a previous run already completed items
+        """
+        return bool(self.completed)
+
+    def _load(self) -> int:
+        """
+        Reads the completed identifiers of a previous run and returns the
+        length of the journal up to its last complete line
+        """
+        try:
+            with open(self.path, 'rb') as journal_file:
+                content = journal_file.read()
+        except FileNotFoundError:
+            return 0
+        valid_length = 0
+        for line in content.splitlines(keepends=True):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("torn line")
+                record = json.loads(line)
+            except ValueError:
+                break
+            if valid_length == 0:
+                self._check_header(record)
+            elif isinstance(record, dict) and 'id' in record:
+                self.completed.add(record['id'])
+            valid_length += len(line)
+        if valid_length == 0 and content:
+            # Never truncate a file that is not a journal
+            self._check_header(None)
+        return valid_length
+
+    def _check_header(self, header):
+        if not isinstance(header, dict) or header.get('journal') != JOURNAL_FORMAT_VERSION:
+            raise InvalidFormatException(f"Error: '{self.path}' is not a journal of "
+                                         "a bulk command")
+        if header.get('command') != self.command:
+            raise InvalidFormatException(f"Error: the journal '{self.path}' was written by "
+                                         f"`conjur {header.get('command')}`, "
+                                         f"not `conjur {self.command}`")
+
+    def pending(self, items: Iterable[str]) -> List[str]:
+        """
+        Returns the items that were not completed by a previous run
+        """
+        return [item for item in items if item not in self.completed]
+
+    def track(self, results: Iterable[Tuple], output: IO = None) -> Iterator[Tuple]:
+        """
+        Yields the (item, result, error) tuples of a bulk command and records
+        each item that succeeded once the caller is done with it, so an item
+        whose result was not written out yet is never recorded. The output
+        the results are written to is synced with the journal, also when the
+        caller stops early
+        """
+        self._output = output
+        try:
+            for item, result, error in results:
+                yield item, result, error
+                if error is None:
+                    self.record(item)
+        finally:
+            # The output is closed before the journal is, so both are synced now
+            self.sync()
+            self._output = None
+
+    def record(self, item: str):
+        """
+        Appends a completed item to the journal
+        """
+        self._append({'id': item})
+        self.completed.add(item)
+        if time.monotonic() - self._last_sync >= JOURNAL_SYNC_SECONDS:
+            self.sync()
+
+    def _append(self, record: dict):
+        self._file.write(json.dumps(record).encode('utf-8') + b'\n')
+        self._file.flush()
+
+    def sync(self):
+        """
+        Writes the output, then the journal to disk
+        """
+        self._sync_output()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def _sync_output(self):
+        if self._output is None or self._output.closed:
+            return
+        self._output.flush()
+        try:
+            os.fsync(self._output.fileno())
+        except OSError:
+            # Terminals, pipes and in-memory streams cannot be synced
+            pass
+
+    def close(self):
+        """
+        Syncs and closes the journal
+        """
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def pending(items: List[str], journal: BulkJournal = None) -> List[str]:
+    """
+    Returns the items not completed according to the journal, if any
+    """
+    return journal.pending(items) if journal else items
+
+
+def tracked(results: Iterable[Tuple], journal: BulkJournal = None,
+            output: IO = None) -> Iterable[Tuple]:
+    """
+    Returns the results, recorded to the journal as consumed if any. The
+    output they are written to is synced with the journal
+    """
+    return journal.track(results, output) if journal else results
+
+
+def resumed(journal: BulkJournal = None) -> bool:
+    """
+    Returns true if the journal holds items completed by a previous run, in
+    which case results are appended to those of that run
+    """
+    return bool(journal and journal.resumed)
+
+
+# pylint: disable=logging-fstring-interpolation
+@contextmanager
+def open_journal(path: str, command: str):
+    """
+    Yields the journal at path for the command, or None if no path is given
+    """
+    if not path:
+        yield None
+        return
+    journal = BulkJournal(path, command)
+    if journal.resumed:
+        sys.stderr.write(f"Resuming from '{path}', skipping {len(journal.completed)} "
+                         "completed item(s)\n")
+    logging.debug(f"Recording the progress of `conjur {command}` to '{path}'")
+    try:
+        yield journal
+    finally:
+        journal.close()
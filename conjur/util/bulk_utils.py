@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk utils module
+
+This module holds the common logic for commands that operate on many
+identifiers in a single CLI invocation
+"""
+
+# Builtins
+import functools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+# Internals
+from conjur.constants import DEFAULT_BULK_CONCURRENCY
+from conjur.errors import MissingRequiredParameterException
+from conjur.util.circuit_breaker import CircuitBreaker
+
+STDIN_FILE_NAME = '-'
+
+# Sentinel for an exhausted iterator, since None is a valid item
+_NO_ITEM = object()
+
+
+def read_identifiers(identifiers: List[str] = None, ids_file: str = None) -> List[str]:
+    """
+    Collects the identifiers given on the command line and in an ids file.
+    The file holds one identifier per line, blank lines and lines starting
+    with '#' are skipped. Use '-' as the file name to read from stdin.
+    """
+    collected = list(identifiers or [])
+    if ids_file == STDIN_FILE_NAME:
+        collected.extend(_parse_identifier_lines(sys.stdin))
+    elif ids_file:
+        with open(ids_file, 'r', encoding='utf-8') as ids_fp:
+            collected.extend(_parse_identifier_lines(ids_fp))
+
+    if not collected:
+        raise MissingRequiredParameterException(
+            "Provide at least one identifier using '-i' or '--ids-file'")
+    return collected
+
+
+def _parse_identifier_lines(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        identifier = line.strip()
+        if identifier and not identifier.startswith('#'):
+            yield identifier
+
+
+def is_bulk_request(identifiers: List[str], ids_file: str = None) -> bool:
+    """
+    Returns true if the command should run in bulk mode, meaning more than
+    a single identifier was requested or an ids file was given
+    """
+    return bool(ids_file) or len(identifiers or []) > 1
+
+
+# pylint: disable=broad-except
+def run_concurrently(func: Callable, items: Iterable,
+                     max_workers: int = DEFAULT_BULK_CONCURRENCY,
+                     circuit_breaker: CircuitBreaker = None) -> Iterator[Tuple]:
+    """
+    Calls func on every item using a bounded pool of worker threads and yields
+    (item, result, error) tuples in the order of the items. A failure of one
+    item is returned as its error and does not stop the others.
+
+    The first item runs in the calling thread before the pool is started so
+    that the client authenticates once and the workers share its access token.
+    At most 2 * max_workers items are in flight at any time, so arbitrarily
+    long inputs are streamed with bounded memory.
+
+    Calls go through a circuit breaker, so when most recent calls failed
+    with transient errors the workers pause instead of hammering the server.
+    """
+    max_workers = max(1, int(max_workers or DEFAULT_BULK_CONCURRENCY))
+    circuit_breaker = circuit_breaker or CircuitBreaker()
+    func = functools.partial(circuit_breaker.call, func)
+    items = iter(items)
+    first = next(items, _NO_ITEM)
+    if first is _NO_ITEM:
+        return
+    yield _call(func, first)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for item in items:
+            in_flight.append(executor.submit(_call, func, item))
+            if len(in_flight) >= 2 * max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _call(func: Callable, item) -> Tuple:
+    try:
+        return item, func(item), None
+    except Exception as error:
+        return item, None, error
+
+
+def write_json_line(record: dict, stream=None):
+    """
+    Writes a single record as a line of newline-delimited JSON (NDJSON)
+    and flushes it so consumers can process results as they arrive
+    """
+    stream = stream or sys.stdout
+    stream.write(json.dumps(record) + '\n')
+    stream.flush()
+
+
+def open_owner_only(path: str, append: bool = False):
+    """
+    Opens a file for writing that only its owner can read, for output that
+    holds credentials. An existing file is truncated, or appended to, and its
+    mode tightened
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    file_descriptor = os.open(path, flags, 0o600)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(file_descriptor, 0o600)
+    return os.fdopen(file_descriptor, 'w', encoding='utf-8')
+
+
+@contextmanager
+def open_output(output_file: str = None, append: bool = False):
+    """
+    Yields a stream for command results: an owner-only file
+    if output_file is given, stdout otherwise
+    """
+    if not output_file:
+        yield sys.stdout
+        return
+    with open_owner_only(output_file, append) as output_fp:
+        yield output_fp
+
+
+def write_results(results: Iterable[Tuple], result_key: str, output=None) -> Tuple[int, int]:
+    """
+    Writes an (item, result, error) tuple per item, as yielded by
+    run_concurrently, as a JSON line holding either the result under
+    result_key or the error. Returns the number of succeeded and failed items
+    """
+    succeeded = failed = 0
+    for item, result, error in results:
+        if error is None:
+            succeeded += 1
+            write_json_line({'id': item, result_key: result}, output)
+        else:
+            failed += 1
+            write_json_line({'id': item, 'error': format_error(error)}, output)
+    return succeeded, failed
+
+
+def format_error(error: Exception) -> str:
+    """
+    Returns a short, user-facing description of a per-item failure
+    """
+    response = getattr(error, 'response', None)
+    message = str(error) or type(error).__name__
+    return f"{message}. Error: {response}" if response else message
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+Child process module
+
+This module launches the command of the run command with secrets in its
+environment, and writes the secrets that are passed as files
+"""
+
+# Builtins
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+# Preferred parent directories of secret files, in memory rather than on disk
+TMPFS_DIRECTORIES = ('/dev/shm',)
+
+
+class SecretFiles:
+    """
+    Writes secrets to files readable by their owner only.
+
+    Where the platform supports it (Linux), each secret is an anonymous
+    in-memory file (memfd) inherited by the child process, so no secret
+    ever reaches a file system and nothing has to be cleaned up. Otherwise
+    the files are created in a private directory, on a tmpfs if there is
+    one, that must be removed once the child process exited.
+    """
+
+    def __init__(self, use_memfd: bool = None, tmpfs_directories=TMPFS_DIRECTORIES):
+        self.use_memfd = hasattr(os, 'memfd_create') if use_memfd is None else use_memfd
+        self.tmpfs_directories = tmpfs_directories
+        self.directory = None
+        self.file_descriptors: List[int] = []
+
+    def write(self, name: str, content: str) -> str:
+        """
+        Writes the content to a new file and returns its path
+        """
+        data = content.encode('utf-8')
+        if self.use_memfd:
+            try:
+                file_descriptor = os.memfd_create(name, 0)
+            except OSError:
+                # Disabled by the kernel or a sandbox
+                self.use_memfd = False
+                return self.write(name, content)
+            self.file_descriptors.append(file_descriptor)
+            _write_fully(file_descriptor, data)
+            # The pid is kept by exec, so the path is valid in the child process
+            # and in the processes it starts
+            return f"/proc/{os.getpid()}/fd/{file_descriptor}"
+
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='conjur-run-', dir=self._parent_directory())
+        path = os.path.join(self.directory, name)
+        file_descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            _write_fully(file_descriptor, data)
+        finally:
+            os.close(file_descriptor)
+        return path
+
+    @property
+    def needs_cleanup(self) -> bool:
+        """
+        Returns true if files were written to a directory that must be removed
+        """
+        return self.directory is not None
+
+    def cleanup(self):
+        """
+        Removes the files written by this instance
+        """
+        for file_descriptor in self.file_descriptors:
+            os.close(file_descriptor)
+        self.file_descriptors = []
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def _parent_directory(self) -> str:
+        for directory in self.tmpfs_directories:
+            if os.path.isdir(directory) and os.access(directory, os.W_OK | os.X_OK):
+                return directory
+        return None
+
+
+def _write_fully(file_descriptor: int, data: bytes):
+    while data:
+        written = os.write(file_descriptor, data)
+        data = data[written:]
+
+
+# pylint: disable=too-few-public-methods
+class ChildProcess:
+    """
+    A command to launch with additional environment variables
+    """
+
+    def __init__(self, command: List[str], environment: Dict[str, str],
+                 secret_files: SecretFiles = None):
+        self.command = command
+        self.environment = environment
+        self.secret_files = secret_files
+
+    def launch(self) -> int:
+        """
+        Launches the command and returns the exit code to exit the CLI with.
+
+        On POSIX systems the command replaces the CLI process, so it receives
+        the signals sent to the CLI and returns its exit code to the caller
+        directly, unless secret files must be removed after it exited.
+        """
+        environment = dict(os.environ)
+        environment.update(self.environment)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            if os.name == 'posix' and not (self.secret_files and self.secret_files.needs_cleanup):
+                for file_descriptor in self.secret_files.file_descriptors \
+                        if self.secret_files else []:
+                    os.set_inheritable(file_descriptor, True)
+                os.execvpe(self.command[0], self.command, environment)
+            return self._run(environment)
+        except (FileNotFoundError, PermissionError) as error:
+            sys.stderr.write(f"Error: cannot run '{self.command[0]}': {error.strerror}\n")
+            # The exit code of shells for a command that cannot be found or run
+            return 127 if isinstance(error, FileNotFoundError) else 126
+        finally:
+            if self.secret_files:
+                self.secret_files.cleanup()
+
+    def _run(self, environment: Dict[str, str]) -> int:
+        # pylint: disable=consider-using-with
+        process = subprocess.Popen(self.command, env=environment)
+        while True:
+            try:
+                return process.wait()
+            except KeyboardInterrupt:
+                # The child process got the interrupt as well and decides when to exit
+                logging.debug("Interrupted, waiting for the command to exit")
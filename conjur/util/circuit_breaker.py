@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Circuit breaker module
+
+This module pauses the fan-out of commands that run on many identifiers
+when most recent requests failed with transient errors, so a struggling
+server is not hammered by every worker at once
+"""
+
+# Builtins
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# Internals
+from conjur.util.retry import is_transient_error
+
+DEFAULT_WINDOW_SIZE = 20
+DEFAULT_MIN_CALLS = 10
+DEFAULT_FAILURE_RATIO = 0.5
+DEFAULT_COOLDOWN_SECONDS = 2.0
+DEFAULT_MAX_COOLDOWN_SECONDS = 30.0
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the last window_size calls. When at least
+    failure_ratio of them failed with a transient error, the breaker opens
+    and calls wait for a cooldown. A single probe call is then let through:
+    if it succeeds the breaker closes and all calls resume, otherwise it
+    opens again with a doubled cooldown, up to max_cooldown seconds.
+
+    Errors that are not transient, such as 404 or 403, do not count as
+    failures since they say nothing about the health of the server.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, *, window_size: int = DEFAULT_WINDOW_SIZE,
+                 min_calls: int = DEFAULT_MIN_CALLS,
+                 failure_ratio: float = DEFAULT_FAILURE_RATIO,
+                 cooldown: float = DEFAULT_COOLDOWN_SECONDS,
+                 max_cooldown: float = DEFAULT_MAX_COOLDOWN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_calls = min(min_calls, window_size)
+        self.failure_ratio = failure_ratio
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.times_opened = 0
+        self._clock = clock
+        self._outcomes = deque(maxlen=window_size)
+        self._cooldown = cooldown
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._condition = threading.Condition()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Calls func once the breaker lets it through and records its outcome
+        """
+        is_probe = self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            self.record(is_probe, is_transient_error(error))
+            raise
+        self.record(is_probe, False)
+        return result
+
+    def before_call(self) -> bool:
+        """
+        Blocks while the breaker is open. Returns true if the caller was let
+        through as the probe of a half-open breaker
+        """
+        with self._condition:
+            while True:
+                if self.state == CLOSED:
+                    return False
+                if self.state == OPEN:
+                    remaining = self._opened_until - self._clock()
+                    if remaining > 0:
+                        self._condition.wait(remaining)
+                        continue
+                    self.state = HALF_OPEN
+                    self._probe_in_flight = False
+                if not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return True
+                # Wait for the outcome of the probe
+                self._condition.wait(self._cooldown)
+
+    def record(self, is_probe: bool, failed: bool):
+        """
+        Records the outcome of a call let through by before_call
+        """
+        with self._condition:
+            if is_probe:
+                self._probe_in_flight = False
+                if failed:
+                    self._open(min(self._cooldown * 2, self.max_cooldown))
+                else:
+                    logging.debug("Circuit breaker closed, resuming requests")
+                    self.state = CLOSED
+                    self._cooldown = self.base_cooldown
+                    self._outcomes.clear()
+                self._condition.notify_all()
+                return
+
+            self._outcomes.append(failed)
+            if self.state == CLOSED and len(self._outcomes) >= self.min_calls \
+                    and sum(self._outcomes) >= self.failure_ratio * len(self._outcomes):
+                self._open(self._cooldown)
+
+    # pylint: disable=logging-fstring-interpolation
+    def _open(self, cooldown: float):
+        logging.debug(f"Circuit breaker opened after repeated transient errors, "
+                      f"pausing requests for {cooldown:.1f}s")
+        self.state = OPEN
+        self.times_opened += 1
+        self._cooldown = cooldown
+        self._opened_until = self._clock() + cooldown
+        self._outcomes.clear()
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+
+"""
+Completion module
+
+This module answers the shell completion requests of the CLI. It is
+imported without the rest of the CLI, so it only depends on the standard
+library and on the resource index. Commands and options come from a
+description of the argument parser, and resource IDs from index files of
+the IDs of each kind, in the format of the local resource index, that are
+searched in place and refreshed in the background from the server.
+"""
+
+# Builtins
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Internals
+from conjur.util.private_file import write_private_file
+from conjur.util.resource_index import INDEX_FILE_SUFFIX, KindIndex, build_kind_index
+from conjur.version import __version__
+
+# Hidden command the completion scripts call, handled before the CLI is imported
+COMPLETE_COMMAND = '__complete'
+# Age after which the IDs of a kind are refreshed from the server
+CACHE_TTL_SECONDS = 300
+# Time given to a background refresh before another one is started
+REFRESH_TIMEOUT_SECONDS = 60
+# Shells ask before listing many suggestions, this bounds their work
+MAX_SUGGESTIONS = 1000
+
+COMMAND_TREE_FILE_NAME = 'commands.json'
+REFRESH_MARKER_SUFFIX = '.refreshing'
+
+RESOURCE_KINDS = ('variable', 'host', 'user', 'group', 'layer', 'policy',
+                  'webservice', 'host_factory')
+# IDs prefixed with their kind, as in 'variable:secrets/mysecret'
+QUALIFIED_ID = 'qualified'
+
+# The options that take resource IDs, and the kind of those IDs, for each
+# command. The longest command matching the words typed is used
+ID_OPTIONS: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Optional[str]]] = {
+    ('variable',): (('-i', '--id'), 'variable'),
+    ('host',): (('-i', '--id'), 'host'),
+    ('user',): (('-i', '--id'), 'user'),
+    ('policy',): (('-b', '--branch'), 'policy'),
+    ('hostfactory',): (('-i', '--hostfactoryid'), 'host_factory'),
+    # The IDs of this command are the ones of the hosts to create
+    ('hostfactory', 'create', 'host'): ((), None),
+    ('check',): (('-i', '--id'), QUALIFIED_ID),
+    ('show',): (('-i', '--id'), QUALIFIED_ID),
+    ('resource',): (('-i', '--id'), QUALIFIED_ID),
+    ('role',): (('-i', '--id'), QUALIFIED_ID),
+}
+
+
+# pylint: disable=too-few-public-methods
+class IdIndex:
+    """
+    Prefix search in the index file of the IDs of a kind, the one of the
+    local resource index. The file is memory mapped and its sorted IDs are
+    searched by bisection, so a search reads a few pages of the file
+    whatever its size.
+
+    IDs sharing a path segment are suggested once, as the segment, like
+    shells complete directories. Completing `prod/` suggests `prod/db/`
+    rather than every variable under it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def matches(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """
+        Returns the IDs and path segments starting with prefix
+        """
+        try:
+            with KindIndex(self.path) as kind_index:
+                return self._matches(kind_index, prefix, limit)
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _matches(kind_index: KindIndex, prefix: str, limit: int) -> List[str]:
+        found = []
+        numbers = kind_index.prefix_range(prefix)
+        number = numbers.start
+        while number < numbers.stop and len(found) < limit:
+            identifier = kind_index.identifier(number).decode('utf-8', errors='replace')
+            separator = identifier.find('/', len(prefix))
+            if separator == -1:
+                found.append(identifier)
+                number += 1
+            else:
+                segment = identifier[:separator + 1]
+                found.append(segment)
+                # Skips every ID of the segment
+                number = kind_index.prefix_range(segment).stop
+        return found
+
+
+class CompletionCache:
+    """
+    The files completion is answered from: the IDs of every kind and the
+    description of the commands. They are readable by their owner only,
+    since the IDs reveal the names of the resources.
+    """
+
+    def __init__(self, directory: str, clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self._clock = clock
+
+    def index(self, kind: str) -> IdIndex:
+        """
+        Returns the index of the IDs of a kind
+        """
+        return IdIndex(self._path(kind + INDEX_FILE_SUFFIX))
+
+    def write_ids(self, kind: str, identifiers):
+        """
+        Replaces the IDs of a kind
+        """
+        # Only IDs are completed, so no searchable text is indexed
+        content = build_kind_index((identifier, '') for identifier in identifiers)
+        self._write(kind + INDEX_FILE_SUFFIX, content)
+        self._remove(kind + REFRESH_MARKER_SUFFIX)
+
+    def is_stale(self, kind: str) -> bool:
+        """
+        Returns true if the IDs of a kind are missing or older than the TTL
+        """
+        try:
+            modified_at = os.stat(self._path(kind + INDEX_FILE_SUFFIX)).st_mtime
+        except OSError:
+            return True
+        return self._clock() - modified_at > CACHE_TTL_SECONDS
+
+    def start_refresh(self, kind: str) -> bool:
+        """
+        Marks the IDs of a kind as being refreshed. Returns false if a
+        refresh is already running, so only one is started at a time
+        """
+        marker = self._path(kind + REFRESH_MARKER_SUFFIX)
+        try:
+            if self._clock() - os.stat(marker).st_mtime < REFRESH_TIMEOUT_SECONDS:
+                return False
+        except OSError:
+            pass
+        try:
+            self._write(kind + REFRESH_MARKER_SUFFIX, b'')
+        except OSError:
+            return False
+        return True
+
+    def load_command_tree(self) -> Optional[dict]:
+        """
+        Returns the description of the commands, unless it is missing or
+        was written by another version of the CLI
+        """
+        try:
+            with open(self._path(COMMAND_TREE_FILE_NAME), 'r', encoding='utf-8') as tree_file:
+                tree = json.load(tree_file)
+        except (OSError, ValueError):
+            return None
+        return tree if tree.get('version') == __version__ else None
+
+    def write_command_tree(self, tree: dict):
+        """
+        Replaces the description of the commands
+        """
+        self._write(COMMAND_TREE_FILE_NAME, json.dumps(tree).encode('utf-8'))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _write(self, name: str, content: bytes):
+        write_private_file(self.directory, name, content)
+
+    def _remove(self, name: str):
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+def command_tree(parser: argparse.ArgumentParser) -> dict:
+    """
+    Returns the description of the commands of the parser: the subcommands
+    and options of every command, keyed by the words that lead to it
+    """
+    commands = {}
+
+    def describe(path: Tuple[str, ...], current: argparse.ArgumentParser):
+        subcommands = {}
+        options = []
+        multiple_value_options = []
+        for action in current._actions:  # pylint: disable=protected-access
+            if isinstance(action, argparse._SubParsersAction):  # pylint: disable=protected-access
+                subcommands.update(action.choices)
+            elif action.help != argparse.SUPPRESS:
+                options += action.option_strings
+                if action.nargs in ('*', '+'):
+                    multiple_value_options += action.option_strings
+        commands[' '.join(path)] = {'commands': sorted(subcommands),
+                                    'options': sorted(options),
+                                    'multiple_value_options': sorted(multiple_value_options)}
+        for name, subparser in subcommands.items():
+            describe(path + (name,), subparser)
+
+    describe((), parser)
+    return {'version': __version__, 'commands': commands}
+
+
+def id_kind(path: Tuple[str, ...], option: str) -> Optional[str]:
+    """
+    Returns the kind of the IDs the option of a command takes, if any
+    """
+    for length in range(len(path), 0, -1):
+        if path[:length] in ID_OPTIONS:
+            options, kind = ID_OPTIONS[path[:length]]
+            return kind if option in options else None
+    return None
+
+
+class Completer:
+    """
+    Returns the suggestions for the word being typed, given the words
+    before it. IDs are suggested from the cache, and the IDs that are
+    stale are refreshed in the background by calling refresh with their
+    kind, so a completion never waits for the server.
+    """
+
+    def __init__(self, cache: CompletionCache, load_tree: Callable[[], dict],
+                 refresh: Callable[[str], None]):
+        self.cache = cache
+        self._load_tree = load_tree
+        self._refresh = refresh
+
+    def complete(self, words: List[str], prefix: str) -> List[str]:
+        """
+        Returns the suggestions for prefix
+        """
+        tree = self._load_tree()['commands']
+        path: Tuple[str, ...] = ()
+        option = None
+        for word in words:
+            if word.startswith('-'):
+                option = word
+            elif ' '.join(path + (word,)) in tree:
+                path += (word,)
+                option = None
+            elif option not in tree[' '.join(path)]['multiple_value_options']:
+                option = None
+
+        if option is not None and not prefix.startswith('-'):
+            kind = id_kind(path, option)
+            return self._complete_ids(kind, prefix) if kind else []
+
+        command = tree[' '.join(path)]
+        candidates = command['commands']
+        if prefix.startswith('-') or not candidates:
+            candidates = command['options']
+        return [candidate for candidate in candidates if candidate.startswith(prefix)]
+
+    def _complete_ids(self, kind: str, prefix: str) -> List[str]:
+        if kind != QUALIFIED_ID:
+            return self._matches(kind, prefix)
+        kind, separator, identifier = prefix.partition(':')
+        if not separator:
+            return [f"{kind}:" for kind in RESOURCE_KINDS if kind.startswith(prefix)]
+        if kind not in RESOURCE_KINDS:
+            return []
+        return [f"{kind}:{match}" for match in self._matches(kind, identifier)]
+
+    def _matches(self, kind: str, prefix: str) -> List[str]:
+        if self.cache.is_stale(kind) and self.cache.start_refresh(kind):
+            self._refresh(kind)
+        return self.cache.index(kind).matches(prefix)
+
+
+def refresh_in_background(kind: str):
+    """
+    Starts `conjur completion refresh` for a kind, detached from the shell
+    """
+    # pylint: disable=import-outside-toplevel
+    import subprocess
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, '-m', 'conjur']
+    # pylint: disable=consider-using-with
+    subprocess.Popen(command + ['completion', 'refresh', '-k', kind],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+BASH_SCRIPT = r'''# Completion of the conjur command for bash. Add to ~/.bashrc:
+#     source <(conjur completion bash)
+_conjur_complete() {
+    local cur words cword
+    if declare -F _get_comp_words_by_ref >/dev/null 2>&1; then
+        _get_comp_words_by_ref -n : cur words cword
+    else
+        cur="${COMP_WORDS[COMP_CWORD]}"
+        words=("${COMP_WORDS[@]}")
+        cword=$COMP_CWORD
+    fi
+    local IFS=$'\n'
+    COMPREPLY=($("${words[0]}" __complete "${words[@]:1:cword-1}" "$cur" 2>/dev/null))
+    if [[ ${#COMPREPLY[@]} -eq 1 && ${COMPREPLY[0]} == *[/:] ]]; then
+        compopt -o nospace
+    fi
+    if declare -F __ltrim_colon_completions >/dev/null 2>&1; then
+        __ltrim_colon_completions "$cur"
+    fi
+}
+complete -o default -F _conjur_complete conjur
+'''
+
+ZSH_SCRIPT = r'''#compdef conjur
+# Completion of the conjur command for zsh. Add to ~/.zshrc, after compinit:
+#     source <(conjur completion zsh)
+_conjur() {
+    local candidate
+    local -a candidates
+    candidates=("${(@f)$("${words[1]}" __complete "${(@)words[2,CURRENT-1]}" "${words[CURRENT]}" 2>/dev/null)}")
+    for candidate in $candidates; do
+        if [[ $candidate == *[/:] ]]; then
+            compadd -S '' -- "$candidate"
+        else
+            compadd -- "$candidate"
+        fi
+    done
+    (( ${#candidates} )) || _files
+}
+compdef _conjur conjur
+'''
+
+FISH_SCRIPT = r'''# Completion of the conjur command for fish. Add to ~/.config/fish/config.fish:
+#     conjur completion fish | source
+function __conjur_complete
+    set -l words (commandline -opc)
+    $words[1] __complete $words[2..-1] (commandline -ct) 2>/dev/null
+end
+complete -c conjur -a '(__conjur_complete)'
+'''
+
+COMPLETION_SCRIPTS = {'bash': BASH_SCRIPT, 'zsh': ZSH_SCRIPT, 'fish': FISH_SCRIPT}
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+File lock module
+
+This module holds an advisory, cross-process lock on a file, used to
+coordinate CLI processes that share local state files
+"""
+
+# Builtins
+import os
+from contextlib import contextmanager
+
+# pylint: disable=import-error
+if os.name == 'posix':
+    import fcntl
+else:  # pragma: no cover
+    import msvcrt
+
+
+@contextmanager
+def locked_file(path: str):
+    """
+    Opens the file at path for reading and writing, creating it readable by
+    its owner only if it is missing, and holds an exclusive lock on it while
+    the context is active. Other processes entering the context block until
+    the lock is released.
+    """
+    file_descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        _lock(file_descriptor)
+        try:
+            yield file_descriptor
+        finally:
+            _unlock(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def read_all(file_descriptor: int) -> str:
+    """
+    Reads the whole content of a locked file
+    """
+    os.lseek(file_descriptor, 0, os.SEEK_SET)
+    chunks = []
+    while True:
+        chunk = os.read(file_descriptor, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8')
+
+
+def write_all(file_descriptor: int, content: str, sync: bool = True):
+    """
+    Replaces the content of a locked file and, unless sync is false,
+    flushes it to disk
+    """
+    data = content.encode('utf-8')
+    os.lseek(file_descriptor, 0, os.SEEK_SET)
+    os.ftruncate(file_descriptor, 0)
+    while data:
+        written = os.write(file_descriptor, data)
+        data = data[written:]
+    if sync:
+        os.fsync(file_descriptor)
+
+
+if os.name == 'posix':
+    def _lock(file_descriptor: int):
+        fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+
+    def _unlock(file_descriptor: int):
+        fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+else:  # pragma: no cover
+    def _lock(file_descriptor: int):
+        os.lseek(file_descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(file_descriptor, msvcrt.LK_LOCK, 1)
+
+    def _unlock(file_descriptor: int):
+        os.lseek(file_descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(file_descriptor, msvcrt.LK_UNLCK, 1)
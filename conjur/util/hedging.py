@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hedging module
+
+This module cuts the tail latency of secret reads by sending a second,
+hedged request to another endpoint when the first one is slower than usual
+"""
+
+# Builtins
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Internals
+from conjur.util.read_routing import EndpointHealth, is_endpoint_failure
+
+HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_DELAY_SECONDS = 0.1
+MIN_HEDGE_DELAY_SECONDS = 0.01
+
+
+class HedgedReader:
+    """
+    Reads a variable from the endpoint that is expected to answer fastest.
+    If no answer arrived within the 95th percentile of the recent response
+    times of that endpoint, the same read is sent to the next best endpoint.
+    The first answer wins and the other request is cancelled. An endpoint
+    that fails to serve the read triggers the hedged request immediately.
+
+    The clients are created in async mode, so both requests run concurrently
+    on a single event loop and the losing one can be cancelled.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, leader_url: str, read_urls: List[str],
+                 create_client: Callable[[str], object], health: EndpointHealth, *,
+                 default_delay: float = DEFAULT_HEDGE_DELAY_SECONDS,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.leader_url = leader_url
+        self.read_urls = read_urls
+        self.default_delay = default_delay
+        self._create_client = create_client
+        self._health = health
+        self._clock = clock
+        self._clients: Dict[str, object] = {}
+
+    def get(self, variable_id: str, version: str = None) -> bytes:
+        """
+        Returns the value of the variable, from whichever endpoint answered first
+        """
+        return asyncio.run(self._get(variable_id, version))
+
+    def endpoints(self) -> Tuple[str, Optional[str]]:
+        """
+        Returns the endpoint to read from and the endpoint to send the hedged
+        read to, if any. Reads go to the followers, the leader being the last resort
+        """
+        candidates = self._health.ranked(self.read_urls) + [self.leader_url]
+        return candidates[0], candidates[1] if len(candidates) > 1 else None
+
+    def hedge_delay(self, url: str) -> float:
+        """
+        Returns the time to wait for an answer of the endpoint before hedging
+        """
+        delay = self._health.percentile(url, HEDGE_PERCENTILE)
+        if delay is None:
+            return self.default_delay
+        return max(delay, MIN_HEDGE_DELAY_SECONDS)
+
+    # pylint: disable=logging-fstring-interpolation
+    async def _get(self, variable_id: str, version: str) -> bytes:
+        primary_url, alternate_url = self.endpoints()
+        primary = asyncio.ensure_future(self._timed_get(primary_url, variable_id, version))
+        if alternate_url is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(primary_url))
+        if done and (primary.exception() is None
+                     or not is_endpoint_failure(primary.exception())):
+            return primary.result()
+
+        logging.debug(f"No answer from '{primary_url}' yet, "
+                      f"sending a hedged request to '{alternate_url}'")
+        pending = {primary, asyncio.ensure_future(
+            self._timed_get(alternate_url, variable_id, version))} - done
+        error = primary.exception() if done else None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    if not is_endpoint_failure(error):
+                        raise error
+            raise error
+        finally:
+            # The losing request is cancelled rather than awaited
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed_get(self, url: str, variable_id: str, version: str) -> bytes:
+        client = self._client(url)
+        started_at = self._clock()
+        try:
+            result = await client.get(variable_id, version)
+        except Exception as error:  # pylint: disable=broad-except
+            if is_endpoint_failure(error):
+                self._health.record_failure(url)
+            else:
+                self._health.record_success(url, self._clock() - started_at)
+            raise
+        self._health.record_success(url, self._clock() - started_at)
+        return result
+
+    def _client(self, url: str):
+        if url not in self._clients:
+            self._clients[url] = self._create_client(url)
+        return self._clients[url]
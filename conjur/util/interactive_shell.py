@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+"""
+Interactive shell module
+
+This module reads CLI commands line by line and runs them in the same
+process, with history and tab completion where readline is available
+"""
+
+# Builtins
+import argparse
+import logging
+import os
+import re
+import shlex
+import sys
+from typing import Callable, List
+
+try:
+    import readline
+except ImportError:  # pragma: no cover
+    # Not available on Windows
+    readline = None
+
+SHELL_PROMPT = 'conjur> '
+EXIT_COMMANDS = ('exit', 'quit')
+HELP_COMMANDS = ('help', '?')
+HISTORY_LENGTH = 1000
+# Lines passing secrets as options are kept out of the history
+SENSITIVE_OPTIONS_PATTERN = re.compile(r'(^|\s)(-v|--value|-p|--password)(\s|=|$)')
+
+
+def completions(parser: argparse.ArgumentParser, words: List[str], prefix: str) -> List[str]:
+    """
+    Returns the commands, subcommands and options that can follow words
+    and start with prefix
+    """
+    current = parser
+    for word in words:
+        subparsers = _subparser_choices(current)
+        if word in subparsers:
+            current = subparsers[word]
+    candidates = list(_subparser_choices(current))
+    if not words:
+        candidates += EXIT_COMMANDS + HELP_COMMANDS[:1]
+    if prefix.startswith('-') or not candidates:
+        candidates += [option for action in current._actions  # pylint: disable=protected-access
+                       for option in action.option_strings]
+    return sorted(set(candidate for candidate in candidates if candidate.startswith(prefix)))
+
+
+def _subparser_choices(parser: argparse.ArgumentParser) -> dict:
+    for action in parser._actions:  # pylint: disable=protected-access
+        if isinstance(action, argparse._SubParsersAction):  # pylint: disable=protected-access
+            return action.choices
+    return {}
+
+
+class InteractiveShell:
+    """
+    Runs the commands typed by the user until they exit. Each line is split
+    like a shell would and passed to execute, which returns its exit code.
+
+    The prompt is only shown when the input is a terminal, so a file of
+    commands can be piped to the shell as well.
+    """
+
+    def __init__(self, parser: argparse.ArgumentParser, execute: Callable[[List[str]], int],
+                 history_file: str = None, input_func: Callable[[str], str] = input):
+        self.parser = parser
+        self.history_file = history_file
+        self.last_exit_code = 0
+        self._execute = execute
+        self._input = input_func
+        self._matches: List[str] = []
+
+    def run(self) -> int:
+        """
+        Runs commands until the end of the input or an exit command,
+        and returns the exit code of the last command
+        """
+        interactive = sys.stdin.isatty()
+        if interactive:
+            self._setup_readline()
+        try:
+            while True:
+                try:
+                    line = self._input(SHELL_PROMPT if interactive else '')
+                except EOFError:
+                    if interactive:
+                        sys.stdout.write('\n')
+                    break
+                except KeyboardInterrupt:
+                    # Discards the line being typed, as shells do
+                    sys.stdout.write('\n')
+                    continue
+                if interactive and readline is not None \
+                        and SENSITIVE_OPTIONS_PATTERN.search(line) \
+                        and readline.get_current_history_length() > 0:
+                    readline.remove_history_item(readline.get_current_history_length() - 1)
+                if not self.run_line(line):
+                    break
+        finally:
+            if interactive:
+                self._save_history()
+        return self.last_exit_code
+
+    def run_line(self, line: str) -> bool:
+        """
+        Runs a line of input. Returns false if the shell should exit
+        """
+        try:
+            words = shlex.split(line, comments=True)
+        except ValueError as error:
+            sys.stdout.write(f"Error: {error}\n")
+            self.last_exit_code = 1
+            return True
+        if not words:
+            return True
+        if words[0] in EXIT_COMMANDS:
+            return False
+        if words[0] in HELP_COMMANDS:
+            self.parser.print_help()
+            return True
+        try:
+            self.last_exit_code = self._execute(words)
+        except KeyboardInterrupt:
+            sys.stdout.write('\n')
+            self.last_exit_code = 130
+        return True
+
+    def complete(self, text: str, state: int):
+        """
+        Readline completer of commands, subcommands and options
+        """
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_begidx()]
+            try:
+                words = shlex.split(line)
+            except ValueError:
+                words = []
+            self._matches = completions(self.parser, words, text)
+        return self._matches[state] if state < len(self._matches) else None
+
+    # pylint: disable=logging-fstring-interpolation
+    def _setup_readline(self):
+        if readline is None:
+            return
+        readline.set_completer(self.complete)
+        readline.set_completer_delims(' \t\n')
+        # libedit, used by the Python of macOS, has its own syntax
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind('bind ^I rl_complete')
+        else:
+            readline.parse_and_bind('tab: complete')
+        readline.set_history_length(HISTORY_LENGTH)
+        if self.history_file and os.path.exists(self.history_file):
+            try:
+                readline.read_history_file(self.history_file)
+            except OSError:
+                logging.debug(f"Failed to read the history from '{self.history_file}'")
+
+    # pylint: disable=logging-fstring-interpolation
+    def _save_history(self):
+        if readline is None or not self.history_file:
+            return
+        try:
+            # Commands may reveal the names of sensitive resources
+            os.close(os.open(self.history_file, os.O_WRONLY | os.O_CREAT, 0o600))
+            readline.write_history_file(self.history_file)
+        except OSError:
+            logging.debug(f"Failed to write the history to '{self.history_file}'")
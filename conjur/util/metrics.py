@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+"""
+Metrics module
+
+This module records a metric for every call made to the Conjur client, with
+the endpoint called, its status, the size of the response, its duration and
+the number of retries before it, and exports them as JSON lines or as a
+Prometheus textfile for the node exporter textfile collector.
+
+Nothing here is used unless metrics were requested: the client is only
+wrapped when a metrics file is configured.
+"""
+
+# Builtins
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from typing import Callable, List
+
+# SDK
+from conjur_api.errors.errors import HttpStatusError
+
+# Internals
+from conjur.util.file_lock import locked_file
+from conjur.util.retry import current_attempt
+
+JSONL_FORMAT = 'jsonl'
+PROMETHEUS_FORMAT = 'prometheus'
+METRICS_FORMATS = [JSONL_FORMAT, PROMETHEUS_FORMAT]
+PROMETHEUS_FILE_EXTENSION = '.prom'
+
+METRICS_FILE_ENV_VARIABLE_NAME = 'CONJUR_CLI_METRICS_FILE'
+
+# The JSON lines sink appends its buffer at least this often
+JSONL_FLUSH_RECORDS = 1000
+JSONL_FLUSH_SECONDS = 5.0
+
+METRIC_PREFIX = 'conjur_cli_request'
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Matches a sample line of the textfile, as written by PrometheusTextfileSink
+_SAMPLE_LINE = re.compile(r'^(?P<key>[a-zA-Z_:][a-zA-Z0-9_:]*(?:\{.*\})?) (?P<value>\S+)$')
+
+
+def metrics_format_for(path: str, metrics_format: str = None) -> str:
+    """
+    Returns the format to write the metrics file in, which is Prometheus for
+    files with the textfile collector's '.prom' extension unless specified
+    """
+    if metrics_format:
+        return metrics_format
+    return PROMETHEUS_FORMAT if path.endswith(PROMETHEUS_FILE_EXTENSION) else JSONL_FORMAT
+
+
+def response_size(result) -> int:
+    """
+    Returns the approximate size in bytes of a response returned by the client
+    """
+    if result is None:
+        return 0
+    if isinstance(result, (bytes, bytearray)):
+        return len(result)
+    if isinstance(result, str):
+        return len(result.encode('utf-8'))
+    try:
+        return len(json.dumps(result, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+class JsonLinesMetricsSink:
+    """
+    Appends one JSON object per request to a file. Records are buffered and
+    appended every JSONL_FLUSH_RECORDS records or JSONL_FLUSH_SECONDS, and
+    when the process exits, so long-running commands keep a bounded buffer.
+    Records that cannot be appended before the exit are dropped, so a full
+    disk neither fails the command nor grows the buffer.
+    Lines of concurrent CLI processes do not interleave because each
+    process appends its lines under a file lock
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.records = []
+        self._last_flush = clock()
+
+    def add(self, record: dict):
+        """
+        Buffers a request record, appending the buffer to the file once it
+        is full or old enough
+        """
+        self.records.append(record)
+        if len(self.records) >= JSONL_FLUSH_RECORDS \
+                or self.clock() - self._last_flush >= JSONL_FLUSH_SECONDS:
+            try:
+                self.flush()
+            except OSError:
+                # Failing to write metrics must not change the outcome of the command
+                logging.debug(traceback.format_exc())
+                self.records = []
+
+    def flush(self):
+        """
+        Appends the buffered records to the file
+        """
+        self._last_flush = self.clock()
+        if not self.records:
+            return
+        content = ''.join(json.dumps(record) + '\n' for record in self.records)
+        with locked_file(self.path) as file_descriptor:
+            os.lseek(file_descriptor, 0, os.SEEK_END)
+            os.write(file_descriptor, content.encode('utf-8'))
+        self.records = []
+
+
+class PrometheusTextfileSink:
+    """
+    Keeps cumulative request counters in a Prometheus textfile. Every CLI
+    process adds its requests to the counters already in the file, and
+    replaces the file atomically so the collector never reads a partial file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.samples = {}
+
+    def add(self, record: dict):
+        """
+        Adds a request record to the counters
+        """
+        endpoint = _escape_label(record['endpoint'])
+        status = _escape_label(str(record['status']))
+        self._increment(f'{METRIC_PREFIX}s_total{{endpoint="{endpoint}",status="{status}"}}', 1)
+        self._increment(f'{METRIC_PREFIX}_retries_total{{endpoint="{endpoint}"}}',
+                        record['retries'])
+        self._increment(f'{METRIC_PREFIX}_response_bytes_total{{endpoint="{endpoint}"}}',
+                        record['response_bytes'])
+        duration = record['duration_seconds']
+        for bucket in DURATION_BUCKETS:
+            if duration <= bucket:
+                self._increment(f'{METRIC_PREFIX}_duration_seconds_bucket'
+                                f'{{endpoint="{endpoint}",le="{bucket}"}}', 1)
+        self._increment(f'{METRIC_PREFIX}_duration_seconds_bucket'
+                        f'{{endpoint="{endpoint}",le="+Inf"}}', 1)
+        self._increment(f'{METRIC_PREFIX}_duration_seconds_sum{{endpoint="{endpoint}"}}',
+                        duration)
+        self._increment(f'{METRIC_PREFIX}_duration_seconds_count{{endpoint="{endpoint}"}}', 1)
+
+    def _increment(self, key: str, value: float):
+        self.samples[key] = self.samples.get(key, 0) + value
+
+    def flush(self):
+        """
+        Adds the counters to the ones in the file
+        """
+        if not self.samples:
+            return
+        # The lock is taken on a separate file since the textfile is replaced
+        with locked_file(self.path + '.lock'):
+            samples = self._read_samples()
+            for key, value in self.samples.items():
+                samples[key] = samples.get(key, 0) + value
+            temporary_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w', encoding='utf-8') as textfile:
+                textfile.write(_format_textfile(samples))
+            os.replace(temporary_path, self.path)
+        self.samples = {}
+
+    def _read_samples(self) -> dict:
+        samples = {}
+        if not os.path.exists(self.path):
+            return samples
+        with open(self.path, 'r', encoding='utf-8') as textfile:
+            for line in textfile:
+                match = _SAMPLE_LINE.match(line.strip())
+                if match:
+                    samples[match.group('key')] = float(match.group('value'))
+        return samples
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_textfile(samples: dict) -> str:
+    types = {
+        f'{METRIC_PREFIX}s_total': 'counter',
+        f'{METRIC_PREFIX}_retries_total': 'counter',
+        f'{METRIC_PREFIX}_response_bytes_total': 'counter',
+        f'{METRIC_PREFIX}_duration_seconds': 'histogram',
+    }
+    lines = []
+    for name, metric_type in types.items():
+        keys = sorted(key for key in samples
+                      if key.split('{', 1)[0] in (name, f'{name}_bucket', f'{name}_sum',
+                                                  f'{name}_count'))
+        if not keys:
+            continue
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(f'{key} {samples[key]:g}' for key in keys)
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRecorder:
+    """
+    Records a metric for every call of an instrumented client and passes
+    it to a sink, which writes out what it still holds when the recorder is
+    closed
+    """
+
+    def __init__(self, sink, command: str = None, clock: Callable[[], float] = time.time,
+                 timer: Callable[[], float] = time.perf_counter):
+        self.sink = sink
+        self.command = command
+        self.clock = clock
+        self.timer = timer
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(path: str, metrics_format: str = None, command: str = None):
+        """
+        Returns a recorder writing to the file at path in the given format
+        """
+        if metrics_format_for(path, metrics_format) == PROMETHEUS_FORMAT:
+            return MetricsRecorder(PrometheusTextfileSink(path), command)
+        return MetricsRecorder(JsonLinesMetricsSink(path), command)
+
+    def wrap_client(self, client):
+        """
+        Returns a proxy of the client that records every call it makes
+        """
+        return _InstrumentedClient(client, self)
+
+    # pylint: disable=too-many-arguments
+    def record(self, endpoint: str, started_at: float, duration: float,
+               result=None, error: Exception = None):
+        """
+        Records a single call to the client
+        """
+        if error is None:
+            status = 'ok'
+        elif isinstance(error, HttpStatusError):
+            status = error.status
+        else:
+            status = type(error).__name__
+        record = {
+            'timestamp': round(started_at, 6),
+            'command': self.command,
+            'endpoint': endpoint,
+            'status': status,
+            'response_bytes': response_size(result),
+            'duration_seconds': round(duration, 6),
+            'retries': current_attempt() - 1,
+        }
+        with self._lock:
+            self.sink.add(record)
+
+    def close(self):
+        """
+        Writes out the recorded metrics
+        """
+        with self._lock:
+            self.sink.flush()
+
+    @property
+    def records(self) -> List[dict]:
+        """
+        Returns the records not written yet, when the sink keeps them
+        """
+        return list(getattr(self.sink, 'records', []))
+
+
+# pylint: disable=too-few-public-methods
+class _InstrumentedClient:
+    """
+    Proxy of the Conjur client that records a metric for every method call,
+    awaiting the calls of a client in async mode
+    """
+
+    def __init__(self, client, recorder: MetricsRecorder):
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        recorder = self._recorder
+
+        if getattr(self._client, 'async_mode', None) is True:
+            async def instrumented_async(*args, **kwargs):
+                started_at = recorder.clock()
+                timer_started_at = recorder.timer()
+                try:
+                    result = await attribute(*args, **kwargs)
+                # A cancelled request, such as the loser of a hedged read, was sent all the same
+                except (Exception, asyncio.CancelledError) as error:
+                    _record_safely(recorder, name, started_at,
+                                   recorder.timer() - timer_started_at, error=error)
+                    raise
+                _record_safely(recorder, name, started_at,
+                               recorder.timer() - timer_started_at, result=result)
+                return result
+            return instrumented_async
+
+        def instrumented(*args, **kwargs):
+            started_at = recorder.clock()
+            timer_started_at = recorder.timer()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as error:
+                _record_safely(recorder, name, started_at,
+                               recorder.timer() - timer_started_at, error=error)
+                raise
+            _record_safely(recorder, name, started_at, recorder.timer() - timer_started_at,
+                           result=result)
+            return result
+        return instrumented
+
+
+# pylint: disable=too-many-arguments
+def _record_safely(recorder: MetricsRecorder, endpoint: str, started_at: float,
+                   duration: float, *, result=None, error: Exception = None):
+    # Recording a call must never change its result or its error
+    # pylint: disable=broad-except
+    try:
+        recorder.record(endpoint, started_at, duration, result, error)
+    except Exception:
+        logging.debug(traceback.format_exc())
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+Private file module
+
+This module writes the local caches of the CLI, which are readable by
+their owner only
+"""
+
+# Builtins
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def write_private_file(directory: str, name: str, content: bytes):
+    """
+    Replaces the file name of directory with content. The directory is
+    created if needed
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    with open_private_file(os.path.join(directory, name)) as private_file:
+        private_file.write(content)
+
+
+@contextmanager
+def open_private_file(path: str):
+    """
+    Yields a binary file that replaces the file at path once the block
+    succeeds. The file is written next to its destination and renamed, so
+    that readers never see a partial file, and is removed if the block fails
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    # mkstemp creates the file readable by its owner only
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.")
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            yield temporary_file
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
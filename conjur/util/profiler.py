@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Profiler module
+
+This module measures where a CLI invocation spends its time. It is imported
+first by the conjur package so the time spent importing the CLI is known.
+"""
+
+# Builtins
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Taken when the conjur package starts importing its modules
+IMPORT_STARTED_AT = time.perf_counter()
+
+
+def process_age() -> Optional[float]:
+    """
+    Returns the number of seconds since the current process started, or
+    None where the platform does not expose it. The resolution is a clock tick
+    """
+    try:
+        with open(f'/proc/{os.getpid()}/stat', 'r', encoding='utf-8') as stat_fp:
+            # The command name may hold spaces, the fields after it may not
+            start_ticks = int(stat_fp.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r', encoding='utf-8') as uptime_fp:
+            uptime = float(uptime_fp.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class Profiler:
+    """
+    Records the duration of named phases of a CLI invocation, the time spent
+    in calls to the Conjur client and, optionally, a cProfile of the command.
+
+    Recording a phase costs two clock reads, so the phases are always recorded
+    and only reported when profiling was requested.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.created_at = clock()
+        age = process_age()
+        self.process_started_at = self.created_at - age if age is not None else None
+        self.phases = []
+        self.client_calls = {}
+        self._client_calls_lock = threading.Lock()
+        self._cprofile = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Records the duration of the wrapped block as the phase 'name'
+        """
+        started_at = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self.clock() - started_at))
+
+    def record_client_call(self, name: str, seconds: float):
+        """
+        Adds a call to the Conjur client, which includes its network round trips
+        """
+        with self._client_calls_lock:
+            count, total = self.client_calls.get(name, (0, 0.0))
+            self.client_calls[name] = (count + 1, total + seconds)
+
+    def wrap_client(self, client):
+        """
+        Returns a proxy of the client that records the duration of its calls
+        """
+        return _ProfiledClient(client, self)
+
+    def start_cprofile(self):
+        """
+        Starts collecting a cProfile of the calling thread
+        """
+        # Imported here so cProfile is only loaded when it is requested
+        import cProfile  # pylint: disable=import-outside-toplevel
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def dump_cprofile(self, path: str):
+        """
+        Stops collecting the cProfile and writes it in pstats format
+        """
+        if self._cprofile is None:
+            return
+        self._cprofile.disable()
+        self._cprofile.dump_stats(path)
+        self._cprofile = None
+
+    def report(self) -> str:
+        """
+        Returns the timing report of the phases recorded so far
+        """
+        lines = ['Profile:', f"  {'phase':<44}{'seconds':>10}"]
+        if self.process_started_at is not None:
+            lines.append(f"  {'interpreter start':<44}"
+                         f"{IMPORT_STARTED_AT - self.process_started_at:>10.3f}")
+        lines.append(f"  {'imports':<44}{self.created_at - IMPORT_STARTED_AT:>10.3f}")
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<44}{seconds:>10.3f}")
+        for name, (count, seconds) in sorted(self.client_calls.items()):
+            lines.append(f"    {'client.' + name + f' x{count}':<42}{seconds:>10.3f}")
+        started_at = self.process_started_at if self.process_started_at is not None \
+            else IMPORT_STARTED_AT
+        lines.append(f"  {'total':<44}{self.clock() - started_at:>10.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, stream=None):
+        """
+        Writes the timing report, to stderr by default so command output is unaffected
+        """
+        (stream or sys.stderr).write(self.report())
+
+
+# pylint: disable=too-few-public-methods
+class _ProfiledClient:
+    """
+    Proxy of the Conjur client that times every method call
+    """
+
+    def __init__(self, client, profiler: Profiler):
+        self._client = client
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def timed(*args, **kwargs):
+            started_at = self._profiler.clock()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._profiler.record_client_call(name, self._profiler.clock() - started_at)
+        return timed
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+RateLimiter module
+
+This module holds a client-side throttle for commands that fan out
+many requests to the Conjur server
+"""
+
+# Builtins
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable
+
+# Internals
+from conjur.util.file_lock import locked_file, read_all, write_all
+
+RATE_LIMIT_STATE_VERSION = 1
+DEFAULT_POLL_INTERVAL_SECONDS = 0.01
+
+
+# pylint: disable=too-few-public-methods
+class RateLimiter:
+    """
+    Token bucket limiting the rate of requests.
+
+    The bucket holds up to 'burst' tokens and is refilled at 'rate' tokens
+    per second. Every request takes a token; when none is left the caller
+    reserves the next one and sleeps until it becomes available, so
+    concurrent callers are served in the order they arrived. The clock and
+    sleep functions are injectable to keep the limiter deterministic under test.
+    """
+
+    def __init__(self, rate: float, burst: int = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError(f"Rate must be a positive number, got: {rate}")
+        self.rate = float(rate)
+        self.burst = burst if burst else max(1, math.ceil(self.rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, sleeping until one is available.
+        Returns the number of seconds the caller waited
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class SharedRateLimiter:
+    """
+    Limits the rate of requests and the number of requests in flight to a
+    Conjur appliance across all the CLI processes of the machine.
+
+    The state of a token bucket and the in-flight count of every process is
+    kept per appliance URL in a small JSON file, updated under an exclusive
+    file lock. Processes that exited without releasing their requests are
+    dropped from the in-flight count. The clock and sleep functions are
+    injectable to keep the limiter deterministic under test.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, state_file: str, appliance: str, *, rate: float = None,
+                 max_in_flight: int = None, burst: int = None,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS):
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Rate must be a positive number, got: {rate}")
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError(f"Maximum in-flight requests must be a positive number, "
+                             f"got: {max_in_flight}")
+        self.state_file = state_file
+        self.appliance = appliance
+        self.rate = float(rate) if rate else None
+        self.burst = burst if burst else max(1, math.ceil(rate)) if rate else None
+        self.max_in_flight = max_in_flight
+        self.pid = str(os.getpid())
+        self._clock = clock
+        self._sleep = sleep
+        self._poll_interval = poll_interval
+
+    def acquire(self) -> float:
+        """
+        Waits until the rate allows another request and a request slot is
+        free, and takes the slot. Returns the number of seconds the caller waited
+        """
+        waited = 0.0
+        if self.rate:
+            wait = self._update(self._take_token)
+            if wait > 0:
+                self._sleep(wait)
+                waited += wait
+        if self.max_in_flight:
+            while not self._update(self._take_slot):
+                self._sleep(self._poll_interval)
+                waited += self._poll_interval
+        return waited
+
+    def release(self):
+        """
+        Frees the request slot taken by acquire
+        """
+        if self.max_in_flight:
+            self._update(self._free_slot)
+
+    @contextmanager
+    def request(self):
+        """
+        Holds a request slot while the context is active
+        """
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def async_request(self):
+        """
+        Holds a request slot while the context is active. The slot is waited
+        for in a thread, so the event loop keeps serving the other requests
+        """
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The slot taken once the wait ends is freed at once
+            acquiring.add_done_callback(self._release_if_acquired)
+            raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _release_if_acquired(self, acquiring: asyncio.Future):
+        if acquiring.exception() is None:
+            self.release()
+
+    def _update(self, change: Callable[[dict], object]):
+        with locked_file(self.state_file) as file_descriptor:
+            content = read_all(file_descriptor)
+            try:
+                state = json.loads(content) if content else {}
+            except ValueError:
+                # A corrupted state only loses the history of the bucket
+                state = {}
+            appliances = state.setdefault('appliances', {})
+            result = change(appliances.setdefault(self.appliance, {}))
+            state['version'] = RATE_LIMIT_STATE_VERSION
+            # Losing the state in a crash is harmless, so it is not synced to disk
+            write_all(file_descriptor, json.dumps(state), sync=False)
+        return result
+
+    def _take_token(self, appliance_state: dict) -> float:
+        now = self._clock()
+        tokens = appliance_state.get('tokens', float(self.burst))
+        updated = appliance_state.get('updated', now)
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+        appliance_state['tokens'] = tokens
+        appliance_state['updated'] = now
+        # A negative balance reserves the next tokens for this caller
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    def _take_slot(self, appliance_state: dict) -> bool:
+        in_flight = {pid: count for pid, count in appliance_state.get('in_flight', {}).items()
+                     if count > 0 and (pid == self.pid or _is_process_alive(int(pid)))}
+        appliance_state['in_flight'] = in_flight
+        if sum(in_flight.values()) >= self.max_in_flight:
+            return False
+        in_flight[self.pid] = in_flight.get(self.pid, 0) + 1
+        return True
+
+    def _free_slot(self, appliance_state: dict):
+        in_flight = appliance_state.setdefault('in_flight', {})
+        count = in_flight.get(self.pid, 0) - 1
+        if count > 0:
+            in_flight[self.pid] = count
+        else:
+            in_flight.pop(self.pid, None)
+
+
+def _is_process_alive(pid: int) -> bool:
+    if os.name != 'posix':  # pragma: no cover
+        # Slots of crashed processes are only reclaimed on POSIX
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# pylint: disable=too-few-public-methods
+class ThrottledClient:
+    """
+    Proxy of the Conjur client that passes every method call through a
+    shared rate limiter. The calls of a client in async mode are throttled
+    without blocking its event loop
+    """
+
+    def __init__(self, client, rate_limiter: SharedRateLimiter):
+        self._client = client
+        self._rate_limiter = rate_limiter
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        rate_limiter = self._rate_limiter
+
+        if getattr(self._client, 'async_mode', None) is True:
+            async def throttled_async(*args, **kwargs):
+                async with rate_limiter.async_request():
+                    return await attribute(*args, **kwargs)
+            return throttled_async
+
+        def throttled(*args, **kwargs):
+            with rate_limiter.request():
+                return attribute(*args, **kwargs)
+        return throttled
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+"""
+Read routing module
+
+This module sends the read requests of the CLI to read-only followers,
+choosing the follower that answered fastest recently, while writes and
+policy loads go to the leader
+"""
+
+# Builtins
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# SDK
+from conjur_api.errors.errors import CertificateHostnameMismatchException, HttpSslError
+
+# Internals
+from conjur.util.file_lock import locked_file, read_all, write_all
+from conjur.util.retry import is_transient_error
+
+ENDPOINT_HEALTH_STATE_VERSION = 1
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_STALE_AFTER_SECONDS = 300.0
+DEFAULT_UNHEALTHY_COOLDOWN_SECONDS = 30.0
+DEFAULT_MAX_UNHEALTHY_COOLDOWN_SECONDS = 300.0
+# Number of recent response times kept per endpoint for percentiles
+RESPONSE_TIME_SAMPLES = 50
+
+# Client methods that only read state, and so can be served by a follower
+READ_CLIENT_METHODS = frozenset([
+    'list', 'check_privilege', 'get_resource', 'resource_exists', 'get_role', 'role_exists',
+    'role_memberships', 'list_permitted_roles', 'list_members_of_role', 'get', 'get_many',
+    'find_resources_by_identifier', 'find_resource_by_identifier',
+])
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """
+    Returns true if the error means the endpoint could not serve the request,
+    as opposed to an answer such as 404 that the leader would give as well
+    """
+    return is_transient_error(error) or \
+        isinstance(error, (HttpSslError, CertificateHostnameMismatchException))
+
+
+class EndpointHealth:
+    """
+    Tracks the response time and health of Conjur endpoints, shared by the
+    CLI processes of the machine through a small state file.
+
+    Response times are smoothed as an exponentially weighted moving average
+    (EWMA). An endpoint that failed is skipped for a cooldown that doubles
+    with every consecutive failure. Endpoints without a recent response time
+    are preferred, so every endpoint is measured again periodically.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, state_file: str, *, clock: Callable[[], float] = time.time,
+                 alpha: float = DEFAULT_EWMA_ALPHA,
+                 stale_after: float = DEFAULT_STALE_AFTER_SECONDS,
+                 cooldown: float = DEFAULT_UNHEALTHY_COOLDOWN_SECONDS,
+                 max_cooldown: float = DEFAULT_MAX_UNHEALTHY_COOLDOWN_SECONDS):
+        self.state_file = state_file
+        self.alpha = alpha
+        self.stale_after = stale_after
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._endpoints = None
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def select(self, urls: List[str]) -> Optional[str]:
+        """
+        Returns the healthy endpoint to send requests to, or None if none is healthy
+        """
+        ranked = self.ranked(urls)
+        return ranked[0] if ranked else None
+
+    def ranked(self, urls: List[str]) -> List[str]:
+        """
+        Returns the healthy endpoints in the order they should be used:
+        endpoints to measure first, then from the fastest to the slowest
+        """
+        with self._lock:
+            now = self._clock()
+            healthy = [url for url in urls
+                       if self._endpoint(url).get('unhealthy_until', 0) <= now]
+            unmeasured = [url for url in healthy
+                          if self._endpoint(url).get('ewma_seconds') is None
+                          or now - self._endpoint(url).get('measured_at', 0) > self.stale_after]
+            measured = sorted((url for url in healthy if url not in unmeasured),
+                              key=lambda url: self._endpoint(url)['ewma_seconds'])
+            return unmeasured + measured
+
+    def percentile(self, url: str, fraction: float, min_samples: int = 5) -> Optional[float]:
+        """
+        Returns the given percentile of the recent response times of the
+        endpoint, or None if it has too few of them
+        """
+        with self._lock:
+            samples = sorted(self._endpoint(url).get('samples', []))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def record_success(self, url: str, seconds: float):
+        """
+        Adds a response time of the endpoint to its average and marks it healthy
+        """
+        with self._lock:
+            endpoint = self._endpoint(url)
+            ewma = endpoint.get('ewma_seconds')
+            endpoint['ewma_seconds'] = seconds if ewma is None \
+                else self.alpha * seconds + (1 - self.alpha) * ewma
+            endpoint['samples'] = (endpoint.get('samples', []) + [seconds])[-RESPONSE_TIME_SAMPLES:]
+            endpoint['measured_at'] = self._clock()
+            endpoint['failures'] = 0
+            endpoint['unhealthy_until'] = 0
+            self._changed.add(url)
+
+    def record_failure(self, url: str):
+        """
+        Marks the endpoint unhealthy for a cooldown
+        """
+        with self._lock:
+            endpoint = self._endpoint(url)
+            endpoint['failures'] = endpoint.get('failures', 0) + 1
+            cooldown = min(self.cooldown * 2 ** (endpoint['failures'] - 1), self.max_cooldown)
+            endpoint['unhealthy_until'] = self._clock() + cooldown
+            self._changed.add(url)
+
+    def save(self):
+        """
+        Writes the endpoints measured by this process to the state file,
+        keeping the ones measured by other processes
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            with locked_file(self.state_file) as file_descriptor:
+                state = _parse_state(read_all(file_descriptor))
+                for url in self._changed:
+                    state['endpoints'][url] = self._endpoints[url]
+                state['version'] = ENDPOINT_HEALTH_STATE_VERSION
+                write_all(file_descriptor, json.dumps(state), sync=False)
+            self._changed = set()
+
+    def _endpoint(self, url: str) -> dict:
+        if self._endpoints is None:
+            with locked_file(self.state_file) as file_descriptor:
+                self._endpoints = _parse_state(read_all(file_descriptor))['endpoints']
+        return self._endpoints.setdefault(url, {})
+
+
+def _parse_state(content: str) -> dict:
+    try:
+        state = json.loads(content) if content else {}
+    except ValueError:
+        # A corrupted state only loses the measurements
+        state = {}
+    state.setdefault('endpoints', {})
+    return state
+
+
+# pylint: disable=too-few-public-methods
+class ReadRoutingClient:
+    """
+    Proxy of the Conjur client of the leader that sends read requests to the
+    fastest healthy follower. A read that the follower fails to serve is sent
+    to the leader, and the follower is skipped until it is healthy again.
+    Other requests always go to the leader.
+
+    Followers replicate the leader asynchronously, so a read may not see a
+    change made by an earlier command for a short while.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, leader_client, read_urls: List[str],
+                 create_client: Callable[[str], object], health: EndpointHealth,
+                 clock: Callable[[], float] = time.perf_counter):
+        self._leader_client = leader_client
+        self._read_urls = read_urls
+        self._create_client = create_client
+        self._health = health
+        self._clock = clock
+        self._clients: Dict[str, object] = {}
+        self._selected_url = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._leader_client, name)
+        if name not in READ_CLIENT_METHODS or not callable(attribute):
+            return attribute
+
+        def routed(*args, **kwargs):
+            return self._read(name, attribute, *args, **kwargs)
+        return routed
+
+    # pylint: disable=logging-fstring-interpolation
+    def _read(self, name: str, leader_method: Callable, *args, **kwargs):
+        url, client = self._follower()
+        if client is None:
+            return leader_method(*args, **kwargs)
+
+        started_at = self._clock()
+        try:
+            result = getattr(client, name)(*args, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            if not is_endpoint_failure(error):
+                self._health.record_success(url, self._clock() - started_at)
+                raise
+            logging.debug(f"Follower '{url}' failed to serve the request: {error}. "
+                          f"Sending it to the leader")
+            self._health.record_failure(url)
+            with self._lock:
+                if self._selected_url == url:
+                    self._selected_url = None
+            return leader_method(*args, **kwargs)
+        self._health.record_success(url, self._clock() - started_at)
+        return result
+
+    # pylint: disable=logging-fstring-interpolation
+    def _follower(self):
+        with self._lock:
+            if self._selected_url is None:
+                self._selected_url = self._health.select(self._read_urls)
+                if self._selected_url is None:
+                    return None, None
+                logging.debug(f"Sending read requests to '{self._selected_url}'")
+            url = self._selected_url
+            if url not in self._clients:
+                self._clients[url] = self._create_client(url)
+            return url, self._clients[url]
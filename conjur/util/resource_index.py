@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resource index module
+
+This module keeps a local index of the resources of an account, so the
+list command can answer kind, search and prefix queries without a request
+to the server.
+
+Each kind has its own file, memory mapped when queried, holding:
+
+    header      magic, number of IDs, number of trigrams, sizes of the blobs
+    id offsets  offset of every ID in the ID blob, and the end of the blob
+    text offsets offset of the searchable text of every ID in the text blob
+    trigrams    every trigram of the texts, sorted, as 24-bit integers
+    postings    for every trigram, the numbers of the IDs whose text holds it
+    ID blob     the IDs, sorted by their UTF-8 bytes
+    text blob   the lowercase ID and annotation values of every ID
+
+The numbers are unsigned 32-bit integers in the byte order of the machine,
+as the index is a cache of the machine that built it.
+"""
+
+# Builtins
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from itertools import islice
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Internals
+from conjur.errors import FileNotFoundException, InvalidFormatException
+from conjur.util.private_file import write_private_file
+
+INDEX_MAGIC = b'CJRIDX01'
+# Magic, number of IDs, number of trigrams, size of the ID blob, size of the text blob
+INDEX_HEADER = struct.Struct('=8sIIII')
+INDEX_FILE_SUFFIX = '.idx'
+METADATA_FILE_NAME = 'index.json'
+# Searchable texts are split into the trigrams of their UTF-8 bytes
+TRIGRAM_LENGTH = 3
+# Separates the ID and the annotation values in the searchable text
+TEXT_SEPARATOR = '\n'
+
+
+def build_kind_index(entries: Iterable[Tuple[str, str]]) -> bytes:
+    """
+    Returns the content of the index file of a kind, given its IDs and
+    their searchable texts
+    """
+    entries = sorted((identifier.encode('utf-8'), text.lower().encode('utf-8'))
+                     for identifier, text in dict(entries).items())
+    id_offsets, text_offsets = array('I', [0]), array('I', [0])
+    postings: Dict[bytes, List[int]] = {}
+    for number, (identifier, text) in enumerate(entries):
+        id_offsets.append(id_offsets[-1] + len(identifier))
+        text_offsets.append(text_offsets[-1] + len(text))
+        for trigram in {text[start:start + TRIGRAM_LENGTH]
+                        for start in range(len(text) - TRIGRAM_LENGTH + 1)}:
+            postings.setdefault(trigram, []).append(number)
+
+    # Trigrams sort as their bytes and as their big-endian value alike
+    trigrams = sorted(postings)
+    keys = array('I', (int.from_bytes(trigram, 'big') for trigram in trigrams))
+    posting_offsets = array('I', [0])
+    all_postings = array('I')
+    for trigram in trigrams:
+        all_postings.extend(postings[trigram])
+        posting_offsets.append(len(all_postings))
+
+    ids_blob = b''.join(identifier for identifier, _ in entries)
+    text_blob = b''.join(text for _, text in entries)
+    return b''.join([INDEX_HEADER.pack(INDEX_MAGIC, len(entries), len(keys),
+                                       len(ids_blob), len(text_blob)),
+                     id_offsets.tobytes(), text_offsets.tobytes(), keys.tobytes(),
+                     posting_offsets.tobytes(), all_postings.tobytes(),
+                     ids_blob, text_blob])
+
+
+# pylint: disable=too-many-instance-attributes
+class KindIndex:
+    """
+    The index of the resources of a kind, memory mapped for queries.
+    IDs are referred to by their number, their rank in the sorted IDs
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as index_file:
+            self._buffer = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._map_sections()
+        except (struct.error, TypeError, ValueError) as error:
+            self.close()
+            raise InvalidFormatException(f"Error: the local index '{path}' is corrupted, "
+                                         f"run `conjur index sync` to rebuild it") from error
+
+    def _map_sections(self):
+        magic, self.count, trigram_count, ids_size, text_size = \
+            INDEX_HEADER.unpack_from(self._buffer)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"unknown magic {magic!r}")
+        # The layout is checked before any view of the file is taken, so a
+        # corrupted file can still be unmapped
+        lengths = [self.count + 1, self.count + 1, trigram_count, trigram_count + 1]
+        postings_start = INDEX_HEADER.size + 4 * sum(lengths)
+        (posting_count,) = struct.unpack_from('=I', self._buffer, postings_start - 4)
+        lengths.append(posting_count)
+        self._ids_start = postings_start + 4 * posting_count
+        self._text_start = self._ids_start + ids_size
+        if self._text_start + text_size != len(self._buffer):
+            raise ValueError("unexpected size")
+
+        view = memoryview(self._buffer)
+        starts = [INDEX_HEADER.size]
+        for length in lengths:
+            starts.append(starts[-1] + 4 * length)
+        self._id_offsets = view[starts[0]:starts[1]].cast('I')
+        self._text_offsets = view[starts[1]:starts[2]].cast('I')
+        self._trigrams = view[starts[2]:starts[3]].cast('I')
+        self._posting_offsets = view[starts[3]:starts[4]].cast('I')
+        self._postings = view[starts[4]:starts[5]].cast('I')
+        view.release()
+
+    def close(self):
+        """
+        Unmaps the file
+        """
+        for name in ('_id_offsets', '_text_offsets', '_trigrams', '_posting_offsets',
+                     '_postings'):
+            section = getattr(self, name, None)
+            if section is not None:
+                section.release()
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def identifier(self, number: int) -> bytes:
+        """
+        Returns the ID of a number, as UTF-8 bytes
+        """
+        return self._buffer[self._ids_start + self._id_offsets[number]:
+                            self._ids_start + self._id_offsets[number + 1]]
+
+    def _text(self, number: int) -> bytes:
+        return self._buffer[self._text_start + self._text_offsets[number]:
+                            self._text_start + self._text_offsets[number + 1]]
+
+    def prefix_range(self, prefix: str) -> range:
+        """
+        Returns the numbers of the IDs starting with prefix
+        """
+        identifiers = _Identifiers(self)
+        encoded = prefix.encode('utf-8')
+        start = bisect.bisect_left(identifiers, encoded)
+        # The IDs starting with prefix are the ones lower than the first
+        # string of bytes that is greater than prefix without starting with it
+        successor = encoded.rstrip(b'\xff')
+        if not successor:
+            return range(start, self.count)
+        successor = successor[:-1] + bytes([successor[-1] + 1])
+        return range(start, bisect.bisect_left(identifiers, successor, lo=start))
+
+    def search(self, query: str, numbers: range = None) -> Iterator[int]:
+        """
+        Yields, in order, the numbers of the IDs whose ID or annotation
+        values contain query, ignoring case, among the given numbers or all
+        """
+        encoded = query.lower().encode('utf-8')
+        numbers = range(self.count) if numbers is None else numbers
+        if len(encoded) < TRIGRAM_LENGTH and len(numbers) == self.count:
+            yield from self._scan(encoded)
+            return
+        # The rarest trigram of the query gives the fewest candidates to verify
+        candidates = numbers
+        for start in range(len(encoded) - TRIGRAM_LENGTH + 1):
+            postings = self._postings_of(encoded[start:start + TRIGRAM_LENGTH])
+            if len(postings) < len(candidates):
+                candidates = postings
+            if not candidates:
+                return
+        for number in candidates:
+            if number in numbers and encoded in self._text(number):
+                yield number
+
+    def _postings_of(self, trigram: bytes):
+        key = int.from_bytes(trigram, 'big')
+        position = bisect.bisect_left(self._trigrams, key)
+        if position == len(self._trigrams) or self._trigrams[position] != key:
+            return []
+        return self._postings[self._posting_offsets[position]:
+                              self._posting_offsets[position + 1]]
+
+    def _scan(self, encoded: bytes) -> Iterator[int]:
+        end = self._text_start + self._text_offsets[-1]
+        position = self._buffer.find(encoded, self._text_start, end)
+        while position != -1:
+            number = bisect.bisect_right(self._text_offsets, position - self._text_start) - 1
+            text_end = self._text_start + self._text_offsets[number + 1]
+            if position + len(encoded) <= text_end:
+                yield number
+                # The next match is looked for in the next text
+                position = self._buffer.find(encoded, text_end, end)
+            else:
+                # The match spans two texts
+                position = self._buffer.find(encoded, position + 1, end)
+
+
+# pylint: disable=too-few-public-methods
+class _Identifiers:
+    """
+    The IDs of an index as a sequence, for bisect
+    """
+
+    def __init__(self, kind_index: KindIndex):
+        self._kind_index = kind_index
+
+    def __len__(self) -> int:
+        return self._kind_index.count
+
+    def __getitem__(self, number: int) -> bytes:
+        return self._kind_index.identifier(number)
+
+
+def searchable_text(resource) -> Tuple[str, str]:
+    """
+    Returns the ID of a listed resource, without its account and kind, and
+    the text searched for it: the ID and the values of its annotations
+    """
+    if isinstance(resource, dict):
+        full_id = resource['id']
+        annotations = [annotation.get('value') or ''
+                       for annotation in resource.get('annotations') or ()]
+    else:
+        full_id, annotations = resource, []
+    identifier = full_id.split(':', 2)[-1]
+    return identifier, TEXT_SEPARATOR.join([identifier] + annotations)
+
+
+class ResourceIndex:
+    """
+    The index files of the resources of a Conjur server, one per kind, and
+    the metadata of the index: the account and when each kind was synced.
+    The files are readable by their owner only, as they reveal the names
+    of the resources.
+    """
+
+    def __init__(self, directory: str, clock=time.time):
+        self.directory = directory
+        self._clock = clock
+
+    @classmethod
+    def for_server(cls, parent_directory: str, conjur_url: str) -> 'ResourceIndex':
+        """
+        Returns the index of the resources of the server at conjur_url
+        """
+        digest = hashlib.sha256(conjur_url.encode('utf-8')).hexdigest()[:16]
+        return cls(os.path.join(parent_directory, digest))
+
+    def metadata(self) -> Optional[dict]:
+        """
+        Returns the metadata of the index, or None if it was never synced
+        """
+        try:
+            with open(os.path.join(self.directory, METADATA_FILE_NAME), 'r',
+                      encoding='utf-8') as metadata_file:
+                return json.load(metadata_file)
+        except FileNotFoundError:
+            return None
+
+    def write_kinds(self, account: str, resources_by_kind: Dict[str, list]):
+        """
+        Replaces the index of each kind with the listed resources of the
+        kind. The other kinds are kept
+        """
+        metadata = self.metadata() or {'kinds': {}}
+        metadata['account'] = account
+        for kind, resources in resources_by_kind.items():
+            content = build_kind_index(searchable_text(resource) for resource in resources)
+            write_private_file(self.directory, kind + INDEX_FILE_SUFFIX, content)
+            metadata['kinds'][kind] = {'count': INDEX_HEADER.unpack_from(content)[1],
+                                       'synced_at': self._clock()}
+        write_private_file(self.directory, METADATA_FILE_NAME,
+                           json.dumps(metadata, indent=4).encode('utf-8'))
+
+    def query(self, kinds: List[str] = None, search: str = None, prefix: str = None,
+              offset: int = 0, limit: int = None) -> List[str]:
+        """
+        Returns the full IDs of the indexed resources of the kinds, or of
+        every kind, matching search and prefix, in the order of the server
+        """
+        metadata = self.metadata()
+        if metadata is None:
+            raise FileNotFoundException("Error: the local index is empty, "
+                                        "run `conjur index sync` first")
+        matches = self._matches(metadata, kinds, search, prefix)
+        try:
+            return list(islice(matches, offset, None if limit is None else offset + limit))
+        finally:
+            # Releases the views of the file being read before it is unmapped
+            matches.close()
+
+    def _matches(self, metadata: dict, kinds: List[str], search: str,
+                 prefix: str) -> Iterator[str]:
+        for kind in sorted(kinds) if kinds else sorted(metadata['kinds']):
+            if kind not in metadata['kinds']:
+                continue
+            with KindIndex(os.path.join(self.directory, kind + INDEX_FILE_SUFFIX)) as kind_index:
+                numbers = _matching(kind_index, search, prefix)
+                try:
+                    for number in numbers:
+                        identifier = kind_index.identifier(number).decode('utf-8')
+                        yield f"{metadata['account']}:{kind}:{identifier}"
+                finally:
+                    numbers.close()
+
+
+def _matching(kind_index: KindIndex, search: str = None, prefix: str = None) -> Iterator[int]:
+    numbers = kind_index.prefix_range(prefix) if prefix else range(kind_index.count)
+    if search:
+        yield from kind_index.search(search, numbers)
+    else:
+        yield from numbers
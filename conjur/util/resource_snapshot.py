@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resource snapshot module
+
+This module keeps a snapshot of a list result, so that the next list only
+reports the resources added, removed or changed since.
+
+A snapshot is a gzip-compressed text file. Its first line is a JSON header
+holding the list options it was taken with, then each resource has a line
+with its full ID and a digest of its metadata, sorted by ID:
+
+    {"format": 1, "constraints": {"kind": "variable", "inspect": true}}
+    myorg:variable:prod/db/password<TAB>5d41402abc4b2a76b9719d911017c592
+"""
+
+# Builtins
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from typing import Dict, Iterator, Tuple
+
+# Internals
+from conjur.errors import InvalidFormatException
+from conjur.util.private_file import write_private_file
+
+SNAPSHOT_FORMAT_VERSION = 1
+# Separates the ID of a resource and the digest of its metadata
+SNAPSHOT_FIELD_SEPARATOR = '\t'
+# The digests are truncated to 128 bits, which keeps snapshots small
+DIGEST_LENGTH = 32
+
+
+def resource_entry(resource) -> Tuple[str, str]:
+    """
+    Returns the full ID of a listed resource and the digest of its metadata,
+    which is empty when the resources were listed without --inspect
+    """
+    if not isinstance(resource, dict):
+        return resource, ''
+    canonical = json.dumps(resource, sort_keys=True, separators=(',', ':'))
+    return resource['id'], hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:DIGEST_LENGTH]
+
+
+def read_snapshot(path: str, constraints: dict) -> Dict[str, str]:
+    """
+    Returns the digests of the resources of the snapshot by full ID. A
+    missing snapshot holds no resources. A snapshot taken with other list
+    options than constraints cannot be compared and is rejected
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8', newline='\n') as snapshot_file:
+            header = json.loads(snapshot_file.readline())
+            if header.get('format') != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"unknown format {header.get('format')}")
+            if header.get('constraints') != constraints:
+                raise InvalidFormatException(
+                    f"Error: the snapshot '{path}' was taken with other list options "
+                    f"({header.get('constraints')}). Use another snapshot file")
+            digests = {}
+            for line in snapshot_file:
+                resource_id, digest = line.rstrip('\n').rsplit(SNAPSHOT_FIELD_SEPARATOR, 1)
+                digests[resource_id] = digest
+            return digests
+    except (OSError, EOFError, zlib.error, ValueError, AttributeError) as error:
+        raise InvalidFormatException(f"Error: the snapshot '{path}' is corrupted, "
+                                     f"remove it to take a new one") from error
+
+
+def write_snapshot(path: str, constraints: dict, digests: Dict[str, str]):
+    """
+    Replaces the snapshot with the digests of the resources
+    """
+    lines = [json.dumps({'format': SNAPSHOT_FORMAT_VERSION, 'constraints': constraints})]
+    lines.extend(f"{resource_id}{SNAPSHOT_FIELD_SEPARATOR}{digests[resource_id]}"
+                 for resource_id in sorted(digests))
+    # A fixed mtime keeps the snapshots of identical lists identical
+    content = gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'), mtime=0)
+    directory, name = os.path.split(os.path.abspath(path))
+    write_private_file(directory, name, content)
+
+
+def snapshot_changes(previous: Dict[str, str],
+                     current: Dict[str, str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yields the changes from the previous digests to the current ones as
+    ('added' | 'removed' | 'changed', full ID), sorted by ID
+    """
+    for resource_id in sorted(previous.keys() | current.keys()):
+        if resource_id not in previous:
+            yield 'added', resource_id
+        elif resource_id not in current:
+            yield 'removed', resource_id
+        elif previous[resource_id] != current[resource_id]:
+            yield 'changed', resource_id
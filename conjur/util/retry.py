@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Retry module
+
+This module holds the retry logic for requests that failed because of
+transient server or network errors
+"""
+
+# Builtins
+import functools
+import http
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+# SDK
+from conjur_api.errors.errors import HttpError, HttpSslError, HttpStatusError
+
+# Statuses that indicate the server (or a load balancer in front of it)
+# could not handle the request right now, but may succeed if asked again
+TRANSIENT_HTTP_STATUSES = (http.HTTPStatus.REQUEST_TIMEOUT,
+                           http.HTTPStatus.TOO_MANY_REQUESTS,
+                           http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                           http.HTTPStatus.BAD_GATEWAY,
+                           http.HTTPStatus.SERVICE_UNAVAILABLE,
+                           http.HTTPStatus.GATEWAY_TIMEOUT)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY_SECONDS = 0.5
+DEFAULT_MAX_DELAY_SECONDS = 10.0
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 60.0
+
+# Client methods that only read state, or whose HTTP verb is idempotent
+# (PUT, DELETE), so sending them again after a failure is safe
+IDEMPOTENT_CLIENT_METHODS = frozenset([
+    'authenticate', 'whoami', 'list_oidc_providers', 'list', 'check_privilege',
+    'get_resource', 'resource_exists', 'get_role', 'role_exists', 'role_memberships',
+    'list_permitted_roles', 'list_members_of_role', 'get', 'get_many', 'get_server_info',
+    'server_version', 'find_resources_by_identifier', 'find_resource_by_identifier',
+    'replace_policy_file', 'revoke_token',
+])
+
+# The attempt being made by RetryPolicy.call in the current thread
+_attempt_state = threading.local()
+
+
+def current_attempt() -> int:
+    """
+    Returns the number of the attempt RetryPolicy.call is making in the
+    current thread, which is 1 outside of a retried call
+    """
+    return getattr(_attempt_state, 'attempt', 1)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Returns true if the request that raised the error is worth retrying
+    """
+    if isinstance(error, HttpStatusError):
+        return error.status in TRANSIENT_HTTP_STATUSES
+    # Connection errors are raised as a plain HttpError. SSL errors
+    # are configuration problems and will not go away by retrying
+    return isinstance(error, HttpError) and not isinstance(error, HttpSslError)
+
+
+def retry_after_seconds(error: Exception, clock: Callable[[], float] = time.time) \
+        -> Optional[float]:
+    """
+    Returns the number of seconds the server asked to wait before retrying,
+    from the Retry-After header of the response that raised the error, or
+    None if it did not ask. The SDK chains the aiohttp error holding the
+    response headers as the cause of the HttpStatusError it raises
+    """
+    headers = getattr(error.__cause__, 'headers', None)
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - clock())
+    except (TypeError, ValueError):
+        return None
+
+
+# pylint: disable=too-few-public-methods
+class RetryPolicy:
+    """
+    Retries a call on transient errors with exponential backoff and full jitter,
+    meaning the n-th retry sleeps a random time between zero and
+    min(max_delay, base_delay * 2^(n-1)) seconds
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, *,
+                 base_delay: float = DEFAULT_BASE_DELAY_SECONDS,
+                 max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+                 sleep: Callable[[float], None] = time.sleep,
+                 rand: Callable[[], float] = random.random,
+                 max_retry_after: float = DEFAULT_MAX_RETRY_AFTER_SECONDS):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self._sleep = sleep
+        self._rand = rand
+
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        """
+        Returns the time to sleep after the given failed attempt. When the
+        server answered with a Retry-After header, it is waited for instead,
+        up to max_retry_after seconds
+        """
+        backoff = self._rand() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is None:
+            return backoff
+        return min(max(retry_after, backoff), self.max_retry_after)
+
+    # pylint: disable=logging-fstring-interpolation
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Calls func, retrying it while it fails with a transient error
+        and attempts are left
+        """
+        attempt = 1
+        outer_attempt = current_attempt()
+        try:
+            while True:
+                _attempt_state.attempt = attempt
+                try:
+                    return func(*args, **kwargs)
+                except Exception as error:  # pylint: disable=broad-except
+                    if attempt >= self.max_attempts or not is_transient_error(error):
+                        raise
+                    delay = self.delay(attempt, error)
+                    logging.debug(f"Attempt {attempt} of {self.max_attempts} failed with a "
+                                  f"transient error: {error}. Retrying in {delay:.2f}s")
+                    self._sleep(delay)
+                    attempt += 1
+        finally:
+            _attempt_state.attempt = outer_attempt
+
+
+# pylint: disable=too-few-public-methods
+class RetryingClient:
+    """
+    Proxy of the Conjur client that retries the idempotent methods of the
+    client with a retry policy. Other methods are called once, since sending
+    them again could apply a change twice
+    """
+
+    def __init__(self, client, retry_policy: RetryPolicy):
+        self._client = client
+        self._retry_policy = retry_policy
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if name not in IDEMPOTENT_CLIENT_METHODS or not callable(attribute):
+            return attribute
+        return functools.partial(self._retry_policy.call, attribute)
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+"""
+Role graph module
+
+This module holds the graph of the memberships of Conjur roles, crawled
+once from the server and then queried locally: the transitive memberships
+of a role, the shortest chain of memberships from a role to another and
+the cycles of memberships.
+
+Roles are numbered by their rank in the sorted full IDs, and the roles
+each role is a direct member of are kept as a compressed sparse row
+adjacency: the memberships of role n are targets[offsets[n]:offsets[n + 1]].
+"""
+
+# Builtins
+import json
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+# Internals
+from conjur.errors import InvalidFormatException
+
+ROLE_GRAPH_FORMAT_VERSION = 1
+ROLE_KINDS = ('user', 'host', 'group', 'layer', 'policy')
+GRAPH_FORMATS = ['json', 'dot', 'graphml']
+
+
+class RoleGraph:
+    """
+    The roles of an account and the roles each is a direct member of
+    """
+
+    def __init__(self, account: str, roles: List[str], offsets: array, targets: array,
+                 root: str = None):
+        self.account = account
+        self.root = root
+        self.roles = roles
+        self.offsets = offsets
+        self.targets = targets
+        self._numbers = {role: number for number, role in enumerate(roles)}
+
+    @classmethod
+    def from_memberships(cls, account: str, memberships: Dict[str, Iterable[str]],
+                         root: str = None) -> 'RoleGraph':
+        """
+        Builds the graph from the direct memberships of each role, by full ID
+        """
+        roles = sorted(set(memberships).union(*memberships.values()))
+        numbers = {role: number for number, role in enumerate(roles)}
+        offsets, targets = array('I', [0]), array('I')
+        for role in roles:
+            targets.extend(sorted({numbers[membership]
+                                   for membership in memberships.get(role, ())}))
+            offsets.append(len(targets))
+        return cls(account, roles, offsets, targets, root)
+
+    @classmethod
+    def from_dict(cls, content: dict) -> 'RoleGraph':
+        """
+        Loads the graph saved by to_dict
+        """
+        try:
+            if content['format'] != ROLE_GRAPH_FORMAT_VERSION:
+                raise ValueError(f"unknown format {content['format']}")
+            graph = cls(content['account'], list(content['roles']),
+                        array('I', content['offsets']), array('I', content['targets']),
+                        content.get('root'))
+            if len(graph.offsets) != len(graph.roles) + 1 \
+                    or graph.offsets[-1] != len(graph.targets) \
+                    or any(target >= len(graph.roles) for target in graph.targets):
+                raise ValueError("inconsistent adjacency")
+            return graph
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            raise InvalidFormatException("Error: the role graph file is corrupted, "
+                                         "crawl the graph again") from error
+
+    def to_dict(self) -> dict:
+        """
+        Returns the graph as a JSON serializable dictionary
+        """
+        return {'format': ROLE_GRAPH_FORMAT_VERSION, 'account': self.account,
+                'root': self.root, 'roles': self.roles,
+                'offsets': self.offsets.tolist(), 'targets': self.targets.tolist()}
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Returns the number of direct memberships
+        """
+        return len(self.targets)
+
+    def number(self, role: str) -> int:
+        """
+        Returns the number of a role given as account:kind:id or kind:id
+        """
+        full_id = role if role.count(':') >= 2 else f"{self.account}:{role}"
+        if full_id not in self._numbers:
+            raise InvalidFormatException(f"Error: the role '{role}' is not in the graph")
+        return self._numbers[full_id]
+
+    def _direct(self, number: int) -> array:
+        return self.targets[self.offsets[number]:self.offsets[number + 1]]
+
+    def memberships(self, role: str) -> List[str]:
+        """
+        Returns the role and every role it is a direct or indirect member of,
+        as the server returns them for 'role memberships'
+        """
+        start = self.number(role)
+        seen = {start}
+        pending = [start]
+        while pending:
+            for target in self._direct(pending.pop()):
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        return [self.roles[number] for number in sorted(seen)]
+
+    def path(self, member: str, role: str) -> List[str]:
+        """
+        Returns the shortest chain of memberships through which member has
+        role, from member to role, or an empty list if it does not have it
+        """
+        start, end = self.number(member), self.number(role)
+        previous = {start: None}
+        pending = deque([start])
+        while pending and end not in previous:
+            current = pending.popleft()
+            for target in self._direct(current):
+                if target not in previous:
+                    previous[target] = current
+                    pending.append(target)
+        if end not in previous:
+            return []
+        chain = []
+        current = end
+        while current is not None:
+            chain.append(self.roles[current])
+            current = previous[current]
+        return chain[::-1]
+
+    def cycles(self) -> List[List[str]]:
+        """
+        Returns the groups of roles that are members of each other, directly
+        or not: the strongly connected components with more than one role,
+        or a role that is a member of itself
+        """
+        return [[self.roles[number] for number in sorted(component)]
+                for component in self._components()
+                if len(component) > 1 or component[0] in self._direct(component[0])]
+
+    def _components(self) -> Iterable[List[int]]:
+        # Tarjan's algorithm, iterative so that long chains of memberships
+        # do not exceed the recursion limit
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        for start in range(len(self.roles)):
+            if start in index:
+                continue
+            work: List[Tuple[int, int]] = [(start, 0)]
+            while work:
+                number, position = work.pop()
+                if position == 0:
+                    index[number] = low[number] = len(index)
+                    stack.append(number)
+                    on_stack.add(number)
+                direct = self._direct(number)
+                if position < len(direct):
+                    work.append((number, position + 1))
+                    target = direct[position]
+                    if target not in index:
+                        work.append((target, 0))
+                    elif target in on_stack:
+                        low[number] = min(low[number], index[target])
+                    continue
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[number])
+                if low[number] == index[number]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == number:
+                            break
+                    yield component
+
+    def export(self, graph_format: str) -> str:
+        """
+        Returns the graph in the given format: json, dot or graphml
+        """
+        if graph_format == 'dot':
+            return self._to_dot()
+        if graph_format == 'graphml':
+            return self._to_graphml()
+        return json.dumps(self.to_dict())
+
+    def _edges(self) -> Iterable[Tuple[int, int]]:
+        for number in range(len(self.roles)):
+            for target in self._direct(number):
+                yield number, target
+
+    def _to_dot(self) -> str:
+        def quoted(text: str) -> str:
+            return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+        lines = ['digraph memberships {']
+        lines.extend(f"  {quoted(role)} [kind={quoted(role.split(':', 2)[1])}];"
+                     for role in self.roles)
+        lines.extend(f"  {quoted(self.roles[member])} -> {quoted(self.roles[role])};"
+                     for member, role in self._edges())
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    def _to_graphml(self) -> str:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+                 '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>',
+                 '  <graph id="memberships" edgedefault="directed">']
+        lines.extend(f"    <node id={quoteattr(role)}><data key=\"kind\">"
+                     f"{escape(role.split(':', 2)[1])}</data></node>"
+                     for role in self.roles)
+        lines.extend(f"    <edge source={quoteattr(self.roles[member])} "
+                     f"target={quoteattr(self.roles[role])}/>"
+                     for member, role in self._edges())
+        lines.extend(['  </graph>', '</graphml>'])
+        return '\n'.join(lines) + '\n'
+
+
+def is_in_policy(full_id: str, policy_id: str) -> bool:
+    """
+    Returns true if the role was defined in the policy or in the policies
+    it holds. Users of a policy have an ID suffixed by the policy, as in
+    alice@apps-backend for the apps/backend policy
+    """
+    if policy_id == 'root':
+        return True
+    kind, identifier = full_id.split(':', 2)[1:]
+    if kind == 'user':
+        suffix = '@' + policy_id.replace('/', '-')
+        return identifier.endswith(suffix) or f"{suffix}-" in identifier
+    return identifier == policy_id or identifier.startswith(policy_id + '/')
+
+
+def role_kind(full_id: str) -> Optional[str]:
+    """
+    Returns the kind of the full ID if it is the one of a role
+    """
+    parts = full_id.split(':', 2)
+    return parts[1] if len(parts) == 3 and parts[1] in ROLE_KINDS else None
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+Secrets archive module
+
+This module reads and writes the encrypted archives of variable values
+made by `conjur export` and replayed by `conjur import`.
+
+An archive is a header followed by chunks:
+
+    header  magic, scrypt salt and cost parameters
+    chunk   length, nonce and AES-256-GCM ciphertext of the zlib-compressed
+            JSON lines of a batch of variables, {"id": ..., "value": ...}
+
+The last chunk holds the number of variables of the archive instead. The
+header, the number of each chunk and whether it is the last one are
+authenticated with every chunk, so a reordered, truncated or tampered
+archive, or a wrong passphrase, is reported. Imports verify the whole
+archive before setting any value, so such an archive is not partially
+imported.
+"""
+
+# Builtins
+import base64
+import getpass
+import json
+import os
+import struct
+import zlib
+from typing import BinaryIO, Iterator, List, Tuple
+
+# Third party
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+# Internals
+from conjur.constants import EXPORT_PASSPHRASE_ENV_VARIABLE_NAME
+from conjur.errors import InvalidFormatException, MissingRequiredParameterException
+
+ARCHIVE_MAGIC = b'CJRSEC01'
+# Magic, salt, log2 of the scrypt cost, scrypt block size and parallelization
+ARCHIVE_HEADER = struct.Struct('>8s16sBBB')
+# Length of the nonce and ciphertext of a chunk
+CHUNK_LENGTH = struct.Struct('>I')
+# Number of the chunk and whether it is the last one, authenticated with it
+CHUNK_CONTEXT = struct.Struct('>Q?')
+SALT_LENGTH = 16
+NONCE_LENGTH = 12
+KEY_LENGTH = 32
+SCRYPT_LOG2_COST = 15
+SCRYPT_BLOCK_SIZE = 8
+SCRYPT_PARALLELIZATION = 1
+
+
+def _derive_key(passphrase: str, salt: bytes, log2_cost: int, block_size: int,
+                parallelization: int) -> bytes:
+    return Scrypt(salt=salt, length=KEY_LENGTH, n=2 ** log2_cost, r=block_size,
+                  p=parallelization).derive(passphrase.encode('utf-8'))
+
+
+def read_passphrase(confirm: bool = False) -> str:
+    """
+    Returns the passphrase of the archive, from the environment or prompted
+    for. A new passphrase is prompted for twice
+    """
+    passphrase = os.environ.get(EXPORT_PASSPHRASE_ENV_VARIABLE_NAME)
+    if passphrase:
+        return passphrase
+    passphrase = getpass.getpass(prompt="Enter the passphrase of the archive: ")
+    if not passphrase:
+        raise MissingRequiredParameterException("Error: the passphrase cannot be empty")
+    if confirm and getpass.getpass(prompt="Confirm the passphrase: ") != passphrase:
+        raise MissingRequiredParameterException("Error: the passphrases do not match")
+    return passphrase
+
+
+def encode_value(variable_id: str, value) -> dict:
+    """
+    Returns the record of a variable value. Values that are not UTF-8
+    text are kept as base64
+    """
+    if isinstance(value, bytes):
+        try:
+            value = value.decode('utf-8')
+        except UnicodeDecodeError:
+            return {'id': variable_id, 'value_base64': base64.b64encode(value).decode('ascii')}
+    return {'id': variable_id, 'value': value}
+
+
+def decode_value(record: dict):
+    """
+    Returns the value of a record made by encode_value
+    """
+    if 'value_base64' in record:
+        return base64.b64decode(record['value_base64'])
+    return record['value']
+
+
+class ArchiveWriter:
+    """
+    Writes the chunks of an archive to a binary stream as they are given,
+    so that only one chunk is held in memory
+    """
+
+    def __init__(self, stream: BinaryIO, passphrase: str):
+        self._stream = stream
+        salt = os.urandom(SALT_LENGTH)
+        self._header = ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, salt, SCRYPT_LOG2_COST,
+                                           SCRYPT_BLOCK_SIZE, SCRYPT_PARALLELIZATION)
+        self._cipher = AESGCM(_derive_key(passphrase, salt, SCRYPT_LOG2_COST,
+                                          SCRYPT_BLOCK_SIZE, SCRYPT_PARALLELIZATION))
+        self._chunk_count = 0
+        self.record_count = 0
+        self._stream.write(self._header)
+
+    def write_chunk(self, records: List[dict]):
+        """
+        Encrypts and writes the records of a batch of variables
+        """
+        lines = ''.join(json.dumps(record) + '\n' for record in records)
+        self._write(zlib.compress(lines.encode('utf-8')), last=False)
+        self.record_count += len(records)
+
+    def close(self):
+        """
+        Writes the last chunk, which holds the number of variables
+        """
+        self._write(json.dumps({'count': self.record_count}).encode('utf-8'), last=True)
+
+    def _write(self, plaintext: bytes, last: bool):
+        nonce = os.urandom(NONCE_LENGTH)
+        context = self._header + CHUNK_CONTEXT.pack(self._chunk_count, last)
+        ciphertext = self._cipher.encrypt(nonce, plaintext, context)
+        self._stream.write(CHUNK_LENGTH.pack(NONCE_LENGTH + len(ciphertext)))
+        self._stream.write(nonce + ciphertext)
+        self._chunk_count += 1
+
+
+class ArchiveReader:
+    """
+    Reads the chunks of an archive from a binary stream, one at a time
+    """
+
+    def __init__(self, stream: BinaryIO, passphrase: str):
+        self._stream = stream
+        self._header = stream.read(ARCHIVE_HEADER.size)
+        try:
+            magic, self.salt, log2_cost, block_size, parallelization = \
+                ARCHIVE_HEADER.unpack(self._header)
+        except struct.error as error:
+            raise InvalidFormatException("Error: the file is not an archive of "
+                                         "`conjur export`") from error
+        if magic != ARCHIVE_MAGIC:
+            raise InvalidFormatException("Error: the file is not an archive of `conjur export`")
+        self._cipher = AESGCM(_derive_key(passphrase, self.salt, log2_cost, block_size,
+                                          parallelization))
+        self._chunks_start = stream.tell()
+
+    def verify(self):
+        """
+        Reads the whole archive to check that it is complete and was not
+        modified, without keeping its records, then rewinds to its first chunk
+        """
+        for _ in self.chunks():
+            pass
+        self._stream.seek(self._chunks_start)
+
+    def chunks(self) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Yields the number and the records of every chunk. The archive is
+        verified to be complete once its last chunk is read
+        """
+        number = record_count = 0
+        while True:
+            plaintext, last = self._read(number)
+            if last:
+                if json.loads(plaintext)['count'] != record_count:
+                    raise InvalidFormatException("Error: the archive is incomplete")
+                return
+            records = [json.loads(line) for line in
+                       zlib.decompress(plaintext).decode('utf-8').splitlines()]
+            record_count += len(records)
+            yield number, records
+            number += 1
+
+    def _read(self, number: int) -> Tuple[bytes, bool]:
+        length_bytes = self._stream.read(CHUNK_LENGTH.size)
+        if len(length_bytes) < CHUNK_LENGTH.size:
+            raise InvalidFormatException("Error: the archive is incomplete")
+        (length,) = CHUNK_LENGTH.unpack(length_bytes)
+        chunk = self._stream.read(length)
+        if len(chunk) < length:
+            raise InvalidFormatException("Error: the archive is incomplete")
+        for last in (False, True):
+            context = self._header + CHUNK_CONTEXT.pack(number, last)
+            try:
+                return self._cipher.decrypt(chunk[:NONCE_LENGTH], chunk[NONCE_LENGTH:],
+                                            context), last
+            except InvalidTag:
+                continue
+        raise InvalidFormatException("Error: wrong passphrase, or the archive was modified")
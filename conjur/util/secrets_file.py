@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+Secrets file module
+
+This module reads the mapping of environment variable names to secrets used
+by the run command. The format is the one of the secrets.yml files of Summon:
+
+    DB_PASSWORD: !var prod/db/password
+    TLS_CERT: !var:file prod/tls/cert
+    DB_HOST: !str db.example.com
+
+Values tagged !var are the IDs of variables to fetch, !var:file variables are
+written to a file whose path is put in the environment instead of the value,
+!str values are literal and !file literal values are written to a file.
+The mapping may be split into environments, in which case the `common`
+section is shared by every environment.
+"""
+
+# Builtins
+import re
+from typing import List
+
+# Third party
+import yaml
+
+# Internals
+from conjur.errors import InvalidFormatException
+
+VARIABLE = 'var'
+LITERAL = 'str'
+
+COMMON_ENVIRONMENTS = ('common', 'default')
+
+ENVIRONMENT_VARIABLE_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+# pylint: disable=too-few-public-methods
+class SecretSpec:
+    """
+    An environment variable of the child process, and where its value comes from
+    """
+
+    def __init__(self, name: str, kind: str, value: str, as_file: bool = False):
+        self.name = name
+        self.kind = kind
+        self.value = value
+        self.as_file = as_file
+
+    def __repr__(self) -> str:
+        # Literal values may be sensitive, so they are masked
+        value = self.value if self.kind == VARIABLE else '****'
+        return f"{{'name': '{self.name}', 'kind': '{self.kind}', " \
+               f"'value': '{value}', 'as_file': {self.as_file}}}"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SecretSpec) and vars(self) == vars(other)
+
+
+class _Tagged:
+    """
+    Value of a node of the secrets file, with its tag
+    """
+
+    def __init__(self, kind: str, value: str, as_file: bool):
+        self.kind = kind
+        self.value = value
+        self.as_file = as_file
+
+
+# pylint: disable=too-many-ancestors
+class _SecretsFileLoader(yaml.SafeLoader):
+    """
+    YAML loader that understands the tags of the secrets file
+    """
+
+
+def _tag_constructor(kind: str, as_file: bool):
+    def construct(loader: yaml.SafeLoader, node: yaml.Node) -> _Tagged:
+        if not isinstance(node, yaml.ScalarNode):
+            raise InvalidFormatException(f"Error: the value of tag '{node.tag}' must be a string")
+        return _Tagged(kind, loader.construct_scalar(node), as_file)
+    return construct
+
+
+for _tag, _kind, _as_file in (('!var', VARIABLE, False), ('!var:file', VARIABLE, True),
+                              ('!str', LITERAL, False), ('!file', LITERAL, True)):
+    _SecretsFileLoader.add_constructor(_tag, _tag_constructor(_kind, _as_file))
+
+
+def load_secrets_file(path: str, environment: str = None) -> List[SecretSpec]:
+    """
+    Reads the secrets file at path and returns the secrets of the environment,
+    or of the whole file when it is not split into environments
+    """
+    with open(path, 'r', encoding='utf-8') as secrets_file:
+        content = secrets_file.read()
+    return parse_secrets(content, environment)
+
+
+def parse_secrets(content: str, environment: str = None) -> List[SecretSpec]:
+    """
+    Parses the content of a secrets file
+    """
+    try:
+        mapping = yaml.load(content, Loader=_SecretsFileLoader)
+    except yaml.YAMLError as error:
+        raise InvalidFormatException(f"Error: the secrets file is not valid YAML. {error}") \
+            from error
+    if mapping is None:
+        mapping = {}
+    if not isinstance(mapping, dict):
+        raise InvalidFormatException("Error: the secrets file must be a mapping of "
+                                     "environment variable names to values")
+
+    has_environments = any(isinstance(value, dict) for value in mapping.values())
+    if environment is not None:
+        if environment not in mapping or not isinstance(mapping[environment], dict):
+            raise InvalidFormatException(f"Error: environment '{environment}' "
+                                         f"is not defined in the secrets file")
+        selected = {}
+        for section in COMMON_ENVIRONMENTS + (environment,):
+            selected.update(mapping.get(section) or {})
+        mapping = selected
+    elif has_environments:
+        raise InvalidFormatException("Error: the secrets file defines environments, "
+                                     "choose one with --environment")
+
+    return [_to_spec(name, value) for name, value in mapping.items()]
+
+
+def _to_spec(name, value) -> SecretSpec:
+    if not isinstance(name, str) or not ENVIRONMENT_VARIABLE_NAME_PATTERN.match(name):
+        raise InvalidFormatException(f"Error: '{name}' is not a valid environment variable name")
+    if isinstance(value, _Tagged):
+        return SecretSpec(name, value.kind, value.value, value.as_file)
+    if isinstance(value, (dict, list)) or value is None:
+        raise InvalidFormatException(f"Error: the value of '{name}' must be a string")
+    # Untagged values are literals, as in Summon
+    return SecretSpec(name, LITERAL, str(value))
@@ -13,9 +13,10 @@ import logging
 import platform
 import os
 import sys
+from typing import Dict, Iterable, List
 
 # SDK
-from conjur_api.errors.errors import HttpError
+from conjur_api.errors.errors import HttpError, HttpStatusError
 from conjur_api.models import SslVerificationMetadata, SslVerificationMode
 
 # Internals
@@ -147,3 +148,37 @@ def print_json_result(result):
     Method to print the JSON of the returned result
     """
     sys.stdout.write(f"{json.dumps(result, indent=4)}\n")
+
+
+def print_json_array(items: Iterable):
+    """
+    Method to print the items as a JSON array while they are produced,
+    formatted as print_json_result formats a list of them
+    """
+    separator = '[\n'
+    for item in items:
+        element = json.dumps(item, indent=4).replace('\n', '\n    ')
+        sys.stdout.write(f"{separator}    {element}")
+        separator = ',\n'
+    sys.stdout.write('[]\n' if separator == '[\n' else '\n]\n')
+
+
+def get_existing_values(client, variable_ids: List[str]) -> Dict[str, object]:
+    """
+    Method to fetch the values of variables in a single batch request. A batch
+    fails as a whole when one of its variables does not exist or has no value,
+    so the variables are then fetched one by one and those left out
+    """
+    try:
+        return client.get_many(*variable_ids)
+    except HttpStatusError as error:
+        if error.status != 404:
+            raise
+    values = {}
+    for variable_id in variable_ids:
+        try:
+            values[variable_id] = client.get(variable_id)
+        except HttpStatusError as error:
+            if error.status != 404:
+                raise
+    return values
@@ -32,10 +32,10 @@ setup(
     scripts=['pkg_bin/conjur'],
 
     entry_points={
-        'console_scripts': ['conjur=conjur:Cli.launch'],
+        'console_scripts': ['conjur=conjur.launcher:launch'],
 
         'setuptools.installation': [
-            'eggsecutable = conjur:Cli.launch',
+            'eggsecutable = conjur.launcher:launch',
         ]
     },
 
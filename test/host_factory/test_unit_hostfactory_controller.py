@@ -1,8 +1,16 @@
+import io
+import json
+import os
+import stat
+import tempfile
 import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock
 
 from conjur.controller.hostfactory_controller import HostFactoryController
 from conjur_api.models import CreateHostData, CreateTokenData
-from conjur.errors import MissingRequiredParameterException
+from conjur.errors import MissingRequiredParameterException, InvalidHostFactoryTokenException
+from conjur_api.errors.errors import HttpStatusError
 from conjur_api.errors.errors import MissingRequiredParameterException as SdkMissingRequiredParameterException
 from conjur.logic.hostfactory_logic import HostFactoryLogic
 
@@ -44,3 +52,34 @@ class HostfactoryControllerTest(unittest.TestCase):
         mock_hostfactory_controller = HostFactoryController(mock_hostfactory_logic)
         with self.assertRaises(MissingRequiredParameterException):
             mock_hostfactory_controller.revoke_token(None)
+
+    def test_create_hosts_writes_results_to_owner_only_file(self):
+        client = MagicMock()
+        client.create_host.side_effect = [{'id': 'one', 'api_key': 'key'}, HttpStatusError(status=422)]
+        hostfactory_controller = HostFactoryController(HostFactoryLogic(client))
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'keys.json')
+            with redirect_stdout(io.StringIO()) as summary:
+                failed = hostfactory_controller.create_hosts(['one', 'two'], 'some-token',
+                                                             output_file=output_file,
+                                                             max_workers=1)
+            with open(output_file) as output_fp:
+                lines = [json.loads(line) for line in output_fp]
+            mode = stat.S_IMODE(os.stat(output_file).st_mode)
+
+        self.assertEqual(lines[0], {'id': 'one', 'host': {'id': 'one', 'api_key': 'key'}})
+        self.assertEqual(lines[1]['id'], 'two')
+        self.assertIn('422', lines[1]['error'])
+        self.assertEqual(mode, 0o600)
+        self.assertEqual(failed, 1)
+        self.assertIn("Created 1 host(s) using Host Factory, 1 failed", summary.getvalue())
+
+    def test_create_hosts_with_invalid_token_raises_invalid_token_exception(self):
+        client = MagicMock()
+        client.create_host.side_effect = HttpStatusError(status=401)
+        hostfactory_controller = HostFactoryController(HostFactoryLogic(client))
+
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(InvalidHostFactoryTokenException):
+                hostfactory_controller.create_hosts(['one', 'two'], 'bad-token', max_workers=1)
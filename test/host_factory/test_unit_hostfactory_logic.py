@@ -5,6 +5,8 @@ from unittest.mock import MagicMock
 from conjur_api.models import CreateTokenData
 from conjur.errors import MissingRequiredParameterException
 from conjur.logic.hostfactory_logic import HostFactoryLogic
+from conjur.util.retry import RetryPolicy
+from conjur_api.errors.errors import HttpStatusError
 from unittest.mock import patch
 
 
@@ -25,3 +27,21 @@ class HostfactoryLogicTest(unittest.TestCase):
         mock_hostfactory_logic.create_token(create_token_data=mock_create_token_data)
 
         mock_hostfactory_logic.client.create_token.assert_called_once_with(mock_create_token_data)
+
+    def test_create_hosts_creates_each_host_with_the_token(self):
+        client = MagicMock()
+        client.create_host.side_effect = lambda data: {'id': data.host_id, 'api_key': 'key'}
+        results = list(HostFactoryLogic(client).create_hosts(['one', 'two'], 'some-token', 2))
+
+        self.assertEqual([host_id for host_id, _, _ in results], ['one', 'two'])
+        self.assertEqual(results[0][1], {'id': 'one', 'api_key': 'key'})
+        self.assertEqual(client.create_host.call_args[0][0].token, 'some-token')
+
+    def test_create_hosts_retries_transient_failures(self):
+        client = MagicMock()
+        client.create_host.side_effect = [HttpStatusError(status=502), {'id': 'one'}]
+        retry_policy = RetryPolicy(max_attempts=2, sleep=MagicMock())
+        results = list(HostFactoryLogic(client).create_hosts(['one'], 'some-token',
+                                                             retry_policy=retry_policy))
+
+        self.assertEqual(results, [('one', {'id': 'one'}, None)])
@@ -0,0 +1,153 @@
+import json
+import os
+import stat
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.data_object import CreateTokenData
+from conjur.errors import InvalidFormatException, MissingRequiredParameterException, \
+    TokenPoolEmptyException
+from conjur.logic.token_pool_logic import TokenPoolLogic
+
+NOW = 1_700_000_000
+
+
+def expiration(seconds_from_now: int) -> str:
+    return datetime.fromtimestamp(NOW + seconds_from_now, timezone.utc) \
+        .strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class FakeHostFactory:
+    """
+    Stands in for the client, minting tokens that expire in an hour
+    """
+
+    def __init__(self):
+        self.minted = 0
+        self.requests = []
+        self.revoked = []
+
+    def create_token(self, create_token_data):
+        self.requests.append(create_token_data)
+        tokens = [{'token': f'token-{self.minted + i}', 'expiration': expiration(3600),
+                   'cidr': create_token_data.cidr}
+                  for i in range(create_token_data.count)]
+        self.minted += create_token_data.count
+        return tokens
+
+    def revoke_token(self, token):
+        self.revoked.append(token)
+
+
+class TokenPoolLogicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool_dir = tempfile.TemporaryDirectory()
+        self.pool_file = os.path.join(self.pool_dir.name, 'tokens.json')
+        self.client = FakeHostFactory()
+        self.token_pool_logic = TokenPoolLogic(self.client, self.pool_file, clock=lambda: NOW)
+
+    def tearDown(self):
+        self.pool_dir.cleanup()
+
+    def read_pool(self):
+        with open(self.pool_file) as pool_fp:
+            return json.load(pool_fp)
+
+    def test_refill_mints_tokens_in_a_single_request(self):
+        created, available = self.token_pool_logic.refill('my_factory', 5, 2, ['10.0.0.0/24'], 60)
+
+        self.assertEqual((created, available), (5, 5))
+        self.assertEqual(len(self.client.requests), 1)
+        self.assertEqual(self.client.requests[0].to_dict()['count'], 5)
+        self.assertEqual(self.client.requests[0].cidr, ['10.0.0.0/24'])
+        self.assertEqual(len(self.read_pool()['host_factories']['my_factory']['tokens']), 5)
+        self.assertEqual(stat.S_IMODE(os.stat(self.pool_file).st_mode), 0o600)
+
+    def test_refill_only_tops_up_missing_tokens(self):
+        self.token_pool_logic.refill('my_factory', 5, 2, None, 60)
+        self.token_pool_logic.acquire('my_factory')
+        created, available = self.token_pool_logic.refill('my_factory', 5, 2, None, 60)
+
+        self.assertEqual((created, available), (1, 5))
+
+    def test_refill_without_duration_raises_missing_parameter(self):
+        with self.assertRaises(MissingRequiredParameterException):
+            self.token_pool_logic.refill('my_factory', 5, 2, None, 0)
+
+    def test_acquire_hands_out_each_token_once(self):
+        self.token_pool_logic.refill('my_factory', 3, 0, None, 60)
+        tokens = [self.token_pool_logic.acquire('my_factory')['token'] for _ in range(3)]
+
+        self.assertEqual(sorted(tokens), ['token-0', 'token-1', 'token-2'])
+        self.assertEqual(len(self.client.requests), 1)
+
+    def test_acquire_refills_below_low_water_mark(self):
+        self.token_pool_logic.refill('my_factory', 4, 2, None, 60)
+        self.token_pool_logic.acquire('my_factory')
+        self.token_pool_logic.acquire('my_factory')
+        self.assertEqual(len(self.client.requests), 1)
+
+        self.token_pool_logic.acquire('my_factory')
+        self.assertEqual(len(self.client.requests), 2)
+        self.assertEqual(self.client.requests[1].count, 3)
+        self.assertEqual(len(self.read_pool()['host_factories']['my_factory']['tokens']), 4)
+
+    def test_acquire_hands_out_the_token_when_the_low_water_refill_fails(self):
+        self.token_pool_logic.refill('my_factory', 2, 2, None, 60)
+        self.client.create_token = MagicMock(side_effect=HttpStatusError(status=503))
+
+        self.assertEqual(self.token_pool_logic.acquire('my_factory')['token'], 'token-0')
+        self.assertEqual([token['token'] for token in
+                          self.read_pool()['host_factories']['my_factory']['tokens']],
+                         ['token-1'])
+        self.assertEqual(self.token_pool_logic.acquire('my_factory')['token'], 'token-1')
+        self.assertEqual(self.client.create_token.call_count, 2)
+
+    def test_acquire_skips_tokens_expiring_within_min_ttl(self):
+        with open(self.pool_file, 'w') as pool_fp:
+            json.dump({'host_factories': {'my_factory': {'tokens': [
+                {'token': 'expired', 'expiration': expiration(-10)},
+                {'token': 'expiring', 'expiration': expiration(30)},
+                {'token': 'valid', 'expiration': expiration(600)}]}}}, pool_fp)
+
+        self.assertEqual(self.token_pool_logic.acquire('my_factory', min_ttl=60)['token'], 'valid')
+
+    def test_acquire_from_empty_pool_without_settings_raises(self):
+        with self.assertRaises(TokenPoolEmptyException):
+            self.token_pool_logic.acquire('my_factory')
+
+    def test_drain_revokes_unused_tokens(self):
+        self.token_pool_logic.refill('my_factory', 3, 0, None, 60)
+        self.token_pool_logic.acquire('my_factory')
+        revoked, failures = self.token_pool_logic.drain('my_factory', 2)
+
+        self.assertEqual((revoked, failures), (2, []))
+        self.assertEqual(sorted(self.client.revoked), ['token-1', 'token-2'])
+        self.assertEqual(self.read_pool()['host_factories'], {})
+
+    def test_drain_keeps_tokens_that_failed_to_be_revoked(self):
+        self.token_pool_logic.refill('my_factory', 2, 0, None, 60)
+        self.client.revoke_token = MagicMock(side_effect=[None, HttpStatusError(status=503)])
+        revoked, failures = self.token_pool_logic.drain(max_workers=1)
+
+        self.assertEqual(revoked, 1)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.read_pool()['host_factories']['my_factory']['tokens'],
+                         [failures[0][0]])
+
+
+class CreateTokenDataTest(unittest.TestCase):
+
+    def test_count_is_sent_only_when_many_tokens_are_requested(self):
+        self.assertNotIn('count', CreateTokenData(host_factory='my_factory', days=1).to_dict())
+        self.assertEqual(
+            CreateTokenData(host_factory='my_factory', days=1, count=3).to_dict()['count'], 3)
+
+    def test_non_positive_count_raises_invalid_format(self):
+        with self.assertRaises(InvalidFormatException):
+            CreateTokenData(host_factory='my_factory', days=1, count=0)
@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.cli import Cli
+from conjur.errors import InvalidFormatException
+from conjur.util.batch_runner import BatchRunner, mask_sensitive_options, parse_batch
+
+BATCH = '''# Load the policy first
+policy load -b root -f policy.yml
+wait
+variable set -i one -v "secret value"
+variable get -i two
+
+wait
+whoami
+'''
+
+
+def fake_execute(words):
+    sys.stdout.write(f"output of {words[0]} {threading.get_ident()}\n")
+    if words[-1] == 'fail':
+        sys.stderr.write('failed\n')
+        return 1
+    return 0
+
+
+class BatchRunnerTest(unittest.TestCase):
+
+    def run_batch(self, content, **kwargs):
+        report = io.StringIO()
+        commands = BatchRunner(fake_execute, **kwargs).run(parse_batch(io.StringIO(content)),
+                                                           report)
+        return commands, [json.loads(line) for line in report.getvalue().splitlines()]
+
+    def test_lines_are_split_into_groups_at_wait(self):
+        groups = parse_batch(io.StringIO(BATCH))
+
+        self.assertEqual([[command.line_number for command in group] for group in groups],
+                         [[2], [4, 5], [8]])
+        self.assertEqual(groups[1][0].words, ['variable', 'set', '-i', 'one', '-v',
+                                              'secret value'])
+
+    def test_invalid_line_raises_error(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_batch(io.StringIO('whoami\nvariable get -i "unclosed\n'))
+
+    def test_sensitive_option_values_are_masked(self):
+        self.assertEqual(mask_sensitive_options(['user', 'change-password', '-p', 'pw',
+                                                 '--value=secret', '-i', 'id']),
+                         ['user', 'change-password', '-p', '****', '--value=****', '-i', 'id'])
+
+    def test_report_holds_output_of_each_command(self):
+        _, reports = self.run_batch(BATCH)
+
+        self.assertEqual([report['line'] for report in reports], [2, 4, 5, 8])
+        self.assertEqual(reports[1]['command'], "variable set -i one -v '****'")
+        self.assertTrue(reports[1]['output'].startswith('output of variable'))
+        self.assertEqual({report['status'] for report in reports}, {'ok'})
+
+    def test_parallel_commands_have_separate_output(self):
+        content = ''.join(f'show -i {index}\n' for index in range(20))
+
+        _, reports = self.run_batch(content, parallel=4)
+
+        for report in reports:
+            self.assertEqual(report['output'].count('\n'), 1)
+        self.assertEqual([report['line'] for report in reports], list(range(1, 21)))
+
+    def test_failed_command_does_not_stop_the_batch(self):
+        commands, reports = self.run_batch('show -i fail\nwait\nwhoami\n')
+
+        self.assertEqual([report['status'] for report in reports], ['failed', 'ok'])
+        self.assertEqual(reports[0]['errors'], 'failed\n')
+        self.assertEqual([command.exit_code for command in commands], [1, 0])
+
+    def test_fail_fast_skips_remaining_commands(self):
+        _, reports = self.run_batch('whoami\nshow -i fail\nwhoami\nwait\nwhoami\n',
+                                    fail_fast=True)
+
+        self.assertEqual([report['status'] for report in reports],
+                         ['ok', 'failed', 'skipped', 'skipped'])
+
+    def test_fail_fast_in_parallel_skips_following_groups(self):
+        _, reports = self.run_batch('show -i fail\nwhoami\nwait\nwhoami\n',
+                                    fail_fast=True, parallel=2)
+
+        self.assertEqual([report['status'] for report in reports], ['failed', 'ok', 'skipped'])
+
+
+class CliBatchTest(unittest.TestCase):
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_batch_runs_commands_with_one_client(self, mock_stdout, mock_stderr):
+        client = MagicMock()
+        client.get.return_value = b'value'
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            batch_file = os.path.join(tmp_dir, 'commands.txt')
+            with open(batch_file, 'w', encoding='utf-8') as batch_fp:
+                batch_fp.write('variable get -i one\nlogin\n')
+            cli = Cli()
+            cli.parser = Cli._build_parser()
+            args = MagicMock(batch_file=batch_file, parallel=1, fail_fast=False, debug=False)
+
+            exit_code = cli._run_batch(args, client)
+
+        reports = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(exit_code, 1)
+        self.assertEqual([(report['status'], report['output']) for report in reports],
+                         [('ok', 'value\n'),
+                          ('failed', 'Error: the login command cannot run in a shell '
+                                     'or a batch\n')])
+        self.assertIn('Ran 2 of 2 command(s), 1 failed', mock_stderr.getvalue())
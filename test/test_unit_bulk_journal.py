@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.controller.host_controller import HostController
+from conjur.errors import InvalidFormatException
+from conjur.util.bulk_journal import BulkJournal, open_journal
+
+
+class BulkJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'rotate.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_completed_items_are_skipped_on_resume(self):
+        journal = BulkJournal(self.path, 'host rotate-api-key')
+        self.assertFalse(journal.resumed)
+        journal.record('host1')
+        journal.record('host3')
+        journal.close()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        journal = BulkJournal(self.path, 'host rotate-api-key')
+        self.assertTrue(journal.resumed)
+        self.assertEqual(journal.pending(['host1', 'host2', 'host3', 'host4']),
+                         ['host2', 'host4'])
+        journal.close()
+
+    def test_only_items_that_succeeded_are_recorded_once_consumed(self):
+        journal = BulkJournal(self.path, 'host rotate-api-key')
+        results = journal.track(iter([('host1', 'key1', None),
+                                      ('host2', None, ConnectionError('lost')),
+                                      ('host3', 'key3', None)]))
+
+        next(results)
+        self.assertEqual(journal.completed, set())
+        for _ in results:
+            pass
+        journal.close()
+
+        self.assertEqual(BulkJournal(self.path, 'host rotate-api-key').completed,
+                         {'host1', 'host3'})
+
+    def test_output_is_synced_before_the_journal(self):
+        output_path = os.path.join(self.directory.name, 'keys.json')
+        journal = BulkJournal(self.path, 'host rotate-api-key')
+        synced = []
+        with open(output_path, 'w', encoding='utf-8') as output, \
+                patch('conjur.util.bulk_journal.JOURNAL_SYNC_SECONDS', 0), \
+                patch('os.fsync', side_effect=synced.append):
+            for item, result, _ in journal.track(iter([('host1', 'key1', None)]), output):
+                output.write(json.dumps({'id': item, 'api_key': result}) + '\n')
+            expected = [output.fileno(), journal._file.fileno()]
+        journal.close()
+
+        # Synced once as the item is recorded, then once the results are consumed
+        self.assertEqual(synced, expected * 2)
+        with open(output_path, 'r', encoding='utf-8') as output:
+            self.assertEqual(json.loads(output.read()), {'id': 'host1', 'api_key': 'key1'})
+
+    def test_output_is_synced_when_the_caller_stops_early(self):
+        output_path = os.path.join(self.directory.name, 'keys.json')
+        journal = BulkJournal(self.path, 'host rotate-api-key')
+        synced = []
+        with open(output_path, 'w', encoding='utf-8') as output, \
+                patch('os.fsync', side_effect=synced.append):
+            with self.assertRaises(InvalidFormatException):
+                for item, result, _ in journal.track(iter([('host1', 'key1', None),
+                                                           ('host2', 'key2', None)]), output):
+                    output.write(json.dumps({'id': item, 'api_key': result}) + '\n')
+                    raise InvalidFormatException("stopped")
+            expected = [output.fileno(), journal._file.fileno()]
+        journal.close()
+
+        self.assertEqual(synced[:2], expected)
+
+    def test_line_torn_by_an_interrupted_run_is_dropped(self):
+        with open_journal(self.path, 'user rotate-api-key') as journal:
+            journal.record('alice')
+        with open(self.path, 'ab') as journal_file:
+            journal_file.write(b'{"id": "bo')
+
+        with patch('sys.stderr', new_callable=io.StringIO) as mock_stderr:
+            with open_journal(self.path, 'user rotate-api-key') as journal:
+                self.assertEqual(journal.completed, {'alice'})
+                journal.record('bob')
+        self.assertIn("skipping 1 completed item(s)", mock_stderr.getvalue())
+
+        with open(self.path, 'r', encoding='utf-8') as journal_file:
+            lines = [json.loads(line) for line in journal_file]
+        self.assertEqual(lines[1:], [{'id': 'alice'}, {'id': 'bob'}])
+
+    def test_journal_of_another_command_is_rejected(self):
+        BulkJournal(self.path, 'host rotate-api-key').close()
+
+        with self.assertRaises(InvalidFormatException):
+            BulkJournal(self.path, 'user rotate-api-key')
+
+    def test_file_that_is_not_a_journal_is_left_untouched(self):
+        with open(self.path, 'w', encoding='utf-8') as other_file:
+            other_file.write('host1\nhost2\n')
+
+        with self.assertRaises(InvalidFormatException):
+            BulkJournal(self.path, 'host rotate-api-key')
+        with open(self.path, 'r', encoding='utf-8') as other_file:
+            self.assertEqual(other_file.read(), 'host1\nhost2\n')
+
+    def test_no_journal_without_a_path(self):
+        with open_journal(None, 'host rotate-api-key') as journal:
+            self.assertIsNone(journal)
+
+
+class BulkJournalResumeTest(unittest.TestCase):
+
+    def test_interrupted_rotation_resumes_and_appends_to_the_output(self):
+        mock_client = MagicMock()
+        mock_client.rotate_other_api_key.side_effect = [
+            'key1', HttpStatusError(status=503), 'key3', 'key2']
+        host_controller = HostController(mock_client, None)
+
+        with tempfile.TemporaryDirectory() as directory:
+            journal_file = os.path.join(directory, 'rotate.journal')
+            output_file = os.path.join(directory, 'keys.json')
+            with redirect_stdout(io.StringIO()):
+                for _ in range(2):
+                    with patch('sys.stderr', new_callable=io.StringIO), \
+                            open_journal(journal_file, 'host rotate-api-key') as journal:
+                        host_controller.rotate_api_keys(['host1', 'host2', 'host3'],
+                                                        output_file=output_file,
+                                                        max_workers=1, journal=journal)
+            with open(output_file, 'r', encoding='utf-8') as output_fp:
+                lines = [json.loads(line) for line in output_fp]
+
+        self.assertEqual(mock_client.rotate_other_api_key.call_count, 4)
+        self.assertEqual([line['id'] for line in lines], ['host1', 'host2', 'host3', 'host2'])
+        self.assertEqual(lines[3], {'id': 'host2', 'api_key': 'key2'})
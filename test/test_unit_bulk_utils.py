@@ -0,0 +1,76 @@
+import io
+import json
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.errors import MissingRequiredParameterException
+from conjur.util import bulk_utils
+from conjur.util.circuit_breaker import CircuitBreaker
+
+
+class BulkUtilsTest(unittest.TestCase):
+
+    def test_read_identifiers_combines_arguments_and_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as ids_file:
+            ids_file.write("variable:two\n\n# a comment\n  host:three  \n")
+            ids_file.flush()
+            identifiers = bulk_utils.read_identifiers(['variable:one'], ids_file.name)
+        self.assertEqual(identifiers, ['variable:one', 'variable:two', 'host:three'])
+
+    def test_read_identifiers_reads_stdin_when_file_is_dash(self):
+        with patch('sys.stdin', io.StringIO("variable:one\nvariable:two\n")):
+            self.assertEqual(bulk_utils.read_identifiers(None, '-'), ['variable:one', 'variable:two'])
+
+    def test_read_identifiers_without_identifiers_raises_missing_required_parameter_exception(self):
+        with self.assertRaises(MissingRequiredParameterException):
+            bulk_utils.read_identifiers([], None)
+
+    def test_is_bulk_request(self):
+        self.assertFalse(bulk_utils.is_bulk_request(['one']))
+        self.assertTrue(bulk_utils.is_bulk_request(['one', 'two']))
+        self.assertTrue(bulk_utils.is_bulk_request(None, 'ids.txt'))
+
+    def test_run_concurrently_keeps_order_and_reports_errors(self):
+        def func(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item * 10
+
+        results = list(bulk_utils.run_concurrently(func, range(6), max_workers=2))
+        self.assertEqual([item for item, _, _ in results], list(range(6)))
+        self.assertEqual(results[1], (1, 10, None))
+        self.assertIsInstance(results[3][2], ValueError)
+
+    def test_run_concurrently_runs_first_item_in_calling_thread(self):
+        threads = []
+        list(bulk_utils.run_concurrently(lambda item: threads.append(threading.current_thread()),
+                                         range(3), max_workers=2))
+        self.assertIs(threads[0], threading.current_thread())
+
+    def test_run_concurrently_with_no_items_yields_nothing(self):
+        self.assertEqual(list(bulk_utils.run_concurrently(lambda item: item, [])), [])
+
+    def test_write_json_line_writes_single_line(self):
+        stream = io.StringIO()
+        bulk_utils.write_json_line({'id': 'variable:one', 'exists': True}, stream)
+        self.assertEqual(json.loads(stream.getvalue()), {'id': 'variable:one', 'exists': True})
+        self.assertTrue(stream.getvalue().endswith('\n'))
+        self.assertEqual(stream.getvalue().count('\n'), 1)
+
+    def test_run_concurrently_pauses_when_circuit_breaker_opens(self):
+        circuit_breaker = CircuitBreaker(window_size=2, min_calls=2, cooldown=0.05)
+
+        def func(item):
+            if item < 2:
+                raise HttpStatusError(status=503)
+            return item
+
+        results = list(bulk_utils.run_concurrently(func, range(4), max_workers=1,
+                                                   circuit_breaker=circuit_breaker))
+
+        self.assertEqual([result for _, result, _ in results], [None, None, 2, 3])
+        self.assertEqual(circuit_breaker.times_opened, 1)
@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.util.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def fail_transiently():
+    raise HttpStatusError(status=502)
+
+
+def fail_permanently():
+    raise HttpStatusError(status=404)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def trip(self, circuit_breaker, calls=4):
+        for _ in range(calls):
+            with self.assertRaises(HttpStatusError):
+                circuit_breaker.call(fail_transiently)
+
+    def test_opens_when_failure_ratio_is_reached(self):
+        circuit_breaker = CircuitBreaker(window_size=4, min_calls=4, failure_ratio=0.5)
+        circuit_breaker.call(lambda: 'ok')
+        circuit_breaker.call(lambda: 'ok')
+        self.trip(circuit_breaker, 1)
+        self.assertEqual(circuit_breaker.state, CLOSED)
+
+        self.trip(circuit_breaker, 1)
+
+        self.assertEqual(circuit_breaker.state, OPEN)
+        self.assertEqual(circuit_breaker.times_opened, 1)
+
+    def test_permanent_errors_do_not_open_the_breaker(self):
+        circuit_breaker = CircuitBreaker(window_size=4, min_calls=4)
+        for _ in range(10):
+            with self.assertRaises(HttpStatusError):
+                circuit_breaker.call(fail_permanently)
+
+        self.assertEqual(circuit_breaker.state, CLOSED)
+
+    def test_calls_wait_for_cooldown_and_successful_probe_closes(self):
+        circuit_breaker = CircuitBreaker(window_size=4, min_calls=4, cooldown=0.05)
+        self.trip(circuit_breaker)
+
+        started_at = time.monotonic()
+        self.assertEqual(circuit_breaker.call(lambda: 'ok'), 'ok')
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.04)
+        self.assertEqual(circuit_breaker.state, CLOSED)
+
+    def test_failed_probe_reopens_with_doubled_cooldown(self):
+        circuit_breaker = CircuitBreaker(window_size=4, min_calls=4, cooldown=0.01,
+                                         max_cooldown=0.03)
+        self.trip(circuit_breaker)
+        self.trip(circuit_breaker, 1)
+        self.assertEqual((circuit_breaker.state, circuit_breaker.times_opened), (OPEN, 2))
+        self.trip(circuit_breaker, 1)
+
+        self.assertEqual(circuit_breaker._cooldown, 0.03)
+
+    def test_only_one_probe_is_let_through_when_half_open(self):
+        circuit_breaker = CircuitBreaker(window_size=4, min_calls=4, cooldown=0.01)
+        self.trip(circuit_breaker)
+        time.sleep(0.02)
+        self.assertTrue(circuit_breaker.before_call())
+        self.assertEqual(circuit_breaker.state, HALF_OPEN)
+
+        waiter = threading.Thread(target=circuit_breaker.before_call)
+        waiter.start()
+        waiter.join(0.05)
+        self.assertTrue(waiter.is_alive())
+
+        circuit_breaker.record(True, False)
+        waiter.join(1)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(circuit_breaker.state, CLOSED)
@@ -1,4 +1,8 @@
+import json
+import io
+import sys
 import tempfile
+from contextlib import redirect_stdout
 
 import unittest
 from unittest.mock import patch, MagicMock
@@ -9,6 +13,7 @@ from conjur_api.models import SslVerificationMetadata, SslVerificationMode
 from conjur.controller import InitController
 from conjur.controller.host_controller import HostController
 from conjur.controller.hostfactory_controller import HostFactoryController
+from conjur.controller.token_pool_controller import TokenPoolController
 from conjur.controller.login_controller import LoginController
 from conjur.controller.logout_controller import LogoutController
 from conjur.controller.user_controller import UserController
@@ -205,6 +210,44 @@ Copyright (c) {time.strftime("%Y")} CyberArk Software Ltd. All rights reserved.
     def test_cli_show_outputs_formatted_json(self, cli_invocation, output, client):
         self.assertEquals('{\n    "foo": "A",\n    "bar": "B"\n}\n', output)
 
+    @cli_test(["show", "-i", "kind:/path/to/var", "kind:/path/to/other"], show_output={"foo": "A"})
+    def test_cli_show_with_multiple_ids_outputs_json_lines(self, cli_invocation, output, client):
+        self.assertEqual(client.get_resource.call_count, 2)
+        self.assertEqual('{"id": "kind:/path/to/var", "resource": {"foo": "A"}}\n'
+                         '{"id": "kind:/path/to/other", "resource": {"foo": "A"}}\n', output)
+
+    def test_cli_show_with_multiple_ids_exits_with_error_when_any_id_failed(self):
+        capture_stream = io.StringIO()
+        client = MagicMock()
+        client.get_resource.return_value = {'foo': 'A'}
+        with self.assertRaises(SystemExit) as sys_exit:
+            with redirect_stdout(capture_stream), \
+                    patch.object(sys, 'argv', ['cli', 'show', '-i', 'kind:/path/to/var',
+                                               'missingkind']), \
+                    patch('conjur.cli.Client', return_value=client):
+                Cli().run()
+
+        self.assertEqual(sys_exit.exception.code, 1)
+        lines = [json.loads(line) for line in capture_stream.getvalue().splitlines()]
+        self.assertEqual(lines[0], {'id': 'kind:/path/to/var', 'resource': {'foo': 'A'}})
+        self.assertIn('error', lines[1])
+
+    def test_cli_bulk_rotation_and_creation_exit_with_error_when_any_id_failed(self):
+        for command, handler in ((['host', 'rotate-api-key', '--ids-file', 'ids.txt'],
+                                  'handle_host_logic'),
+                                 (['user', 'rotate-api-key', '--ids-file', 'ids.txt'],
+                                  'handle_user_logic'),
+                                 (['hostfactory', 'create', 'host', '-t', 'token',
+                                   '--ids-file', 'ids.txt'], 'handle_hostfactory_logic'),
+                                 (['import', '-i', 'apps.enc'], 'handle_import_logic')):
+            with self.assertRaises(SystemExit) as sys_exit:
+                with redirect_stdout(io.StringIO()), \
+                        patch.object(sys, 'argv', ['cli'] + command), \
+                        patch('conjur.cli.Client'), \
+                        patch.object(cli_actions, handler, return_value=2):
+                    Cli().run()
+            self.assertEqual(sys_exit.exception.code, 1, command)
+
     @cli_test(["resource", "exists", "-i", "kind:/path/to/var"])
     def test_cli_invokes_resource_exists_correctly(self, cli_invocation, output, client):
         client.resource_exists.assert_called_once_with('kind', '/path/to/var')
@@ -273,6 +316,100 @@ Copyright (c) {time.strftime("%Y")} CyberArk Software Ltd. All rights reserved.
     def test_cli_invokes_whoami_outputs_formatted_json(self, cli_invocation, output, client):
         self.assertEquals('{\n    "conjur_account": "myaccount"\n}\n', output)
 
+    @cli_test(["--profile", "whoami"], whoami_output=WHOAMI_RESPONSE)
+    def test_cli_profile_keeps_command_output_unchanged(self, cli_invocation, output, client):
+        client.whoami.assert_called_once_with()
+        self.assertEqual('{\n    "conjur_account": "myaccount"\n}\n', output)
+
+    @patch('conjur.cli.Cli._write_profile')
+    def test_cli_profile_writes_report_when_command_fails(self, mock_write_profile):
+        with patch.object(sys, 'argv', ['cli', '--profile', '--profile-output', 'out.prof',
+                                        'whoami']), \
+                patch('conjur.cli.Client') as mock_client, \
+                redirect_stdout(io.StringIO()):
+            mock_client.return_value.whoami.side_effect = ValueError('boom')
+            with self.assertRaises(SystemExit) as sys_exit:
+                Cli().run()
+
+        self.assertEqual(sys_exit.exception.code, 1)
+        mock_write_profile.assert_called_once_with('out.prof')
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_cli_profile_report_includes_phases_and_client_calls(self, mock_stderr):
+        with patch.object(sys, 'argv', ['cli', '--profile', 'whoami']), \
+                patch('conjur.cli.Client') as mock_client, \
+                redirect_stdout(io.StringIO()):
+            mock_client.return_value.whoami.return_value = WHOAMI_RESPONSE
+            with self.assertRaises(SystemExit):
+                Cli().run()
+
+        report = mock_stderr.getvalue()
+        for phase in ['argument parser build', 'credential store resolution',
+                      'config load', 'client creation', 'command', 'client.whoami x1']:
+            self.assertIn(phase, report)
+
+    def test_cli_metrics_file_records_client_calls(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metrics_file = f'{tmp_dir}/metrics.jsonl'
+            with patch.object(sys, 'argv', ['cli', '--metrics-file', metrics_file,
+                                            'variable', 'get', '-i', 'foo']), \
+                    patch('conjur.cli.Client') as mock_client, \
+                    redirect_stdout(io.StringIO()):
+                mock_client.return_value.get.return_value = b'bar'
+                with self.assertRaises(SystemExit):
+                    Cli().run()
+
+            with open(metrics_file, 'r', encoding='utf-8') as metrics_fp:
+                records = [json.loads(line) for line in metrics_fp]
+        self.assertEqual([(record['command'], record['endpoint'], record['status'])
+                          for record in records], [('variable get', 'get', 'ok')])
+
+    def test_cli_max_request_rate_throttles_client_calls(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_file = f'{tmp_dir}/rate-limit.json'
+            with patch.object(sys, 'argv', ['cli', '--max-request-rate', '5', '--max-in-flight',
+                                            '2', 'variable', 'get', '-i', 'foo']), \
+                    patch('conjur.cli.DEFAULT_RATE_LIMIT_STATE_FILE', state_file), \
+                    patch('conjur.cli.Client') as mock_client, \
+                    redirect_stdout(io.StringIO()):
+                mock_client.return_value.get.return_value = b'bar'
+                with self.assertRaises(SystemExit):
+                    Cli().run()
+
+            with open(state_file, 'r', encoding='utf-8') as state_fp:
+                state = json.load(state_fp)
+        self.assertEqual(state['appliances']['https://someurl']['tokens'], 4)
+        self.assertEqual(state['appliances']['https://someurl']['in_flight'], {})
+
+    @patch('conjur.util.child_process.ChildProcess.launch', return_value=3)
+    def test_cli_run_launches_command_after_fetching_secrets_in_one_batch(self, mock_launch):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            secrets_file = f'{tmp_dir}/secrets.yml'
+            with open(secrets_file, 'w', encoding='utf-8') as secrets_fp:
+                secrets_fp.write('A: !var one/secret\nB: !var two/secret\nC: !str three\n')
+            with patch.object(sys, 'argv', ['cli', 'run', '--secrets', secrets_file,
+                                            '--', 'env', '-u', 'HOME']), \
+                    patch('conjur.cli.Client') as mock_client:
+                mock_client.return_value.get_many.return_value = {'one/secret': '1',
+                                                                  'two/secret': '2'}
+                with self.assertRaises(SystemExit) as sys_exit:
+                    Cli().run()
+
+        self.assertEqual(sys_exit.exception.code, 3)
+        mock_client.return_value.get_many.assert_called_once_with('one/secret', 'two/secret')
+        mock_launch.assert_called_once_with()
+
+    def test_cli_completion_script_is_printed_without_a_client(self):
+        with patch.object(sys, 'argv', ['cli', 'completion', 'bash']), \
+                patch('conjur.cli.Client') as mock_client, \
+                redirect_stdout(io.StringIO()) as stdout:
+            with self.assertRaises(SystemExit) as sys_exit:
+                Cli().run()
+
+        self.assertEqual(sys_exit.exception.code, 0)
+        self.assertIn('complete -o default -F _conjur_complete conjur', stdout.getvalue())
+        mock_client.assert_not_called()
+
     @patch('conjur.cli_actions.handle_init_logic')
     def test_cli_init_functions_are_properly_called(self, mock_init):
         cli_actions.handle_init_logic(url="https://someurl", account="somename",
@@ -488,3 +625,110 @@ Copyright (c) {time.strftime("%Y")} CyberArk Software Ltd. All rights reserved.
 
         cli_actions.handle_hostfactory_logic(args=mock_obj, client='someclient')
         mock_hostfactory_create_token.assert_called_once()
+
+    @patch.object(HostFactoryController, 'create_host')
+    def test_cli_hostfactory_host_create_with_single_id_creates_one_host(self, mock_create_host):
+        mock_obj = MockArgs()
+        mock_obj.action_type = 'create_host'
+        mock_obj.id = ['some-host']
+        mock_obj.ids_file = None
+        mock_obj.output_file = None
+        mock_obj.token = 'some-token'
+
+        cli_actions.handle_hostfactory_logic(args=mock_obj, client='someclient')
+        self.assertEqual(mock_create_host.call_args[0][0].host_id, 'some-host')
+
+    @patch.object(HostFactoryController, 'create_hosts')
+    def test_cli_hostfactory_host_create_with_many_ids_creates_hosts_in_bulk(self, mock_create_hosts):
+        mock_obj = MockArgs()
+        mock_obj.action_type = 'create_host'
+        mock_obj.id = ['some-host', 'other-host']
+        mock_obj.ids_file = None
+        mock_obj.output_file = None
+        mock_obj.token = 'some-token'
+        mock_obj.concurrency = 4
+        mock_obj.rate_limit = 10
+        mock_obj.retries = 2
+
+        cli_actions.handle_hostfactory_logic(args=mock_obj, client='someclient')
+        self.assertEqual(mock_create_hosts.call_args[0], (['some-host', 'other-host'], 'some-token'))
+        self.assertEqual(mock_create_hosts.call_args[1]['max_workers'], 4)
+        self.assertEqual(mock_create_hosts.call_args[1]['retry_policy'].max_attempts, 3)
+
+    @patch.object(TokenPoolController, 'acquire')
+    def test_cli_hostfactory_pool_acquire_takes_token_from_pool_file(self, mock_acquire):
+        mock_obj = MockArgs()
+        mock_obj.action_type = 'pool_acquire'
+        mock_obj.hostfactoryid = 'my_factory'
+        mock_obj.min_ttl = 60
+        mock_obj.pool_file = 'tokens.json'
+
+        cli_actions.handle_hostfactory_logic(args=mock_obj, client='someclient')
+        mock_acquire.assert_called_once_with('my_factory', 60)
+
+    @patch.object(TokenPoolController, 'refill')
+    def test_cli_hostfactory_pool_refill_converts_duration_to_minutes(self, mock_refill):
+        mock_obj = MockArgs()
+        mock_obj.action_type = 'pool_refill'
+        mock_obj.hostfactoryid = 'my_factory'
+        mock_obj.cidr = None
+        mock_obj.duration_days = 1
+        mock_obj.duration_hours = 2
+        mock_obj.duration_minutes = None
+        mock_obj.size = 10
+        mock_obj.low_water = 2
+        mock_obj.pool_file = 'tokens.json'
+
+        cli_actions.handle_hostfactory_logic(args=mock_obj, client='someclient')
+        mock_refill.assert_called_once_with('my_factory', 10, 2, None, 1560)
+
+    @patch.object(HostController, 'rotate_api_key')
+    @patch.object(HostController, 'rotate_api_keys')
+    def test_cli_host_rotate_api_key_with_output_file_writes_the_key_to_it(
+            self, mock_rotate_api_keys, mock_rotate_api_key):
+        mock_obj = MockArgs()
+        mock_obj.action = 'rotate-api-key'
+        mock_obj.id = 'somehost'
+        mock_obj.ids_file = None
+        mock_obj.output_file = 'keys.json'
+        mock_obj.concurrency = 4
+
+        cli_actions.handle_host_logic(args=mock_obj, client='someclient')
+        mock_rotate_api_keys.assert_called_once_with(['somehost'], output_file='keys.json',
+                                                     max_workers=4, journal=None,
+                                                     logged_in_username=None)
+        mock_rotate_api_key.assert_not_called()
+
+    @patch.object(UserController, 'rotate_api_key')
+    @patch.object(UserController, 'rotate_api_keys')
+    def test_cli_user_rotate_api_key_with_output_file_writes_the_key_to_it(
+            self, mock_rotate_api_keys, mock_rotate_api_key):
+        mock_obj = MockArgs()
+        mock_obj.action = 'rotate-api-key'
+        mock_obj.id = 'someuser'
+        mock_obj.ids_file = None
+        mock_obj.output_file = 'keys.json'
+        mock_obj.concurrency = 4
+
+        cli_actions.handle_user_logic(credential_provider=FileCredentialsProvider(), args=mock_obj,
+                                      client='someclient')
+        mock_rotate_api_keys.assert_called_once_with(['someuser'], output_file='keys.json',
+                                                     max_workers=4, journal=None)
+        mock_rotate_api_key.assert_not_called()
+
+    @patch.object(HostController, 'rotate_api_keys')
+    def test_cli_host_rotate_api_key_with_ids_file_rotates_in_bulk(self, mock_rotate_api_keys):
+        mock_obj = MockArgs()
+        mock_obj.action = 'rotate-api-key'
+        mock_obj.id = 'someid'
+        mock_obj.output_file = 'keys.json'
+        mock_obj.concurrency = 4
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as ids_file:
+            ids_file.write('host1\n# comment\nhost2\n')
+            ids_file.flush()
+            mock_obj.ids_file = ids_file.name
+
+            cli_actions.handle_host_logic(args=mock_obj, client='someclient')
+        mock_rotate_api_keys.assert_called_once_with(['someid', 'host1', 'host2'],
+                                                     output_file='keys.json', max_workers=4,
+                                                     journal=None, logged_in_username=None)
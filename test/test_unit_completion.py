@@ -0,0 +1,162 @@
+import io
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur import launcher
+from conjur.cli import Cli
+from conjur.logic.completion_logic import CompletionLogic
+from conjur.util.completion import CACHE_TTL_SECONDS, COMPLETION_SCRIPTS, Completer, \
+    CompletionCache, IdIndex, command_tree, id_kind
+from conjur.util.resource_index import build_kind_index
+
+TREE = command_tree(Cli._build_parser())
+
+
+class CompletionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CompletionCache(os.path.join(self.directory.name, 'completion'))
+        self.refresh = MagicMock()
+        self.completer = Completer(self.cache, lambda: TREE, self.refresh)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ids_matching_a_prefix_are_suggested_in_order(self):
+        self.cache.write_ids('variable', ['b', 'ab', 'aa', 'a', 'ab', 'c'])
+
+        self.assertEqual(self.cache.index('variable').matches('a'), ['a', 'aa', 'ab'])
+        self.assertEqual(self.cache.index('variable').matches('ab'), ['ab'])
+        self.assertEqual(self.cache.index('variable').matches('d'), [])
+        self.assertEqual(self.cache.index('variable').matches(''), ['a', 'aa', 'ab', 'b', 'c'])
+
+    def test_ids_sharing_a_path_segment_are_suggested_once(self):
+        self.cache.write_ids('variable', ['prod/db/password', 'prod/db/user', 'prod/app/key',
+                                          'prod/db', 'prod/db-admin', 'dev/token'])
+
+        index = self.cache.index('variable')
+        self.assertEqual(index.matches(''), ['dev/', 'prod/'])
+        self.assertEqual(index.matches('prod/'), ['prod/app/', 'prod/db', 'prod/db-admin',
+                                                  'prod/db/'])
+        self.assertEqual(index.matches('prod/db/'), ['prod/db/password', 'prod/db/user'])
+
+    def test_suggestions_are_limited(self):
+        self.cache.write_ids('variable', [f"secret-{number}" for number in range(100)])
+
+        self.assertEqual(len(self.cache.index('variable').matches('secret-', limit=10)), 10)
+
+    def test_missing_or_empty_ids_suggest_nothing(self):
+        self.assertEqual(self.cache.index('host').matches(''), [])
+        self.cache.write_ids('host', [])
+        self.assertEqual(self.cache.index('host').matches(''), [])
+
+    def test_many_ids_are_searched_quickly(self):
+        self.cache.write_ids('variable', [f"apps/app-{number % 100}/secret-{number}"
+                                          for number in range(200000)])
+        index = self.cache.index('variable')
+
+        started_at = time.perf_counter()
+        matches = index.matches('apps/app-42/secret-1')
+        self.assertLess(time.perf_counter() - started_at, 0.05)
+        self.assertIn('apps/app-42/secret-142', matches)
+
+    def test_cache_files_are_readable_by_their_owner_only(self):
+        self.cache.write_ids('variable', ['secret'])
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache.directory).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache.index('variable').path).st_mode), 0o600)
+
+    def test_commands_subcommands_and_options_are_completed(self):
+        self.assertEqual(self.completer.complete([], 'vari'), ['variable'])
+        self.assertEqual(self.completer.complete(['variable'], 's'), ['set'])
+        self.assertIn('--version', self.completer.complete(['variable', 'get'], '--v'))
+        # Commands without subcommands suggest their options
+        self.assertIn('-h', self.completer.complete(['whoami'], ''))
+
+    def test_ids_of_the_kind_of_the_option_are_completed(self):
+        self.cache.write_ids('variable', ['prod/password'])
+        self.cache.write_ids('policy', ['root', 'prod'])
+
+        self.assertEqual(self.completer.complete(['variable', 'get', '-i'], 'p'),
+                         ['prod/'])
+        self.assertEqual(self.completer.complete(['-d', 'policy', 'load', '-b'], 'p'),
+                         ['prod'])
+        # Options that take many IDs keep completing them
+        self.assertEqual(self.completer.complete(['variable', 'get', '-i', 'a'], 'prod/'),
+                         ['prod/password'])
+        self.assertEqual(self.completer.complete(['variable', 'set', '-i', 'a', '-v'], ''), [])
+
+    def test_qualified_ids_are_completed_with_their_kind(self):
+        self.cache.write_ids('host', ['app/web'])
+
+        self.assertEqual(self.completer.complete(['check', '-i'], 'ho'),
+                         ['host:', 'host_factory:'])
+        self.assertEqual(self.completer.complete(['check', '-i'], 'host:a'), ['host:app/'])
+        self.assertEqual(self.completer.complete(['check', '-i'], 'nope:a'), [])
+
+    def test_kind_of_ids_is_the_one_of_the_longest_command(self):
+        self.assertEqual(id_kind(('hostfactory', 'create', 'token'), '-i'), 'host_factory')
+        self.assertIsNone(id_kind(('hostfactory', 'create', 'host'), '-i'))
+        self.assertIsNone(id_kind(('variable', 'set'), '-v'))
+        self.assertIsNone(id_kind((), '-i'))
+
+    def test_stale_ids_are_refreshed_in_the_background_once(self):
+        self.completer.complete(['variable', 'get', '-i'], '')
+        self.completer.complete(['variable', 'get', '-i'], '')
+        self.refresh.assert_called_once_with('variable')
+
+        self.cache.write_ids('variable', ['secret'])
+        self.completer.complete(['variable', 'get', '-i'], '')
+        self.refresh.assert_called_once()
+
+    def test_ids_older_than_the_ttl_are_stale(self):
+        self.cache.write_ids('variable', ['secret'])
+        self.assertFalse(self.cache.is_stale('variable'))
+
+        cache = CompletionCache(self.cache.directory,
+                                clock=lambda: time.time() + CACHE_TTL_SECONDS + 1)
+        self.assertTrue(cache.is_stale('variable'))
+
+    def test_command_tree_of_another_version_is_ignored(self):
+        self.cache.write_command_tree(TREE)
+        self.assertEqual(self.cache.load_command_tree(), TREE)
+
+        self.cache.write_command_tree(dict(TREE, version='0.0.1'))
+        self.assertIsNone(self.cache.load_command_tree())
+
+    def test_refresh_lists_every_kind_in_a_single_request(self):
+        client = MagicMock()
+        client.list.return_value = ['dev:variable:b', 'dev:variable:a', 'dev:host:web',
+                                    'dev:webservice:api']
+        logic = CompletionLogic(client, self.cache)
+
+        self.assertEqual(logic.refresh(['variable', 'host']), {'variable': 2, 'host': 1})
+        client.list.assert_called_once_with({})
+        self.assertEqual(self.cache.index('variable').matches(''), ['a', 'b'])
+
+        client.list.return_value = [{'id': 'dev:policy:root'}]
+        logic.refresh(['policy'])
+        client.list.assert_called_with({'kind': 'policy'})
+        self.assertEqual(self.cache.index('policy').matches(''), ['root'])
+
+    def test_launcher_writes_one_suggestion_per_line(self):
+        self.cache.write_command_tree(TREE)
+        with patch('conjur.launcher.DEFAULT_COMPLETION_CACHE_DIRECTORY', self.cache.directory), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            self.assertEqual(launcher.complete(['variable', 'g']), 0)
+        self.assertEqual(mock_stdout.getvalue(), 'get\n')
+
+    def test_scripts_call_the_completion_command(self):
+        for shell, script in COMPLETION_SCRIPTS.items():
+            self.assertIn('__complete', script, shell)
+
+    def test_index_reads_the_file_it_is_given(self):
+        path = os.path.join(self.directory.name, 'variable.idx')
+        with open(path, 'wb') as index_file:
+            index_file.write(build_kind_index([('a', 'a'), ('b', 'b'), ('c', 'c')]))
+        self.assertEqual(IdIndex(path).matches('c'), ['c'])
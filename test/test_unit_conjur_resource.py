@@ -14,3 +14,16 @@ class ConjurResourceDataTest(unittest.TestCase):
         EXPECTED_REP_OBJECT = "'kind': 'sometype', 'identifier': 'somename'"
         mock_resource = Resource(kind="sometype", identifier="somename")
         self.assertEquals(str(EXPECTED_REP_OBJECT), mock_resource.__repr__())
+
+    def test_resource_does_not_have_instance_dict(self):
+        mock_resource = Resource(kind="sometype", identifier="somename")
+        self.assertFalse(hasattr(mock_resource, '__dict__'))
+
+    def test_resource_kind_is_interned(self):
+        first = Resource(kind="".join(["some", "type"]), identifier="somename")
+        second = Resource(kind="".join(["some", "type"]), identifier="othername")
+        self.assertIs(first.kind, second.kind)
+
+    def test_equal_resources_have_equal_hashes(self):
+        self.assertEqual(hash(Resource("sometype", "somename")),
+                         hash(Resource.from_full_id("someacc:sometype:somename")))
@@ -0,0 +1,76 @@
+import json
+import unittest
+
+from conjur_api import Client
+from conjur_api.errors.errors import HttpStatusError
+from conjur_api.models import ConjurConnectionInfo, CreateHostData, CreateTokenData, \
+    CredentialsData, SslVerificationMode
+from conjur_api.providers import AuthnAuthenticationStrategy, SimpleCredentialsProvider
+
+from test.util.cli_sandbox import CliSandbox
+from test.util.conjur_stub_server import ConjurStubServer
+
+
+class ConjurStubServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ConjurStubServer()
+        cls.server.start()
+        cls.api_key = cls.server.add_user('admin', password='secret')
+        cls.server.add_variable('db/password', 'p4ss')
+        cls.server.add_variable('db/user', 'admin')
+        cls.server.add_resource('group', 'ops')
+        cls.server.add_membership('group:ops', 'user:admin')
+        cls.server.add_host_factory('factory')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset_stats()
+        credentials_provider = SimpleCredentialsProvider()
+        credentials_provider.save(CredentialsData(machine=self.server.url, username='admin',
+                                                  api_key=self.api_key))
+        self.client = Client(ConjurConnectionInfo(self.server.url, self.server.account),
+                             authn_strategy=AuthnAuthenticationStrategy(credentials_provider),
+                             ssl_verification_mode=SslVerificationMode.INSECURE,
+                             async_mode=False)
+
+    def test_client_authenticates_once_and_reads_secrets(self):
+        self.assertEqual(self.client.get('db/password'), b'p4ss')
+        self.assertEqual(self.client.get_many('db/password', 'db/user'),
+                         {'db/password': 'p4ss', 'db/user': 'admin'})
+        self.assertEqual(self.server.request_counts['authenticate'], 1)
+        self.assertEqual(self.server.request_total, 3)
+
+    def test_client_lists_and_shows_resources(self):
+        self.assertIn('dev:variable:db/user', self.client.list({'kind': 'variable'}))
+        self.assertEqual(self.client.get_resource('group', 'ops')['id'], 'dev:group:ops')
+        self.assertFalse(self.client.resource_exists('variable', 'missing'))
+
+    def test_client_creates_hosts_with_host_factory_token(self):
+        tokens = self.client.create_token(CreateTokenData(host_factory='factory', hours=1))
+        host = self.client.create_host(CreateHostData(host_id='new-host',
+                                                      token=tokens[0]['token']))
+
+        self.assertEqual(host['id'], 'dev:host:new-host')
+        self.assertEqual(host['api_key'], self.server.api_keys['dev:host:new-host'])
+
+    def test_injected_failures_are_returned_as_http_errors(self):
+        self.server.failure_rate = 1
+        try:
+            with self.assertRaises(HttpStatusError) as context:
+                self.client.get('db/password')
+        finally:
+            self.server.failure_rate = 0
+        self.assertEqual(context.exception.status, 503)
+
+    def test_cli_runs_end_to_end_in_sandbox(self):
+        with CliSandbox(self.server.url, self.server.account, 'admin', self.api_key) as sandbox:
+            result = sandbox.run('whoami')
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(json.loads(result.stdout)['username'], 'admin')
+        self.assertEqual(self.server.request_counts['whoami'], 1)
@@ -9,7 +9,7 @@ class ConjurrcDataTest(unittest.TestCase):
     def test_conjurrc_object_representation(self):
         conjurrc_data = ConjurrcData("https://someurl", "someaccount", "/some/cert/path")
         rep_obj = conjurrc_data.__repr__()
-        expected_rep_obj = {'conjur_url': 'https://someurl', 'conjur_account': 'someaccount', 'cert_file': "/some/cert/path", 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : None}
+        expected_rep_obj = {'conjur_url': 'https://someurl', 'conjur_account': 'someaccount', 'cert_file': "/some/cert/path", 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : None, 'read_urls': []}
         self.assertEquals(str(expected_rep_obj), rep_obj)
 
     def test_conjurrc_object_is_filled_correctly(self):
@@ -21,7 +21,7 @@ appliance_url: https://someurl
 cert_file: /some/path/to/pem
 netrc_path: /some/path/to/netrc
 """
-        expected_dict = {'conjur_url': 'https://someurl', 'conjur_account': 'someacc', 'cert_file': '/some/path/to/pem', 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : '/some/path/to/netrc'}
+        expected_dict = {'conjur_url': 'https://someurl', 'conjur_account': 'someacc', 'cert_file': '/some/path/to/pem', 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : '/some/path/to/netrc', 'read_urls': []}
         with patch("builtins.open", mock_open(read_data=read_data)):
             mock_conjurrc_data = ConjurrcData.load_from_file()
             self.assertEquals(mock_conjurrc_data.__dict__, expected_dict)
@@ -34,7 +34,7 @@ conjur_account: someacc
 conjur_url: https://someurl
 cert_file: /some/path/to/pem
 """
-        expected_dict = {'conjur_url': 'https://someurl', 'conjur_account': 'someacc', 'cert_file': '/some/path/to/pem', 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : None}
+        expected_dict = {'conjur_url': 'https://someurl', 'conjur_account': 'someacc', 'cert_file': '/some/path/to/pem', 'authn_type': AuthnTypes.AUTHN, 'service_id': None, 'netrc_path' : None, 'read_urls': []}
         with patch("builtins.open", mock_open(read_data=read_data)):
             mock_conjurrc_data = ConjurrcData.load_from_file()
             self.assertEquals(mock_conjurrc_data.__dict__, expected_dict)
@@ -58,3 +58,22 @@ authn_type: abcd
             with self.assertRaises(InvalidConfigurationException) as context:
                 ConjurrcData.load_from_file()
             self.assertRegex(str(context.exception), "Invalid authn_type")
+
+    def test_conjurrc_loads_read_urls(self):
+        read_data = \
+"""
+---
+account: someacc
+appliance_url: https://leader
+cert_file: /some/path/to/pem
+read_urls:
+- https://follower1/
+- https://follower2
+"""
+        with patch("builtins.open", mock_open(read_data=read_data)):
+            conjurrc_data = ConjurrcData.load_from_file()
+        self.assertEqual(conjurrc_data.read_urls, ['https://follower1', 'https://follower2'])
+
+    def test_conjurrc_throws_error_when_invalid_read_urls(self):
+        with self.assertRaises(InvalidConfigurationException):
+            ConjurrcData("https://someurl", "someaccount", read_urls=[{'url': 'x'}])
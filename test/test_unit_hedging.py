@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from conjur_api.errors.errors import HttpError, HttpStatusError
+
+from conjur.data_object.variable_data import VariableData
+from conjur.logic.variable_logic import VariableLogic
+from conjur.util.hedging import HedgedReader, MIN_HEDGE_DELAY_SECONDS
+from conjur.util.metrics import MetricsRecorder
+from conjur.util.rate_limiter import SharedRateLimiter, ThrottledClient
+from conjur.util.read_routing import EndpointHealth
+
+LEADER = 'https://leader'
+FOLLOWERS = ['https://follower1', 'https://follower2']
+
+
+class FakeAsyncClient:
+    async_mode = True
+
+    def __init__(self, value=b'secret', delay=0.0, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def get(self, variable_id, version=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.value
+
+
+class HedgingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.health = EndpointHealth(os.path.join(self.tmp_dir.name, 'health.json'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_reader(self, clients, default_delay=0.05):
+        return HedgedReader(LEADER, FOLLOWERS, clients.__getitem__, self.health,
+                            default_delay=default_delay)
+
+    def test_fast_primary_is_not_hedged(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        clients = {FOLLOWERS[0]: FakeAsyncClient(b'primary'),
+                   FOLLOWERS[1]: FakeAsyncClient(b'alternate')}
+
+        self.assertEqual(self.create_reader(clients).get('one/secret'), b'primary')
+        self.assertEqual(clients[FOLLOWERS[1]].calls, 0)
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        clients = {FOLLOWERS[0]: FakeAsyncClient(b'primary', delay=5),
+                   FOLLOWERS[1]: FakeAsyncClient(b'alternate')}
+
+        self.assertEqual(self.create_reader(clients).get('one/secret'), b'alternate')
+        self.assertTrue(clients[FOLLOWERS[0]].cancelled)
+
+    def test_primary_failure_is_hedged_immediately(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        clients = {FOLLOWERS[0]: FakeAsyncClient(error=HttpError()),
+                   FOLLOWERS[1]: FakeAsyncClient(b'alternate')}
+
+        self.assertEqual(self.create_reader(clients, default_delay=5).get('one/secret'),
+                         b'alternate')
+        self.assertEqual(self.health.ranked(FOLLOWERS), [FOLLOWERS[1]])
+
+    def test_not_found_is_not_hedged(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        clients = {FOLLOWERS[0]: FakeAsyncClient(error=HttpStatusError(status=404)),
+                   FOLLOWERS[1]: FakeAsyncClient(b'alternate')}
+
+        with self.assertRaises(HttpStatusError):
+            self.create_reader(clients, default_delay=5).get('one/secret')
+        self.assertEqual(clients[FOLLOWERS[1]].calls, 0)
+
+    def test_error_is_raised_when_all_endpoints_fail(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        clients = {FOLLOWERS[0]: FakeAsyncClient(error=HttpError()),
+                   FOLLOWERS[1]: FakeAsyncClient(error=HttpError())}
+
+        with self.assertRaises(HttpError):
+            self.create_reader(clients).get('one/secret')
+
+    def test_leader_is_the_last_alternate(self):
+        self.health.record_failure(FOLLOWERS[1])
+        reader = HedgedReader(LEADER, FOLLOWERS, MagicMock(), self.health)
+
+        self.assertEqual(reader.endpoints(), (FOLLOWERS[0], LEADER))
+
+    def test_hedge_delay_is_p95_of_recent_response_times(self):
+        reader = HedgedReader(LEADER, FOLLOWERS, MagicMock(), self.health, default_delay=0.5)
+        self.assertEqual(reader.hedge_delay(FOLLOWERS[0]), 0.5)
+
+        for seconds in range(1, 21):
+            self.health.record_success(FOLLOWERS[0], seconds / 100)
+
+        self.assertEqual(reader.hedge_delay(FOLLOWERS[0]), 0.2)
+        self.health.record_success(FOLLOWERS[1], 0)
+        for _ in range(5):
+            self.health.record_success(FOLLOWERS[1], 0)
+        self.assertEqual(reader.hedge_delay(FOLLOWERS[1]), MIN_HEDGE_DELAY_SECONDS)
+
+    def test_variable_logic_reads_single_variable_through_hedged_reader(self):
+        client = MagicMock()
+        hedged_reader = MagicMock()
+        hedged_reader.get.return_value = b'secret'
+        variable_data = VariableData(action='get', id=['one/secret'], value=None,
+                                     variable_version=None)
+
+        result = VariableLogic(client, hedged_reader).get_variable(variable_data)
+
+        self.assertEqual(result, 'secret')
+        hedged_reader.get.assert_called_once_with('one/secret', None)
+        client.get.assert_not_called()
+
+    def test_hedged_requests_are_throttled_and_measured(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+        self.health.record_success(FOLLOWERS[1], 0.02)
+        state_file = os.path.join(self.tmp_dir.name, 'rate_limit.json')
+        recorder = MetricsRecorder(MagicMock())
+        clients = {FOLLOWERS[0]: FakeAsyncClient(b'primary', delay=5),
+                   FOLLOWERS[1]: FakeAsyncClient(b'alternate')}
+
+        def create_client(url):
+            return ThrottledClient(recorder.wrap_client(clients[url]),
+                                   SharedRateLimiter(state_file, url, rate=10, max_in_flight=2))
+
+        reader = HedgedReader(LEADER, FOLLOWERS, create_client, self.health, default_delay=0.05)
+        self.assertEqual(reader.get('one/secret'), b'alternate')
+
+        with open(state_file, 'r', encoding='utf-8') as state_fp:
+            appliances = json.load(state_fp)['appliances']
+        # Both requests took a token, and the cancelled one freed its slot too
+        for url in FOLLOWERS:
+            self.assertEqual(appliances[url]['tokens'], 9)
+            self.assertEqual(appliances[url]['in_flight'], {})
+        statuses = [call.args[0]['status'] for call in recorder.sink.add.call_args_list]
+        self.assertEqual(sorted(statuses), ['CancelledError', 'ok'])
+
@@ -1,7 +1,14 @@
+import io
+import json
+import os
+import stat
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import MagicMock, patch
 
 from conjur_api  import Client
+from conjur_api.errors.errors import HttpStatusError
 from conjur.errors import MissingRequiredParameterException
 from conjur.controller.host_controller import HostController
 from conjur.data_object.host_resource_data import HostResourceData
@@ -40,3 +47,42 @@ class HostControllerTest(unittest.TestCase):
             with patch('builtins.input', return_value=''):
                 mock_host_controller.prompt_for_host_id_if_needed()
                 assert mock_host_resource_data.host_to_update == ''
+
+    def test_rotate_api_keys_writes_new_keys_and_failures_to_owner_only_file(self):
+        mock_client = MagicMock()
+        mock_client.rotate_other_api_key.side_effect = [
+            'key1', HttpStatusError(status=403), 'key3']
+        host_controller = HostController(mock_client, None)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'keys.json')
+            with redirect_stdout(io.StringIO()) as summary:
+                host_controller.rotate_api_keys(['host1', 'host2', 'host3'],
+                                                output_file=output_file, max_workers=1)
+            with open(output_file) as output_fp:
+                lines = [json.loads(line) for line in output_fp]
+            mode = stat.S_IMODE(os.stat(output_file).st_mode)
+
+        self.assertEqual(lines[0], {'id': 'host1', 'api_key': 'key1'})
+        self.assertIn('403', lines[1]['error'])
+        self.assertEqual(lines[2], {'id': 'host3', 'api_key': 'key3'})
+        self.assertEqual(mode, 0o600)
+        self.assertEqual(mock_client.rotate_other_api_key.call_args[0][0],
+                         Resource(kind='host', identifier='host3'))
+        self.assertIn("Rotated the API key of 2 host(s), 1 failed", summary.getvalue())
+
+    def test_rotate_api_keys_reports_the_logged_in_host_and_returns_the_failures(self):
+        mock_client = MagicMock()
+        mock_client.rotate_other_api_key.return_value = 'key'
+        host_controller = HostController(mock_client, None)
+
+        with redirect_stdout(io.StringIO()) as output:
+            failed = host_controller.rotate_api_keys(['host1', 'myapp'], max_workers=1,
+                                                     logged_in_username='host/myapp')
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(failed, 1)
+        self.assertEqual(lines[0], {'id': 'host1', 'api_key': 'key'})
+        self.assertIn('logged-in host', lines[1]['error'])
+        mock_client.rotate_other_api_key.assert_called_once_with(
+            Resource(kind='host', identifier='host1'))
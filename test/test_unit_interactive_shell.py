@@ -0,0 +1,93 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.cli import Cli
+from conjur.util.interactive_shell import InteractiveShell, completions
+
+PARSER = Cli._build_parser()
+
+
+class InteractiveShellTest(unittest.TestCase):
+
+    def run_shell(self, lines, execute):
+        inputs = iter(lines)
+
+        def read_line(_):
+            try:
+                return next(inputs)
+            except StopIteration:
+                raise EOFError
+
+        with patch('sys.stdin') as mock_stdin:
+            mock_stdin.isatty.return_value = False
+            return InteractiveShell(PARSER, execute, input_func=read_line).run()
+
+    def test_commands_are_executed_until_exit(self):
+        execute = MagicMock(return_value=0)
+
+        exit_code = self.run_shell(['variable get -i "secrets/my secret"', '', '# comment',
+                                    'whoami', 'exit', 'whoami'], execute)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([call.args[0] for call in execute.call_args_list],
+                         [['variable', 'get', '-i', 'secrets/my secret'], ['whoami']])
+
+    def test_exit_code_is_the_one_of_the_last_command(self):
+        self.assertEqual(self.run_shell(['whoami', 'show -i a'], MagicMock(side_effect=[0, 1])), 1)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_unbalanced_quotes_are_reported(self, mock_stdout):
+        execute = MagicMock()
+
+        self.assertEqual(self.run_shell(['variable get -i "unclosed'], execute), 1)
+        execute.assert_not_called()
+        self.assertIn('No closing quotation', mock_stdout.getvalue())
+
+    def test_commands_and_subcommands_are_completed(self):
+        self.assertEqual(completions(PARSER, [], 'va'), ['variable'])
+        self.assertEqual(completions(PARSER, ['variable'], ''), ['access', 'get', 'set', 'watch'])
+        self.assertIn('--version', completions(PARSER, ['variable', 'get'], '--v'))
+        self.assertIn('exit', completions(PARSER, [], 'ex'))
+
+
+class CliShellTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = Cli()
+        self.cli.parser = PARSER
+        self.client = MagicMock()
+        self.shell_args = MagicMock(debug=False)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_command_reuses_the_shell_client(self, mock_stdout):
+        self.client.get.return_value = b'value'
+
+        exit_code = self.cli._run_nested_command(self.shell_args,
+                                                ['variable', 'get', '-i', 'one'], self.client)
+
+        self.assertEqual(exit_code, 0)
+        self.client.get.assert_called_once_with('one', None)
+        self.assertEqual(mock_stdout.getvalue(), 'value\n')
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_failed_command_returns_exit_code_without_exiting(self, mock_stdout):
+        self.client.whoami.side_effect = ValueError('boom')
+
+        exit_code = self.cli._run_nested_command(self.shell_args, ['whoami'], self.client)
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn('boom', mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_commands_changing_the_session_are_rejected(self, mock_stdout):
+        for command in ['login', 'logout', 'shell']:
+            self.assertEqual(self.cli._run_nested_command(self.shell_args, [command],
+                                                         self.client), 1)
+        self.assertIn('cannot run in a shell', mock_stdout.getvalue())
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_invalid_command_returns_exit_code_without_exiting(self, mock_stdout, mock_stderr):
+        self.assertEqual(self.cli._run_nested_command(self.shell_args, ['bogus'], self.client), 1)
+        self.assertIn('invalid choice', mock_stderr.getvalue())
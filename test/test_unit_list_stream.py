@@ -0,0 +1,96 @@
+import io
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from conjur.controller.list_controller import ListController
+from conjur.data_object.list_data import ListData
+from conjur.errors import InvalidFormatException
+from conjur.logic.list_logic import ListLogic
+from conjur.util import util_functions
+
+
+class PagedClient:
+    """
+    Lists the given resources with the limit and offset of the server
+    """
+
+    def __init__(self, resources, fail_at_offset=None):
+        self.resources = resources
+        self.fail_at_offset = fail_at_offset
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def list(self, constraints):
+        with self.lock:
+            self.calls.append(dict(constraints))
+        inspect = constraints.pop('inspect', None)
+        offset, limit = int(constraints['offset']), int(constraints['limit'])
+        if offset == self.fail_at_offset:
+            raise ConnectionError('lost')
+        page = self.resources[offset:offset + limit]
+        return page if inspect else [resource['id'] for resource in page]
+
+
+RESOURCES = [{'id': f"dev:variable:secret-{number:04}", 'annotations': []}
+             for number in range(2500)]
+
+
+class ListStreamTest(unittest.TestCase):
+
+    def test_every_resource_is_listed_in_order(self):
+        client = PagedClient(RESOURCES)
+
+        listed = list(ListLogic(client).list_pages(ListData(inspect=True), page_size=1000,
+                                                   concurrency=2))
+
+        self.assertEqual(listed, RESOURCES)
+        self.assertTrue(all(call['inspect'] for call in client.calls))
+        self.assertEqual(sorted(int(call['offset']) for call in client.calls)[:3],
+                         [0, 1000, 2000])
+
+    def test_pages_fetched_ahead_are_bounded(self):
+        client = PagedClient(RESOURCES)
+
+        listed = list(ListLogic(client).list_pages(ListData(kind='variable'), page_size=10,
+                                                   concurrency=2))
+
+        self.assertEqual(len(listed), 2500)
+        # 250 full pages, the short page and up to 2 * concurrency pages fetched ahead
+        self.assertLessEqual(len(client.calls), 251 + 4)
+
+    def test_limit_and_offset_are_split_in_pages(self):
+        client = PagedClient(RESOURCES)
+
+        listed = list(ListLogic(client).list_pages(ListData(limit='25', offset='990'),
+                                                   page_size=10, concurrency=1))
+
+        self.assertEqual(listed, [resource['id'] for resource in RESOURCES[990:1015]])
+        self.assertEqual([(call['offset'], call['limit']) for call in client.calls],
+                         [('990', '10'), ('1000', '10'), ('1010', '5')])
+
+    def test_failed_page_stops_the_list(self):
+        client = PagedClient(RESOURCES, fail_at_offset=1000)
+
+        with self.assertRaises(ConnectionError):
+            list(ListLogic(client).list_pages(ListData(kind=None), page_size=500))
+
+    def test_invalid_page_size_is_rejected(self):
+        with self.assertRaises(InvalidFormatException):
+            list(ListLogic(PagedClient([])).list_pages(ListData(kind=None), page_size=0))
+
+    def test_streamed_array_is_printed_as_the_whole_list(self):
+        for result in ([], ['dev:host:a'], RESOURCES[:3]):
+            with patch('sys.stdout', new_callable=io.StringIO) as streamed:
+                util_functions.print_json_array(iter(result))
+            with patch('sys.stdout', new_callable=io.StringIO) as printed:
+                util_functions.print_json_result(result)
+            self.assertEqual(streamed.getvalue(), printed.getvalue())
+
+    def test_controller_prints_the_streamed_list(self):
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            ListController(ListLogic(PagedClient(RESOURCES))) \
+                .load_stream(ListData(inspect=True), page_size=300, concurrency=4)
+
+        self.assertEqual(json.loads(mock_stdout.getvalue()), RESOURCES)
@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur_api.errors.errors import HttpError, HttpStatusError
+
+from conjur.util.metrics import JsonLinesMetricsSink, MetricsRecorder, \
+    PrometheusTextfileSink, metrics_format_for, response_size
+from conjur.util.retry import RetryPolicy
+
+
+class FakeTimer:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.jsonl_path = os.path.join(self.tmp_dir.name, 'metrics.jsonl')
+        self.prom_path = os.path.join(self.tmp_dir.name, 'conjur.prom')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_recorder(self, sink):
+        return MetricsRecorder(sink, command='variable get', clock=lambda: 1000.0,
+                               timer=FakeTimer(0.05))
+
+    def read_jsonl(self):
+        with open(self.jsonl_path, 'r', encoding='utf-8') as metrics_file:
+            return [json.loads(line) for line in metrics_file]
+
+    def test_metrics_format_for_uses_extension_unless_specified(self):
+        self.assertEqual(metrics_format_for('/var/lib/node_exporter/conjur.prom'), 'prometheus')
+        self.assertEqual(metrics_format_for('metrics.log'), 'jsonl')
+        self.assertEqual(metrics_format_for('metrics.log', 'prometheus'), 'prometheus')
+
+    def test_response_size(self):
+        self.assertEqual(response_size(None), 0)
+        self.assertEqual(response_size(b'abc'), 3)
+        self.assertEqual(response_size('é'), 2)
+        self.assertEqual(response_size({'a': 1}), len('{"a": 1}'))
+
+    def test_instrumented_client_records_successful_calls(self):
+        client = MagicMock()
+        client.get.return_value = b'secret'
+        recorder = self.create_recorder(JsonLinesMetricsSink(self.jsonl_path))
+
+        self.assertEqual(recorder.wrap_client(client).get('some/var'), b'secret')
+        recorder.close()
+
+        client.get.assert_called_once_with('some/var')
+        self.assertEqual(self.read_jsonl(), [{
+            'timestamp': 1000.0, 'command': 'variable get', 'endpoint': 'get', 'status': 'ok',
+            'response_bytes': 6, 'duration_seconds': 0.05, 'retries': 0}])
+
+    def test_instrumented_client_records_failed_calls_and_raises(self):
+        client = MagicMock()
+        client.get.side_effect = HttpStatusError(status=404)
+        client.whoami.side_effect = HttpError()
+        recorder = self.create_recorder(JsonLinesMetricsSink(self.jsonl_path))
+        wrapped = recorder.wrap_client(client)
+
+        with self.assertRaises(HttpStatusError):
+            wrapped.get('missing')
+        with self.assertRaises(HttpError):
+            wrapped.whoami()
+
+        self.assertEqual([record['status'] for record in recorder.records], [404, 'HttpError'])
+
+    def test_retries_are_recorded(self):
+        client = MagicMock()
+        client.create_host.side_effect = [HttpStatusError(status=503), {'id': 'host'}]
+        recorder = self.create_recorder(JsonLinesMetricsSink(self.jsonl_path))
+        wrapped = recorder.wrap_client(client)
+
+        RetryPolicy(max_attempts=2, sleep=MagicMock()).call(wrapped.create_host, 'data')
+
+        self.assertEqual([(record['status'], record['retries']) for record in recorder.records],
+                         [(503, 0), ('ok', 1)])
+
+    def test_jsonl_sink_appends_to_existing_file(self):
+        for _ in range(2):
+            sink = JsonLinesMetricsSink(self.jsonl_path)
+            sink.add({'endpoint': 'get'})
+            sink.flush()
+
+        self.assertEqual(len(self.read_jsonl()), 2)
+
+    def test_jsonl_sink_appends_its_buffer_once_full_or_old_enough(self):
+        now = [0.0]
+        sink = JsonLinesMetricsSink(self.jsonl_path, clock=lambda: now[0])
+        with patch('conjur.util.metrics.JSONL_FLUSH_RECORDS', 3):
+            for _ in range(4):
+                sink.add({'endpoint': 'get'})
+            self.assertEqual(len(self.read_jsonl()), 3)
+            self.assertEqual(len(sink.records), 1)
+
+            now[0] += 10
+            sink.add({'endpoint': 'get'})
+        self.assertEqual(len(self.read_jsonl()), 5)
+        self.assertEqual(sink.records, [])
+
+    def test_failed_flush_does_not_change_the_result_of_the_call(self):
+        client = MagicMock()
+        client.get.return_value = b'secret'
+        client.list.side_effect = HttpStatusError(status=403)
+        sink = JsonLinesMetricsSink(os.path.join(self.tmp_dir.name, 'missing', 'metrics.jsonl'))
+        wrapped = self.create_recorder(sink).wrap_client(client)
+
+        with patch('conjur.util.metrics.JSONL_FLUSH_RECORDS', 1):
+            self.assertEqual(wrapped.get('some/var'), b'secret')
+            with self.assertRaises(HttpStatusError):
+                wrapped.list()
+        self.assertEqual(sink.records, [])
+
+        with patch.object(sink, 'add', side_effect=ValueError('broken sink')):
+            self.assertEqual(wrapped.get('some/var'), b'secret')
+
+    def test_nothing_is_written_without_calls(self):
+        self.create_recorder(JsonLinesMetricsSink(self.jsonl_path)).close()
+        self.create_recorder(PrometheusTextfileSink(self.prom_path)).close()
+
+        self.assertFalse(os.path.exists(self.jsonl_path))
+        self.assertFalse(os.path.exists(self.prom_path))
+
+    def test_prometheus_textfile_accumulates_counters_across_runs(self):
+        for _ in range(2):
+            client = MagicMock()
+            client.get.return_value = b'secret'
+            client.list.side_effect = HttpStatusError(status=403)
+            recorder = self.create_recorder(PrometheusTextfileSink(self.prom_path))
+            wrapped = recorder.wrap_client(client)
+            wrapped.get('some/var')
+            with self.assertRaises(HttpStatusError):
+                wrapped.list()
+            recorder.close()
+
+        with open(self.prom_path, 'r', encoding='utf-8') as textfile:
+            content = textfile.read()
+        self.assertIn('# TYPE conjur_cli_requests_total counter', content)
+        self.assertIn('conjur_cli_requests_total{endpoint="get",status="ok"} 2\n', content)
+        self.assertIn('conjur_cli_requests_total{endpoint="list",status="403"} 2\n', content)
+        self.assertIn('conjur_cli_request_response_bytes_total{endpoint="get"} 12\n', content)
+        self.assertIn('conjur_cli_request_duration_seconds_bucket{endpoint="get",le="0.05"} 2\n',
+                      content)
+        self.assertIn('conjur_cli_request_duration_seconds_bucket{endpoint="get",le="+Inf"} 2\n',
+                      content)
+        self.assertIn('conjur_cli_request_duration_seconds_count{endpoint="get"} 2\n', content)
+        self.assertEqual([name for name in os.listdir(self.tmp_dir.name) if name.endswith('.tmp')],
+                         [])
@@ -0,0 +1,108 @@
+import io
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.util import profiler
+from conjur.util.profiler import Profiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        with patch('conjur.util.profiler.process_age', return_value=None):
+            self.profiler = Profiler(clock=self.clock)
+
+    def test_phase_records_the_duration_of_the_block(self):
+        with self.profiler.phase('config load'):
+            self.clock.now += 0.25
+
+        self.assertEqual(self.profiler.phases, [('config load', 0.25)])
+
+    def test_phase_is_recorded_when_the_block_raises(self):
+        with self.assertRaises(ValueError):
+            with self.profiler.phase('command'):
+                self.clock.now += 1
+                raise ValueError
+
+        self.assertEqual(self.profiler.phases, [('command', 1)])
+
+    def test_wrapped_client_records_calls_and_returns_their_result(self):
+        client = MagicMock()
+        client.get.return_value = b'secret'
+
+        def slow_get(*args):
+            self.clock.now += 0.5
+            return b'secret'
+        client.get.side_effect = slow_get
+        wrapped = self.profiler.wrap_client(client)
+
+        self.assertEqual(wrapped.get('some/var'), b'secret')
+        self.assertEqual(wrapped.get('some/var'), b'secret')
+        client.get.assert_called_with('some/var')
+        self.assertEqual(self.profiler.client_calls, {'get': (2, 1.0)})
+
+    def test_wrapped_client_records_calls_that_raise(self):
+        client = MagicMock()
+        client.whoami.side_effect = ConnectionError
+        wrapped = self.profiler.wrap_client(client)
+
+        with self.assertRaises(ConnectionError):
+            wrapped.whoami()
+        self.assertEqual(self.profiler.client_calls['whoami'][0], 1)
+
+    def test_report_lists_phases_and_client_calls(self):
+        with self.profiler.phase('command'):
+            self.profiler.record_client_call('list', 0.125)
+            self.clock.now += 0.5
+
+        report = self.profiler.report()
+
+        self.assertIn('imports', report)
+        self.assertRegex(report, r'command\s+0\.500')
+        self.assertRegex(report, r'client\.list x1\s+0\.125')
+        self.assertIn('total', report)
+        self.assertNotIn('interpreter start', report)
+
+    def test_report_includes_interpreter_start_when_process_age_is_known(self):
+        with patch('conjur.util.profiler.process_age', return_value=5.0):
+            report = Profiler(clock=self.clock).report()
+
+        self.assertIn('interpreter start', report)
+
+    def test_write_report_writes_to_the_stream(self):
+        stream = io.StringIO()
+        self.profiler.write_report(stream)
+
+        self.assertTrue(stream.getvalue().startswith('Profile:'))
+
+    def test_cprofile_is_dumped_in_pstats_format(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'conjur.prof')
+            self.profiler.start_cprofile()
+            sorted(range(1000))
+            self.profiler.dump_cprofile(path)
+
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+    def test_dump_cprofile_without_start_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'conjur.prof')
+            self.profiler.dump_cprofile(path)
+
+            self.assertFalse(os.path.exists(path))
+
+    def test_process_age_returns_none_when_proc_is_unavailable(self):
+        with patch('builtins.open', side_effect=OSError):
+            self.assertIsNone(profiler.process_age())
@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.util.rate_limiter import RateLimiter, SharedRateLimiter, ThrottledClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_requests_within_burst_do_not_wait(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+        self.assertEqual(rate_limiter.acquire(), 0)
+        self.assertEqual(rate_limiter.acquire(), 0)
+        self.assertEqual(clock.sleeps, [])
+
+    def test_requests_beyond_burst_wait_for_refill(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(rate=2, burst=1, clock=clock, sleep=clock.sleep)
+        rate_limiter.acquire()
+        self.assertAlmostEqual(rate_limiter.acquire(), 0.5)
+        self.assertAlmostEqual(rate_limiter.acquire(), 0.5)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_tokens_refill_over_time_up_to_burst(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(rate=1, burst=2, clock=clock, sleep=clock.sleep)
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+        clock.now += 10
+        self.assertEqual(rate_limiter.acquire(), 0)
+        self.assertEqual(rate_limiter.acquire(), 0)
+        self.assertAlmostEqual(rate_limiter.acquire(), 1.0)
+
+    def test_non_positive_rate_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+
+class SharedRateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp_dir.name, 'rate-limit.json')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_limiter(self, appliance='https://conjur', **kwargs):
+        return SharedRateLimiter(self.state_file, appliance, clock=self.clock,
+                                 sleep=self.clock.sleep, **kwargs)
+
+    def read_state(self):
+        with open(self.state_file, 'r', encoding='utf-8') as state_fp:
+            return json.load(state_fp)
+
+    def test_invalid_limits_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            self.create_limiter(rate=0)
+        with self.assertRaises(ValueError):
+            self.create_limiter(max_in_flight=-1)
+
+    def test_bucket_is_shared_between_limiters_of_the_same_appliance(self):
+        first = self.create_limiter(rate=2, burst=2)
+        second = self.create_limiter(rate=2, burst=2)
+
+        self.assertEqual(first.acquire(), 0)
+        self.assertEqual(second.acquire(), 0)
+        self.assertEqual(first.acquire(), 0.5)
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_appliances_have_separate_buckets(self):
+        self.create_limiter('https://leader', rate=1).acquire()
+
+        self.assertEqual(self.create_limiter('https://follower', rate=1).acquire(), 0)
+        self.assertEqual(set(self.read_state()['appliances']),
+                         {'https://leader', 'https://follower'})
+
+    def test_in_flight_requests_are_limited(self):
+        rate_limiter = self.create_limiter(max_in_flight=1, poll_interval=0.25)
+        rate_limiter.acquire()
+        released = []
+
+        def release_on_sleep(seconds):
+            released.append(seconds)
+            rate_limiter.release()
+        rate_limiter._sleep = release_on_sleep
+
+        self.assertEqual(rate_limiter.acquire(), 0.25)
+        self.assertEqual(released, [0.25])
+        self.assertEqual(self.read_state()['appliances']['https://conjur']['in_flight'],
+                         {str(os.getpid()): 1})
+
+    def test_slots_of_exited_processes_are_reclaimed(self):
+        with open(self.state_file, 'w', encoding='utf-8') as state_fp:
+            json.dump({'appliances': {'https://conjur': {'in_flight': {'999999999': 5}}}},
+                      state_fp)
+        rate_limiter = self.create_limiter(max_in_flight=1)
+
+        with patch('os.kill', side_effect=ProcessLookupError):
+            self.assertEqual(rate_limiter.acquire(), 0)
+        self.assertEqual(self.read_state()['appliances']['https://conjur']['in_flight'],
+                         {str(os.getpid()): 1})
+
+    def test_request_releases_slot_when_call_raises(self):
+        rate_limiter = self.create_limiter(max_in_flight=2)
+        with self.assertRaises(ValueError):
+            with rate_limiter.request():
+                raise ValueError
+
+        self.assertEqual(self.read_state()['appliances']['https://conjur']['in_flight'], {})
+
+    def test_corrupted_state_is_reset(self):
+        with open(self.state_file, 'w', encoding='utf-8') as state_fp:
+            state_fp.write('{not json')
+
+        self.assertEqual(self.create_limiter(rate=1).acquire(), 0)
+        self.assertEqual(self.read_state()['version'], 1)
+
+    def test_concurrent_threads_never_exceed_max_in_flight(self):
+        rate_limiter = SharedRateLimiter(self.state_file, 'https://conjur', max_in_flight=2,
+                                         poll_interval=0.001)
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def work():
+            with rate_limiter.request():
+                with lock:
+                    in_flight.append(1)
+                    peak.append(len(in_flight))
+                threading.Event().wait(0.005)
+                with lock:
+                    in_flight.pop()
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(max(peak), 2)
+
+    def test_throttled_client_acquires_around_every_call(self):
+        rate_limiter = MagicMock()
+        client = MagicMock()
+        client.get.return_value = b'value'
+
+        self.assertEqual(ThrottledClient(client, rate_limiter).get('some/var'), b'value')
+        rate_limiter.request.assert_called_once_with()
+        client.get.assert_called_once_with('some/var')
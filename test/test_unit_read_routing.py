@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from conjur_api.errors.errors import HttpError, HttpStatusError
+
+from conjur.logic.credential_provider import LeaderCredentialsProvider
+from conjur.util.read_routing import EndpointHealth, ReadRoutingClient, is_endpoint_failure
+
+LEADER = 'https://leader'
+FOLLOWERS = ['https://follower1', 'https://follower2']
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReadRoutingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp_dir.name, 'health.json')
+        self.clock = FakeClock()
+        self.health = EndpointHealth(self.state_file, clock=self.clock, cooldown=10,
+                                     max_cooldown=15)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_routing_client(self, leader_client, follower_clients):
+        return ReadRoutingClient(leader_client, FOLLOWERS, follower_clients.__getitem__,
+                                 self.health, clock=self.clock)
+
+    def test_is_endpoint_failure(self):
+        self.assertTrue(is_endpoint_failure(HttpError()))
+        self.assertTrue(is_endpoint_failure(HttpStatusError(status=503)))
+        self.assertFalse(is_endpoint_failure(HttpStatusError(status=404)))
+
+    def test_unmeasured_endpoints_are_selected_first(self):
+        self.health.record_success(FOLLOWERS[0], 0.01)
+
+        self.assertEqual(self.health.select(FOLLOWERS), FOLLOWERS[1])
+
+    def test_fastest_endpoint_is_selected_by_ewma(self):
+        self.health.record_success(FOLLOWERS[0], 0.1)
+        self.health.record_success(FOLLOWERS[1], 0.2)
+        self.assertEqual(self.health.select(FOLLOWERS), FOLLOWERS[0])
+
+        self.health.record_success(FOLLOWERS[0], 0.5)
+
+        self.assertAlmostEqual(self.health._endpoint(FOLLOWERS[0])['ewma_seconds'], 0.22)
+        self.assertEqual(self.health.select(FOLLOWERS), FOLLOWERS[1])
+
+    def test_stale_endpoints_are_measured_again(self):
+        self.health.record_success(FOLLOWERS[0], 0.1)
+        self.health.record_success(FOLLOWERS[1], 0.2)
+        self.clock.now += 301
+        self.health.record_success(FOLLOWERS[0], 0.1)
+
+        self.assertEqual(self.health.select(FOLLOWERS), FOLLOWERS[1])
+
+    def test_failed_endpoints_are_skipped_for_a_doubling_cooldown(self):
+        self.health.record_failure(FOLLOWERS[0])
+        self.health.record_failure(FOLLOWERS[1])
+        self.assertIsNone(self.health.select(FOLLOWERS))
+
+        self.clock.now += 10
+        self.assertEqual(self.health.select(FOLLOWERS), FOLLOWERS[0])
+        self.health.record_failure(FOLLOWERS[0])
+        self.assertEqual(self.health._endpoint(FOLLOWERS[0])['unhealthy_until'],
+                         self.clock.now + 15)
+
+    def test_health_is_shared_through_the_state_file(self):
+        self.health.record_success(FOLLOWERS[0], 0.1)
+        self.health.save()
+        other = EndpointHealth(self.state_file, clock=self.clock)
+        other.record_failure(FOLLOWERS[1])
+        other.save()
+
+        with open(self.state_file, 'r', encoding='utf-8') as state_fp:
+            endpoints = json.load(state_fp)['endpoints']
+        self.assertEqual(endpoints[FOLLOWERS[0]]['ewma_seconds'], 0.1)
+        self.assertEqual(endpoints[FOLLOWERS[1]]['failures'], 1)
+
+    def test_reads_go_to_follower_and_writes_to_leader(self):
+        leader, follower = MagicMock(), MagicMock()
+        follower.get.return_value = b'from follower'
+        routing_client = self.create_routing_client(leader, {FOLLOWERS[0]: follower})
+
+        self.assertEqual(routing_client.get('some/var'), b'from follower')
+        routing_client.set('some/var', 'value')
+        routing_client.load_policy_file('root', 'policy.yml')
+
+        leader.get.assert_not_called()
+        leader.set.assert_called_once_with('some/var', 'value')
+        leader.load_policy_file.assert_called_once_with('root', 'policy.yml')
+        follower.set.assert_not_called()
+
+    def test_failed_read_falls_back_to_leader_and_marks_follower_unhealthy(self):
+        leader, first, second = MagicMock(), MagicMock(), MagicMock()
+        first.get.side_effect = HttpError()
+        leader.get.return_value = b'from leader'
+        second.get.return_value = b'from second'
+        routing_client = self.create_routing_client(leader, {FOLLOWERS[0]: first,
+                                                             FOLLOWERS[1]: second})
+
+        self.assertEqual(routing_client.get('some/var'), b'from leader')
+        self.assertEqual(routing_client.get('some/var'), b'from second')
+        self.assertEqual(self.health._endpoint(FOLLOWERS[0])['failures'], 1)
+
+    def test_not_found_from_follower_is_raised(self):
+        leader, follower = MagicMock(), MagicMock()
+        follower.get.side_effect = HttpStatusError(status=404)
+        routing_client = self.create_routing_client(leader, {FOLLOWERS[0]: follower})
+
+        with self.assertRaises(HttpStatusError):
+            routing_client.get('missing')
+        leader.get.assert_not_called()
+        self.assertEqual(self.health._endpoint(FOLLOWERS[0]).get('failures'), 0)
+
+    def test_leader_credentials_provider_loads_leader_credentials(self):
+        credentials_provider = MagicMock()
+        leader_credentials_provider = LeaderCredentialsProvider(credentials_provider, LEADER)
+
+        leader_credentials_provider.load(FOLLOWERS[0])
+        leader_credentials_provider.is_exists(FOLLOWERS[0])
+
+        credentials_provider.load.assert_called_once_with(LEADER)
+        credentials_provider.is_exists.assert_called_once_with(LEADER)
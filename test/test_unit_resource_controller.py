@@ -1,4 +1,7 @@
+import io
 import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock
 
 import conjur
 from conjur.controller.resource_controller import ResourceController
@@ -14,3 +17,28 @@ class ResourceControllerTest(unittest.TestCase):
 
         with self.assertRaises(conjur.errors.MissingRequiredParameterException):
             mock_resource_controller.exists("resource_id") # missing kind (kind:resource_id)
+
+    def test_resource_exists_many_writes_a_json_line_per_resource(self):
+        mock_resource_logic = ResourceLogic(MagicMock())
+        mock_resource_logic.client.resource_exists.side_effect = [True, False]
+        mock_resource_controller = ResourceController(mock_resource_logic)
+
+        capture_stream = io.StringIO()
+        with redirect_stdout(capture_stream):
+            failed = mock_resource_controller.exists_many(['variable:one', 'variable:two'], 1)
+
+        self.assertEqual('{"id": "variable:one", "exists": true}\n'
+                         '{"id": "variable:two", "exists": false}\n', capture_stream.getvalue())
+        self.assertEqual(failed, 0)
+
+    def test_resource_exists_many_returns_the_number_of_failed_checks(self):
+        mock_resource_logic = ResourceLogic(MagicMock())
+        mock_resource_logic.client.resource_exists.side_effect = [True, ConnectionError('lost')]
+        mock_resource_controller = ResourceController(mock_resource_logic)
+
+        capture_stream = io.StringIO()
+        with redirect_stdout(capture_stream):
+            failed = mock_resource_controller.exists_many(['variable:one', 'variable:two'], 1)
+
+        self.assertEqual(failed, 1)
+        self.assertIn('"id": "variable:two", "error": "lost"', capture_stream.getvalue())
@@ -0,0 +1,178 @@
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from conjur.data_object.list_data import ListData
+from conjur.errors import FileNotFoundException, InvalidFormatException
+from conjur.logic.index_logic import IndexLogic
+from conjur.logic.list_logic import ListLogic
+from conjur.util.resource_index import INDEX_FILE_SUFFIX, KindIndex, ResourceIndex, \
+    build_kind_index
+
+
+def resource(full_id, **annotations):
+    return {'id': full_id,
+            'annotations': [{'name': name, 'value': value}
+                            for name, value in annotations.items()]}
+
+
+RESOURCES = {
+    'variable': [resource('dev:variable:prod/db/password', description='Main DB password'),
+                 resource('dev:variable:prod/db/user'),
+                 resource('dev:variable:prod/app/token', owner='Payments team'),
+                 resource('dev:variable:dev/db/password')],
+    'host': ['dev:host:app/web-1', 'dev:host:app/Web-2'],
+}
+
+
+class ResourceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = ResourceIndex(os.path.join(self.directory.name, 'index'),
+                                   clock=lambda: 1000.0)
+        self.index.write_kinds('dev', RESOURCES)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resources_of_every_kind_are_listed_in_order(self):
+        self.assertEqual(self.index.query(),
+                         ['dev:host:app/Web-2', 'dev:host:app/web-1',
+                          'dev:variable:dev/db/password', 'dev:variable:prod/app/token',
+                          'dev:variable:prod/db/password', 'dev:variable:prod/db/user'])
+
+    def test_resources_are_filtered_by_kind(self):
+        self.assertEqual(self.index.query(kinds=['host']),
+                         ['dev:host:app/Web-2', 'dev:host:app/web-1'])
+        self.assertEqual(self.index.query(kinds=['layer']), [])
+
+    def test_search_matches_ids_and_annotation_values_ignoring_case(self):
+        self.assertEqual(self.index.query(search='PAYMENTS'), ['dev:variable:prod/app/token'])
+        self.assertEqual(self.index.query(search='db/pass'),
+                         ['dev:variable:dev/db/password', 'dev:variable:prod/db/password'])
+        self.assertEqual(self.index.query(search='main db'),
+                         ['dev:variable:prod/db/password'])
+        self.assertEqual(self.index.query(search='web'),
+                         ['dev:host:app/Web-2', 'dev:host:app/web-1'])
+        self.assertEqual(self.index.query(search='nothing'), [])
+
+    def test_short_searches_do_not_match_across_resources(self):
+        self.assertEqual(self.index.query(kinds=['host'], search='2'), ['dev:host:app/Web-2'])
+        # 'web-1' is followed by 'app/web-2' in the text of the index
+        self.assertEqual(self.index.query(kinds=['host'], search='1a'), [])
+
+    def test_resources_are_filtered_by_prefix(self):
+        self.assertEqual(self.index.query(prefix='prod/db/'),
+                         ['dev:variable:prod/db/password', 'dev:variable:prod/db/user'])
+        self.assertEqual(self.index.query(prefix='prod/db/', search='user'),
+                         ['dev:variable:prod/db/user'])
+        self.assertEqual(self.index.query(prefix='zzz'), [])
+
+    def test_limit_and_offset_apply_to_the_matching_resources(self):
+        self.assertEqual(self.index.query(kinds=['variable'], offset=1, limit=2),
+                         ['dev:variable:prod/app/token', 'dev:variable:prod/db/password'])
+        self.assertEqual(self.index.query(kinds=['variable'], offset=10), [])
+
+    def test_sync_of_a_kind_keeps_the_other_kinds(self):
+        self.index.write_kinds('dev', {'host': ['dev:host:app/web-3']})
+
+        self.assertEqual(self.index.query(kinds=['host']), ['dev:host:app/web-3'])
+        self.assertEqual(len(self.index.query(kinds=['variable'])), 4)
+        self.assertEqual(self.index.metadata()['kinds']['host'], {'count': 1,
+                                                                  'synced_at': 1000.0})
+
+    def test_index_files_are_readable_by_their_owner_only(self):
+        path = os.path.join(self.index.directory, 'variable' + INDEX_FILE_SUFFIX)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(self.index.directory).st_mode), 0o700)
+
+    def test_each_server_has_its_own_index(self):
+        first = ResourceIndex.for_server(self.directory.name, 'https://conjur-a')
+        second = ResourceIndex.for_server(self.directory.name, 'https://conjur-b')
+        self.assertNotEqual(first.directory, second.directory)
+
+    def test_empty_index_is_reported(self):
+        with self.assertRaises(FileNotFoundException):
+            ResourceIndex(os.path.join(self.directory.name, 'other')).query()
+
+    def test_corrupted_index_is_reported(self):
+        path = os.path.join(self.index.directory, 'host' + INDEX_FILE_SUFFIX)
+        with open(path, 'r+b') as index_file:
+            index_file.truncate(40)
+
+        with self.assertRaises(InvalidFormatException):
+            self.index.query(kinds=['host'])
+
+    def test_kind_index_of_no_resources(self):
+        path = os.path.join(self.directory.name, 'empty' + INDEX_FILE_SUFFIX)
+        with open(path, 'wb') as index_file:
+            index_file.write(build_kind_index([]))
+        with KindIndex(path) as kind_index:
+            self.assertEqual(kind_index.count, 0)
+            self.assertEqual(list(kind_index.search('a')), [])
+            self.assertEqual(kind_index.prefix_range('a'), range(0, 0))
+
+    def test_many_resources_are_searched_quickly(self):
+        self.index.write_kinds('dev', {'variable': [
+            f"dev:variable:apps/app-{number % 100}/secret-{number}"
+            for number in range(50000)]})
+
+        started_at = time.perf_counter()
+        results = self.index.query(search='secret-4999')
+        self.assertLess(time.perf_counter() - started_at, 0.05)
+        self.assertEqual(len(results), 11)
+
+
+class IndexLogicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = ResourceIndex(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sync_lists_every_kind_in_a_single_request(self):
+        client = MagicMock()
+        client.list.return_value = RESOURCES['variable'] + RESOURCES['host']
+
+        counts = IndexLogic(client, self.index).sync('dev')
+
+        client.list.assert_called_once_with({'inspect': True})
+        self.assertEqual(counts, {'host': 2, 'variable': 4})
+
+    def test_sync_of_one_kind_is_filtered_by_the_server(self):
+        client = MagicMock()
+        client.list.return_value = RESOURCES['host']
+
+        counts = IndexLogic(client, self.index).sync('dev', ['host'])
+
+        client.list.assert_called_once_with({'inspect': True, 'kind': 'host'})
+        self.assertEqual(counts, {'host': 2})
+
+    def test_kinds_without_resources_are_emptied_by_a_full_sync(self):
+        self.index.write_kinds('dev', RESOURCES)
+        client = MagicMock()
+        client.list.return_value = RESOURCES['variable']
+
+        self.assertEqual(IndexLogic(client, self.index).sync('dev'), {'host': 0, 'variable': 4})
+        self.assertEqual(self.index.query(kinds=['host']), [])
+
+    def test_list_local_reads_the_index_only(self):
+        self.index.write_kinds('dev', RESOURCES)
+        client = MagicMock()
+
+        result = ListLogic(client).list_local(ListData(kind='variable', search='db',
+                                                       limit='1', offset='1'),
+                                              self.index, prefix='prod/')
+
+        self.assertEqual(result, ['dev:variable:prod/db/user'])
+        client.list.assert_not_called()
+
+    def test_list_local_rejects_invalid_limit(self):
+        with self.assertRaises(InvalidFormatException):
+            ListLogic(MagicMock()).list_local(ListData(limit='many'), self.index)
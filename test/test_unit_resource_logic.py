@@ -1,7 +1,8 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from conjur_api import Client
+from conjur_api.errors.errors import HttpStatusError
 from conjur.logic.resource_logic import ResourceLogic
 
 
@@ -12,3 +13,12 @@ class ResourceLogicTest(unittest.TestCase):
         mock_resource_logic = ResourceLogic(mock_client)
         mock_resource_logic.exists('some_kind', 'some_id')
         mock_resource_exists.assert_called_once_with('some_kind', 'some_id')
+
+    def test_exists_many_returns_per_resource_results(self):
+        mock_client = MagicMock()
+        mock_client.resource_exists.side_effect = [True, HttpStatusError(status=500)]
+        results = list(ResourceLogic(mock_client).exists_many(['variable:one', 'variable:two'], 1))
+
+        self.assertEqual(results[0], ('variable:one', True, None))
+        self.assertEqual(results[1][0], 'variable:two')
+        self.assertIsInstance(results[1][2], HttpStatusError)
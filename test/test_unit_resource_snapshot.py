@@ -0,0 +1,123 @@
+import gzip
+import io
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.controller.list_controller import ListController
+from conjur.data_object.list_data import ListData
+from conjur.errors import InvalidFormatException
+from conjur.logic.list_logic import ListLogic
+from conjur.util.resource_snapshot import read_snapshot, resource_entry, snapshot_changes, \
+    write_snapshot
+
+
+def resource(full_id, **annotations):
+    return {'id': full_id,
+            'annotations': [{'name': name, 'value': value}
+                            for name, value in annotations.items()]}
+
+
+class ResourceSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'inventory.snap')
+        self.client = MagicMock()
+        self.logic = ListLogic(self.client)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def changes(self, list_data):
+        return list(self.logic.list_changes(list_data, self.path))
+
+    def test_first_run_reports_every_resource_as_added(self):
+        self.client.list.return_value = ['dev:variable:b', 'dev:variable:a']
+
+        self.assertEqual(self.changes(ListData(kind='variable')),
+                         [{'change': 'added', 'id': 'dev:variable:a'},
+                          {'change': 'added', 'id': 'dev:variable:b'}])
+        self.client.list.assert_any_call({'kind': 'variable', 'offset': '0', 'limit': '1000'})
+
+    def test_added_and_removed_resources_are_reported(self):
+        self.client.list.return_value = ['dev:variable:a', 'dev:variable:b']
+        self.changes(ListData(kind=None))
+        self.client.list.return_value = ['dev:variable:b', 'dev:variable:c']
+
+        self.assertEqual(self.changes(ListData(kind=None)),
+                         [{'change': 'removed', 'id': 'dev:variable:a'},
+                          {'change': 'added', 'id': 'dev:variable:c'}])
+        self.assertEqual(self.changes(ListData(kind=None)), [])
+
+    def test_changed_metadata_is_reported_with_inspect(self):
+        self.client.list.return_value = [resource('dev:host:a', owner='ops'),
+                                         resource('dev:host:b')]
+        self.changes(ListData(inspect=True))
+        changed = resource('dev:host:a', owner='security')
+        self.client.list.return_value = [changed, resource('dev:host:b')]
+
+        self.assertEqual(self.changes(ListData(inspect=True)),
+                         [{'change': 'changed', 'id': 'dev:host:a', 'resource': changed}])
+
+    def test_resources_are_listed_page_by_page_keeping_only_the_changed_ones(self):
+        pages = {'0': [resource('dev:host:a'), resource('dev:host:b')],
+                 '2': [resource('dev:host:c')]}
+        self.client.list.side_effect = lambda constraints: pages.get(constraints['offset'], [])
+        self.assertEqual(len(list(self.logic.list_changes(ListData(inspect=True), self.path,
+                                                          page_size=2))), 3)
+        changed = resource('dev:host:c', owner='ops')
+        pages['2'] = [changed]
+
+        self.assertEqual(list(self.logic.list_changes(ListData(inspect=True), self.path,
+                                                      page_size=2)),
+                         [{'change': 'changed', 'id': 'dev:host:c', 'resource': changed}])
+        self.client.list.assert_any_call({'inspect': True, 'offset': '2', 'limit': '2'})
+
+    def test_interrupted_run_reports_the_changes_again(self):
+        self.client.list.return_value = ['dev:variable:a', 'dev:variable:b']
+        changes = self.logic.list_changes(ListData(kind=None), self.path)
+        next(changes)
+        changes.close()
+
+        self.assertEqual(len(self.changes(ListData(kind=None))), 2)
+
+    def test_snapshot_of_other_list_options_is_rejected(self):
+        self.client.list.return_value = ['dev:variable:a']
+        self.changes(ListData(kind='variable'))
+
+        with self.assertRaises(InvalidFormatException):
+            self.changes(ListData(kind='host'))
+
+    def test_corrupted_snapshot_is_rejected(self):
+        with open(self.path, 'wb') as snapshot_file:
+            snapshot_file.write(b'not gzip')
+
+        with self.assertRaises(InvalidFormatException):
+            read_snapshot(self.path, {})
+
+    def test_snapshot_is_compressed_and_readable_by_its_owner_only(self):
+        digests = dict(resource_entry(resource(f"dev:variable:apps/secret-{number}"))
+                       for number in range(10000))
+        write_snapshot(self.path, {'inspect': True}, digests)
+
+        self.assertEqual(read_snapshot(self.path, {'inspect': True}), digests)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertLess(os.path.getsize(self.path), 64 * 10000)
+        with gzip.open(self.path, 'rt') as snapshot_file:
+            self.assertIn('"format": 1', snapshot_file.readline())
+
+    def test_changes_are_sorted_by_id(self):
+        self.assertEqual(list(snapshot_changes({'b': '1', 'c': '1'}, {'a': '', 'c': '2'})),
+                         [('added', 'a'), ('removed', 'b'), ('changed', 'c')])
+
+    def test_changes_are_printed_as_json_lines(self):
+        self.client.list.return_value = ['dev:variable:a']
+
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            ListController(self.logic).load_changes(ListData(kind=None), self.path, 1000, 1)
+
+        self.assertEqual(mock_stdout.getvalue(),
+                         '{"change": "added", "id": "dev:variable:a"}\n')
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock
+
+from aiohttp import ClientResponseError
+from conjur_api.errors.errors import HttpError, HttpSslError, HttpStatusError
+
+from conjur.util.retry import RetryingClient, RetryPolicy, current_attempt, \
+    is_transient_error, retry_after_seconds
+
+
+class RetryTest(unittest.TestCase):
+
+    def test_is_transient_error(self):
+        self.assertTrue(is_transient_error(HttpStatusError(status=502)))
+        self.assertTrue(is_transient_error(HttpStatusError(status=429)))
+        self.assertTrue(is_transient_error(HttpError()))
+        self.assertFalse(is_transient_error(HttpStatusError(status=404)))
+        self.assertFalse(is_transient_error(HttpSslError()))
+        self.assertFalse(is_transient_error(ValueError()))
+
+    def test_call_retries_transient_errors_until_success(self):
+        sleep = MagicMock()
+        func = MagicMock(side_effect=[HttpStatusError(status=503), HttpError(), 'result'])
+        retry_policy = RetryPolicy(max_attempts=3, sleep=sleep, rand=lambda: 1.0)
+
+        self.assertEqual(retry_policy.call(func, 'arg'), 'result')
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [0.5, 1.0])
+
+    def test_call_raises_when_attempts_are_exhausted(self):
+        func = MagicMock(side_effect=HttpStatusError(status=503))
+        with self.assertRaises(HttpStatusError):
+            RetryPolicy(max_attempts=2, sleep=MagicMock()).call(func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_call_does_not_retry_permanent_errors(self):
+        func = MagicMock(side_effect=HttpStatusError(status=403))
+        with self.assertRaises(HttpStatusError):
+            RetryPolicy(max_attempts=5, sleep=MagicMock()).call(func)
+        func.assert_called_once()
+
+    def test_delay_is_capped(self):
+        retry_policy = RetryPolicy(base_delay=1, max_delay=5, rand=lambda: 1.0)
+        self.assertEqual(retry_policy.delay(10), 5)
+
+    def test_current_attempt_is_tracked_during_call(self):
+        attempts = []
+
+        def func():
+            attempts.append(current_attempt())
+            if len(attempts) < 3:
+                raise HttpStatusError(status=503)
+            return 'result'
+
+        RetryPolicy(max_attempts=3, sleep=MagicMock()).call(func)
+
+        self.assertEqual(attempts, [1, 2, 3])
+        self.assertEqual(current_attempt(), 1)
+
+    def test_retry_after_seconds_reads_header_of_the_cause(self):
+        self.assertEqual(retry_after_seconds(status_error(503, {'Retry-After': '7'})), 7.0)
+        self.assertEqual(retry_after_seconds(
+            status_error(503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:10 GMT'}),
+            clock=lambda: 1445412480.0), 10.0)
+        self.assertIsNone(retry_after_seconds(status_error(503, {'Retry-After': 'soon'})))
+        self.assertIsNone(retry_after_seconds(status_error(503, {})))
+        self.assertIsNone(retry_after_seconds(HttpStatusError(status=503)))
+
+    def test_delay_honors_retry_after_up_to_its_maximum(self):
+        retry_policy = RetryPolicy(rand=lambda: 0.0, max_retry_after=30)
+
+        self.assertEqual(retry_policy.delay(1, status_error(429, {'Retry-After': '5'})), 5.0)
+        self.assertEqual(retry_policy.delay(1, status_error(429, {'Retry-After': '120'})), 30)
+        self.assertEqual(retry_policy.delay(1, HttpStatusError(status=503)), 0.0)
+
+    def test_retrying_client_retries_idempotent_methods_only(self):
+        client = MagicMock()
+        client.get.side_effect = [HttpStatusError(status=502), b'value']
+        client.set.side_effect = HttpStatusError(status=502)
+        retrying_client = RetryingClient(client, RetryPolicy(max_attempts=3, sleep=MagicMock()))
+
+        self.assertEqual(retrying_client.get('some/var'), b'value')
+        with self.assertRaises(HttpStatusError):
+            retrying_client.set('some/var', 'value')
+
+        self.assertEqual(client.get.call_count, 2)
+        client.set.assert_called_once_with('some/var', 'value')
+
+
+def status_error(status, headers):
+    error = HttpStatusError(status=status)
+    error.__cause__ = ClientResponseError(MagicMock(), (), status=status, headers=headers)
+    return error
@@ -0,0 +1,177 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from xml.etree import ElementTree
+
+from conjur.controller.role_controller import RoleController
+from conjur.errors import FileNotFoundException, InvalidFormatException
+from conjur.logic.role_logic import RoleLogic
+from conjur.util.role_graph import RoleGraph, is_in_policy
+
+# member -> roles it is a direct member of
+MEMBERSHIPS = {
+    'dev:host:apps/web': ['dev:layer:apps/web-servers'],
+    'dev:layer:apps/web-servers': ['dev:group:apps/readers'],
+    'dev:group:apps/readers': ['dev:group:admins'],
+    'dev:user:alice@apps': ['dev:group:apps/readers', 'dev:group:admins'],
+    'dev:group:admins': [],
+    'dev:user:bob': ['dev:group:ops'],
+    'dev:group:ops': [],
+}
+
+
+class CrawlClient:
+    """
+    Answers the list and direct memberships requests of the crawl
+    """
+
+    def __init__(self, memberships):
+        self.memberships = memberships
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def list(self, _constraints):
+        return sorted(self.memberships) + ['dev:variable:apps/secret']
+
+    def role_memberships(self, kind, identifier, direct):
+        with self.lock:
+            self.calls.append((kind, identifier, direct))
+        return self.memberships[f"dev:{kind}:{identifier}"]
+
+
+class RoleGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = RoleGraph.from_memberships('dev', MEMBERSHIPS)
+
+    def test_roles_are_numbered_in_order_with_compact_adjacency(self):
+        self.assertEqual(self.graph.roles, sorted(MEMBERSHIPS))
+        self.assertEqual(self.graph.edge_count, 6)
+        self.assertEqual(self.graph.targets.typecode, 'I')
+
+    def test_transitive_memberships_include_the_role(self):
+        self.assertEqual(self.graph.memberships('host:apps/web'),
+                         ['dev:group:admins', 'dev:group:apps/readers', 'dev:host:apps/web',
+                          'dev:layer:apps/web-servers'])
+        self.assertEqual(self.graph.memberships('dev:group:admins'), ['dev:group:admins'])
+
+    def test_shortest_path_explains_a_membership(self):
+        self.assertEqual(self.graph.path('host:apps/web', 'group:admins'),
+                         ['dev:host:apps/web', 'dev:layer:apps/web-servers',
+                          'dev:group:apps/readers', 'dev:group:admins'])
+        self.assertEqual(self.graph.path('user:alice@apps', 'group:admins'),
+                         ['dev:user:alice@apps', 'dev:group:admins'])
+        self.assertEqual(self.graph.path('user:bob', 'group:admins'), [])
+
+    def test_unknown_role_is_reported(self):
+        with self.assertRaises(InvalidFormatException):
+            self.graph.memberships('host:nope')
+
+    def test_cycles_are_detected(self):
+        self.assertEqual(self.graph.cycles(), [])
+        graph = RoleGraph.from_memberships('dev', dict(MEMBERSHIPS, **{
+            'dev:group:admins': ['dev:host:apps/web'],
+            'dev:group:ops': ['dev:group:ops']}))
+
+        self.assertEqual(graph.cycles(), [['dev:group:admins', 'dev:group:apps/readers',
+                                           'dev:host:apps/web', 'dev:layer:apps/web-servers'],
+                                          ['dev:group:ops']])
+
+    def test_long_chains_do_not_exceed_the_recursion_limit(self):
+        chain = {f"dev:group:g{number:05}": [f"dev:group:g{number + 1:05}"]
+                 for number in range(20000)}
+        graph = RoleGraph.from_memberships('dev', chain)
+
+        self.assertEqual(graph.cycles(), [])
+        self.assertEqual(len(graph.path('group:g00000', 'group:g20000')), 20001)
+
+    def test_saved_graph_is_loaded(self):
+        loaded = RoleGraph.from_dict(json.loads(self.graph.export('json')))
+
+        self.assertEqual(loaded.to_dict(), self.graph.to_dict())
+
+    def test_corrupted_graph_is_rejected(self):
+        content = self.graph.to_dict()
+        content['targets'][0] = 1000
+        with self.assertRaises(InvalidFormatException):
+            RoleGraph.from_dict(content)
+        with self.assertRaises(InvalidFormatException):
+            RoleGraph.from_dict({'format': 1})
+
+    def test_graph_is_exported_as_dot(self):
+        dot = self.graph.export('dot')
+
+        self.assertTrue(dot.startswith('digraph memberships {'))
+        self.assertIn('"dev:host:apps/web" -> "dev:layer:apps/web-servers";', dot)
+        self.assertIn('"dev:user:bob" [kind="user"];', dot)
+
+    def test_graph_is_exported_as_graphml(self):
+        root = ElementTree.fromstring(self.graph.export('graphml'))
+        namespace = '{http://graphml.graphdrawing.org/xmlns}'
+
+        self.assertEqual(len(root.findall(f'.//{namespace}node')), 7)
+        self.assertEqual(len(root.findall(f'.//{namespace}edge')), 6)
+
+    def test_roles_of_a_policy(self):
+        self.assertTrue(is_in_policy('dev:host:apps/web', 'apps'))
+        self.assertTrue(is_in_policy('dev:policy:apps', 'apps'))
+        self.assertTrue(is_in_policy('dev:user:alice@apps', 'apps'))
+        self.assertTrue(is_in_policy('dev:user:carol@apps-backend', 'apps'))
+        self.assertFalse(is_in_policy('dev:user:dave@apps2', 'apps'))
+        self.assertFalse(is_in_policy('dev:host:apps2/web', 'apps'))
+        self.assertTrue(is_in_policy('dev:user:bob', 'root'))
+
+
+class RoleGraphCrawlTest(unittest.TestCase):
+
+    def test_roles_of_the_policy_and_their_memberships_are_crawled_once(self):
+        client = CrawlClient(MEMBERSHIPS)
+
+        graph = RoleLogic(client).role_graph('dev', 'policy:apps', concurrency=4)
+
+        self.assertEqual(graph.root, 'apps')
+        self.assertEqual(graph.roles, ['dev:group:admins', 'dev:group:apps/readers',
+                                       'dev:host:apps/web', 'dev:layer:apps/web-servers',
+                                       'dev:user:alice@apps'])
+        self.assertEqual(sorted(client.calls),
+                         sorted({(role.split(':')[1], role.split(':', 2)[2], True)
+                                 for role in graph.roles}))
+
+    def test_failed_crawl_is_reported(self):
+        client = MagicMock()
+        client.list.return_value = ['dev:host:apps/web']
+        client.role_memberships.side_effect = ConnectionError('lost')
+
+        with self.assertRaises(ConnectionError):
+            RoleLogic(client).role_graph('dev', 'apps')
+
+
+class RoleGraphControllerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'apps.graph.json')
+        self.controller = RoleController(RoleLogic(CrawlClient(MEMBERSHIPS)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_crawled_graph_is_saved_and_queried(self):
+        with patch('sys.stderr', new_callable=io.StringIO):
+            graph = self.controller.load_role_graph('dev', root='root')
+        self.controller.export_role_graph(graph, 'json', self.path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        loaded = self.controller.load_role_graph(None, input_file=self.path)
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            self.controller.role_graph_path(loaded, 'user:bob', 'group:ops')
+        self.assertEqual(json.loads(mock_stdout.getvalue()), ['dev:user:bob', 'dev:group:ops'])
+
+    def test_missing_graph_file_is_reported(self):
+        with self.assertRaises(FileNotFoundException):
+            self.controller.load_role_graph(None, input_file=self.path)
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.controller.run_controller import RunController
+from conjur.errors import MissingRequiredParameterException
+from conjur.logic.run_logic import RunLogic
+from conjur.util.child_process import ChildProcess, SecretFiles
+from conjur.util.secrets_file import LITERAL, VARIABLE, SecretSpec
+
+SECRETS = [SecretSpec('DB_PASSWORD', VARIABLE, 'db/password'),
+           SecretSpec('DB_PASSWORD_COPY', VARIABLE, 'db/password'),
+           SecretSpec('TLS_CERT', VARIABLE, 'tls/cert', as_file=True),
+           SecretSpec('DB_HOST', LITERAL, 'db.example.com')]
+
+
+class RunLogicTest(unittest.TestCase):
+
+    def test_variables_are_fetched_in_one_batch(self):
+        client = MagicMock()
+        client.get_many.return_value = {'db/password': 'secret', 'tls/cert': 'cert'}
+
+        values = RunLogic(client).fetch_values(SECRETS)
+
+        client.get_many.assert_called_once_with('db/password', 'tls/cert')
+        self.assertEqual(values, {'db/password': 'secret', 'tls/cert': 'cert'})
+
+    def test_no_request_is_sent_without_variables(self):
+        client = MagicMock()
+
+        self.assertEqual(RunLogic(client).fetch_values([SecretSpec('A', LITERAL, 'a')]), {})
+        client.get_many.assert_not_called()
+
+    def test_environment_holds_values_and_file_paths(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            secret_files = SecretFiles(use_memfd=False, tmpfs_directories=(tmp_dir,))
+            child_process = RunLogic.prepare(SECRETS, {'db/password': 'secret',
+                                                       'tls/cert': 'cert'},
+                                             ['env'], secret_files)
+
+            environment = child_process.environment
+            self.assertEqual(environment['DB_PASSWORD'], 'secret')
+            self.assertEqual(environment['DB_PASSWORD_COPY'], 'secret')
+            self.assertEqual(environment['DB_HOST'], 'db.example.com')
+            with open(environment['TLS_CERT']) as cert_file:
+                self.assertEqual(cert_file.read(), 'cert')
+            self.assertEqual(os.stat(environment['TLS_CERT']).st_mode & 0o777, 0o600)
+            self.assertTrue(secret_files.needs_cleanup)
+            secret_files.cleanup()
+            self.assertFalse(os.path.exists(environment['TLS_CERT']))
+
+    @unittest.skipUnless(hasattr(os, 'memfd_create'), 'memfd is not supported')
+    def test_secret_files_are_written_in_memory(self):
+        secret_files = SecretFiles()
+        try:
+            path = secret_files.write('TLS_CERT', 'cert')
+
+            with open(path) as cert_file:
+                self.assertEqual(cert_file.read(), 'cert')
+            self.assertFalse(secret_files.needs_cleanup)
+        finally:
+            secret_files.cleanup()
+
+    def test_controller_requires_a_command(self):
+        with self.assertRaises(MissingRequiredParameterException):
+            RunController(RunLogic(MagicMock())).load('secrets.yml', None, ['--'])
+
+
+class ChildProcessTest(unittest.TestCase):
+
+    def test_secret_files_are_removed_after_the_command_exited(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            secret_files = SecretFiles(use_memfd=False, tmpfs_directories=(tmp_dir,))
+            path = secret_files.write('TLS_CERT', 'cert')
+            command = [sys.executable, '-c',
+                       'import os, sys; sys.exit(int(open(os.environ["TLS_CERT"]).read() == "cert"'
+                       ' and os.environ["DB_HOST"] == "db") + 2)']
+
+            exit_code = ChildProcess(command, {'TLS_CERT': path, 'DB_HOST': 'db'},
+                                     secret_files).launch()
+
+            self.assertEqual(exit_code, 3)
+            self.assertFalse(os.path.exists(path))
+
+    @patch('os.execvpe')
+    def test_command_replaces_the_process_when_nothing_is_to_be_cleaned_up(self, mock_execvpe):
+        ChildProcess(['env'], {'DB_HOST': 'db'}).launch()
+
+        name, command, environment = mock_execvpe.call_args[0]
+        self.assertEqual((name, command), ('env', ['env']))
+        self.assertEqual(environment['DB_HOST'], 'db')
+
+    @patch('os.execvpe', side_effect=FileNotFoundError(2, 'No such file or directory'))
+    def test_missing_command_exits_with_127(self, _):
+        self.assertEqual(ChildProcess(['no-such-command'], {}).launch(), 127)
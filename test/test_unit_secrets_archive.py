@@ -0,0 +1,263 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.controller.export_controller import ExportController
+from conjur.controller.import_controller import ImportController
+from conjur.errors import FileNotFoundException, InvalidFormatException
+from conjur.logic.export_logic import ExportLogic
+from conjur.logic.import_logic import CHECKPOINT_FILE_SUFFIX, ImportLogic
+from conjur.util.secrets_archive import ArchiveReader, ArchiveWriter, encode_value
+
+PASSPHRASE_ENV = {'CONJUR_EXPORT_PASSPHRASE': 'correct horse'}
+
+
+def not_found():
+    return HttpStatusError(status=404, message='not found')
+
+
+class SecretsClient:
+    """
+    Answers the list, batch and single retrievals and the writes of variables
+    """
+
+    def __init__(self, values, listed=None, failing_id=None):
+        self.values = values
+        self.listed = listed if listed is not None else sorted(values)
+        self.failing_id = failing_id
+        self.batches = []
+        self.written = {}
+        self.lock = threading.Lock()
+
+    def list(self, constraints):
+        offset, limit = int(constraints['offset']), int(constraints['limit'])
+        return [f"dev:variable:{variable_id}" for variable_id in
+                self.listed[offset:offset + limit]]
+
+    def get_many(self, *variable_ids):
+        with self.lock:
+            self.batches.append(variable_ids)
+        if any(variable_id not in self.values for variable_id in variable_ids):
+            raise not_found()
+        return {variable_id: self.values[variable_id] for variable_id in variable_ids}
+
+    def get(self, variable_id):
+        if variable_id not in self.values:
+            raise not_found()
+        return self.values[variable_id].encode('utf-8')
+
+    def set(self, variable_id, value):
+        if variable_id == self.failing_id:
+            raise ConnectionError('forbidden')
+        with self.lock:
+            self.written[variable_id] = value
+
+
+def make_archive(chunks, passphrase='correct horse') -> bytes:
+    stream = io.BytesIO()
+    writer = ArchiveWriter(stream, passphrase)
+    for records in chunks:
+        writer.write_chunk(records)
+    writer.close()
+    return stream.getvalue()
+
+
+class SecretsArchiveTest(unittest.TestCase):
+
+    def test_records_are_read_back_chunk_by_chunk(self):
+        chunks = [[encode_value('apps/a', 'one'), encode_value('apps/b', b'\xff\x00')],
+                  [encode_value('apps/c', 'three')]]
+
+        reader = ArchiveReader(io.BytesIO(make_archive(chunks)), 'correct horse')
+
+        self.assertEqual(list(reader.chunks()), [(0, chunks[0]), (1, chunks[1])])
+        self.assertEqual(chunks[0][1], {'id': 'apps/b', 'value_base64': '/wA='})
+
+    def test_wrong_passphrase_is_reported(self):
+        reader = ArchiveReader(io.BytesIO(make_archive([[encode_value('a', 'b')]])), 'wrong')
+
+        with self.assertRaises(InvalidFormatException):
+            list(reader.chunks())
+
+    def test_truncated_or_tampered_archive_is_reported(self):
+        archive = make_archive([[encode_value('a', 'one')], [encode_value('b', 'two')]])
+        tampered = bytearray(archive)
+        tampered[-1] ^= 1
+
+        for content in (archive[:-10], bytes(tampered), b'not an archive'):
+            with self.assertRaises(InvalidFormatException):
+                list(ArchiveReader(io.BytesIO(content), 'correct horse').chunks())
+
+    def test_dropped_last_chunks_are_reported(self):
+        stream = io.BytesIO()
+        writer = ArchiveWriter(stream, 'correct horse')
+        writer.write_chunk([encode_value('a', 'one')])
+        length = len(stream.getvalue())
+        writer.write_chunk([encode_value('b', 'two')])
+        writer.close()
+
+        reader = ArchiveReader(io.BytesIO(stream.getvalue()[:length]), 'correct horse')
+        with self.assertRaises(InvalidFormatException):
+            list(reader.chunks())
+
+
+class ExportLogicTest(unittest.TestCase):
+
+    def test_variables_of_the_policy_are_exported_in_batches(self):
+        values = {f"apps/{number:03}": f"value {number}" for number in range(25)}
+        values['other/secret'] = 'not exported'
+        client = SecretsClient(values)
+        stream = io.BytesIO()
+
+        exported = ExportLogic(client, batch_size=10, concurrency=3) \
+            .export('apps', ArchiveWriter(stream, 'correct horse'))
+
+        self.assertEqual(exported, 25)
+        self.assertEqual([len(batch) for batch in client.batches], [10, 10, 5])
+        chunks = list(ArchiveReader(io.BytesIO(stream.getvalue()), 'correct horse').chunks())
+        self.assertEqual([record['id'] for _, records in chunks for record in records],
+                         sorted(variable_id for variable_id in values
+                                if variable_id.startswith('apps/')))
+
+    def test_variables_without_a_value_are_skipped(self):
+        client = SecretsClient({'apps/a': 'one', 'apps/c': 'three'},
+                               listed=['apps/a', 'apps/b', 'apps/c'])
+        export_logic = ExportLogic(client)
+        stream = io.BytesIO()
+
+        self.assertEqual(export_logic.export('root', ArchiveWriter(stream, 'pass')), 2)
+        self.assertEqual(export_logic.skipped_count, 1)
+        self.assertEqual(list(ArchiveReader(io.BytesIO(stream.getvalue()), 'pass').chunks()),
+                         [(0, [{'id': 'apps/a', 'value': 'one'},
+                               {'id': 'apps/c', 'value': 'three'}])])
+
+
+class ImportLogicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'apps.enc')
+        chunks = [[encode_value(f"apps/{chunk}-{number}", f"{chunk}-{number}")
+                   for number in range(3)] for chunk in range(4)]
+        with open(self.path, 'wb') as archive_file:
+            archive_file.write(make_archive(chunks))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def import_archive(self, client, resume=False, failures=None):
+        with open(self.path, 'rb') as archive_file:
+            reader = ArchiveReader(archive_file, 'correct horse')
+            return ImportLogic(client, concurrency=4).import_archive(
+                self.path, reader, resume,
+                on_failure=lambda variable_id, error: failures.append(variable_id)
+                if failures is not None else None)
+
+    def test_values_are_set_and_the_checkpoint_removed(self):
+        client = SecretsClient({})
+        failures = []
+
+        self.assertEqual(self.import_archive(client, failures=failures), (12, 0))
+        self.assertEqual(failures, [])
+        self.assertEqual(client.written['apps/2-1'], '2-1')
+        self.assertFalse(os.path.exists(self.path + CHECKPOINT_FILE_SUFFIX))
+
+    def test_failures_are_reported_without_stopping_the_import(self):
+        client = SecretsClient({}, failing_id='apps/1-2')
+        failures = []
+
+        self.assertEqual(self.import_archive(client, failures=failures), (11, 1))
+        self.assertEqual(failures, ['apps/1-2'])
+
+    def test_resumed_import_sets_the_chunks_with_failures_again(self):
+        self.import_archive(SecretsClient({}, failing_id='apps/1-2'))
+        with open(self.path + CHECKPOINT_FILE_SUFFIX, 'r', encoding='utf-8') as checkpoint:
+            self.assertEqual(json.load(checkpoint)['chunks'], 1)
+
+        client = SecretsClient({})
+        self.assertEqual(self.import_archive(client, resume=True), (12, 0))
+        self.assertEqual(sorted(client.written),
+                         [f"apps/{chunk}-{number}" for chunk in (1, 2, 3) for number in range(3)])
+        self.assertFalse(os.path.exists(self.path + CHECKPOINT_FILE_SUFFIX))
+
+    def test_interrupted_import_resumes_after_the_last_chunk_done(self):
+        class InterruptedClient(SecretsClient):
+            def set(self, variable_id, value):
+                if variable_id.startswith('apps/2-'):
+                    raise KeyboardInterrupt
+                super().set(variable_id, value)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.import_archive(InterruptedClient({}))
+        with open(self.path + CHECKPOINT_FILE_SUFFIX, 'r', encoding='utf-8') as checkpoint:
+            self.assertEqual(json.load(checkpoint)['chunks'], 2)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path + CHECKPOINT_FILE_SUFFIX).st_mode),
+                         0o600)
+
+        client = SecretsClient({})
+        self.assertEqual(self.import_archive(client, resume=True), (12, 0))
+        self.assertEqual(sorted(client.written),
+                         [f"apps/{chunk}-{number}" for chunk in (2, 3) for number in range(3)])
+
+    def test_truncated_archive_sets_no_value(self):
+        # The last chunk, the one holding the number of variables, is missing
+        with open(self.path, 'wb') as archive_file:
+            writer = ArchiveWriter(archive_file, 'correct horse')
+            for chunk in range(4):
+                writer.write_chunk([encode_value(f"apps/{chunk}", 'value')])
+        client = SecretsClient({})
+
+        with self.assertRaises(InvalidFormatException):
+            self.import_archive(client)
+        self.assertEqual(client.written, {})
+
+    def test_checkpoint_of_another_archive_is_ignored(self):
+        with open(self.path + CHECKPOINT_FILE_SUFFIX, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'salt': '00', 'chunks': 3, 'imported': 9, 'failed': 0}, checkpoint)
+        client = SecretsClient({})
+
+        self.assertEqual(self.import_archive(client, resume=True), (12, 0))
+        self.assertEqual(len(client.written), 12)
+
+
+@patch.dict(os.environ, PASSPHRASE_ENV)
+class ExportImportControllerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'apps.enc')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_exported_archive_is_private_and_imported(self):
+        source = SecretsClient({'apps/a': 'one', 'apps/b': 'two'})
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            ExportController(ExportLogic(source)).export('apps', self.path)
+        self.assertIn("Exported 2 variable(s)", mock_stdout.getvalue())
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        target = SecretsClient({})
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            ImportController(ImportLogic(target)).import_archive(self.path)
+        self.assertEqual(mock_stdout.getvalue(), "Imported 2 variable(s), 0 failed\n")
+        self.assertEqual(target.written, {'apps/a': 'one', 'apps/b': 'two'})
+
+    def test_failed_export_leaves_no_file(self):
+        client = SecretsClient({'apps/a': 'one'})
+        client.get_many = lambda *_: (_ for _ in ()).throw(ConnectionError('lost'))
+
+        with self.assertRaises(ConnectionError):
+            ExportController(ExportLogic(client)).export('apps', self.path)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_missing_archive_is_reported(self):
+        with self.assertRaises(FileNotFoundException):
+            ImportController(ImportLogic(SecretsClient({}))).import_archive(self.path)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from conjur.errors import InvalidFormatException
+from conjur.util.secrets_file import LITERAL, VARIABLE, SecretSpec, load_secrets_file, \
+    parse_secrets
+
+SECRETS_WITH_ENVIRONMENTS = '''
+common:
+  DB_HOST: !str db.example.com
+production:
+  DB_PASSWORD: !var prod/db/password
+  TLS_CERT: !var:file prod/tls/cert
+testing:
+  DB_PASSWORD: !var test/db/password
+'''
+
+
+class SecretsFileTest(unittest.TestCase):
+
+    def test_tags_are_parsed(self):
+        secrets = parse_secrets('A: !var one/secret\n'
+                                'B: !var:file two/secret\n'
+                                'C: !str literal\n'
+                                'D: !file content\n'
+                                'E: 42\n')
+
+        self.assertEqual(secrets, [SecretSpec('A', VARIABLE, 'one/secret'),
+                                   SecretSpec('B', VARIABLE, 'two/secret', as_file=True),
+                                   SecretSpec('C', LITERAL, 'literal'),
+                                   SecretSpec('D', LITERAL, 'content', as_file=True),
+                                   SecretSpec('E', LITERAL, '42')])
+
+    def test_environment_is_merged_with_common_section(self):
+        secrets = parse_secrets(SECRETS_WITH_ENVIRONMENTS, 'production')
+
+        self.assertEqual([secret.name for secret in secrets],
+                         ['DB_HOST', 'DB_PASSWORD', 'TLS_CERT'])
+        self.assertEqual(secrets[1].value, 'prod/db/password')
+
+    def test_environment_is_required_when_file_defines_environments(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_secrets(SECRETS_WITH_ENVIRONMENTS)
+
+    def test_unknown_environment_raises_error(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_secrets(SECRETS_WITH_ENVIRONMENTS, 'staging')
+
+    def test_invalid_variable_name_raises_error(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_secrets('NOT-VALID: !var one/secret\n')
+
+    def test_invalid_yaml_raises_error(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_secrets('A: [unclosed\n')
+
+    def test_python_tags_are_rejected(self):
+        with self.assertRaises(InvalidFormatException):
+            parse_secrets('A: !!python/object/apply:os.system ["true"]\n')
+
+    def test_literal_values_are_masked_in_repr(self):
+        self.assertNotIn('hunter2', repr(SecretSpec('A', LITERAL, 'hunter2')))
+
+    def test_load_secrets_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'secrets.yml')
+            with open(path, 'w') as secrets_file:
+                secrets_file.write(SECRETS_WITH_ENVIRONMENTS)
+
+            self.assertEqual(len(load_secrets_file(path, 'testing')), 2)
@@ -29,3 +29,20 @@ class ShowControllerTest(unittest.TestCase):
 
         with self.assertRaises(HttpStatusError):
             mock_show_controller.load("variable:myvar")
+
+    def test_show_many_writes_a_json_line_per_resource(self):
+        mock_show_logic = ShowLogic(MagicMock())
+        mock_show_logic.client.get_resource.side_effect = \
+            lambda kind, identifier: {'id': f'acc:{kind}:{identifier}'}
+        mock_show_controller = ShowController(mock_show_logic)
+
+        capture_stream = io.StringIO()
+        with redirect_stdout(capture_stream):
+            failed = mock_show_controller.load_many(['variable:one', 'missingkind', 'host:two'], 2)
+
+        lines = [json.loads(line) for line in capture_stream.getvalue().splitlines()]
+        self.assertEqual(lines[0], {'id': 'variable:one', 'resource': {'id': 'acc:variable:one'}})
+        self.assertEqual(lines[1]['id'], 'missingkind')
+        self.assertIn("missing 'kind:' prefix", lines[1]['error'])
+        self.assertEqual(lines[2], {'id': 'host:two', 'resource': {'id': 'acc:host:two'}})
+        self.assertEqual(failed, 1)
@@ -0,0 +1,96 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur.controller.template_controller import TemplateController
+from conjur.errors import ConflictingParametersException, InvalidFormatException, \
+    MissingRequiredParameterException
+from conjur.logic.template_logic import TemplateLogic
+
+TEMPLATE = 'user={{ secret "db/user" }}\n' \
+           'password={{secret \'db/password\'}}\r\n' \
+           'url=postgres://{{ secret "db/user" }}@db\n'
+
+
+class TemplateLogicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.client = MagicMock()
+        self.client.get_many.return_value = {'db/user': 'admin', 'db/password': 's3cr3t'}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_template(self, name: str, content: str = TEMPLATE) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as template:
+            template.write(content)
+        return path
+
+    def test_references_are_found_once_in_order(self):
+        first = self.write_template('first.tpl')
+        second = self.write_template('second.tpl', '{{ secret "api/key" }} {{ secret "db/user" }}')
+
+        self.assertEqual(TemplateLogic.find_references([first, second]),
+                         ['db/user', 'db/password', 'api/key'])
+
+    def test_malformed_reference_raises_error(self):
+        template = self.write_template('bad.tpl', 'ok\n{{ secret db/user }}\n')
+
+        with self.assertRaises(InvalidFormatException) as error:
+            TemplateLogic.find_references([template])
+        self.assertIn('line 2', str(error.exception))
+
+    def test_render_replaces_references_and_keeps_line_endings(self):
+        template = self.write_template('app.tpl')
+        output = io.StringIO()
+
+        TemplateLogic.render(template, self.client.get_many.return_value, output)
+
+        self.assertEqual(output.getvalue(), 'user=admin\npassword=s3cr3t\r\n'
+                                            'url=postgres://admin@db\n')
+
+    def test_render_to_file_is_readable_by_owner_only(self):
+        template = self.write_template('app.tpl')
+        output_path = os.path.join(self.tmp_dir.name, 'app.conf')
+
+        TemplateLogic.render_to_file(template, self.client.get_many.return_value, output_path)
+
+        self.assertEqual(os.stat(output_path).st_mode & 0o777, 0o600)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['app.conf', 'app.tpl'])
+
+    def test_failed_render_leaves_no_file(self):
+        template = self.write_template('app.tpl')
+        output_path = os.path.join(self.tmp_dir.name, 'app.conf')
+
+        with self.assertRaises(KeyError):
+            TemplateLogic.render_to_file(template, {}, output_path)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['app.tpl'])
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_many_templates_share_one_batch_request(self, _):
+        first = self.write_template('first.conf.tpl')
+        second = self.write_template('second.tpl')
+        output_dir = os.path.join(self.tmp_dir.name, 'out')
+        os.mkdir(output_dir)
+
+        TemplateController(TemplateLogic(self.client)).render([first, second],
+                                                              output_dir=output_dir)
+
+        self.client.get_many.assert_called_once_with('db/user', 'db/password')
+        self.assertEqual(sorted(os.listdir(output_dir)), ['first.conf', 'second'])
+
+    def test_many_templates_require_output_dir(self):
+        with self.assertRaises(MissingRequiredParameterException):
+            TemplateController(TemplateLogic(self.client)).render(['a.tpl', 'b.tpl'], 'out')
+
+    def test_template_cannot_be_rendered_over_itself(self):
+        template = self.write_template('app')
+
+        with self.assertRaises(ConflictingParametersException):
+            TemplateController(TemplateLogic(self.client)).render([template],
+                                                                  output_dir=self.tmp_dir.name)
+        self.client.get_many.assert_not_called()
@@ -123,3 +123,26 @@ class UserLogicTest(unittest.TestCase):
         mock_user_logic.update_api_key_in_credential_store('some_user_to_update', 'loaded_creds', 'someapikey')
         FileCredentialsProvider.update_api_key_entry.assert_called_once_with('some_user_to_update', 'loaded_creds',
                                                                          'someapikey')
+
+    def test_rotate_other_api_keys_loads_credentials_once_and_rotates_every_user(self):
+        mock_client = MagicMock()
+        mock_client.rotate_other_api_key.side_effect = lambda resource: f'key-{resource.identifier}'
+        user_logic = UserLogic(self.conjurrc_data, self.credential_provider, mock_client)
+        user_logic.extract_credentials_from_credential_store = MagicMock(return_value=MockCredentials)
+
+        results = list(user_logic.rotate_other_api_keys(['alice', 'bob'], max_workers=2))
+
+        user_logic.extract_credentials_from_credential_store.assert_called_once()
+        self.assertEqual(results, [('alice', 'key-alice', None), ('bob', 'key-bob', None)])
+
+    def test_rotate_other_api_keys_reports_logged_in_user_as_error(self):
+        mock_client = MagicMock()
+        mock_client.rotate_other_api_key.return_value = 'newkey'
+        user_logic = UserLogic(self.conjurrc_data, self.credential_provider, mock_client)
+        user_logic.extract_credentials_from_credential_store = MagicMock(return_value=MockCredentials)
+
+        results = list(user_logic.rotate_other_api_keys(['someuser', 'bob']))
+
+        self.assertIsNotNone(results[0][2])
+        self.assertEqual(results[1], ('bob', 'newkey', None))
+        mock_client.rotate_other_api_key.assert_called_once()
@@ -0,0 +1,98 @@
+import io
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from conjur.controller.variable_access_controller import VariableAccessController
+from conjur.logic.variable_access_logic import VariableAccessLogic
+
+PERMITTED = {
+    'secrets/a': ['dev:group:readers', 'dev:host:apps/direct'],
+    'secrets/b': ['dev:layer:apps/web'],
+    'secrets/c': ['dev:group:readers', 'dev:policy:apps'],
+}
+
+MEMBERS = {
+    'dev:group:readers': ['dev:user:alice', 'dev:layer:apps/web', 'dev:group:admins'],
+    'dev:layer:apps/web': ['dev:host:apps/web-1', 'dev:host:apps/web-2'],
+    'dev:group:admins': ['dev:user:bob', 'dev:group:readers'],
+    'dev:policy:apps': ['dev:user:admin'],
+}
+
+
+class AccessClient:
+    """
+    Answers the permitted roles and members-of requests, counting them
+    """
+
+    def __init__(self, permitted, members, failing_role=None):
+        self.permitted = permitted
+        self.members = members
+        self.failing_role = failing_role
+        self.members_calls = []
+        self.lock = threading.Lock()
+
+    def list_permitted_roles(self, data):
+        if data.identifier not in self.permitted:
+            raise ConnectionError('not found')
+        return list(self.permitted[data.identifier])
+
+    def list_members_of_role(self, data):
+        role = f"dev:{data.resource.kind}:{data.resource.identifier}"
+        with self.lock:
+            self.members_calls.append(role)
+        if role == self.failing_role:
+            raise ConnectionError('forbidden')
+        return [{'role': role, 'member': member} for member in self.members.get(role, [])]
+
+
+class VariableAccessTest(unittest.TestCase):
+
+    def test_permitted_roles_are_expanded_to_users_and_hosts(self):
+        client = AccessClient(PERMITTED, MEMBERS)
+
+        results = list(VariableAccessLogic(client, concurrency=4)
+                       .who_can_access(['secrets/a', 'secrets/b', 'secrets/c']))
+
+        self.assertEqual([variable_id for variable_id, _, _ in results],
+                         ['secrets/a', 'secrets/b', 'secrets/c'])
+        self.assertEqual(results[0][1], {
+            'privilege': 'execute',
+            'roles': ['dev:group:readers', 'dev:host:apps/direct'],
+            'users': ['dev:user:alice', 'dev:user:bob'],
+            'hosts': ['dev:host:apps/direct', 'dev:host:apps/web-1', 'dev:host:apps/web-2']})
+        self.assertEqual(results[1][1]['users'], [])
+        self.assertEqual(results[2][1]['users'],
+                         ['dev:user:admin', 'dev:user:alice', 'dev:user:bob'])
+
+    def test_members_of_shared_roles_are_listed_once(self):
+        client = AccessClient(PERMITTED, MEMBERS)
+
+        list(VariableAccessLogic(client).who_can_access(['secrets/a', 'secrets/b',
+                                                         'secrets/c'] * 100))
+
+        self.assertEqual(sorted(client.members_calls), sorted(MEMBERS))
+
+    def test_failures_are_reported_per_variable(self):
+        client = AccessClient(PERMITTED, MEMBERS, failing_role='dev:group:admins')
+
+        results = list(VariableAccessLogic(client).who_can_access(
+            ['secrets/a', 'secrets/b', 'secrets/missing']))
+
+        self.assertIsInstance(results[0][2], ConnectionError)
+        self.assertEqual(results[1][1]['hosts'], ['dev:host:apps/web-1', 'dev:host:apps/web-2'])
+        self.assertIsInstance(results[2][2], ConnectionError)
+
+    def test_results_are_written_as_json_lines(self):
+        controller = VariableAccessController(
+            VariableAccessLogic(AccessClient(PERMITTED, MEMBERS)))
+
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            controller.who_can_access(['secrets/b', 'secrets/missing'], privilege='read')
+
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(lines[0], {'id': 'secrets/b', 'access': {
+            'privilege': 'read', 'roles': ['dev:layer:apps/web'], 'users': [],
+            'hosts': ['dev:host:apps/web-1', 'dev:host:apps/web-2']}})
+        self.assertEqual(lines[1], {'id': 'secrets/missing', 'error': 'not found'})
@@ -0,0 +1,99 @@
+import argparse
+import io
+import json
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from conjur_api.errors.errors import HttpStatusError
+
+from conjur.argument_parser.parser_utils import duration_seconds
+from conjur.controller.variable_watch_controller import VariableWatchController
+from conjur.logic.variable_watch_logic import VariableWatchLogic
+
+
+class VariableWatchTest(unittest.TestCase):
+
+    def create_logic(self, responses):
+        self.client = MagicMock()
+        self.client.get_many.side_effect = responses
+        self.sleeps = []
+        return VariableWatchLogic(self.client, interval=10, max_interval=30,
+                                  sleep=self.sleeps.append, jitter=lambda: 1)
+
+    def test_changes_are_reported_after_the_first_poll(self):
+        logic = self.create_logic([{'a': '1', 'b': '1'}, {'a': '1', 'b': '2'},
+                                   {'a': '3', 'b': '2'}])
+        changes = []
+
+        logic.watch(['a', 'b', 'a'], changes.append, polls=3)
+
+        self.assertEqual(changes, [['b'], ['a']])
+        self.client.get_many.assert_called_with('a', 'b')
+        self.assertEqual(self.client.get_many.call_count, 3)
+
+    def test_interval_grows_while_idle_and_resets_on_change(self):
+        logic = self.create_logic([{'a': '1'}, {'a': '1'}, {'a': '1'}, {'a': '1'},
+                                   {'a': '2'}, {'a': '2'}])
+
+        logic.watch(['a'], MagicMock(), polls=6)
+
+        self.assertEqual(self.sleeps, [15, 22.5, 30, 30, 10])
+
+    def test_transient_errors_are_retried_later(self):
+        logic = self.create_logic([{'a': '1'}, HttpStatusError(status=503), {'a': '2'}])
+        changes = []
+
+        with self.assertLogs(level='WARNING'):
+            logic.watch(['a'], changes.append, polls=3)
+
+        self.assertEqual(changes, [['a']])
+
+    def test_other_errors_stop_the_watch(self):
+        logic = self.create_logic([{'a': '1'}, HttpStatusError(status=403)])
+
+        with self.assertRaises(HttpStatusError):
+            logic.watch(['a'], MagicMock(), polls=3)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_removed_variable_does_not_stop_the_watch_of_the_others(self, mock_stdout):
+        logic = self.create_logic([{'a': '1', 'b': '1'}, HttpStatusError(status=404),
+                                   HttpStatusError(status=404), {'a': '3', 'b': '2'}])
+        self.client.get.side_effect = [HttpStatusError(status=404), b'1',
+                                       HttpStatusError(status=404), b'1']
+
+        VariableWatchController(logic).watch(['a', 'b'], polls=4)
+
+        events = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([(event['event'], event['id']) for event in events],
+                         [('removed', 'a'), ('changed', 'a'), ('changed', 'b')])
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_changes_are_printed_as_json_lines(self, mock_stdout):
+        logic = self.create_logic([{'a': '1', 'b': '1'}, {'a': '2', 'b': '2'}])
+
+        VariableWatchController(logic).watch(['a', 'b'], polls=2)
+
+        events = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([(event['event'], event['id']) for event in events],
+                         [('changed', 'a'), ('changed', 'b')])
+        self.assertNotIn('2', [value for event in events for value in event.values()])
+
+    def test_hook_receives_changed_ids(self):
+        logic = self.create_logic([{'a b': '1', 'c': '1'}, {'a b': '2', 'c': '2'}])
+        hook = f'{sys.executable} -c "import os, sys; ' \
+               f'sys.exit(os.environ[\'CONJUR_CHANGED_VARIABLES\'] != \'a b\\nc\')"'
+
+        with patch('sys.stderr', new_callable=io.StringIO) as mock_stderr:
+            VariableWatchController(logic, hook).watch(['a b', 'c'], polls=2)
+
+        self.assertEqual(mock_stderr.getvalue(), '')
+
+    def test_duration_seconds(self):
+        self.assertEqual(duration_seconds('30'), 30)
+        self.assertEqual(duration_seconds('30s'), 30)
+        self.assertEqual(duration_seconds('5m'), 300)
+        self.assertEqual(duration_seconds('1.5h'), 5400)
+        for invalid in ['', 'm', '0', '-1s', 'tens']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                duration_seconds(invalid)
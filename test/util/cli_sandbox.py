@@ -0,0 +1,101 @@
+"""
+CLI sandbox
+
+Runs the CLI in a subprocess with its own home directory holding a
+.conjurrc and a netrc that point at a Conjur stub server, and reports the
+wall time and peak memory of every run.
+"""
+
+# Builtins
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+CLI_ENTRYPOINT = 'from conjur.cli import Cli; Cli.launch()'
+
+
+@dataclass
+class CliRun:
+    """
+    Outcome of a single CLI invocation
+    """
+    returncode: int
+    stdout: str
+    stderr: str
+    seconds: float
+    max_rss_kb: int
+
+
+class CliSandbox:
+    """
+    Temporary home directory configured for a stub server. The CLI is
+    launched the same way as the 'conjur' console script, with --insecure
+    since the stub serves plain HTTP.
+    """
+
+    def __init__(self, url: str, account: str, login: str, api_key: str):
+        self.home = tempfile.mkdtemp(prefix='conjur-cli-sandbox-')
+        self.netrc_path = os.path.join(self.home, '.netrc')
+        with open(os.path.join(self.home, '.conjurrc'), 'w', encoding='utf-8') as conjurrc:
+            conjurrc.write(f"account: {account}\n"
+                           f"appliance_url: {url}\n"
+                           "cert_file: ''\n"
+                           "authn_type: authn\n"
+                           f"netrc_path: {self.netrc_path}\n")
+        with open(self.netrc_path, 'w', encoding='utf-8') as netrc:
+            netrc.write(f"machine {url}\nlogin {login}\npassword {api_key}\n")
+        os.chmod(self.netrc_path, 0o600)
+        self.env = dict(os.environ, HOME=self.home, USERPROFILE=self.home,
+                        PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+        self.env.pop('TEST_ENV', None)
+
+    def path(self, *parts: str) -> str:
+        """
+        Returns a path inside the sandbox home directory
+        """
+        return os.path.join(self.home, *parts)
+
+    def run(self, *args: str, stdin: str = None) -> CliRun:
+        """
+        Runs the CLI with the given arguments and waits for it to exit
+        """
+        command = [sys.executable, '-c', CLI_ENTRYPOINT, '--insecure', *args]
+        with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+            start = time.perf_counter()
+            # pylint: disable=consider-using-with
+            process = subprocess.Popen(command, cwd=self.home, env=self.env,
+                                       stdin=subprocess.PIPE if stdin is not None
+                                       else subprocess.DEVNULL,
+                                       stdout=stdout, stderr=stderr)
+            if stdin is not None:
+                process.stdin.write(stdin.encode('utf-8'))
+                process.stdin.close()
+            max_rss_kb = 0
+            if hasattr(os, 'wait4'):
+                _, status, rusage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+                max_rss_kb = rusage.ru_maxrss
+            else:  # pragma: no cover
+                process.wait()
+            seconds = time.perf_counter() - start
+            stdout.seek(0)
+            stderr.seek(0)
+            return CliRun(process.returncode, stdout.read().decode('utf-8', errors='replace'),
+                          stderr.read().decode('utf-8', errors='replace'), seconds, max_rss_kb)
+
+    def cleanup(self):
+        """
+        Removes the sandbox home directory
+        """
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
@@ -0,0 +1,515 @@
+"""
+Conjur stub server
+
+A local, in-memory stand-in for the Conjur REST endpoints used by the CLI
+(authn, secrets, batch secrets, resources, roles, policies, API key
+rotation and Host Factory). It lets the CLI run end to end without a real
+Conjur, and lets benchmarks measure wall time and request counts with an
+injectable server latency.
+
+The server runs its own event loop in a background thread:
+
+    with ConjurStubServer(latency=0.01) as server:
+        server.add_user('admin', password='secret')
+        server.add_variable('db/password', 'p4ss')
+        ... point a .conjurrc at server.url ...
+        print(server.request_counts)
+"""
+
+# Builtins
+import asyncio
+import base64
+import json
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib import parse
+
+# Third party
+from aiohttp import web
+
+DEFAULT_ACCOUNT = 'dev'
+TOKEN_TTL_SECONDS = 8 * 60
+
+
+# pylint: disable=too-many-instance-attributes,too-many-public-methods,too-many-arguments
+class ConjurStubServer:
+    """
+    In-memory Conjur stub. Resources, secrets, role memberships, API keys and
+    Host Factory tokens are seeded through the add_* methods. Every request
+    is delayed by 'latency' (plus up to 'jitter') seconds, and a 'failure_rate'
+    share of requests can be answered with 'failure_status' to exercise retries.
+    """
+
+    def __init__(self, account: str = DEFAULT_ACCOUNT, latency: float = 0.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0,
+                 failure_status: int = 503, seed: int = 0):
+        self.account = account
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self._random = random.Random(seed)
+
+        self.resources = {}
+        self.secrets = {}
+        self.members = {}
+        self.api_keys = {}
+        self.passwords = {}
+        self.host_factory_tokens = {}
+        self.policy_version = 0
+
+        self.request_counts = Counter()
+        self._connections = set()
+        self._stats_lock = threading.Lock()
+
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self.url = None
+
+    # Lifecycle
+
+    def start(self) -> str:
+        """
+        Starts serving on a free local port and returns the server URL
+        """
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start_site())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name='conjur-stub-server', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.url
+
+    def stop(self):
+        """
+        Stops the server and its event loop
+        """
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def _start_site(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes(self._routes())
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f'http://{host}:{port}'
+
+    # Seeding
+
+    def add_resource(self, kind: str, identifier: str, owner: str = None,
+                     annotations: dict = None) -> str:
+        """
+        Adds a resource and returns its full ID
+        """
+        full_id = self.full_id(kind, identifier)
+        self.resources[full_id] = {
+            'id': full_id,
+            'owner': owner or self.full_id('user', 'admin'),
+            'policy': self.full_id('policy', 'root'),
+            'permissions': [],
+            'annotations': [{'name': name, 'value': value}
+                            for name, value in (annotations or {}).items()],
+            'created_at': '2022-08-02T12:00:00.000+00:00',
+        }
+        return full_id
+
+    def add_user(self, login: str, password: str = None, api_key: str = None) -> str:
+        """
+        Adds a user that can log in with its password and authenticate with
+        its API key. Returns the API key
+        """
+        return self._add_role('user', login, password, api_key)
+
+    def add_host(self, identifier: str, api_key: str = None) -> str:
+        """
+        Adds a host and returns its API key
+        """
+        return self._add_role('host', identifier, None, api_key)
+
+    def add_variable(self, identifier: str, value=None):
+        """
+        Adds a variable, with a first secret version if a value is given
+        """
+        full_id = self.add_resource('variable', identifier)
+        self.secrets[full_id] = [] if value is None else [_to_bytes(value)]
+
+    def add_membership(self, role: str, member: str):
+        """
+        Grants 'role' to 'member', both given as 'kind:id'
+        """
+        self.members.setdefault(self.full_id(*role.split(':', 1)), set()) \
+            .add(self.full_id(*member.split(':', 1)))
+
+    def add_host_factory(self, identifier: str) -> str:
+        """
+        Adds a Host Factory and returns its full ID
+        """
+        return self.add_resource('host_factory', identifier)
+
+    def full_id(self, kind: str, identifier: str) -> str:
+        """
+        Returns the full ID of a resource in the stub account
+        """
+        return f'{self.account}:{kind}:{identifier}'
+
+    def _add_role(self, kind: str, identifier: str, password: str, api_key: str) -> str:
+        full_id = self.add_resource(kind, identifier)
+        self.api_keys[full_id] = api_key or secrets.token_hex(16)
+        if password:
+            self.passwords[full_id] = password
+        return self.api_keys[full_id]
+
+    # Statistics
+
+    @property
+    def request_total(self) -> int:
+        """
+        Number of requests served since the last reset
+        """
+        return sum(self.request_counts.values())
+
+    @property
+    def connection_total(self) -> int:
+        """
+        Number of TCP connections that sent requests since the last reset
+        """
+        return len(self._connections)
+
+    def reset_stats(self):
+        """
+        Clears the request and connection counters
+        """
+        with self._stats_lock:
+            self.request_counts.clear()
+            self._connections.clear()
+
+    # Request handling
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = request.match_info.route.name or 'unknown'
+        with self._stats_lock:
+            self.request_counts[route] += 1
+            self._connections.add(request.transport.get_extra_info('peername'))
+
+        delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return web.Response(status=self.failure_status, text='Injected failure')
+        return await handler(request)
+
+    def _routes(self) -> list:
+        return [
+            web.get('/authn/{account}/login', self._login, name='login'),
+            web.post('/authn/{account}/{login}/authenticate', self._authenticate,
+                     name='authenticate'),
+            web.put('/authn/{account}/api_key', self._rotate_api_key, name='rotate_api_key'),
+            web.put('/authn/{account}/password', self._change_password, name='change_password'),
+            web.get('/whoami', self._whoami, name='whoami'),
+            web.get('/secrets', self._batch_secrets, name='batch_secrets'),
+            web.get('/secrets/{account}/{kind}/{identifier:.+}', self._get_secret,
+                    name='get_secret'),
+            web.post('/secrets/{account}/{kind}/{identifier:.+}', self._set_secret,
+                     name='set_secret'),
+            web.get('/resources/{account}', self._list_resources, name='list_resources'),
+            web.route('*', '/resources/{account}/{kind}/{identifier:.+}', self._resource,
+                      name='resource'),
+            web.route('*', '/roles/{account}/{kind}/{identifier:.+}', self._role, name='role'),
+            web.route('*', '/policies/{account}/policy/{identifier:.+}', self._load_policy,
+                      name='policy'),
+            web.post('/host_factory_tokens', self._create_tokens, name='create_tokens'),
+            web.delete('/host_factory_tokens/{token}', self._revoke_token, name='revoke_token'),
+            web.post('/host_factories/hosts', self._create_host, name='create_host'),
+            web.get('/', self._root, name='root'),
+        ]
+
+    async def _login(self, request: web.Request) -> web.Response:
+        login, password = _basic_auth(request)
+        role_id = self._role_id_of_login(login)
+        if role_id is None or self.passwords.get(role_id) != password:
+            raise web.HTTPUnauthorized()
+        return web.Response(text=self.api_keys[role_id])
+
+    async def _authenticate(self, request: web.Request) -> web.Response:
+        login = parse.unquote(request.match_info['login'])
+        role_id = self._role_id_of_login(login)
+        if role_id is None or self.api_keys.get(role_id) != await request.text():
+            raise web.HTTPUnauthorized()
+        return web.Response(text=self._issue_access_token(login))
+
+    async def _rotate_api_key(self, request: web.Request) -> web.Response:
+        if request.headers.get('Authorization', '').startswith('Basic '):
+            caller = self._authorize_basic(request)
+        else:
+            caller = self._authorize(request)
+        role = request.query.get('role')
+        role_id = self.full_id(*role.split(':', 1)) if role else caller
+        if role_id not in self.api_keys:
+            raise web.HTTPNotFound()
+        self.api_keys[role_id] = secrets.token_hex(16)
+        return web.Response(text=self.api_keys[role_id])
+
+    async def _change_password(self, request: web.Request) -> web.Response:
+        role_id = self._authorize_basic(request)
+        self.passwords[role_id] = await request.text()
+        return web.Response(status=204)
+
+    async def _whoami(self, request: web.Request) -> web.Response:
+        caller = self._authorize(request)
+        _, kind, identifier = caller.split(':', 2)
+        username = identifier if kind == 'user' else f'{kind}/{identifier}'
+        return web.json_response({'client_ip': request.remote, 'user_agent': '',
+                                  'account': self.account, 'username': username,
+                                  'token_issued_at': _utc_now().isoformat()})
+
+    async def _batch_secrets(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        values = {}
+        for full_id in request.query.get('variable_ids', '').split(','):
+            versions = self.secrets.get(full_id)
+            if not versions:
+                raise web.HTTPNotFound()
+            values[full_id] = versions[-1].decode('utf-8', errors='replace')
+        return web.json_response(values)
+
+    async def _get_secret(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        versions = self.secrets.get(self._resource_id(request))
+        if not versions:
+            raise web.HTTPNotFound()
+        version = int(request.query.get('version', len(versions)))
+        if not 0 < version <= len(versions):
+            raise web.HTTPNotFound()
+        return web.Response(body=versions[version - 1])
+
+    async def _set_secret(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        full_id = self._resource_id(request)
+        if full_id not in self.secrets:
+            raise web.HTTPNotFound()
+        self.secrets[full_id].append(await request.read())
+        return web.Response(status=201)
+
+    async def _list_resources(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        kind, search = request.query.get('kind'), request.query.get('search')
+        matches = [resource for full_id, resource in self.resources.items()
+                   if (not kind or full_id.split(':', 2)[1] == kind)
+                   and (not search or search in full_id)]
+        if request.query.get('count') == 'true':
+            return web.json_response({'count': len(matches)})
+        offset = int(request.query.get('offset', 0))
+        limit = request.query.get('limit')
+        matches = matches[offset:offset + int(limit)] if limit else matches[offset:]
+        return web.json_response(matches)
+
+    async def _resource(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        resource = self.resources.get(self._resource_id(request))
+        if request.method == 'HEAD':
+            return web.Response(status=200 if resource else 404)
+        if resource is None:
+            raise web.HTTPNotFound()
+        if request.query.get('check') == 'true':
+            return web.Response(status=204)
+        if request.query.get('permitted_roles') == 'true':
+            return web.json_response([resource['owner']])
+        return web.json_response(resource)
+
+    async def _role(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        role_id = self._resource_id(request)
+        if role_id not in self.resources:
+            raise web.HTTPNotFound()
+        if request.method == 'HEAD':
+            return web.Response(status=200)
+        if 'members' in request.query:
+            return web.json_response([self._grant(role_id, member)
+                                      for member in sorted(self.members.get(role_id, ()))])
+        if 'memberships' in request.query:
+            return web.json_response([self._grant(role, role_id)
+                                      for role in self._memberships_of(role_id)])
+        if 'all' in request.query:
+            return web.json_response([role_id] + self._all_memberships_of(role_id))
+        return web.json_response({'id': role_id, 'members': [
+            self._grant(role_id, member) for member in sorted(self.members.get(role_id, ()))]})
+
+    async def _load_policy(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        if request.method not in ('POST', 'PUT', 'PATCH'):
+            raise web.HTTPMethodNotAllowed(request.method, ['POST', 'PUT', 'PATCH'])
+        await request.read()
+        if request.query.get('dryRun') != 'true':
+            self.policy_version += 1
+        return web.json_response({'created_roles': {}, 'version': self.policy_version},
+                                 status=201)
+
+    async def _create_tokens(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        form = parse.parse_qs(await request.text())
+        host_factory = form.get('host_factory', [''])[0]
+        if host_factory not in self.resources:
+            raise web.HTTPNotFound()
+        tokens = []
+        for _ in range(int(form.get('count', ['1'])[0])):
+            token = secrets.token_hex(24)
+            self.host_factory_tokens[token] = {'token': token,
+                                               'expiration': _normalize_expiration(
+                                                   form.get('expiration', [''])[0]),
+                                               'cidr': form.get('cidr[]', []),
+                                               'host_factory': host_factory}
+            tokens.append({key: value for key, value in self.host_factory_tokens[token].items()
+                           if key != 'host_factory'})
+        return web.json_response(tokens)
+
+    async def _revoke_token(self, request: web.Request) -> web.Response:
+        self._authorize(request)
+        if self.host_factory_tokens.pop(request.match_info['token'], None) is None:
+            raise web.HTTPNotFound()
+        return web.Response(status=204)
+
+    async def _create_host(self, request: web.Request) -> web.Response:
+        token = _authorization_token(request)
+        if token not in self.host_factory_tokens:
+            raise web.HTTPUnauthorized()
+        host_id = parse.parse_qs(await request.text()).get('id', [''])[0]
+        if not host_id:
+            raise web.HTTPUnprocessableEntity()
+        api_key = self.add_host(host_id)
+        host = dict(self.resources[self.full_id('host', host_id)])
+        host['api_key'] = api_key
+        return web.json_response(host, status=201)
+
+    async def _root(self, _: web.Request) -> web.Response:
+        return web.Response(text='<html><body>Conjur stub server</body></html>',
+                            content_type='text/html')
+
+    # Helpers
+
+    def _authorize(self, request: web.Request) -> str:
+        """
+        Returns the full ID of the role holding the access token of the request
+        """
+        try:
+            access_token = json.loads(base64.b64decode(_authorization_token(request)))
+            claims = json.loads(base64.b64decode(access_token['payload']))
+        except (ValueError, KeyError, TypeError) as invalid_token:
+            raise web.HTTPUnauthorized() from invalid_token
+        if claims['exp'] < time.time():
+            raise web.HTTPUnauthorized()
+        role_id = self._role_id_of_login(claims['sub'])
+        if role_id is None:
+            raise web.HTTPUnauthorized()
+        return role_id
+
+    def _authorize_basic(self, request: web.Request) -> str:
+        """
+        Returns the full ID of the role whose login and password or API key
+        are given as basic auth
+        """
+        login, password = _basic_auth(request)
+        role_id = self._role_id_of_login(login)
+        if role_id is None or password not in (self.passwords.get(role_id),
+                                               self.api_keys[role_id]):
+            raise web.HTTPUnauthorized()
+        return role_id
+
+    def _issue_access_token(self, login: str) -> str:
+        now = int(time.time())
+        payload = {'sub': login, 'iat': now, 'exp': now + TOKEN_TTL_SECONDS}
+        return json.dumps({
+            'protected': base64.b64encode(b'{"alg":"stub"}').decode(),
+            'payload': base64.b64encode(json.dumps(payload).encode()).decode(),
+            'signature': secrets.token_hex(16),
+        })
+
+    def _role_id_of_login(self, login: str):
+        if login.startswith('host/'):
+            role_id = self.full_id('host', login[len('host/'):])
+        else:
+            role_id = self.full_id('user', login)
+        return role_id if role_id in self.api_keys else None
+
+    def _resource_id(self, request: web.Request) -> str:
+        return self.full_id(request.match_info['kind'],
+                            parse.unquote(request.match_info['identifier']))
+
+    def _memberships_of(self, role_id: str) -> list:
+        return sorted(role for role, members in self.members.items() if role_id in members)
+
+    def _all_memberships_of(self, role_id: str) -> list:
+        seen, pending = [], [role_id]
+        while pending:
+            for role in self._memberships_of(pending.pop()):
+                if role not in seen and role != role_id:
+                    seen.append(role)
+                    pending.append(role)
+        return seen
+
+    def _grant(self, role: str, member: str) -> dict:
+        return {'admin_option': False, 'ownership': False, 'role': role, 'member': member,
+                'policy': self.full_id('policy', 'root')}
+
+
+def _authorization_token(request: web.Request) -> str:
+    header = request.headers.get('Authorization', '')
+    prefix = 'Token token="'
+    if not header.startswith(prefix) or not header.endswith('"'):
+        raise web.HTTPUnauthorized()
+    return header[len(prefix):-1]
+
+
+def _basic_auth(request: web.Request) -> tuple:
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Basic '):
+        raise web.HTTPUnauthorized()
+    login, _, password = base64.b64decode(header[len('Basic '):]).decode().partition(':')
+    return login, password
+
+
+def _to_bytes(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode('utf-8')
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _normalize_expiration(expiration: str) -> str:
+    """
+    Formats a requested token expiration the way Conjur returns it
+    """
+    try:
+        expires_at = datetime.fromisoformat(expiration.replace('Z', '+00:00'))
+    except ValueError:
+        expires_at = _utc_now() + timedelta(hours=1)
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.strftime('%Y-%m-%dT%H:%M:%SZ')